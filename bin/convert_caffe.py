@@ -14,6 +14,7 @@ import numpy as np
 
 from webdnn import Graph, Shape
 from webdnn.backend import generate_descriptor
+from webdnn.backend.interface.generator import generate_and_save_descriptors
 from webdnn.frontend.chainer import ChainerConverter
 from webdnn.util import console
 
@@ -36,7 +37,6 @@ def parse_input_blob(args):
 
 
 def main():
-    sys.setrecursionlimit(10000)  # workaround for deep copying large graph
     parser = argparse.ArgumentParser()
     # default is Caffenet of Caffe example
     parser.add_argument("caffemodel")
@@ -53,6 +53,8 @@ def main():
     parser.add_argument("--out",
                         help="output directory (default: <model>/webdnn_graph_descriptor)")
     parser.add_argument("--encoding", help="name of weight encoder")
+    parser.add_argument("--cache_dir", help="directory of conversion cache. If the same graph was converted before, cached result is used.")
+    parser.add_argument("--jobs", type=int, default=1, help="number of processes to generate descriptors of backends in parallel")
     args = parser.parse_args()
 
     # multiple blob input can be easily implemented, but command-line arguments becomes complicated.
@@ -86,13 +88,23 @@ def main():
 
     console.stderr("[convert_caffe] Generating descriptors")
     any_backend_failed = False
-    for backend in args.backend.split(","):
-        try:
-            graph_exec_data = generate_descriptor(backend, graph, constant_encoder_name=args.encoding)
-            graph_exec_data.save(output_dir)
-        except Exception as ex:
-            any_backend_failed = True
-            console.error(f"[convert_caffe] Failed generating descriptor for backend {backend}: {str(ex)}")
+    backends = args.backend.split(",")
+    if args.jobs > 1 and len(backends) > 1:
+        errors = generate_and_save_descriptors(backends, graph, output_dir, jobs=args.jobs, constant_encoder_name=args.encoding,
+                                               cache_dir=args.cache_dir)
+        for backend, error in errors.items():
+            if error is not None:
+                any_backend_failed = True
+                console.error(f"[convert_caffe] Failed generating descriptor for backend {backend}: {error}")
+
+    else:
+        for backend in backends:
+            try:
+                graph_exec_data = generate_descriptor(backend, graph, constant_encoder_name=args.encoding, cache_dir=args.cache_dir)
+                graph_exec_data.save(output_dir)
+            except Exception as ex:
+                any_backend_failed = True
+                console.error(f"[convert_caffe] Failed generating descriptor for backend {backend}: {str(ex)}")
 
     if any_backend_failed:
         sys.exit(1)
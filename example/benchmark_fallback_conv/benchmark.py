@@ -0,0 +1,135 @@
+"""
+Benchmark of Convolution2D kernels of fallback backend.
+
+Both the naive kernel and the im2col + GEMM kernel are executed by Node.js for some convolution shapes, and the elapsed time and the
+maximum error against NumPy reference are reported.
+
+    python benchmark.py [--node NODE] [--repeat REPEAT]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import tempfile
+from os import path
+
+import numpy as np
+
+from webdnn.backend.fallback.kernels.convolution_2d import source, source_im2col
+
+# (N, H, W, C_in, C_out, ksize, stride, padding)
+SHAPES = [
+    (1, 56, 56, 64, 64, 1, 1, 0),
+    (1, 56, 56, 64, 64, 3, 1, 1),
+    (1, 28, 28, 128, 128, 3, 1, 1),
+    (1, 14, 14, 256, 256, 3, 1, 1),
+    (1, 112, 112, 3, 32, 3, 2, 1),
+    (1, 224, 224, 3, 64, 7, 2, 3),
+    (8, 32, 32, 1, 16, 3, 1, 1),
+]
+
+RUNNER_SOURCE = """
+var fs = require("fs");
+var kernels = {%s};
+var args = JSON.parse(fs.readFileSync(process.argv[2], "utf8"));
+
+function load(filename) {
+    var buffer = fs.readFileSync(filename);
+    return new Float32Array(buffer.buffer, buffer.byteOffset, buffer.byteLength / 4);
+}
+
+var x = load(args.x);
+var w = load(args.w);
+var result = {};
+Object.keys(kernels).forEach(function (name) {
+    var y = new Float32Array(args.y_size);
+    kernels[name]([x, w], [y], args.option);  // warm up
+
+    var start = Date.now();
+    for (var i = 0; i < args.repeat; i++) kernels[name]([x, w], [y], args.option);
+    result[name] = (Date.now() - start) / args.repeat;
+
+    fs.writeFileSync(args.y + "." + name, Buffer.from(y.buffer));
+});
+console.log(JSON.stringify(result));
+"""
+
+
+def reference(x, w, stride, padding):
+    n, h, w_, c = x.shape
+    oc, kh, kw, _ = w.shape
+    xp = np.pad(x, ((0, 0), (padding, padding), (padding, padding), (0, 0)), "constant")
+    oh = (h + 2 * padding - kh) // stride + 1
+    ow = (w_ + 2 * padding - kw) // stride + 1
+    y = np.zeros((n, oh, ow, oc), dtype=np.float64)
+    for ky in range(kh):
+        for kx in range(kw):
+            patch = xp[:, ky:ky + stride * oh:stride, kx:kx + stride * ow:stride, :]
+            y += np.tensordot(patch, w[:, ky, kx, :], axes=([3], [1]))
+
+    return y
+
+
+def run(node, repeat, shape, workdir):
+    n, h, w_, ic, oc, k, s, p = shape
+    oh = (h + 2 * p - k) // s + 1
+    ow = (w_ + 2 * p - k) // s + 1
+
+    x = np.random.rand(n, h, w_, ic).astype(np.float32)
+    w = np.random.rand(oc, k, k, ic).astype(np.float32) - 0.5
+    x.tofile(path.join(workdir, "x"))
+    w.tofile(path.join(workdir, "w"))
+
+    option = {
+        "in_spatial": [h, w_],
+        "n": n,
+        "out_size": oc,
+        "in_size": ic,
+        "out_spatial": [oh, ow],
+        "strides_x": [h * w_ * ic, w_ * ic, ic, 1],
+        "strides_w": [k * k * ic, k * ic, ic, 1],
+        "strides_y": [oh * ow * oc, ow * oc, oc, 1],
+        "padding": [p, p],
+        "stride": [s, s],
+        "ksize": [k, k],
+        "dilation_rate": [1, 1],
+        "pointwise": k == 1 and s == 1 and p == 0
+    }
+    with open(path.join(workdir, "args.json"), "w") as f:
+        json.dump({"x": path.join(workdir, "x"), "w": path.join(workdir, "w"), "y": path.join(workdir, "y"), "y_size": n * oh * ow * oc,
+                   "repeat": repeat, "option": option}, f)
+
+    output = subprocess.check_output([node, path.join(workdir, "runner.js"), path.join(workdir, "args.json")])
+    elapsed = json.loads(output.decode("utf-8"))
+
+    expected = reference(x.astype(np.float64), w.astype(np.float64), s, p)
+    errors = {}
+    for name in elapsed:
+        y = np.fromfile(path.join(workdir, "y." + name), dtype=np.float32).reshape(expected.shape)
+        errors[name] = float(np.max(np.abs(y - expected)))
+
+    return elapsed, errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--node", default="node", help="path to Node.js executable")
+    parser.add_argument("--repeat", type=int, default=3, help="number of measured executions for each shape")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        with open(path.join(workdir, "runner.js"), "w") as f:
+            f.write(RUNNER_SOURCE % (source + source_im2col))
+
+        print(f"{'N,H,W,Cin,Cout,k,s,p':<32}{'naive[ms]':>12}{'im2col[ms]':>12}{'speedup':>10}{'max error':>12}")
+        for shape in SHAPES:
+            elapsed, errors = run(args.node, args.repeat, shape, workdir)
+            naive = elapsed["convolution_2d"]
+            im2col = elapsed["convolution_2d_im2col"]
+            print(f"{','.join(map(str, shape)):<32}{naive:>12.1f}{im2col:>12.1f}{naive / max(im2col, 1e-3):>10.2f}"
+                  f"{max(errors.values()):>12.2e}")
+
+
+if __name__ == "__main__":
+    main()
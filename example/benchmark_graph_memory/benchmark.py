@@ -0,0 +1,99 @@
+"""
+Benchmark of memory usage of graph IR.
+
+ResNet-50 IR is constructed with WebDNN operators (without any frontend framework), and the memory allocated for nodes is measured by
+tracemalloc. Memory of constant data is excluded.
+
+    python benchmark.py [--batch-size BATCH_SIZE]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from webdnn.graph import traverse
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.average_pooling_2d import AveragePooling2D
+from webdnn.graph.operators.axiswise_bias import AxiswiseBias
+from webdnn.graph.operators.axiswise_scale import AxiswiseScale
+from webdnn.graph.operators.convolution2d import Convolution2D
+from webdnn.graph.operators.linear import Linear
+from webdnn.graph.operators.max_pooling_2d import MaxPooling2D
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.operators.softmax import Softmax
+from webdnn.graph.order import OrderNHWC, OrderHWCN, OrderC, OrderNC, OrderCN
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+# (number of blocks, channels of bottleneck, stride of first block)
+STAGES = [(3, 64, 1), (4, 128, 2), (6, 256, 2), (3, 512, 2)]
+
+
+def conv_bn(x: Variable, out_channels: int, ksize: int, stride: int, relu: bool) -> Variable:
+    in_channels = x.shape_dict[Axis.C]
+    w = ConstantVariable(np.zeros((ksize, ksize, in_channels, out_channels)), OrderHWCN)
+    h, = Convolution2D(None, ksize=ksize, stride=stride, padding=ksize // 2)(x, w)
+    h, = AxiswiseScale(None, axis=Axis.C)(h, ConstantVariable(np.ones((out_channels,)), OrderC))
+    h, = AxiswiseBias(None, axis=Axis.C)(h, ConstantVariable(np.zeros((out_channels,)), OrderC))
+    if relu:
+        h, = Relu(None)(h)
+
+    return h
+
+
+def bottleneck(x: Variable, channels: int, stride: int) -> Variable:
+    h = conv_bn(x, channels, 1, stride, True)
+    h = conv_bn(h, channels, 3, 1, True)
+    h = conv_bn(h, channels * 4, 1, 1, False)
+
+    if x.shape_dict[Axis.C] != channels * 4 or stride != 1:
+        x = conv_bn(x, channels * 4, 1, stride, False)
+
+    y, = Relu(None)(h + x)
+    return y
+
+
+def resnet50(batch_size: int) -> Graph:
+    x = Variable((batch_size, 224, 224, 3), OrderNHWC)
+    h = conv_bn(x, 64, 7, 2, True)
+    h, = MaxPooling2D(None, ksize=3, stride=2, padding=0)(h)
+
+    for num_blocks, channels, stride in STAGES:
+        for i in range(num_blocks):
+            h = bottleneck(h, channels, stride if i == 0 else 1)
+
+    h, = AveragePooling2D(None, ksize=7, stride=1, padding=0)(h)
+    h, = Linear(None)(h, ConstantVariable(np.zeros((1, 1, 2048, 1000)), OrderHWCN))
+    h, = AxiswiseBias(None, axis=Axis.C)(h, ConstantVariable(np.zeros((1000,)), OrderC))
+    y, = Softmax(None, axis=Axis.C)(h)
+
+    return Graph([x], [y])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=1)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    graph = resnet50(args.batch_size)
+    elapsed_build = time.perf_counter() - start
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nodes = traverse.listup_nodes(graph)
+    constant_size = sum(v.data.nbytes for v in traverse.filter_nodes(nodes, ConstantVariable))
+    node_size = allocated - constant_size
+
+    print(f"nodes              : {len(nodes)} ({len(traverse.listup_operators(graph))} operators)")
+    print(f"memory (nodes)     : {node_size / 1024:.1f} KiB")
+    print(f"bytes/node         : {node_size / len(nodes):.1f}")
+    print(f"build time         : {elapsed_build * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,9 @@
 
 import WeightDecoder from "./weight_decoder";
 import WeightDecoderEightbit from "./weight_decoder_eightbit";
+import WeightDecoderFP16 from "./weight_decoder_fp16";
+import WeightDecoderInt8 from "./weight_decoder_int8";
+import WeightDecoderKMeans from "./weight_decoder_kmeans";
 import WeightDecoderRaw from "./weight_decoder_raw";
 
 /**
@@ -16,6 +19,14 @@ export default function get_weight_decoder(name: string): WeightDecoder {
             return new WeightDecoderRaw();
         case 'eightbit':
             return new WeightDecoderEightbit();
+        case 'fp16':
+            return new WeightDecoderFP16();
+        case 'int8_symmetric':
+            return new WeightDecoderInt8(false);
+        case 'int8_asymmetric':
+            return new WeightDecoderInt8(true);
+        case 'kmeans':
+            return new WeightDecoderKMeans();
         default:
             throw new Error('Unknown weight encoding');
     }
@@ -0,0 +1,33 @@
+/**
+ * @module webdnn
+ */
+/** Don't Remove This comment block */
+
+import WeightDecoder from "./weight_decoder";
+
+/**
+ * @protected
+ */
+export default class WeightDecoderFP16 implements WeightDecoder {
+    async decode(data: Uint8Array): Promise<Float32Array> {
+        let src = new Uint16Array(data.buffer.slice(data.byteOffset, data.byteOffset + data.byteLength));
+        let dst = new Float32Array(src.length);
+
+        for (let i = 0; i < src.length; i++) {
+            let h = src[i];
+            let sign = (h & 0x8000) ? -1.0 : 1.0;
+            let exponent = (h >> 10) & 0x1F;
+            let fraction = h & 0x03FF;
+
+            if (exponent === 0) {
+                dst[i] = sign * fraction * Math.pow(2, -24);
+            } else if (exponent === 0x1F) {
+                dst[i] = fraction === 0 ? sign * Infinity : NaN;
+            } else {
+                dst[i] = sign * (1.0 + fraction / 1024) * Math.pow(2, exponent - 15);
+            }
+        }
+
+        return dst;
+    }
+}
@@ -0,0 +1,48 @@
+/**
+ * @module webdnn
+ */
+/** Don't Remove This comment block */
+
+import WeightDecoder from "./weight_decoder";
+
+/**
+ * @protected
+ */
+export default class WeightDecoderInt8 implements WeightDecoder {
+    constructor(private asymmetric: boolean) {
+    }
+
+    async decode(data: Uint8Array): Promise<Float32Array> {
+        let data_view = new DataView(data.buffer, data.byteOffset, data.byteLength);
+        let dst = new Float32Array(data_view.getInt32(0, true));
+        let src_offset = 4;
+
+        while (src_offset < data.length) {
+            let dst_offset = data_view.getInt32(src_offset, true);
+            let size = data_view.getInt32(src_offset + 4, true);
+            let num_channels = data_view.getInt32(src_offset + 8, true);
+            src_offset += 16;
+
+            let scale_offset = src_offset;
+            src_offset += num_channels * 4;
+
+            let minimum_offset = src_offset;
+            if (this.asymmetric) src_offset += num_channels * 4;
+
+            let channel_size = size / num_channels;
+            for (let c = 0; c < num_channels; c++) {
+                let scale = data_view.getFloat32(scale_offset + c * 4, true);
+                let minimum = this.asymmetric ? data_view.getFloat32(minimum_offset + c * 4, true) : 0.0;
+
+                for (let i = c * channel_size; i < (c + 1) * channel_size; i++) {
+                    let code = this.asymmetric ? data_view.getUint8(src_offset + i) : data_view.getInt8(src_offset + i);
+                    dst[dst_offset + i] = code * scale + minimum;
+                }
+            }
+
+            src_offset += (size + 3) & ~3;
+        }
+
+        return dst;
+    }
+}
@@ -0,0 +1,44 @@
+/**
+ * @module webdnn
+ */
+/** Don't Remove This comment block */
+
+import WeightDecoder from "./weight_decoder";
+
+/**
+ * @protected
+ */
+export default class WeightDecoderKMeans implements WeightDecoder {
+    async decode(data: Uint8Array): Promise<Float32Array> {
+        let data_view = new DataView(data.buffer, data.byteOffset, data.byteLength);
+        let dst = new Float32Array(data_view.getInt32(0, true));
+        let src_offset = 4;
+
+        while (src_offset < data.length) {
+            let dst_offset = data_view.getInt32(src_offset, true);
+            let size = data_view.getInt32(src_offset + 4, true);
+            let bits = data_view.getInt32(src_offset + 8, true);
+            src_offset += 16;
+
+            let codebook = new Float32Array(1 << bits);
+            for (let i = 0; i < codebook.length; i++) {
+                codebook[i] = data_view.getFloat32(src_offset + i * 4, true);
+            }
+            src_offset += codebook.length * 4;
+
+            // packed code is a bit stream (MSB first)
+            let bit_offset = 0;
+            for (let i = 0; i < size; i++) {
+                let code = 0;
+                for (let b = 0; b < bits; b++, bit_offset++) {
+                    code = (code << 1) | ((data[src_offset + (bit_offset >> 3)] >> (7 - (bit_offset & 7))) & 1);
+                }
+                dst[dst_offset + i] = codebook[code];
+            }
+
+            src_offset += ((((size * bits + 7) >> 3) + 3) & ~3);
+        }
+
+        return dst;
+    }
+}
@@ -108,10 +108,15 @@ export default class DescriptorRunnerWebGL extends DescriptorRunner<GraphDescrip
             })
                 .then(res => res.json() as Promise<GraphDescriptorWebGL>),
 
-            webdnnFetch(`${directory}/weight_${this.backendName}_${MAX_TEXTURE_SIZE}.bin`, {
+            // Weight pack is shared by all max texture size variants.
+            webdnnFetch(`${directory}/weight_${this.backendName}.bin`, {
                 ignoreCache: this.ignoreCache,
                 progressCallback: progressCallback
             })
+                .catch(() => webdnnFetch(`${directory}/weight_${this.backendName}_${MAX_TEXTURE_SIZE}.bin`, {
+                    ignoreCache: this.ignoreCache,
+                    progressCallback: progressCallback
+                })) // for descriptors generated by older version
                 .then(res => readArrayBufferProgressively(res, progressCallback))
         ]);
 
@@ -2,4 +2,5 @@ from webdnn.backend.code_generator import allocator
 from webdnn.backend.code_generator import command_buffer
 from webdnn.backend.code_generator import injector
 from webdnn.backend.code_generator import injectors
+from webdnn.backend.code_generator import kernel_deduplicator
 from webdnn.backend.code_generator import templates
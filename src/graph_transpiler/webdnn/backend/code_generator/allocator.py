@@ -1,5 +1,7 @@
+import tempfile
+from collections import OrderedDict
 from enum import auto, Enum
-from typing import Dict, List, Set, Union, Tuple
+from typing import Dict, List, Set, Union, Tuple, Callable, Iterable
 
 import numpy as np
 
@@ -7,10 +9,10 @@ from webdnn.graph import traverse
 from webdnn.graph.graph import Graph
 from webdnn.graph.operator import Operator
 from webdnn.graph.operators.attributes.inplace import Inplace
-from webdnn.graph.placeholder import Placeholder
+from webdnn.graph.placeholder import Placeholder, Dependency, PlaceholderOperator
 from webdnn.graph.variable import Variable
 from webdnn.graph.variables.constant_variable import ConstantVariable
-from webdnn.util import json, flags, console
+from webdnn.util import json, flags, console, profiler
 
 IntLike = Union[int, Placeholder]
 AllocationDict = Dict[Variable, "Allocation"]
@@ -55,9 +57,13 @@ class Allocation(json.SerializableMixin):
 
 
 class MemoryLayout(json.SerializableMixin):
-    def __init__(self, allocations: AllocationDict = None, data: np.array = None):
+    def __init__(self, allocations: AllocationDict = None, data: np.array = None, dynamic_size: IntLike = None, alignment: int = 1):
         self.allocations = {} if allocations is None else allocations  # type: AllocationDict
         self.data = data  # type: np.array
+        self._dynamic_size = dynamic_size  # type: IntLike
+        self.alignment = alignment  # type: int
+        self.report = None  # type: AllocationReport
+        self.planner_static_sizes = OrderedDict()  # type: Dict[str, int]
 
     def _to_serializable_(self):
         return {
@@ -80,6 +86,26 @@ class MemoryLayout(json.SerializableMixin):
     def __contains__(self, v: Variable):
         return v in self.allocations
 
+    def is_aligned(self, v: Variable, unit: int = 4) -> bool:
+        """is_aligned(v, unit=4)
+
+        Returns whether the offset of the variable is known to be a multiple of :code:`unit` elements. Kernel generators can use vector
+        load and store (ex. :code:`float4` in WebGPU) for aligned buffers.
+
+        Args:
+            v: variable
+            unit: alignment unit in elements
+
+        Returns:
+            (bool) `True` if aligned
+        """
+        offset = self.allocations[v].offset
+        if _check_resolved(offset):
+            return Placeholder.force_int(offset) % unit == 0
+
+        # Unresolved offsets are sum of aligned sizes
+        return self.alignment % unit == 0
+
     @property
     def total_size(self) -> IntLike:
         return self.static_size + self.dynamic_size
@@ -95,15 +121,148 @@ class MemoryLayout(json.SerializableMixin):
 
     @property
     def dynamic_size(self) -> IntLike:
+        if self._dynamic_size is not None:
+            return self._dynamic_size
+
         size = 0
-        for a in self.allocations.values():
+        for a in set(self.allocations.values()):
             if a.buffer_type == BufferType.Dynamic:
                 size += a.size
 
         return size
 
 
-def allocate(graph: Graph) -> MemoryLayout:
+class LifetimeReport(json.SerializableMixin):
+    """
+    Memory usage over time steps of allocations which are placed in same buffer region.
+
+    Dynamic allocations are grouped by :code:`term`, the product of unresolved placeholders in their size (see
+    :func:`_optimize_dynamic_buffer_reuse`). In that case, all sizes in this report are the coefficients of :code:`term`. For example,
+    when :code:`term` is :code:`N` and :code:`size` is :code:`1024`, actual buffer size is :code:`1024 * N` bytes. For static
+    allocations, :code:`term` is :code:`"1"`.
+
+    Attributes:
+        term (str): product of unresolved placeholders
+        timeline (list of int): total size of live allocations at each time step in bytes
+        peak_step (int or None): time step at which live size is maximum. `None` if there is no time step.
+        peak_live_size (int): total size of live allocations at :code:`peak_step` in bytes
+        peak_variables (list of str): names of variables alive at :code:`peak_step`
+        size (int): planned buffer size in bytes
+        size_without_reuse (int): total size of all allocations in bytes, which is required if no buffer is reused
+        padding_size (int): total size of padding appended to each allocation for alignment in bytes
+        num_variables (int): number of variables
+        num_allocations (int): number of allocations. Variables merged by in-place optimization share one allocation.
+    """
+
+    def __init__(self, term: str, timeline: List[int], peak_variables: List[str], size: int, size_without_reuse: int, padding_size: int,
+                 num_variables: int, num_allocations: int):
+        self.term = term
+        self.timeline = timeline
+        self.peak_step = max(range(len(timeline)), key=lambda t: timeline[t]) if len(timeline) > 0 else None
+        self.peak_live_size = 0 if self.peak_step is None else timeline[self.peak_step]
+        self.peak_variables = peak_variables
+        self.size = size
+        self.size_without_reuse = size_without_reuse
+        self.padding_size = padding_size
+        self.num_variables = num_variables
+        self.num_allocations = num_allocations
+
+    @property
+    def inplace_merges(self) -> int:
+        """
+        Number of variables which share the allocation with other variable by in-place optimization
+        """
+        return self.num_variables - self.num_allocations
+
+    @property
+    def fragmentation(self) -> float:
+        """
+        Ratio of the buffer which is not used even at peak time step. :code:`0` means that the planned buffer size is optimal.
+        """
+        return 1 - self.peak_live_size / self.size if self.size > 0 else 0.0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """
+        Ratio of the total allocation size to the planned buffer size. :code:`1` means that no buffer is reused.
+        """
+        return self.size_without_reuse / self.size if self.size > 0 else 1.0
+
+    def _to_serializable_(self):
+        return {
+            "term": self.term,
+            "size": self.size,
+            "size_without_reuse": self.size_without_reuse,
+            "padding_size": self.padding_size,
+            "peak_step": self.peak_step,
+            "peak_live_size": self.peak_live_size,
+            "peak_variables": self.peak_variables,
+            "fragmentation": self.fragmentation,
+            "reuse_ratio": self.reuse_ratio,
+            "num_variables": self.num_variables,
+            "num_allocations": self.num_allocations,
+            "inplace_merges": self.inplace_merges,
+            "timeline": self.timeline
+        }
+
+
+class AllocationReport(json.SerializableMixin):
+    """
+    Structured report of memory allocation, which is available as :code:`MemoryLayout.report`. Backends save it as
+    :code:`allocation_<backend>.json` next to :code:`graph_<backend>.json`.
+
+    Time step :code:`t` means the execution of :code:`t`-th operator. All sizes are in bytes.
+
+    Attributes:
+        num_steps (int): number of time steps
+        alignment (int): alignment of offsets in bytes
+        constant_size (int): size of constant buffer including padding, which is not included in the static report
+        constant_padding_size (int): size of padding between constant variables for alignment
+        static (:class:`LifetimeReport`): report of static allocations except constants
+        dynamic (list of :class:`LifetimeReport`): reports of dynamic allocations for each group
+        dynamic_size (int or :class:`~webdnn.graph.placeholder.Placeholder`): planned dynamic buffer size
+        planner_static_sizes (dict of str and int): peak static buffer size (except constants) planned by each buffer reuse planner
+    """
+
+    def __init__(self, num_steps: int, alignment: int, constant_size: int, constant_padding_size: int, static: LifetimeReport,
+                 dynamic: List[LifetimeReport], dynamic_size: IntLike, planner_static_sizes: Dict[str, int] = None):
+        self.num_steps = num_steps
+        self.alignment = alignment
+        self.constant_size = constant_size
+        self.constant_padding_size = constant_padding_size
+        self.static = static
+        self.dynamic = dynamic
+        self.dynamic_size = dynamic_size
+        self.planner_static_sizes = OrderedDict() if planner_static_sizes is None else planner_static_sizes
+
+    def _to_serializable_(self):
+        return {
+            "num_steps": self.num_steps,
+            "alignment": self.alignment,
+            "constant_size": self.constant_size,
+            "constant_padding_size": self.constant_padding_size,
+            "static": self.static,
+            "dynamic": {
+                "size": self.dynamic_size if Placeholder.check_resolved(self.dynamic_size) else repr(self.dynamic_size),
+                "groups": self.dynamic
+            },
+            "planner_static_sizes": self.planner_static_sizes
+        }
+
+
+def allocate(graph: Graph, alignment: int = 1) -> MemoryLayout:
+    """allocate(graph, alignment=1)
+
+    Allocate memory for all variables in the graph.
+
+    Args:
+        graph: graph
+        alignment: alignment unit of offsets in elements. Each allocation is padded so that all offsets of variables and constants are
+            multiples of this value. Backends which use vector load and store specify it (ex. :code:`4` for 16 bytes alignment).
+
+    Returns:
+        (:class:`MemoryLayout`) memory layout
+    """
     nodes = traverse.listup_nodes(graph)
     operators = traverse.filter_nodes(nodes, Operator)  # type: List[Operator]
     variables = traverse.filter_nodes(nodes, Variable)  # type: List[Variable]
@@ -115,24 +274,41 @@ def allocate(graph: Graph) -> MemoryLayout:
     dynamic_constants = traverse.filter_nodes([v for v in variables if not Placeholder.check_resolved(v.size)], ConstantVariable)
     assert len(dynamic_constants) == 0, f"ConstantVariable with unresolved placeholder shape is detected: f{dynamic_constants}"
 
-    allocations = _get_allocations(graph, operators, variables)
-    _optimize_inplace(operators, allocations)
+    with profiler.profile("allocator", "get_allocations"):
+        allocations = _get_allocations(graph, operators, variables)
+
+    with profiler.profile("allocator", "optimize_inplace"):
+        _optimize_inplace(operators, allocations)
 
     variable_allocations = {v: allocations[v] for v in variables if not isinstance(v, ConstantVariable)}
     constant_allocations = {v: allocations[v] for v in variables if isinstance(v, ConstantVariable)}
 
-    _update_offset(variable_allocations)
-    _optimize_buffer_reuse(variable_allocations)
+    with profiler.profile("allocator", "update_offset"):
+        dynamic_size = _update_offset(variable_allocations, alignment)
 
-    data = _update_constant_offset(constant_allocations)
+    planner_static_sizes = OrderedDict()  # type: Dict[str, int]
+    with profiler.profile("allocator", "optimize_buffer_reuse"):
+        _optimize_buffer_reuse(variable_allocations, alignment, planner_static_sizes)
+
+    dynamic_group_sizes = []  # type: List[Tuple[Placeholder, int]]
+    with profiler.profile("allocator", "optimize_dynamic_buffer_reuse"):
+        dynamic_size = _optimize_dynamic_buffer_reuse(variable_allocations, dynamic_size, alignment, dynamic_group_sizes)
+
+    with profiler.profile("allocator", "update_constant_offset"):
+        data = _update_constant_offset(constant_allocations, alignment)
 
     for allocation in set(variable_allocations.values()):
-        allocation.offset += data.size
+        if allocation.buffer_type == BufferType.Static:
+            allocation.offset += data.size
 
     allocations = variable_allocations
     allocations.update(constant_allocations)
 
-    layout = MemoryLayout(allocations, data)
+    layout = MemoryLayout(allocations, data, dynamic_size, alignment)
+    layout.planner_static_sizes = planner_static_sizes
+
+    with profiler.profile("allocator", "build_report"):
+        layout.report = _build_report(operators, variables, layout, dynamic_group_sizes)
 
     if flags.VISUALIZE_MEMORY_ALLOCATION:
         _visualize_allocation(operators, variables, layout)
@@ -195,30 +371,77 @@ def _get_allocations(graph: Graph, operators: List[Operator], variables: List[Va
     return allocations
 
 
-def _update_offset(allocations: AllocationDict):
+def _update_offset(allocations: AllocationDict, alignment: int = 1) -> IntLike:
+    """
+    Place all allocations sequentially without reusing. Returns the size of dynamic buffer.
+    """
     static_offset = 0
     dynamic_offset = 0
 
-    for allocation in allocations.values():
+    for allocation in _unique(allocations.values()):
         if allocation.buffer_type == BufferType.Static:
             allocation.offset = static_offset
-            static_offset = _align(static_offset + allocation.size)
+            static_offset = _align(static_offset + allocation.size, alignment)
 
         else:
             allocation.offset = dynamic_offset
-            dynamic_offset += _align(dynamic_offset + allocation.size)
+            dynamic_offset = dynamic_offset + _padded_size(allocation.size, alignment)
 
+    return dynamic_offset
+
+
+def _padded_size(size: IntLike, alignment: int) -> IntLike:
+    """
+    Returns the size padded to a multiple of :code:`alignment`. Unresolved size is padded by rounding up its integer coefficient, so that
+    the sum of padded sizes is also a multiple of :code:`alignment` for any placeholder value.
+    """
+    if _check_resolved(size):
+        return _align(Placeholder.force_int(size), alignment)
+
+    if alignment == 1:
+        return size
+
+    coefficient, term = _split_coefficient(size)
+    return _align(coefficient, alignment) * term
+
+
+def _unique(allocations: Iterable[Allocation]) -> List[Allocation]:
+    # Allocations merged by in-place optimization are shared by multiple variables
+    return list(OrderedDict.fromkeys(allocations).keys())
 
-def _update_constant_offset(allocations: AllocationDict):
-    offset = 0
-    data = []
 
+def create_constant_buffer(size: int) -> np.ndarray:
+    """create_constant_buffer(size)
+
+    Create float32 buffer for constant data. If the buffer size is larger than :code:`flags.CONSTANT_MEMMAP_THRESHOLD` bytes, the buffer
+    is backed by an anonymous temporary file (:class:`numpy.memmap`) so that the constant data of large models is not held in memory
+    twice. The file is removed when the buffer is released.
+
+    Args:
+        size: number of elements
+
+    Returns:
+        (np.ndarray) zero-filled buffer
+    """
+    if size == 0 or size * 4 < flags.CONSTANT_MEMMAP_THRESHOLD:
+        return np.zeros((size,), dtype=np.float32)
+
+    with tempfile.TemporaryFile() as f:
+        return np.memmap(f, dtype=np.float32, mode="w+", shape=(size,))
+
+
+def _update_constant_offset(allocations: AllocationDict, alignment: int = 1):
+    offset = 0
     for v, a in allocations.items():  # type: ConstantVariable, Allocation
-        data.append(v.data.flatten())
         a.offset = offset
-        offset = _align(offset + v.size)
+        offset = _align(offset + v.size, alignment)
 
-    return np.concatenate(data) if len(data) > 0 else np.empty((0,))
+    # Each constant is copied into its offset directly, without concatenating flattened copies. Padding is filled by zero.
+    data = create_constant_buffer(offset)
+    for v, a in allocations.items():  # type: ConstantVariable, Allocation
+        data[a.offset:a.offset + v.size] = v.data.ravel()
+
+    return data
 
 
 def _optimize_inplace(operators: List[Operator], allocations_dict: AllocationDict):
@@ -231,10 +454,307 @@ def _optimize_inplace(operators: List[Operator], allocations_dict: AllocationDic
             _merge_allocation(allocations_dict, allocations_dict[attr.get_input()], allocations_dict[attr.get_output()])
 
 
-def _optimize_buffer_reuse(allocations_dict: AllocationDict):
+def _optimize_buffer_reuse(allocations_dict: AllocationDict, alignment: int = 1, planner_static_sizes: Dict[str, int] = None):
     """
     Optimize memory size by reusing buffer if available
 
+    Only static allocations are optimized. Algorithm is selected by :code:`flags.optimize.MEMORY_ALLOCATION_PLANNER`. Planners place
+    proxy allocations whose sizes are padded to multiples of :code:`alignment`, so that all planned offsets are aligned.
+
+    - :code:`"greedy"`: :func:`_optimize_buffer_reuse_greedy` (default)
+    - :code:`"merge_table"`: :func:`_optimize_buffer_reuse_merge_table`
+
+    The peak static buffer size in bytes planned by the selected planner is logged and stored into :code:`planner_static_sizes` if it is
+    specified. If :code:`flags.optimize.MEMORY_ALLOCATION_COMPARE_PLANNERS` is set, all planners are executed to compare the memory
+    footprint (the merge table planner is much slower on large graphs), and sizes of all planners are stored. Only the result of the
+    selected planner is applied.
+    """
+    if not (flags.optimize.OPTIMIZE and flags.optimize.OPTIMIZE_MEMORY_ALLOCATION):
+        console.debug('_optimize_buffer_reuse is skipped')
+        return
+
+    allocations = _unique(a for a in allocations_dict.values() if a.buffer_type == BufferType.Static)
+    if len(allocations) == 0:
+        return
+
+    proxies = [Allocation(size=_align(a.size, alignment), begin=a.begin, end=a.end, name=a.name) for a in allocations]
+    sorted_proxies = sorted(proxies, key=lambda a: (-a.size, a.begin, a.end, a.name))
+
+    planner_name = flags.optimize.MEMORY_ALLOCATION_PLANNER
+    if planner_name not in _buffer_reuse_planners:
+        raise ValueError(f"Unknown memory allocation planner: {planner_name}")
+
+    if planner_static_sizes is None:
+        planner_static_sizes = OrderedDict()
+
+    if flags.optimize.MEMORY_ALLOCATION_COMPARE_PLANNERS:
+        # The selected planner is executed at last, and its result is applied.
+        planner_names = sorted(_buffer_reuse_planners.keys(), key=lambda n: n == planner_name)
+
+    else:
+        planner_names = [planner_name]
+
+    for name in planner_names:
+        _buffer_reuse_planners[name](sorted_proxies)
+        planner_static_sizes[name] = _peak_size(proxies) * 4
+        console.debug(f"[Allocator] planner '{name}': peak static size = {planner_static_sizes[name]}[B]")
+
+    for proxy, a in zip(proxies, allocations):
+        a.offset = proxy.offset
+
+
+def _optimize_dynamic_buffer_reuse(allocations_dict: AllocationDict, dynamic_size: IntLike, alignment: int = 1,
+                                   group_sizes: List[Tuple[Placeholder, int]] = None) -> IntLike:
+    """
+    Optimize dynamic buffer size by reusing buffer if available. Returns the size of dynamic buffer. If :code:`group_sizes` is
+    specified, the term and the planned peak size of each group are appended into it.
+
+    Algorithm:
+
+    The size of dynamic allocation is represented as :code:`coefficient * term`, where :code:`coefficient` is an integer and :code:`term`
+    is a product of unresolved placeholders. For example, when batch size is :code:`N`, the size of variable whose shape is
+    :code:`(N, 3, 224, 224)` is represented as :code:`150528 * N`. Allocations are grouped by :code:`term`. Although unresolved sizes cannot
+    be compared in general, sizes of allocations in same group are compared based on the coefficients. Therefore, buffer reuse in each
+    group can be optimized by the static planner, with proxy allocations whose size is the coefficient. The offset of each allocation is
+    represented as placeholder expression like follows. When :code:`alignment` is specified, coefficients of proxy allocations are padded to
+    multiples of it, and therefore all offsets are aligned for any placeholder value.
+
+    .. code-block:: text
+
+        group1:             term = N,     planned peak size = 300
+        group2:             term = N * T, planned peak size = 100
+
+        allocation offset:  (offset of allocation in group1) * N
+                            300 * N + (offset of allocation in group2) * N * T
+        dynamic size:       300 * N + 100 * N * T
+    """
+    if not (flags.optimize.OPTIMIZE and flags.optimize.OPTIMIZE_MEMORY_ALLOCATION):
+        console.debug('_optimize_dynamic_buffer_reuse is skipped')
+        return dynamic_size
+
+    allocations = _unique(a for a in allocations_dict.values() if a.buffer_type == BufferType.Dynamic)
+    if len(allocations) == 0:
+        return dynamic_size
+
+    planner = _buffer_reuse_planners[flags.optimize.MEMORY_ALLOCATION_PLANNER]
+
+    base = 0  # type: IntLike
+    for term, pairs in _group_by_term(allocations):
+        proxies = [Allocation(size=_align(coefficient, alignment), begin=a.begin, end=a.end, name=a.name) for coefficient, a in pairs]
+        planner(sorted(proxies, key=lambda a: (-a.size, a.begin, a.end, a.name)))
+
+        for proxy, (_, a) in zip(proxies, pairs):
+            a.offset = _add(base, proxy.offset * term) if proxy.offset > 0 else base
+
+        base = _add(base, _peak_size(proxies) * term)
+        if group_sizes is not None:
+            group_sizes.append((term, _peak_size(proxies)))
+
+    console.debug(f"[Allocator] dynamic buffer size: {dynamic_size} -> {base}")
+    return base
+
+
+def _group_by_term(allocations: List[Allocation]) -> List[Tuple[Placeholder, List[Tuple[int, Allocation]]]]:
+    """
+    Group dynamic allocations by the term of their size. Returns the list of the term and the pairs of the coefficient and the allocation
+    in each group.
+    """
+    groups = []  # type: List[Tuple[Placeholder, List[Tuple[int, Allocation]]]]
+    for a in allocations:
+        coefficient, term = _split_coefficient(a.size)
+
+        for group_term, pairs in groups:
+            if group_term == term:
+                pairs.append((coefficient, a))
+                break
+
+        else:
+            groups.append((term, [(coefficient, a)]))
+
+    return groups
+
+
+def _add(x: IntLike, y: IntLike) -> IntLike:
+    # Avoid wrapping placeholder by redundant addition such as "0 + x"
+    if Placeholder.check_resolved(x) and Placeholder.force_int(x) == 0:
+        return y
+
+    return x + y
+
+
+def _split_coefficient(size: Placeholder) -> Tuple[int, Placeholder]:
+    """
+    Split unresolved size into the integer coefficient and the product of unresolved placeholders.
+
+    >>> _split_coefficient(Placeholder(label="N") * 3 * 224 * 224)
+    (150528, <N>)
+    """
+    if size.dependency is None or size.dependency.operator != PlaceholderOperator.Mul:
+        return 1, size
+
+    coefficient = 1
+    terms = []
+    for operand in size.dependency.operands:
+        if Placeholder.check_resolved(operand):
+            coefficient *= Placeholder.force_int(operand)
+
+        else:
+            terms.append(operand)
+
+    if len(terms) == 1:
+        return coefficient, terms[0]
+
+    return coefficient, Placeholder(Dependency(PlaceholderOperator.Mul, terms))
+
+
+def _peak_size(allocations: List[Allocation]) -> int:
+    return max((a.offset + a.size for a in allocations), default=0)
+
+
+class _LifetimeTree:
+    """
+    Segment tree over time steps, which lists up allocations whose lifetime overlaps with the query range.
+
+    Each allocation is registered into at most :code:`O(log T)` canonical nodes covering its lifetime. In addition, each node holds all
+    allocations registered in its subtree, so that a node fully covered by the query range can be answered at once. Therefore, the query
+    costs :code:`O(log T + K)`, where :code:`K` is the number of found allocations.
+    """
+
+    def __init__(self, t_max: int):
+        self.size = 1
+        while self.size < t_max:
+            self.size *= 2
+
+        self.node_items = [[] for _ in range(2 * self.size)]  # type: List[List[Allocation]]
+        self.subtree_items = [[] for _ in range(2 * self.size)]  # type: List[List[Allocation]]
+
+    def insert(self, a: Allocation, begin: int, end: int):
+        updated = set()  # type: Set[int]
+
+        l = begin + self.size
+        r = end + self.size
+        while l < r:
+            if l & 1:
+                self._register(l, a, updated)
+                l += 1
+
+            if r & 1:
+                r -= 1
+                self._register(r, a, updated)
+
+            l >>= 1
+            r >>= 1
+
+    def _register(self, node: int, a: Allocation, updated: Set[int]):
+        self.node_items[node].append(a)
+
+        while node > 0 and node not in updated:
+            self.subtree_items[node].append(a)
+            updated.add(node)
+            node >>= 1
+
+    def query(self, begin: int, end: int) -> List[Allocation]:
+        result = {}  # type: Dict[Allocation, None]
+        stack = [(1, 0, self.size)]  # type: List[Tuple[int, int, int]]
+
+        while len(stack) > 0:
+            node, node_begin, node_end = stack.pop()
+            if node_end <= begin or end <= node_begin:
+                continue
+
+            if begin <= node_begin and node_end <= end:
+                result.update((a, None) for a in self.subtree_items[node])
+                continue
+
+            result.update((a, None) for a in self.node_items[node])
+
+            node_mid = (node_begin + node_end) // 2
+            stack.append((node * 2, node_begin, node_mid))
+            stack.append((node * 2 + 1, node_mid, node_end))
+
+        return list(result.keys())
+
+
+def _optimize_buffer_reuse_greedy(allocations: List[Allocation]):
+    """
+    Optimize memory size by greedy best-fit planning.
+
+    Algorithm:
+
+    Allocations are placed one by one in descending order of size. For each allocation, list up already placed allocations whose lifetime
+    overlaps with it by :class:`_LifetimeTree`, and scan the gaps between them in order of address. The allocation is placed into the
+    smallest gap which can contain it. If no such gap exists, it's placed on the top of the overlapped allocations.
+
+    Because the result depends on the placing order, this procedure is performed in some orders (descending order of size, "area" (size *
+    lifetime length), and lifetime length, and ascending order of allocation time), and the best result is used.
+
+    Time order:
+        Sort: O(N log N)
+        Iteration: O(N) times
+            list up overlapped allocations: O(log T + K)
+            sort overlapped allocations: O(K log K)
+
+        Total: O(N log N + N K log K), where K is the number of allocations alive at same time (usually small).
+    """
+    lifetimes = {a: _get_lifetime(a) for a in allocations}  # type: Dict[Allocation, Tuple[int, int]]
+    t_max = max(end for _, end in lifetimes.values())
+
+    def duration(a: Allocation):
+        begin, end = lifetimes[a]
+        return end - begin
+
+    order_keys = [
+        lambda a: -a.size,
+        lambda a: -a.size * duration(a),
+        lambda a: (-duration(a), -a.size),
+        lambda a: (lifetimes[a][0], -a.size)
+    ]
+
+    best_offsets = None  # type: Dict[Allocation, int]
+    best_size = None  # type: int
+
+    for order_key in order_keys:
+        order = sorted(allocations, key=order_key)
+        tree = _LifetimeTree(t_max)
+
+        for a in order:
+            overlaps = sorted(tree.query(*lifetimes[a]), key=lambda x: x.offset)
+
+            best_offset = None
+            best_gap = None
+            offset = 0
+            for a2 in overlaps:
+                gap = a2.offset - offset
+                if gap >= a.size and (best_gap is None or gap < best_gap):
+                    best_offset = offset
+                    best_gap = gap
+
+                offset = max(offset, _align(a2.offset + a2.size))
+
+            a.offset = offset if best_offset is None else best_offset
+            tree.insert(a, *lifetimes[a])
+
+        size = _peak_size(allocations)
+        if best_size is None or size < best_size:
+            best_size = size
+            best_offsets = {a: a.offset for a in allocations}
+
+    for a, offset in best_offsets.items():
+        a.offset = offset
+
+
+def _get_lifetime(a: Allocation) -> Tuple[int, int]:
+    # Allocation whose begin or end is unknown (ex. output variable of no operator, or variable used by no operator) is also alive
+    # during at least 1 time step.
+    begin = max(a.begin, 0)
+    end = max(a.end, begin + 1)
+    return begin, end
+
+
+def _optimize_buffer_reuse_merge_table(allocations: List[Allocation]):
+    """
+    Optimize memory size by merging allocations based on "Merge Offset Table".
+
     Algorithm:
 
     Considering 4 variables with follow size and lifetime.
@@ -316,17 +836,11 @@ def _optimize_buffer_reuse(allocations_dict: AllocationDict):
     Time order:
         Build Table: O(N^2)
         Iteration: O(N) times
+            get max score pair: rescan the whole table, O(N^2)
             update table: O(N)
 
-        Total: O(N^2)
+        Total: O(N^2) for the table, plus a rescan of the table on each merge
     """
-    if not (flags.optimize.OPTIMIZE and flags.optimize.OPTIMIZE_MEMORY_ALLOCATION):
-        console.debug('_optimize_buffer_reuse is skipped')
-        return
-
-    allocations = list(set(filter(lambda x: Placeholder.check_resolved(x), allocations_dict.values())))
-    allocations = sorted(allocations, key=lambda a: a.size, reverse=True)
-
     # Construct offset table
     offset_table = {a2: {} for a2 in allocations}
     for i1, a1 in enumerate(allocations):
@@ -465,18 +979,84 @@ def _optimize_buffer_reuse(allocations_dict: AllocationDict):
         a2.offset = offset
 
 
+_buffer_reuse_planners = {
+    "greedy": _optimize_buffer_reuse_greedy,
+    "merge_table": _optimize_buffer_reuse_merge_table
+}  # type: Dict[str, Callable[[List[Allocation]], None]]
+
+
 def _merge_allocation(allocations: AllocationDict, a1: Allocation, a2: Allocation, a_new: Allocation = None):
     """
     merge two allocations into one new allocation
     """
     if a_new is None:
-        a_new = Allocation(size=max(a1.size, a2.size), begin=min(a1.begin, a2.begin), end=max(a1.end, a2.end))
+        if Placeholder.check_resolved(a1.size) and Placeholder.check_resolved(a2.size):
+            size = max(Placeholder.force_int(a1.size), Placeholder.force_int(a2.size))
+
+        elif a1.size == a2.size:
+            # In-place input and output have same size, even if it is unresolved
+            size = a1.size
+
+        else:
+            raise ValueError(f"Allocations with different unresolved sizes cannot be merged: {a1.size}, {a2.size}")
+
+        a_new = Allocation(size=size, begin=min(a1.begin, a2.begin), end=max(a1.end, a2.end))
 
     for v, lifetime in allocations.items():
         if lifetime == a1 or lifetime == a2:
             allocations[v] = a_new
 
 
+def _build_report(operators: List[Operator], variables: List[Variable], layout: MemoryLayout,
+                  dynamic_group_sizes: List[Tuple[Placeholder, int]]) -> AllocationReport:
+    allocation_variables = OrderedDict()  # type: Dict[Allocation, List[Variable]]
+    for v in variables:
+        if not isinstance(v, ConstantVariable):
+            allocation_variables.setdefault(layout[v], []).append(v)
+
+    num_steps = max([len(operators)] + [_get_lifetime(a)[1] for a in allocation_variables.keys()])
+
+    def lifetime_report(term: str, pairs: List[Tuple[int, Allocation]], size: int) -> LifetimeReport:
+        # live size is computed by accumulating the change at begin and end of each lifetime
+        delta = [0] * (num_steps + 1)
+        for coefficient, a in pairs:
+            begin, end = _get_lifetime(a)
+            delta[begin] += coefficient * 4
+            delta[end] -= coefficient * 4
+
+        timeline = np.cumsum(delta[:-1], dtype=np.int64).tolist()
+        report = LifetimeReport(term=term, timeline=timeline, peak_variables=[], size=size * 4,
+                                size_without_reuse=sum(coefficient for coefficient, _ in pairs) * 4,
+                                padding_size=sum(_align(coefficient, layout.alignment) - coefficient for coefficient, _ in pairs) * 4,
+                                num_variables=sum(len(allocation_variables[a]) for _, a in pairs), num_allocations=len(pairs))
+
+        if report.peak_step is not None:
+            for _, a in pairs:
+                begin, end = _get_lifetime(a)
+                if begin <= report.peak_step < end:
+                    report.peak_variables.extend(v.name for v in allocation_variables[a])
+
+        return report
+
+    static_allocations = [a for a in allocation_variables.keys() if a.buffer_type == BufferType.Static]
+    static_size = max((a.offset + a.size - layout.data.size for a in static_allocations), default=0)
+    static_report = lifetime_report("1", [(a.size, a) for a in static_allocations], static_size)
+
+    dynamic_reports = []
+    dynamic_allocations = [a for a in allocation_variables.keys() if a.buffer_type == BufferType.Dynamic]
+    for term, pairs in _group_by_term(dynamic_allocations):
+        # If dynamic buffer reuse is skipped, allocations are placed sequentially.
+        size = next((size for group_term, size in dynamic_group_sizes if group_term == term),
+                    sum(_align(coefficient, layout.alignment) for coefficient, _ in pairs))
+        dynamic_reports.append(lifetime_report(repr(term), pairs, size))
+
+    constant_size = sum(v.size for v in variables if isinstance(v, ConstantVariable))
+
+    return AllocationReport(num_steps=num_steps, alignment=layout.alignment * 4, constant_size=layout.data.size * 4,
+                            constant_padding_size=(layout.data.size - constant_size) * 4, static=static_report, dynamic=dynamic_reports,
+                            dynamic_size=layout.dynamic_size * 4, planner_static_sizes=layout.planner_static_sizes)
+
+
 def _visualize_allocation(operators: List[Operator], variables: List[Variable], layout: MemoryLayout):
     UNIT_HEIGHT = 14
     total_size = layout.total_size - layout.data.size
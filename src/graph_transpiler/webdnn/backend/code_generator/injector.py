@@ -1,5 +1,6 @@
 import re
-from typing import List, Tuple
+from functools import lru_cache
+from typing import List, Tuple, Union
 
 
 class Tag:
@@ -12,29 +13,66 @@ class Tag:
 
 _reg_tag = re.compile("%%([a-zA-Z0-9_]+)(?:\((.*?)\))?%%", re.MULTILINE)
 
+Segment = Union[str, Tag]
+
+
+def parse_template(text: str) -> Tuple[Segment, ...]:
+    """parse_template(text)
+
+    Split the template into plain text segments and tags. Results are not cached. Use :func:`parse_raw_template` for templates shared
+    by many kernels.
+
+    Args:
+        text: template text
+
+    Returns:
+        (tuple of str and :class:`Tag`) segments
+    """
+    segments = []  # type: List[Segment]
+    pos = 0
+    for ma in _reg_tag.finditer(text):
+        if ma.start() > pos:
+            segments.append(text[pos:ma.start()])
+
+        args = [] if ma.group(2) is None else list(map(str.strip, ma.group(2).split(",")))
+        segments.append(Tag(ma.group(0), ma.group(1), args, ma.span()))
+        pos = ma.end()
+
+    if pos < len(text):
+        segments.append(text[pos:])
+
+    return tuple(segments)
+
+
+@lru_cache(maxsize=1024)
+def parse_raw_template(text: str) -> Tuple[Segment, ...]:
+    """parse_raw_template(text)
+
+    Same as :func:`parse_template`, but results are cached with the template text as the key, so raw templates shared by many kernels
+    are parsed only once. Text which is unique to each kernel (ex. template whose buffer tags are already injected) must not be passed,
+    because it only evicts the shared entries.
+
+    Returned tags are shared among all injections of the same template, and must not be modified.
+
+    Args:
+        text: raw template text
+
+    Returns:
+        (tuple of str and :class:`Tag`) segments
+    """
+    return parse_template(text)
+
 
 class Injector:
+    # If True, the injected text is a raw kernel template and its parse result is cached by :func:`parse_raw_template`. Injectors
+    # applied to already injected text should set False.
+    cache_template = True
+
     def inject_tag(self, tag: Tag) -> str:
         raise NotImplementedError
 
     def inject(self, text: str) -> str:
-        tags = []
-        pos = 0
-        while True:
-            ma = _reg_tag.search(text, pos)
-            if ma is None:
-                break
-
-            original = ma.group(0)
-            name = ma.group(1)
-            args = [] if ma.group(2) is None else list(map(str.strip, ma.group(2).split(",")))
-            span = ma.span()
-
-            tag = Tag(original, name, args, span)
-            tags.append(tag)
-            pos = tag.span[1]
-
-        for tag in sorted(tags, key=lambda x: x.span[1], reverse=True):
-            text = text[:tag.span[0]] + self.inject_tag(tag) + text[tag.span[1]:]
-
-        return text
+        segments = parse_raw_template(text) if self.cache_template else parse_template(text)
+
+        # Injected values are not scanned again
+        return "".join(segment if isinstance(segment, str) else self.inject_tag(segment) for segment in segments)
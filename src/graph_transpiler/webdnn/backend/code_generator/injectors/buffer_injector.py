@@ -22,7 +22,15 @@ def _flatten(l: Sequence[Any]):
     """
     _flatten([[1, 2], 3, [[4], 5, [[6, 7]]], [8, 9]] == [1, 2, 3, 4, 5, 6, 7, 8, 9]
     """
-    return sum([_flatten(v) if isinstance(v, Sequence) else [v] for v in l], [])
+    result = []
+    for v in l:
+        if isinstance(v, Sequence):
+            result.extend(_flatten(v))
+
+        else:
+            result.append(v)
+
+    return result
 
 
 class BufferInjector(Injector):
@@ -178,7 +186,7 @@ class BufferInjector(Injector):
             return self.buffer
 
         offset_map = {}
-        buffer = bytes()
+        buffer = bytearray()  # appended in-place
         for key, value in self.value_map.items():
             offset_map[key] = len(buffer) // 4  # sizeof(int)
 
@@ -273,6 +281,6 @@ class BufferInjector(Injector):
                     + f"'{key}' is {value}, whose type is {type(value)}.")
 
         self.offset_map = offset_map
-        self.buffer = buffer
+        self.buffer = bytes(buffer)
 
         return self.buffer
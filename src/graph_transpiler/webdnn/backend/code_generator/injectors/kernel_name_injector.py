@@ -6,6 +6,9 @@ from webdnn.graph.operator import Operator
 
 
 class KernelNameInjector(Injector):
+    # Kernel name is injected after all other tags, so the text is unique to each kernel
+    cache_template = False
+
     def __init__(self, base_name: Union[str, Operator]):
         self.base_name = base_name.__class__.__name__.lower() if isinstance(base_name, Operator) else base_name
         self.name = base_name
@@ -0,0 +1,66 @@
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Dict, List, TypeVar
+
+from webdnn.util import console
+
+T_KERNEL = TypeVar("T_KERNEL")
+
+# Function name generated by KernelNameInjector, "<base name>_<sha224 hex digest>"
+_reg_generated_name = re.compile(r"^[a-zA-Z0-9_]+_[0-9a-f]{56}$")
+
+_NAME_PLACEHOLDER = "%%FUNC_NAME%%"
+
+
+def _canonical_key(name: str, source: str) -> str:
+    return hashlib.sha256(source.replace(name, _NAME_PLACEHOLDER).encode("utf-8")).hexdigest()
+
+
+def deduplicate_kernels(kernels: List[T_KERNEL]) -> List[T_KERNEL]:
+    """deduplicate_kernels(kernels)
+
+    Share the functions whose sources are same except the function name.
+
+    :class:`~webdnn.backend.code_generator.injectors.kernel_name_injector.KernelNameInjector` names each function by the hash of its
+    source, and therefore same functions generated from same type of operators are already emitted only once. However, same source can
+    be generated from different type of operators (ex. single :code:`Relu` kernel and :code:`FusedElementwise` kernel which contains
+    only :code:`Relu`), and such functions are emitted with different names. This function renames them into the first emitted name, and
+    updates :code:`entry_func_name` of each kernel.
+
+    Only function names generated by :code:`KernelNameInjector` are renamed. Per-call parameters are already passed through meta
+    buffer (or call option), so renaming the entry function does not change the behavior.
+
+    Args:
+        kernels: kernels. :code:`func_sources` and :code:`exec_info.entry_func_name` of each kernel is modified in-place.
+
+    Returns:
+        (list of kernels) same as :code:`kernels`
+    """
+    canonical_names = {}  # type: Dict[str, str]
+    num_renamed = 0
+
+    for kernel in kernels:
+        renames = {}  # type: Dict[str, str]
+        func_sources = OrderedDict()
+
+        for name, source in kernel.func_sources.items():
+            if _reg_generated_name.match(name):
+                key = _canonical_key(name, source)
+                canonical_name = canonical_names.setdefault(key, name)
+
+                if canonical_name != name:
+                    source = source.replace(name, canonical_name)
+                    renames[name] = canonical_name
+                    num_renamed += 1
+                    name = canonical_name
+
+            func_sources[name] = source
+
+        kernel.func_sources = func_sources
+        kernel.exec_info.entry_func_name = renames.get(kernel.exec_info.entry_func_name, kernel.exec_info.entry_func_name)
+
+    if num_renamed > 0:
+        console.debug(f"[KernelDeduplicator] {num_renamed} kernels reuse the function of other kernel")
+
+    return kernels
@@ -17,17 +17,17 @@ from webdnn.backend.interface.graph_descriptor import IGraphExecutionData
 from webdnn.encoder.constant_encoder import ConstantEncoder
 from webdnn.graph import traverse
 from webdnn.graph.graph import Graph
-from webdnn.util import console, flags
+from webdnn.util import console, flags, profiler
 from webdnn.util.json import json
 
 
 class GraphExecutionData(IGraphExecutionData):
     descriptor: GraphDescriptor
 
-    def __init__(self, graph: Graph, descriptor: GraphDescriptor, constants: bytes):
+    def __init__(self, graph: Graph, descriptor: GraphDescriptor, constant_encoder: ConstantEncoder):
         self.graph = graph
         self.descriptor = descriptor
-        self.constants = constants
+        self.constant_encoder = constant_encoder
         self.backend_suffix = "fallback"
 
     def save(self, dirname: str):
@@ -36,11 +36,18 @@ class GraphExecutionData(IGraphExecutionData):
         with open(path.join(dirname, "graph_{}.json".format(self.backend_suffix)), "w") as f:
             json.dump(self.descriptor, f, indent=2)
 
+        with open(path.join(dirname, "allocation_{}.json".format(self.backend_suffix)), "w") as f:
+            json.dump(self.descriptor.memory_layout.report, f, indent=2)
+
         with open(path.join(dirname, "kernels_{}.js".format(self.backend_suffix)), "w") as f:
             f.write(self.descriptor.concat_kernel_sources())
 
+        # Constants are encoded when saved, and streamed into the file
         with open(path.join(dirname, "weight_{}.bin".format(self.backend_suffix)), "wb") as f:
-            f.write(self.constants)
+            with profiler.profile("encoder", self.constant_encoder.__class__.__name__):
+                constants_size = self.constant_encoder.encode_to(self.descriptor.memory_layout, f)
+
+        console.debug(f"[FallbackDescriptorGenerator] constants encoded size: {constants_size}")
 
 
 class FallbackDescriptorGenerator(DescriptorGenerator[Kernel, GraphExecutionData]):
@@ -56,9 +63,6 @@ class FallbackDescriptorGenerator(DescriptorGenerator[Kernel, GraphExecutionData
         console.debug(f"[FallbackDescriptorGenerator] memory_layout dynamic size: {memory_layout.dynamic_size * 4}")
 
         constant_encoder = ConstantEncoder.get_encoder(kwargs.get("constant_encoder_name", None))
-        constants_bytes = constant_encoder.encode(memory_layout)
-
-        console.debug(f"[FallbackDescriptorGenerator] constants encoded size: {len(constants_bytes)}")
 
         descriptor = GraphDescriptor(
             kernels=cls.generate_kernels(graph, memory_layout),
@@ -68,7 +72,7 @@ class FallbackDescriptorGenerator(DescriptorGenerator[Kernel, GraphExecutionData
             constants_encoding=constant_encoder.name,
             licenses=graph.licenses)
 
-        return GraphExecutionData(graph, descriptor, constants_bytes)
+        return GraphExecutionData(graph, descriptor, constant_encoder)
 
 
 def generate(graph: Graph, **kwargs):
@@ -6,6 +6,7 @@ from webdnn.backend.fallback.kernel import Kernel
 from webdnn.backend.fallback.kernels.util import calculate_stride
 from webdnn.graph.axis import Axis
 from webdnn.graph.operators.convolution2d import Convolution2D
+from webdnn.graph.placeholder import Placeholder
 
 # x: (batch_size, h, w, in_size), w: (kh, kw, in_size, out_size), y: (batch_size, oh, ow, out_size) C-order
 # EcmaScript3 to support older browsers
@@ -72,6 +73,140 @@ for (var batch = 0; batch < n; batch++) {
 
 """
 
+# Convolution lowered into im2col and GEMM.
+#
+# The output pixels are processed in tiles of TILE_M rows. For each tile, input patches are copied into `col` (TILE_M x K, K = kh * kw *
+# in_size) and multiplied by packed filter `wp` (K x out_size). The multiplication is blocked along K so that the used part of `wp` stays
+# in the cache, and the innermost loop is unrolled by 4.
+#
+# If the convolution is pointwise (1x1 kernel, stride 1, no padding) and channels are contiguous in x, im2col is skipped and rows of x are
+# used directly.
+source_im2col = """
+convolution_2d_im2col: function(input_arrays, output_arrays, option) {
+var x = input_arrays[0];
+var w = input_arrays[1];
+var y = output_arrays[0];
+var n = option.n | 0;
+var in_h = option.in_spatial[0] | 0;
+var in_w = option.in_spatial[1] | 0;
+var out_h = option.out_spatial[0] | 0;
+var out_w = option.out_spatial[1] | 0;
+var out_size = option.out_size | 0;
+var in_size = option.in_size | 0;
+var pad_h = option.padding[0] | 0;
+var pad_w = option.padding[1] | 0;
+var stride_h = option.stride[0] | 0;
+var stride_w = option.stride[1] | 0;
+var ksize_h = option.ksize[0] | 0;
+var ksize_w = option.ksize[1] | 0;
+var dilation_h = option.dilation_rate[0] | 0;
+var dilation_w = option.dilation_rate[1] | 0;
+var sx0 = option.strides_x[0] | 0, sx1 = option.strides_x[1] | 0, sx2 = option.strides_x[2] | 0, sx3 = option.strides_x[3] | 0;
+var sw0 = option.strides_w[0] | 0, sw1 = option.strides_w[1] | 0, sw2 = option.strides_w[2] | 0, sw3 = option.strides_w[3] | 0;
+var sy0 = option.strides_y[0] | 0, sy1 = option.strides_y[1] | 0, sy2 = option.strides_y[2] | 0, sy3 = option.strides_y[3] | 0;
+var pointwise = !!option.pointwise;
+
+var TILE_M = 64;
+var BLOCK_K = 256;
+var M = n * out_h * out_w;
+var K = ksize_h * ksize_w * in_size;
+var N = out_size;
+
+// pack filter into K x N matrix
+var wp = new Float32Array(K * N);
+var ky, kx, ic, oc, k;
+for (ky = 0; ky < ksize_h; ky++) {
+  for (kx = 0; kx < ksize_w; kx++) {
+    for (ic = 0; ic < in_size; ic++) {
+      k = (ky * ksize_w + kx) * in_size + ic;
+      for (oc = 0; oc < N; oc++) {
+        wp[k * N + oc] = w[oc * sw0 + ky * sw1 + kx * sw2 + ic * sw3];
+      }
+    }
+  }
+}
+
+var a = pointwise ? x : new Float32Array(TILE_M * K);
+var a_offsets = new Int32Array(TILE_M);
+var y_offsets = new Int32Array(TILE_M);
+var acc = new Float32Array(TILE_M * N);
+
+for (var m0 = 0; m0 < M; m0 += TILE_M) {
+  var rows = M - m0 < TILE_M ? M - m0 : TILE_M;
+  var i, j;
+
+  // im2col
+  for (i = 0; i < rows; i++) {
+    var m = m0 + i;
+    var ox = m % out_w;
+    var oy = ((m - ox) / out_w) % out_h;
+    var b = (m - ox - oy * out_w) / (out_w * out_h);
+    y_offsets[i] = b * sy0 + oy * sy1 + ox * sy2;
+
+    if (pointwise) {
+      a_offsets[i] = b * sx0 + oy * sx1 + ox * sx2;
+      continue;
+    }
+
+    a_offsets[i] = i * K;
+    k = i * K;
+    for (ky = 0; ky < ksize_h; ky++) {
+      var iy = oy * stride_h - pad_h + ky * dilation_h;
+      for (kx = 0; kx < ksize_w; kx++) {
+        var ix = ox * stride_w - pad_w + kx * dilation_w;
+        if (iy < 0 || iy >= in_h || ix < 0 || ix >= in_w) {
+          for (ic = 0; ic < in_size; ic++) a[k++] = 0.0;
+        } else {
+          var x_offset = b * sx0 + iy * sx1 + ix * sx2;
+          for (ic = 0; ic < in_size; ic++) a[k++] = x[x_offset + ic * sx3];
+        }
+      }
+    }
+  }
+
+  // GEMM
+  for (i = 0; i < rows * N; i++) acc[i] = 0.0;
+
+  for (var k0 = 0; k0 < K; k0 += BLOCK_K) {
+    var k1 = K - k0 < BLOCK_K ? K : k0 + BLOCK_K;
+    for (i = 0; i < rows; i++) {
+      var a_offset = a_offsets[i];
+      var c = i * N;
+      for (k = k0; k < k1; k++) {
+        var av = a[a_offset + k];
+        if (av === 0.0) continue;
+
+        var bo = k * N;
+        for (j = 0; j + 3 < N; j += 4) {
+          acc[c + j] += av * wp[bo + j];
+          acc[c + j + 1] += av * wp[bo + j + 1];
+          acc[c + j + 2] += av * wp[bo + j + 2];
+          acc[c + j + 3] += av * wp[bo + j + 3];
+        }
+        for (; j < N; j++) {
+          acc[c + j] += av * wp[bo + j];
+        }
+      }
+    }
+  }
+
+  for (i = 0; i < rows; i++) {
+    var y_offset = y_offsets[i];
+    var c = i * N;
+    for (j = 0; j < N; j++) {
+      y[y_offset + j * sy3] = acc[c + j];
+    }
+  }
+}
+
+},
+
+"""
+
+# The naive kernel is used when the number of output pixels (n * out_h * out_w) is so small that packing filter costs comparably to the
+# convolution itself. See "example/benchmark_fallback_conv".
+IM2COL_MIN_ROWS = 4
+
 
 def calculate_all_strides(var):
     return [calculate_stride(var, axis) for axis in [Axis.N, Axis.H, Axis.W, Axis.C]]
@@ -84,23 +219,38 @@ def convolution_2d(op: Convolution2D, memory_layout: MemoryLayout) -> List[Kerne
     w = op.inputs["w"]
     y = op.outputs["y"]
 
-    kernel = Kernel(
-        {"convolution_2d": source},
-        "convolution_2d",
-        inputs=[memory_layout[x], memory_layout[w]],
-        outputs=[memory_layout[y]],
-        call_option={"in_spatial": [x.shape_dict[Axis.H], x.shape_dict[Axis.W]],
-                     "n": x.shape_dict[Axis.N],
-                     "out_size": y.shape_dict[Axis.C],
-                     "in_size": x.shape_dict[Axis.C],
-                     "out_spatial": [y.shape_dict[Axis.H], y.shape_dict[Axis.W]],
-                     "strides_x": calculate_all_strides(x),
-                     "strides_w": calculate_all_strides(w),
-                     "strides_y": calculate_all_strides(y),
-                     "padding": op.padding,
-                     "stride": op.stride,
-                     "ksize": op.ksize,
-                     "dilation_rate": op.dilation_rate}
-    )
+    strides_x = calculate_all_strides(x)
+    call_option = {"in_spatial": [x.shape_dict[Axis.H], x.shape_dict[Axis.W]],
+                   "n": x.shape_dict[Axis.N],
+                   "out_size": y.shape_dict[Axis.C],
+                   "in_size": x.shape_dict[Axis.C],
+                   "out_spatial": [y.shape_dict[Axis.H], y.shape_dict[Axis.W]],
+                   "strides_x": strides_x,
+                   "strides_w": calculate_all_strides(w),
+                   "strides_y": calculate_all_strides(y),
+                   "padding": op.padding,
+                   "stride": op.stride,
+                   "ksize": op.ksize,
+                   "dilation_rate": op.dilation_rate}
+
+    num_rows = y.shape_dict[Axis.N] * y.shape_dict[Axis.H] * y.shape_dict[Axis.W]
+    if not Placeholder.check_resolved(num_rows) or num_rows >= IM2COL_MIN_ROWS:
+        call_option["pointwise"] = op.ksize == (1, 1) and op.stride == (1, 1) and op.padding == (0, 0) and strides_x[3] == 1
+        kernel = Kernel(
+            {"convolution_2d_im2col": source_im2col},
+            "convolution_2d_im2col",
+            inputs=[memory_layout[x], memory_layout[w]],
+            outputs=[memory_layout[y]],
+            call_option=call_option
+        )
+
+    else:
+        kernel = Kernel(
+            {"convolution_2d": source},
+            "convolution_2d",
+            inputs=[memory_layout[x], memory_layout[w]],
+            outputs=[memory_layout[y]],
+            call_option=call_option
+        )
 
     return [kernel]
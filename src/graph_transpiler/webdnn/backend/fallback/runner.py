@@ -0,0 +1,444 @@
+"""
+Browser-free runner of fallback backend descriptors
+
+:class:`FallbackRunner` loads :code:`graph_fallback.json` and :code:`weight_fallback.bin` saved by
+:class:`~webdnn.backend.fallback.generator.FallbackDescriptorGenerator`, and executes the kernels in the same memory layout as the
+browser runtime does.
+
+Kernels with fixed entry function name (ex. :code:`convolution_2d`, :code:`linear`) are computed by NumPy implementation registered by
+:func:`register_kernel`. Other kernels, such as elementwise kernels which are generated from
+:class:`~webdnn.graph.operators.elementwise.Elementwise` operators, exist only as JavaScript source. They are executed in Node.js
+subprocess with same source code.
+
+Descriptors with placeholders are also supported. Placeholder expressions in the memory layout and :code:`call_option` (serialized as
+:code:`{"eval": "<JavaScript expression>"}`) are resolved after all placeholder values are given, and the memory buffer is allocated
+with the resolved offsets and sizes.
+"""
+import ast
+import json
+import math
+import os.path as path
+import re
+import subprocess
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from webdnn.encoder.constant_encoder import ConstantEncoder
+
+KernelFunction = Callable[[List[np.ndarray], List[np.ndarray], Dict[str, any]], None]
+
+_kernels = {}  # type: Dict[str, KernelFunction]
+
+
+def register_kernel(*entry_func_names: str):
+    """register_kernel(*entry_func_names)
+
+    Decorator to register NumPy implementation of fallback kernels.
+
+    Implementation is called as :code:`fn(inputs, outputs, option)`, where :code:`inputs` and :code:`outputs` are 1D views of the
+    memory buffer and :code:`option` is :code:`call_option` of the kernel. Same as JavaScript kernel, results must be written into the
+    views.
+
+    Args:
+        *entry_func_names: entry function names of the kernel
+    """
+
+    def decorator(fn: KernelFunction):
+        for name in entry_func_names:
+            _kernels[name] = fn
+
+        return fn
+
+    return decorator
+
+
+def _view(buffer: np.ndarray, shape: Sequence[int], strides: Sequence[int], offset: int = 0) -> np.ndarray:
+    """
+    Returns N-dimensional view of 1D buffer, whose element at :code:`index` is :code:`buffer[offset + dot(index, strides)]`
+    """
+    return np.lib.stride_tricks.as_strided(buffer[offset:], shape=tuple(shape),
+                                           strides=tuple(s * buffer.itemsize for s in strides))
+
+
+def _windows(x: np.ndarray, out_spatial: Sequence[int], ksize: Sequence[int], stride: Sequence[int], padding: Sequence[int],
+             dilation_rate: Sequence[int], pad_value: float):
+    """
+    Yields :code:`(ky, kx, window)` for each kernel position. :code:`window` is the (N, out_h, out_w, C) slice of padded
+    :code:`x` (N, H, W, C).
+    """
+    pad_h = max(0, (out_spatial[0] - 1) * stride[0] + (ksize[0] - 1) * dilation_rate[0] + 1 - padding[0] - x.shape[1])
+    pad_w = max(0, (out_spatial[1] - 1) * stride[1] + (ksize[1] - 1) * dilation_rate[1] + 1 - padding[1] - x.shape[2])
+    x = np.pad(x, ((0, 0), (padding[0], pad_h), (padding[1], pad_w), (0, 0)), mode="constant", constant_values=pad_value)
+
+    for ky in range(ksize[0]):
+        for kx in range(ksize[1]):
+            y0 = ky * dilation_rate[0]
+            x0 = kx * dilation_rate[1]
+            yield ky, kx, x[:, y0:y0 + (out_spatial[0] - 1) * stride[0] + 1:stride[0], x0:x0 + (out_spatial[1] - 1) * stride[1] + 1:stride[1], :]
+
+
+def _nhwc_views(inputs: List[np.ndarray], outputs: List[np.ndarray], option: Dict[str, any], in_size: int):
+    in_spatial = option.get("in_spatial", option["out_spatial"])
+    x = _view(inputs[0], [option["n"], in_spatial[0], in_spatial[1], in_size], option["strides_x"])
+    y = _view(outputs[0], [option["n"], option["out_spatial"][0], option["out_spatial"][1], option["out_size"]], option["strides_y"])
+    return x, y
+
+
+@register_kernel("convolution_2d", "convolution_2d_im2col")
+def _convolution_2d(inputs: List[np.ndarray], outputs: List[np.ndarray], option: Dict[str, any]):
+    x, y = _nhwc_views(inputs, outputs, option, option["in_size"])
+    w = _view(inputs[1], [option["out_size"], option["ksize"][0], option["ksize"][1], option["in_size"]], option["strides_w"])
+
+    result = np.zeros(y.shape, dtype=np.float32)
+    for ky, kx, window in _windows(x, option["out_spatial"], option["ksize"], option["stride"], option["padding"],
+                                   option["dilation_rate"], 0):
+        result += np.tensordot(window, w[:, ky, kx, :], axes=([3], [1]))
+
+    y[...] = result
+
+
+@register_kernel("average_pooling_2d")
+def _average_pooling_2d(inputs: List[np.ndarray], outputs: List[np.ndarray], option: Dict[str, any]):
+    x, y = _nhwc_views(inputs, outputs, option, option["out_size"])
+
+    result = np.zeros(y.shape, dtype=np.float32)
+    for _, _, window in _windows(x, option["out_spatial"], option["ksize"], option["stride"], option["padding"], [1, 1], 0):
+        result += window
+
+    y[...] = result / (option["ksize"][0] * option["ksize"][1])
+
+
+@register_kernel("max_pooling_2d")
+def _max_pooling_2d(inputs: List[np.ndarray], outputs: List[np.ndarray], option: Dict[str, any]):
+    x, y = _nhwc_views(inputs, outputs, option, option["out_size"])
+
+    result = np.full(y.shape, -np.inf, dtype=np.float32)
+    for _, _, window in _windows(x, option["out_spatial"], option["ksize"], option["stride"], option["padding"], [1, 1], -np.inf):
+        np.maximum(result, window, out=result)
+
+    y[...] = result
+
+
+@register_kernel("linear")
+def _linear(inputs: List[np.ndarray], outputs: List[np.ndarray], option: Dict[str, any]):
+    m, n, k = option["m"], option["n"], option["k"]
+    x = _view(inputs[0], [m, k], [option["x_m_stride"], option["x_k_stride"]])
+    w = _view(inputs[1], [k, n], [option["w_k_stride"], option["w_n_stride"]])
+    outputs[0][:m * n] = np.dot(x, w).ravel()
+
+
+@register_kernel("local_response_normalization")
+def _local_response_normalization(inputs: List[np.ndarray], outputs: List[np.ndarray], option: Dict[str, any]):
+    x, y = _nhwc_views(inputs, outputs, option, option["out_size"])
+    x = np.array(x, dtype=np.float64)
+    half_n = option["p_half_n"]
+
+    sq_cumsum = np.concatenate([np.zeros(x.shape[:3] + (1,)), np.cumsum(x ** 2, axis=3)], axis=3)
+    channels = np.arange(option["out_size"])
+    low = np.maximum(channels - half_n, 0)
+    high = np.minimum(channels + half_n + 1, option["out_size"])
+    sq_sum = sq_cumsum[..., high] - sq_cumsum[..., low]
+
+    y[...] = x * (sq_sum * option["p_alpha"] + option["p_k"]) ** option["p_minus_beta"]
+
+
+@register_kernel("softmax")
+def _softmax(inputs: List[np.ndarray], outputs: List[np.ndarray], option: Dict[str, any]):
+    N, C = option["N"], option["C"]
+    x = inputs[0][:N * C].reshape(N, C)
+    exp_x = np.exp(x - np.max(x, axis=1, keepdims=True))
+    outputs[0][:N * C] = (exp_x / np.sum(exp_x, axis=1, keepdims=True)).ravel()
+
+
+@register_kernel("reshape", "reinterpret_axis")
+def _copy(inputs: List[np.ndarray], outputs: List[np.ndarray], option: Dict[str, any]):
+    length = option["length"]
+    outputs[0][:length] = inputs[0][:length]
+
+
+@register_kernel("concat")
+def _concat(inputs: List[np.ndarray], outputs: List[np.ndarray], option: Dict[str, any]):
+    if "x_shapes" in option:
+        y = outputs[0]
+        for x, shape, strides, offset in zip(inputs, option["x_shapes"], option["x_strides"], option["x_offsets"]):
+            _view(y, shape, strides, offset)[...] = x[:int(np.prod(shape))].reshape(shape)
+
+    else:
+        # SplitAxis kernel is also named "concat"
+        x = inputs[0]
+        for y, shape, strides, offset in zip(outputs, option["y_shapes"], option["y_strides"], option["y_offsets"]):
+            y[:int(np.prod(shape))] = _view(x, shape, strides, offset).ravel()
+
+
+# Node.js helper process which executes kernels only with JavaScript implementation.
+#
+# Protocol (both directions): JSON header line, followed by raw memory buffer whose length is header.byte_length.
+# At first, the source of kernels is sent as a header without body.
+_node_helper_source = r"""
+var source = null;
+var chunks = [];
+var length = 0;
+var header = null;
+
+function read(n) {
+    var buffer = Buffer.concat(chunks, length);
+    chunks = [buffer.slice(n)];
+    length -= n;
+    return buffer.slice(0, n);
+}
+
+function handle(header, body) {
+    var memory = new Float32Array(body.length / 4);
+    new Uint8Array(memory.buffer).set(body);
+    var views = function(allocations) {
+        return allocations.map(function(a) { return memory.subarray(a[0], a[0] + a[1]); });
+    };
+    var inputs = views(header.inputs);
+    var outputs = views(header.outputs);
+
+    var start = process.hrtime();
+    dnn_fallback_kernel[header.entry_func_name](inputs, outputs, header.call_option);
+    var elapsed = process.hrtime(start);
+
+    process.stdout.write(JSON.stringify({elapsed: elapsed[0] + elapsed[1] * 1e-9, byte_length: body.length}) + "\n");
+    process.stdout.write(Buffer.from(memory.buffer));
+}
+
+process.stdin.on("data", function(chunk) {
+    chunks.push(chunk);
+    length += chunk.length;
+
+    while (true) {
+        if (header === null) {
+            var buffer = Buffer.concat(chunks, length);
+            chunks = [buffer];
+            var i = buffer.indexOf(10);
+            if (i < 0) return;
+            header = JSON.parse(read(i + 1).toString());
+        }
+
+        if (source === null) {
+            source = header.kernel_source;
+            (0, eval)(source);
+            header = null;
+            continue;
+        }
+
+        if (length < header.byte_length) return;
+        handle(header, read(header.byte_length));
+        header = null;
+    }
+});
+"""
+
+
+_reg_math_floor = re.compile(r"\bMath\.floor\(")
+
+# Syntax which is generated by Placeholder.generate_js_function
+_placeholder_expression_nodes = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.USub,
+                                 ast.Num, ast.Str, ast.Name, ast.Load, ast.Subscript, ast.Index, ast.Call)
+
+
+def _evaluate_placeholder_expression(expression: str, placeholders: Dict[str, int]) -> int:
+    """
+    Evaluate the JavaScript expression generated by :func:`~webdnn.graph.placeholder.Placeholder.generate_js_function`.
+    """
+    source = _reg_math_floor.sub("floor(", expression.strip().rstrip(";"))
+    tree = ast.parse(source, mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _placeholder_expression_nodes):
+            raise ValueError(f"[FallbackRunner] Unsupported placeholder expression: {expression}")
+
+    try:
+        value = eval(compile(tree, "<placeholder>", "eval"), {"__builtins__": {}}, {"placeholders": placeholders, "floor": math.floor})
+
+    except KeyError as e:
+        raise ValueError(f"[FallbackRunner] Placeholder {e} is not resolved: {expression}")
+
+    return int(value)
+
+
+def _resolve(value, placeholders: Dict[str, int]):
+    """
+    Returns the copy of :code:`value` in which all placeholder expressions are resolved.
+    """
+    if isinstance(value, dict):
+        if set(value.keys()) == {"eval"}:
+            return _evaluate_placeholder_expression(value["eval"], placeholders)
+
+        return {k: _resolve(v, placeholders) for k, v in value.items()}
+
+    if isinstance(value, list):
+        return [_resolve(v, placeholders) for v in value]
+
+    return value
+
+
+class _NodeKernelExecutor:
+    def __init__(self, kernel_source: str, node: str):
+        self.process = subprocess.Popen([node, "-e", _node_helper_source], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self._write_header({"kernel_source": kernel_source})
+
+    def _write_header(self, header: Dict[str, any]):
+        self.process.stdin.write(json.dumps(header).encode("utf-8") + b"\n")
+
+    def execute(self, memory: np.ndarray, exec_info: Dict[str, any], allocations: Dict[str, Tuple[int, int]]) -> float:
+        self._write_header({
+            "entry_func_name": exec_info["entry_func_name"],
+            "inputs": [allocations[name] for name in exec_info["inputs"]],
+            "outputs": [allocations[name] for name in exec_info["outputs"]],
+            "call_option": exec_info["call_option"],
+            "byte_length": memory.nbytes
+        })
+        self.process.stdin.write(memory.tobytes())
+        self.process.stdin.flush()
+
+        line = self.process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"[FallbackRunner] Node.js process is terminated while executing {exec_info['entry_func_name']}")
+
+        header = json.loads(line.decode("utf-8"))
+        memory[:] = np.frombuffer(self.process.stdout.read(header["byte_length"]), dtype=np.float32)
+        return header["elapsed"]
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+
+class FallbackRunner:
+    """FallbackRunner(directory, node="node", placeholders=None)
+
+    Execute fallback backend descriptor without web browser.
+
+    If the descriptor contains placeholders, their values must be given by :code:`placeholders` or :func:`set_placeholder_value` before
+    :func:`run` is called. Same as the browser runtime, the memory buffer is allocated with the resolved layout.
+
+    Args:
+        directory (str): directory which contains :code:`graph_fallback.json` and :code:`weight_fallback.bin`
+        node (str): Node.js executable, which is used only when the descriptor contains kernels without NumPy implementation
+        placeholders (dict of str and int): values of placeholders
+
+    Attributes:
+        timings (list of tuple of str and float): entry function name and elapsed time in seconds of each kernel in the last
+            :func:`run` call
+    """
+
+    def __init__(self, directory: str, node: str = "node", placeholders: Dict[str, int] = None):
+        with open(path.join(directory, "graph_fallback.json")) as f:
+            self.descriptor = json.load(f)
+
+        with open(path.join(directory, "weight_fallback.bin"), "rb") as f:
+            self.weight = ConstantEncoder.get_encoder(self.descriptor["weight_encoding"]).decode(f.read())
+
+        self.placeholders = {label: None for label in self.descriptor["placeholders"].keys()}  # type: Dict[str, Optional[int]]
+        self.memory = None  # type: Optional[np.ndarray]
+        self.allocations = {}  # type: Dict[str, Tuple[int, int]]
+        self.exec_infos = []  # type: List[Dict[str, any]]
+
+        self.node = node
+        self.timings = []  # type: List[Tuple[str, float]]
+        self._node_executor = None  # type: Optional[_NodeKernelExecutor]
+
+        self.set_placeholder_value({} if placeholders is None else placeholders)
+
+    def set_placeholder_value(self, values: Dict[str, int]):
+        """set_placeholder_value(values)
+
+        Set values of placeholders. When all placeholders are resolved, the memory buffer is (re-)allocated.
+
+        Args:
+            values (dict of str and int): values of placeholders
+        """
+        for label, value in values.items():
+            self.placeholders[label] = int(value)
+
+        if all(value is not None for value in self.placeholders.values()):
+            self._allocate()
+
+    def _allocate(self):
+        placeholders = dict(self.placeholders)
+        static_layout = _resolve(self.descriptor["memory_layout"]["static"], placeholders)
+        dynamic_layout = _resolve(self.descriptor["memory_layout"]["dynamic"], placeholders)
+
+        # Static and dynamic buffers are concatenated into one buffer
+        self.memory = np.zeros((static_layout["size"] + dynamic_layout["size"],), dtype=np.float32)
+        self.memory[:self.weight.size] = self.weight
+
+        self.allocations = {}
+        for a in static_layout["allocations"].values():
+            self.allocations[a["name"]] = (a["offset"], a["size"])
+
+        for a in dynamic_layout["allocations"].values():
+            self.allocations[a["name"]] = (static_layout["size"] + a["offset"], a["size"])
+
+        self.exec_infos = _resolve(self.descriptor["exec_infos"], placeholders)
+
+    def _get_view(self, name: str) -> np.ndarray:
+        offset, size = self.allocations[name]
+        return self.memory[offset:offset + size]
+
+    def run(self, inputs: Sequence[np.ndarray]) -> List[np.ndarray]:
+        """run(inputs)
+
+        Args:
+            inputs (list of np.ndarray): input data in the same order as graph inputs
+
+        Returns:
+            (list of np.ndarray) flattened output data in the same order as graph outputs
+        """
+        if self.memory is None:
+            unresolved = [label for label, value in self.placeholders.items() if value is None]
+            raise ValueError(f"[FallbackRunner] Placeholders are not resolved: {unresolved}")
+
+        for name, data in zip(self.descriptor["inputs"], inputs):
+            self._get_view(name)[:] = np.asarray(data, dtype=np.float32).ravel()
+
+        self.timings = []
+        for exec_info in self.exec_infos:
+            name = exec_info["entry_func_name"]
+
+            if name in _kernels:
+                start = time.perf_counter()
+                _kernels[name]([self._get_view(v) for v in exec_info["inputs"]],
+                               [self._get_view(v) for v in exec_info["outputs"]],
+                               exec_info["call_option"])
+                elapsed = time.perf_counter() - start
+
+            else:
+                if self._node_executor is None:
+                    self._node_executor = _NodeKernelExecutor(self.descriptor["kernel_source"], self.node)
+
+                elapsed = self._node_executor.execute(self.memory, exec_info, self.allocations)
+
+            self.timings.append((name, elapsed))
+
+        return [self._get_view(name).copy() for name in self.descriptor["outputs"]]
+
+    def close(self):
+        if self._node_executor is not None:
+            self._node_executor.close()
+            self._node_executor = None
+
+
+def assert_allclose(expected: np.ndarray, actual: np.ndarray, EPS: float = 1.0e-5, ABS_EPS: float = 0.0):
+    """assert_allclose(expected, actual, EPS=1.0e-5, ABS_EPS=0.0)
+
+    Check :code:`|expected - actual| <= ABS_EPS + EPS * |expected|` for each element, with the same criterion as the browser test
+    runner.
+
+    Args:
+        expected (np.ndarray): expected value
+        actual (np.ndarray): actual value
+        EPS (float): relative tolerance
+        ABS_EPS (float): absolute tolerance
+    """
+    expected = np.asarray(expected, dtype=np.float32).ravel()
+    actual = np.asarray(actual, dtype=np.float32).ravel()
+    assert expected.size == actual.size, f"Size mismatch: (expected size)={expected.size}, (actual size)={actual.size}"
+
+    errors = np.where(~(np.abs(expected - actual) <= ABS_EPS + EPS * np.abs(expected)))[0]
+    assert errors.size == 0, \
+        f"(expected: {expected[errors[0]]}) != (actual: {actual[errors[0]]}) at index {errors[0]} ({errors.size} mismatches)"
@@ -0,0 +1,271 @@
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+from enum import Enum
+from os import path
+from typing import Dict, Optional
+
+import numpy as np
+
+from webdnn.backend.interface.graph_descriptor import IGraphExecutionData
+from webdnn.graph import traverse
+from webdnn.graph.graph import Graph
+from webdnn.graph.node import Node
+from webdnn.graph.operator import Operator
+from webdnn.graph.placeholder import Placeholder
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util import flags, console
+from webdnn.util.misc import recursion_limit
+
+# Generated data is pickled in the cache entry with this file name, and restored when cache is hit. This file is not copied by save().
+EXECUTION_DATA_FILE_NAME = "execution_data.pickle"
+
+_backend_dir_names = ["fallback", "webassembly", "webgl", "webgpu"]
+_source_fingerprints = {}  # type: Dict[str, str]
+
+
+def _stable_repr(value, node_ids: Dict[Node, int], depth: int = 0) -> str:
+    """
+    Returns string representation which does not depend on memory address. If `value` is not able to be represented stably, the result
+    contains the address and therefore the cache is never hit.
+
+    Nodes are represented by the index in `node_ids` instead of their names, because default names depend on how many nodes are created
+    in the process.
+    """
+    if depth > 8:
+        return repr(value)
+
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return repr(value)
+
+    if isinstance(value, Node):
+        return f"<{value.__class__.__name__} {node_ids.get(value, value.name)}>"
+
+    if isinstance(value, Placeholder):
+        return f"Placeholder({value!r})"
+
+    if isinstance(value, Enum):
+        return str(value)
+
+    if isinstance(value, np.ndarray):
+        return f"ndarray({value.dtype}, {value.shape}, {hashlib.sha256(np.ascontiguousarray(value).data).hexdigest()})"
+
+    if isinstance(value, np.generic):
+        return repr(value.item())
+
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_stable_repr(v, node_ids, depth + 1) for v in value) + "]"
+
+    if isinstance(value, (set, frozenset)):
+        return "{" + ", ".join(sorted(_stable_repr(v, node_ids, depth + 1) for v in value)) + "}"
+
+    if isinstance(value, dict):
+        items = [f"{_stable_repr(k, node_ids, depth + 1)}: {_stable_repr(v, node_ids, depth + 1)}" for k, v in value.items()]
+        return "{" + ", ".join(sorted(items)) + "}"
+
+    if type(value).__repr__ is not object.__repr__:
+        return repr(value)
+
+    if hasattr(value, "__dict__"):
+        return f"{value.__class__.__name__}{_stable_repr(vars(value), node_ids, depth + 1)}"
+
+    return repr(value)
+
+
+def _flag_values() -> Dict[str, any]:
+    values = {}
+    for module in [flags, flags.optimize]:
+        for key in dir(module):
+            if key.isupper():
+                values[f"{module.__name__}.{key}"] = getattr(module, key)
+
+    return values
+
+
+def compute_source_fingerprint(backend: str) -> str:
+    """compute_source_fingerprint(backend)
+
+    Compute the digest of source files which affect the conversion result of the backend. Sources of webdnn package except frontends and
+    other backends are included, therefore the cache is invalidated when the generator, kernels, optimize rules or encoders are changed
+    even in same version. The result is computed once in each process.
+
+    Args:
+        backend (str): target backend
+
+    Returns:
+        (str) hex digest
+    """
+    if backend not in _source_fingerprints:
+        import webdnn
+
+        root = path.dirname(path.abspath(webdnn.__file__))
+        excluded = {"frontend"} | {path.join("backend", name) for name in _backend_dir_names if name != backend}
+
+        h = hashlib.sha256()
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames
+                                 if d != "__pycache__" and path.relpath(path.join(dirpath, d), root) not in excluded)
+
+            for filename in sorted(filenames):
+                if not filename.endswith((".py", ".js")):
+                    continue
+
+                filepath = path.join(dirpath, filename)
+                h.update(path.relpath(filepath, root).replace(os.sep, "/").encode("utf-8"))
+                with open(filepath, "rb") as f:
+                    h.update(hashlib.sha256(f.read()).digest())
+
+        _source_fingerprints[backend] = h.hexdigest()
+
+    return _source_fingerprints[backend]
+
+
+def compute_cache_key(backend: str, graph: Graph, **kwargs) -> str:
+    """compute_cache_key(backend, graph, **kwargs)
+
+    Compute the key of conversion result. The key is computed from graph structure, operator parameters, constant data, optimization
+    flags, backend name, generator options and the fingerprint of webdnn sources (see :func:`compute_source_fingerprint`).
+
+    Args:
+        backend (str): target backend
+        graph (:class:`~webdnn.Graph`): graph
+        **kwargs: options passed to descriptor generator (ex. :code:`constant_encoder_name`)
+
+    Returns:
+        (str) hex digest of the key
+    """
+    import webdnn
+
+    h = hashlib.sha256()
+
+    def update(s: str):
+        h.update(s.encode("utf-8"))
+        h.update(b"\n")
+
+    nodes = traverse.listup_nodes(graph)
+    node_ids = {node: i for i, node in enumerate(nodes)}
+
+    def update_repr(value):
+        update(_stable_repr(value, node_ids))
+
+    update(webdnn.__version__)
+    update(compute_source_fingerprint(backend))
+    update(backend)
+    update_repr(kwargs)
+    update_repr(_flag_values())
+    update_repr(graph.inputs)
+    update_repr(graph.outputs)
+
+    for node in nodes:
+        update_repr(node)
+        update_repr(set(node.attributes))
+
+        if isinstance(node, Variable):
+            parameters = dict(node.parameters)
+            if node not in graph.inputs and node not in graph.outputs:
+                # Names of internal variables are not important
+                parameters.pop("name", None)
+
+            update_repr(parameters)
+            update_repr((node.order, node.shape))
+
+        else:
+            update_repr(node.parameters)
+
+        if isinstance(node, ConstantVariable):
+            update_repr(node.data)
+
+        if isinstance(node, Operator):
+            update_repr(node.inputs)
+            update_repr(node.outputs)
+
+    return h.hexdigest()
+
+
+class CachedGraphExecutionData(IGraphExecutionData):
+    """CachedGraphExecutionData(cache_path, source=None)
+
+    Graph execution data stored in conversion cache.
+
+    When cache is hit, :func:`save` copies cached files into the destination directory. Otherwise, `source` is saved into the cache
+    at first. Other attributes (ex. :code:`descriptor`, :code:`constant_encoder` and :code:`backend_suffix`) are delegated to `source`.
+    When cache is hit, `source` is restored from the cache entry at the first access.
+
+    Args:
+        cache_path (str): directory in which files are cached
+        source (:class:`~webdnn.backend.interface.graph_descriptor.IGraphExecutionData`): generated data when cache is not hit
+    """
+
+    def __init__(self, cache_path: str, source: Optional[IGraphExecutionData] = None):
+        self.cache_path = cache_path
+        self.source = source
+
+    def __getattr__(self, item):
+        if item in ("cache_path", "source") or item.startswith("__"):
+            raise AttributeError(item)
+
+        if self.source is None:
+            self.source = self._load()
+
+        return getattr(self.source, item)
+
+    def save(self, dirname: str):
+        if not path.isdir(self.cache_path):
+            self._store()
+
+        os.makedirs(dirname, exist_ok=True)
+        for name in os.listdir(self.cache_path):
+            if name == EXECUTION_DATA_FILE_NAME:
+                continue
+
+            shutil.copy2(path.join(self.cache_path, name), path.join(dirname, name))
+
+    def _load(self) -> IGraphExecutionData:
+        with open(path.join(self.cache_path, EXECUTION_DATA_FILE_NAME), "rb") as f:
+            return pickle.load(f)
+
+    def _store(self):
+        parent = path.dirname(self.cache_path)
+        os.makedirs(parent, exist_ok=True)
+
+        # Save into temporal directory and rename it, to avoid that broken cache is used when saving is failed.
+        tmp_path = tempfile.mkdtemp(dir=parent)
+        try:
+            self.source.save(tmp_path)
+
+            with open(path.join(tmp_path, EXECUTION_DATA_FILE_NAME), "wb") as f, recursion_limit(10000):
+                pickle.dump(self.source, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.rename(tmp_path, self.cache_path)
+
+        except OSError:
+            if not path.isdir(self.cache_path):
+                raise
+
+            # Same cache is stored by other process
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+        except Exception:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+
+
+def load_cache(cache_dir: str, key: str) -> Optional[CachedGraphExecutionData]:
+    """load_cache(cache_dir, key)
+
+    Args:
+        cache_dir (str): cache directory
+        key (str): the key computed by :func:`compute_cache_key`
+
+    Returns:
+        (:class:`CachedGraphExecutionData`) cached data, or `None` if cache is not hit.
+    """
+    cache_path = path.join(cache_dir, key)
+    if not path.isfile(path.join(cache_path, EXECUTION_DATA_FILE_NAME)):
+        return None
+
+    console.debug(f"[ConversionCache] hit: {key}")
+    return CachedGraphExecutionData(cache_path)
@@ -1,23 +1,26 @@
-import copy
-import sys
+import multiprocessing
+import pickle
+import traceback
 from collections import defaultdict
-from typing import Generic, TypeVar, Type, Callable, List, Dict
+from os import path
+from typing import Generic, TypeVar, Type, Callable, List, Dict, Optional, Iterable
 
 from webdnn.backend.code_generator.allocator import MemoryLayout
+from webdnn.backend.code_generator.kernel_deduplicator import deduplicate_kernels
+from webdnn.backend.interface.conversion_cache import compute_cache_key, load_cache, CachedGraphExecutionData
 from webdnn.backend.interface.graph_descriptor import IGraphExecutionData
 from webdnn.graph import traverse
 from webdnn.graph.graph import Graph
 from webdnn.graph.operator import Operator
 from webdnn.optimizer.general_optimize_rule import GeneralOptimizeRule
-from webdnn.util import console
+from webdnn.util import console, profiler
+from webdnn.util.misc import recursion_limit
 
 backend_names = ["webgpu", "webassembly", "fallback"]
 
 T_KERNEL = TypeVar("T_KERNEL")
 T_EXEC_DATA = TypeVar("T_EXEC_DATA")
 
-sys.setrecursionlimit(10000)
-
 
 class DescriptorGenerator(Generic[T_KERNEL, T_EXEC_DATA]):
     _handler_map = defaultdict(dict)  # type: Dict[str, Dict[str, Callable[[Operator, MemoryLayout], List[T_KERNEL]]]]
@@ -51,9 +54,10 @@ class DescriptorGenerator(Generic[T_KERNEL, T_EXEC_DATA]):
             if key not in cls._handler_map[cls.__name__]:
                 raise NotImplementedError(f"[{cls.__name__}] Operator {op} is not handled by any generator handler")
 
-            kernels += cls._handler_map[cls.__name__][key](op, memory_layout)
+            with profiler.profile("generator_handler", f"{cls.__name__}.{key}"):
+                kernels += cls._handler_map[cls.__name__][key](op, memory_layout)
 
-        return kernels
+        return deduplicate_kernels(kernels)
 
 
 def get_generator(backend: str):
@@ -79,24 +83,83 @@ def generate_descriptor(backend: str, graph: Graph, **kwargs) -> IGraphExecution
     This is utility function to generate graph descriptor. This function create specified backend descriptor generator and generat graph
     descriptor.
 
+    If :code:`cache_dir` is specified, the conversion result is cached in the directory with the key computed from the graph, the flags
+    and the other arguments. When the cache is hit, the conversion is skipped and cached files are copied when the result is saved.
+
     Args:
         backend (str): target backend
         graph (:class:`~webdnn.Graph`): graph
+        cache_dir (str): directory of conversion cache (optional)
 
     Returns:
         (:class:`~webdnn.backend.interface.graph_descriptor.IGraphExecutionData`) generated graph descriptor
     """
     generator = get_generator(backend)
 
-    try:
+    cache_dir = kwargs.pop("cache_dir", None)
+    if cache_dir is not None:
+        key = compute_cache_key(backend, graph, **kwargs)
+        cached = load_cache(cache_dir, key)
+        if cached is not None:
+            return cached
+
+        return CachedGraphExecutionData(path.join(cache_dir, key), _generate_descriptor(backend, generator, graph, **kwargs))
+
+    return _generate_descriptor(backend, generator, graph, **kwargs)
+
+
+def _generate_descriptor(backend: str, generator: Callable[..., IGraphExecutionData], graph: Graph, **kwargs) -> IGraphExecutionData:
+    with profiler.profile("generator", f"{backend}.generate_descriptor"):
         # Graph is transformed by backend-specific optimization
-        graph = copy.deepcopy(graph)
-    except RecursionError:
-        # Occurs when the graph has many nodes (e.g. ResNet)
-        raise RecursionError("Recursion error occurred when copying graph." +
-                             " sys.setrecursionlimit(10000) may help fixing it.")
+        with profiler.profile("generator", "Graph.clone"):
+            graph = graph.clone()
+
+        # some optimize rule work even when OPTIMIZE=0
+        graph, _ = GeneralOptimizeRule().optimize(graph)
+
+        return generator(graph, **kwargs)
+
+
+_worker_graph = None  # type: Graph
+
+
+def _initialize_worker(graph_bytes: bytes):
+    global _worker_graph
+    _worker_graph = pickle.loads(graph_bytes)
+
+
+def _generate_and_save_descriptor(backend: str, dirname: str, kwargs: Dict[str, any]) -> Optional[str]:
+    try:
+        generate_descriptor(backend, _worker_graph, **kwargs).save(dirname)
+        return None
+
+    except Exception:
+        return traceback.format_exc()
+
+
+def generate_and_save_descriptors(backends: Iterable[str], graph: Graph, dirname: str, jobs: int = 1,
+                                  **kwargs) -> Dict[str, Optional[str]]:
+    """generate_and_save_descriptors(backends, graph, dirname, jobs=1, **kwargs)
+
+    Generate graph descriptors for multiple backends in parallel processes and save them into the directory. The graph is pickled only
+    once and unpickled once in each worker process.
+
+    Args:
+        backends (list of str): target backends
+        graph (:class:`~webdnn.Graph`): graph
+        dirname (str): destination directory name
+        jobs (int): number of worker processes
+        **kwargs: arguments passed to :func:`generate_descriptor`
+
+    Returns:
+        (dict of str and optional str) traceback message of each backend. If a backend succeeded, the value is `None`.
+    """
+    backends = list(backends)
+    # Pickling recurses along the graph
+    with recursion_limit(10000):
+        graph_bytes = pickle.dumps(graph, protocol=pickle.HIGHEST_PROTOCOL)
 
-    # some optimize rule work even when OPTIMIZE=0
-    graph, _ = GeneralOptimizeRule().optimize(graph)
+    with multiprocessing.Pool(processes=min(jobs, len(backends)), initializer=_initialize_worker, initargs=(graph_bytes,)) as pool:
+        results = pool.starmap(_generate_and_save_descriptor, [(backend, dirname, kwargs) for backend in backends], chunksize=1)
 
-    return generator(graph, **kwargs)
+    return dict(zip(backends, results))
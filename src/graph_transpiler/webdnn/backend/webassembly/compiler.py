@@ -0,0 +1,186 @@
+"""
+Compilation of WebAssembly backend kernels
+
+Each kernel function is compiled into an object file as a separate translation unit, and objects are linked twice, into WebAssembly
+and asm.js. Compiled objects and linked outputs are cached with the key computed from the compiler command, options and source code, so
+unchanged kernels are not re-compiled.
+"""
+import hashlib
+import os
+import os.path as path
+import platform
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from webdnn.util import console, flags, profiler
+
+EXPORTED_FUNCTIONS = "EXPORTED_FUNCTIONS=['_run','_init','_get_static_buffer','_allocate_dynamic_buffer','_get_dynamic_buffer'," \
+                     "'_set_placeholder_value']"
+
+
+def _hash(*values: str) -> str:
+    h = hashlib.sha256()
+    for value in values:
+        h.update(value.encode("utf-8"))
+        h.update(b"\0")
+
+    return h.hexdigest()
+
+
+class EmscriptenCompiler:
+    """EmscriptenCompiler(command=None, cache_dir=None, num_workers=None)
+
+    Compiler of WebAssembly backend kernels.
+
+    Args:
+        command (list of str): compiler command. If `None`, :code:`flags.WEBASSEMBLY_COMPILER` (default: :code:`em++`) is used. Any
+            command which accepts same arguments as :code:`em++` can be used (ex. wrapper script, or stub in tests).
+        cache_dir (str): directory of compilation cache. If `None`, :code:`flags.WEBASSEMBLY_COMPILE_CACHE` is used. If empty string,
+            cache is disabled.
+        num_workers (int): number of concurrent compiler processes. If `None`, the number of CPUs is used.
+    """
+
+    def __init__(self, command: Sequence[str] = None, cache_dir: Optional[str] = None, num_workers: Optional[int] = None):
+        self.command = shlex.split(flags.WEBASSEMBLY_COMPILER) if command is None else list(command)
+        cache_dir = flags.WEBASSEMBLY_COMPILE_CACHE if cache_dir is None else cache_dir
+        self.cache_dir = path.expanduser(cache_dir) if cache_dir else None
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.platform_windows = platform.system() == "Windows"  # workaround for PATH problem
+
+    def _run(self, args: List[str]):
+        try:
+            subprocess.check_call(self.command + args, shell=self.platform_windows)
+        except Exception as ex:
+            sys.stderr.write("Executing em++ command failed." +
+                             " Make sure emscripten is properly installed and environment variables are set.\n")
+            raise ex
+
+    def _cache_path(self, kind: str, key: str) -> Optional[str]:
+        if self.cache_dir is None:
+            return None
+
+        return path.join(self.cache_dir, kind, key)
+
+    def _store(self, src: str, dst: Optional[str]):
+        """
+        Copy file or directory into cache. Copy is renamed atomically, so that other processes never read broken cache.
+        """
+        if dst is None or path.exists(dst):
+            return
+
+        os.makedirs(path.dirname(dst), exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=path.dirname(dst))
+        try:
+            tmp_dst = path.join(tmp, "item")
+            if path.isdir(src):
+                shutil.copytree(src, tmp_dst)
+            else:
+                shutil.copy2(src, tmp_dst)
+
+            os.rename(tmp_dst, dst)
+
+        except OSError:
+            if not path.exists(dst):
+                raise
+
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def compile_object(self, source: str, workdir: str, options: Sequence[str] = ()) -> str:
+        """compile_object(source, workdir, options=())
+
+        Compile single translation unit. If cache is hit, the cached object is returned.
+
+        Args:
+            source (str): source code
+            workdir (str): directory in which the object is created when cache is not hit
+            options (list of str): compiler options
+
+        Returns:
+            (str) path of compiled object file
+        """
+        key = _hash(*self.command, *options, source)
+        cache_path = self._cache_path("objects", key + ".o")
+        if cache_path is not None and path.exists(cache_path):
+            return cache_path
+
+        with profiler.profile("compiler", "compile_object"):
+            source_path = path.join(workdir, key + ".cpp")
+            object_path = path.join(workdir, key + ".o")
+            with open(source_path, "w") as f:
+                f.write(source)
+
+            self._run([source_path, "-c", *options, "-o", object_path])
+
+        self._store(object_path, cache_path)
+        return object_path
+
+    def link(self, objects: Sequence[str], options: Sequence[str], output_dir: str, output_name: str):
+        """link(objects, options, output_dir, output_name)
+
+        Link objects. All files generated by the compiler (ex. :code:`.js` and :code:`.wasm`) are copied into :code:`output_dir`. If
+        cache is hit, cached files are copied.
+
+        Args:
+            objects (list of str): object file paths
+            options (list of str): linker options
+            output_dir (str): output directory
+            output_name (str): output file name (ex. :code:`kernels_webassembly.js`)
+        """
+        # Contents of input files (objects, and files specified in options such as "--pre-js") are also part of the key
+        file_hashes = []
+        for file_path in [*objects, *options]:
+            if path.isfile(file_path):
+                with open(file_path, "rb") as f:
+                    file_hashes.append(hashlib.sha256(f.read()).hexdigest())
+
+        key = _hash(*self.command, *options, output_name, *file_hashes)
+        cache_path = self._cache_path("outputs", key)
+
+        if cache_path is None or not path.isdir(cache_path):
+            with tempfile.TemporaryDirectory() as tmpdir:
+                with profiler.profile("compiler", f"link {output_name}"):
+                    self._run([*objects, *options, "-o", path.join(tmpdir, output_name)])
+
+                if cache_path is None:
+                    self._copy_outputs(tmpdir, output_dir)
+                    return
+
+                self._store(tmpdir, cache_path)
+
+        else:
+            console.debug(f"[EmscriptenCompiler] cache hit: {output_name}")
+
+        self._copy_outputs(cache_path, output_dir)
+
+    @staticmethod
+    def _copy_outputs(src_dir: str, dst_dir: str):
+        for name in os.listdir(src_dir):
+            shutil.copy2(path.join(src_dir, name), path.join(dst_dir, name))
+
+    def build(self, translation_units: Dict[str, str], output_dir: str, targets: Dict[str, List[str]], options: Sequence[str] = ()):
+        """build(translation_units, output_dir, targets, options=())
+
+        Compile all translation units concurrently, and link them into each target concurrently.
+
+        Args:
+            translation_units (dict of str and str): name and source code of each translation unit
+            output_dir (str): output directory
+            targets (dict of str and list of str): output file name and linker options of each target
+            options (list of str): options used both in compilation and linking
+        """
+        with tempfile.TemporaryDirectory() as workdir:
+            with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+                objects = list(executor.map(lambda source: self.compile_object(source, workdir, options),
+                                            translation_units.values()))
+
+                futures = [executor.submit(self.link, objects, [*options, *link_options], output_dir, output_name)
+                           for output_name, link_options in targets.items()]
+
+                for future in futures:
+                    future.result()
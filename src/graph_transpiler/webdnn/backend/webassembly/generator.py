@@ -7,32 +7,32 @@ Descriptor Generator for WebAssembly
 
 import os
 import os.path as path
-import platform
-import subprocess
-import sys
 
 from webdnn.backend.code_generator.allocator import allocate
 from webdnn.backend.interface.generator import DescriptorGenerator
 from webdnn.backend.interface.graph_descriptor import IGraphExecutionData
+from webdnn.backend.webassembly.compiler import EmscriptenCompiler, EXPORTED_FUNCTIONS
 from webdnn.backend.webassembly.graph_descriptor import GraphDescriptor
 from webdnn.backend.webassembly.kernel import Kernel
 from webdnn.backend.webassembly.optimize_rules.webassembly_optimize_rule import WebassemblyOptimizeRule
 from webdnn.encoder.constant_encoder import ConstantEncoder
 from webdnn.graph import traverse
 from webdnn.graph.graph import Graph
-from webdnn.util import flags, console
+from webdnn.util import flags, console, profiler
 from webdnn.util.json import json
 
+# Alignment of buffer offsets in elements. 16 bytes alignment is required for SIMD load and store.
+MEMORY_ALIGNMENT = 4
+
 
 class GraphExecutionData(IGraphExecutionData):
     descriptor: GraphDescriptor
 
-    def __init__(self, graph: Graph, descriptor: GraphDescriptor, constants: bytes):
+    def __init__(self, graph: Graph, descriptor: GraphDescriptor, constant_encoder: ConstantEncoder):
         self.graph = graph
         self.descriptor = descriptor
-        self.constants = constants
+        self.constant_encoder = constant_encoder
         self.backend_suffix = "webassembly"
-        self.platform_windows = platform.system() == "Windows"  # workaround for PATH problem
 
     def save(self, dirname: str):
         os.makedirs(dirname, exist_ok=True)
@@ -40,63 +40,39 @@ class GraphExecutionData(IGraphExecutionData):
         with open(path.join(dirname, "graph_{}.json".format(self.backend_suffix)), "w") as f:
             json.dump(self.descriptor, f, indent=2)
 
+        with open(path.join(dirname, "allocation_{}.json".format(self.backend_suffix)), "w") as f:
+            json.dump(self.descriptor.memory_layout.report, f, indent=2)
+
         with open(path.join(dirname, "kernels_{}.cpp".format(self.backend_suffix)), "w") as f:
             f.write(self.descriptor.concat_kernel_sources())
 
+        # Constants are encoded when saved, and streamed into the file
         with open(path.join(dirname, "weight_{}.bin".format(self.backend_suffix)), "wb") as f:
-            f.write(self.constants)
+            with profiler.profile("encoder", self.constant_encoder.__class__.__name__):
+                constants_size = self.constant_encoder.encode_to(self.descriptor.memory_layout, f)
+
+        console.debug(f"[WebassemblyDescriptorGenerator] constants encoded size: {constants_size}")
 
         self._compile(dirname)
-        self._compile_fallback_asmjs(dirname)
 
     def _compile(self, dirname: str):
-        # noinspection PyListCreation
-        args = ["em++"]
-        args.append(path.join(dirname, "kernels_{}.cpp".format(self.backend_suffix)))
-        args.append("-O3")
-        args.append("-std=c++11")
-        args.append("-s")
-        args.append(
-            "EXPORTED_FUNCTIONS=['_run','_init','_get_static_buffer','_allocate_dynamic_buffer','_get_dynamic_buffer','_set_placeholder_value']")
-        args.append("-s")
-        args.append("WASM=1")
-        args.append("-s")
-        args.append(f"TOTAL_MEMORY={self.descriptor.required_heap}")
-        args.append("-s")
-        args.append(f"ALLOW_MEMORY_GROWTH=1")  # cannot be used in asm.js
-        args.append("--pre-js")
-        args.append(path.join(path.dirname(__file__), "webassembly_header.js"))
-        args.append("-o")
-        args.append(path.join(dirname, "kernels_{}.js".format(self.backend_suffix)))
-        try:
-            subprocess.check_call(args, shell=self.platform_windows)
-        except Exception as ex:
-            sys.stderr.write("Executing em++ command failed." +
-                             " Make sure emscripten is properly installed and environment variables are set.\n")
-            raise ex
-
-    def _compile_fallback_asmjs(self, dirname: str):
-        backend_suffix = "asmjs"
-        # noinspection PyListCreation
-        args = ["em++"]
-        args.append(path.join(dirname, "kernels_{}.cpp".format(self.backend_suffix)))
-        args.append("-O3")
-        args.append("-std=c++11")
-        args.append("-s")
-        args.append(
-            "EXPORTED_FUNCTIONS=['_run','_init','_get_static_buffer','_allocate_dynamic_buffer','_get_dynamic_buffer','_set_placeholder_value']")
-        args.append("-s")
-        args.append(f"TOTAL_MEMORY={self.descriptor.required_heap}")
-        args.append("--pre-js")
-        args.append(path.join(path.dirname(__file__), "webassembly_header.js"))
-        args.append("-o")
-        args.append(path.join(dirname, "kernels_{}.js".format(backend_suffix)))
-        try:
-            subprocess.check_call(args, shell=self.platform_windows)
-        except Exception as ex:
-            sys.stderr.write("Executing em++ command failed." +
-                             " Make sure emscripten is properly installed and environment variables are set.\n")
-            raise ex
+        """
+        Compile kernels into WebAssembly (kernels_webassembly.js) and asm.js (kernels_asmjs.js, fallback for browsers which do not
+        support WebAssembly). Both targets are linked from same objects concurrently.
+        """
+        common_options = ["-s", EXPORTED_FUNCTIONS,
+                          "-s", f"TOTAL_MEMORY={self.descriptor.required_heap}",
+                          "--pre-js", path.join(path.dirname(__file__), "webassembly_header.js")]
+
+        EmscriptenCompiler().build(
+            self.descriptor.split_kernel_sources(),
+            dirname,
+            targets={
+                "kernels_{}.js".format(self.backend_suffix): common_options + ["-s", "WASM=1",
+                                                                               "-s", "ALLOW_MEMORY_GROWTH=1"],  # cannot be used in asm.js
+                "kernels_asmjs.js": common_options
+            },
+            options=["-O3", "-std=c++11"])
 
 
 class WebassemblyDescriptorGenerator(DescriptorGenerator[Kernel, GraphExecutionData]):
@@ -106,16 +82,13 @@ class WebassemblyDescriptorGenerator(DescriptorGenerator[Kernel, GraphExecutionD
         if flags.DEBUG:
             traverse.dump(graph)
 
-        memory_layout = allocate(graph)
+        memory_layout = allocate(graph, alignment=MEMORY_ALIGNMENT)
 
         console.debug(f"[WebassemblyDescriptorGenerator] memory_layout total size: {memory_layout.total_size * 4}")
         console.debug(f"[WebassemblyDescriptorGenerator] memory_layout static size: {memory_layout.static_size * 4}")
         console.debug(f"[WebassemblyDescriptorGenerator] memory_layout dynamic size: {memory_layout.dynamic_size * 4}")
 
         constant_encoder = ConstantEncoder.get_encoder(kwargs.get("constant_encoder_name", None))
-        constants_bytes = constant_encoder.encode(memory_layout)
-
-        console.debug(f"[WebassemblyDescriptorGenerator] constants encoded size: {len(constants_bytes)}")
 
         kernels = cls.generate_kernels(graph, memory_layout)
 
@@ -138,7 +111,7 @@ class WebassemblyDescriptorGenerator(DescriptorGenerator[Kernel, GraphExecutionD
             required_heap=required_heap,
             licenses=graph.licenses)
 
-        return GraphExecutionData(graph, descriptor, constants_bytes)
+        return GraphExecutionData(graph, descriptor, constant_encoder)
 
 
 def generate(graph: Graph, **kwargs):
@@ -16,11 +16,22 @@ source_header = """
 #include <stdlib.h>
 #include <math.h>
 
-float static_buffer[%%STATIC_SIZE%%];
+// Buffers are aligned to 16 bytes, same as the alignment of offsets in them
+alignas(16) float static_buffer[%%STATIC_SIZE%%];
 float* dynamic_buffer = nullptr;
 
 """
 
+# Header of each kernel translation unit. Buffers are defined in the main translation unit.
+source_kernel_header = """
+#include <stdlib.h>
+#include <math.h>
+
+extern float static_buffer[];
+extern float* dynamic_buffer;
+
+"""
+
 source_init = """
 extern "C" void init() {
     //static_buffer = (float*)malloc(%%STATIC_SIZE%% * sizeof(float));
@@ -35,7 +46,10 @@ extern "C" float* allocate_dynamic_buffer(int count) {
         free(dynamic_buffer);
         dynamic_buffer = nullptr;
     }
-    dynamic_buffer = (float*)malloc(count * sizeof(float));
+    void* buffer = nullptr;
+    if (posix_memalign(&buffer, 16, count * sizeof(float)) == 0) {
+        dynamic_buffer = (float*)buffer;
+    }
     return dynamic_buffer;
 }
 
@@ -117,7 +131,7 @@ class GraphDescriptor(json.SerializableMixin, IGraphDescriptor):
         self.footer_sources["exec"] = source_exec.replace("%%EXEC_LINES%%", lines)
         self.header_sources["meta_buffer_initializer"] = meta_buffer_initializer
 
-    def concat_kernel_sources(self):
+    def _unique_func_sources(self) -> Dict[str, str]:
         func_sources = OrderedDict()
 
         for kernel in self.kernels:
@@ -130,6 +144,11 @@ class GraphDescriptor(json.SerializableMixin, IGraphDescriptor):
         self.generate_top_source()
         self.generate_exec_source()
         self.generate_init_source()
+
+        return func_sources
+
+    def concat_kernel_sources(self):
+        func_sources = self._unique_func_sources()
         combined_source = \
             "".join(self.header_sources.values()) + \
             "\n".join(func_sources.values()) + \
@@ -137,6 +156,28 @@ class GraphDescriptor(json.SerializableMixin, IGraphDescriptor):
 
         return combined_source
 
+    def split_kernel_sources(self) -> Dict[str, str]:
+        """split_kernel_sources()
+
+        Returns the source code split into translation units, which can be compiled separately. Each kernel function is placed in its
+        own translation unit, and buffers and entry points are placed in "main" translation unit.
+
+        Returns:
+            (dict of str and str) name and source code of each translation unit
+        """
+        func_sources = self._unique_func_sources()
+
+        units = OrderedDict()
+        units["main"] = \
+            "".join(self.header_sources.values()) + \
+            "".join(f"void {func_name}(const int * meta_buffer);\n" for func_name in func_sources.keys()) + \
+            "".join(self.footer_sources.values())
+
+        for func_name, source in func_sources.items():
+            units[func_name] = source_kernel_header + source
+
+        return units
+
     def get_all_placeholders(self):
         unresolved_variables = []  # type: List[Tuple[int, Placeholder]]
         placeholders_set = set()  # type: Set[Placeholder]
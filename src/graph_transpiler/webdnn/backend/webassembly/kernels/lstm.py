@@ -18,12 +18,9 @@ template = """
 void %%FUNC_NAME%%(const int * %%META_BUFFER%%)
 {
 %%DEFINE_SEQUENCE_OUTPUT%%
-    const float *X = %%LOAD_BUFFER(lstm_X)%%;
     float *Y = %%LOAD_BUFFER(lstm_Y)%%;
     float *mem_c = %%LOAD_BUFFER(lstm_final_c)%%;
-    float *W_input = %%LOAD_BUFFER(lstm_W_input)%%;
     float *W_hidden = %%LOAD_BUFFER(lstm_W_hidden)%%;
-    const int input_dim = %%LOAD_BUFFER(lstm_input_dim)%%;
     const int sequence_len = %%LOAD_BUFFER(lstm_sequence_len)%%;
     const int batch_size = %%LOAD_BUFFER(lstm_batch_size)%%;
     const int hidden_dim = %%LOAD_BUFFER(lstm_hidden_dim)%%;
@@ -46,22 +43,13 @@ void %%FUNC_NAME%%(const int * %%META_BUFFER%%)
     float *mem_h = new float[hidden_dim * batch_size]();
     %%INITIAL_H_COPIER%%
     float *mem_v = new float[hidden_dim4 * batch_size](); // i, f, c, o
-    float *mem_x_t = new float[input_dim * batch_size]();
     Eigen::Map<Eigen::Matrix<float, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor> > mat_v(mem_v, batch_size, hidden_dim4);
     Eigen::Map<Eigen::Matrix<float, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor> > mat_h(mem_h, batch_size, hidden_dim);
-    Eigen::Map<Eigen::Matrix<float, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor> > mat_x_t(mem_x_t, batch_size, input_dim);
-    Eigen::Map<Eigen::Matrix<float, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor> > mat_w_input(W_input, input_dim, hidden_dim4);
     Eigen::Map<Eigen::Matrix<float, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor> > mat_w_hidden(W_hidden, hidden_dim, hidden_dim4);
+    %%INPUT_INITIALIZER%%
 
     for (int t = 0; t < sequence_len; t++) {
-        // copy x of current time
-        for (int n = 0; n < batch_size; n++) {
-            for (int dim = 0; dim < input_dim; dim++) {
-                mem_x_t[dim + n * input_dim] = X[(n * sequence_len + t) * input_dim + dim];
-            }
-        }
-
-        mat_v.noalias() = mat_x_t * mat_w_input + mat_h * mat_w_hidden;
+        %%INPUT_APPLIER%%
         %%BIAS_APPLIER%%
 
         for (int n = 0; n < batch_size; n++) {
@@ -99,22 +87,56 @@ void %%FUNC_NAME%%(const int * %%META_BUFFER%%)
 
     delete[] mem_h;
     delete[] mem_v;
-    delete[] mem_x_t;
+    %%INPUT_FINALIZER%%
 #undef SEQUENCE_OUTPUT
 }
 """
 
+# x_t * W_input is computed in each step
+input_initializer = """
+    const float *X = %%LOAD_BUFFER(lstm_X)%%;
+    float *W_input = %%LOAD_BUFFER(lstm_W_input)%%;
+    const int input_dim = %%LOAD_BUFFER(lstm_input_dim)%%;
+    float *mem_x_t = new float[input_dim * batch_size]();
+    Eigen::Map<Eigen::Matrix<float, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor> > mat_x_t(mem_x_t, batch_size, input_dim);
+    Eigen::Map<Eigen::Matrix<float, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor> > mat_w_input(W_input, input_dim, hidden_dim4);
+"""
+
+input_applier = """
+        // copy x of current time
+        for (int n = 0; n < batch_size; n++) {
+            for (int dim = 0; dim < input_dim; dim++) {
+                mem_x_t[dim + n * input_dim] = X[(n * sequence_len + t) * input_dim + dim];
+            }
+        }
+
+        mat_v.noalias() = mat_x_t * mat_w_input + mat_h * mat_w_hidden;
+"""
+
+input_finalizer = """
+    delete[] mem_x_t;
+"""
+
+# x * W_input of all steps is computed by Sgemm before this kernel (see HoistLSTMInputProjection)
+projected_input_initializer = """
+    const float *X_projected = %%LOAD_BUFFER(lstm_X_projected)%%;
+"""
+
+projected_input_applier = """
+        Eigen::Map<const Eigen::Matrix<float, Eigen::Dynamic, Eigen::Dynamic, Eigen::RowMajor>, 0, Eigen::OuterStride<> > mat_x_projected_t(
+            X_projected + t * hidden_dim4, batch_size, hidden_dim4, Eigen::OuterStride<>(sequence_len * hidden_dim4));
+
+        mat_v.noalias() = mat_h * mat_w_hidden;
+        mat_v += mat_x_projected_t;
+"""
+
 
 @WebassemblyDescriptorGenerator.register_handler(LSTM)
 def lstm(op: LSTM, memory_layout: MemoryLayout) -> List[Kernel]:
-    x = op.inputs["x"]
-    w_input = op.inputs["w_input"]
     w_hidden = op.inputs["w_hidden"]
     y = op.outputs["y"]
     final_c = op.outputs["final_c"]
 
-    assert x.order == OrderNTC
-    assert w_input.order == OrderCN
     assert w_hidden.order == OrderCN
     if op.parameters["return_sequences"]:
         assert y.order == OrderNTC
@@ -126,18 +148,39 @@ def lstm(op: LSTM, memory_layout: MemoryLayout) -> List[Kernel]:
     hidden_dim = w_hidden.shape_dict[Axis.C]
 
     buffer_injector_items = {
-        "lstm_X": memory_layout[x],
         "lstm_Y": memory_layout[y],
         "lstm_final_c": memory_layout[final_c],
-        "lstm_W_input": memory_layout[w_input],
         "lstm_W_hidden": memory_layout[w_hidden],
-        "lstm_input_dim": x.shape_dict[Axis.C],
-        "lstm_sequence_len": x.shape_dict[Axis.T],
-        "lstm_batch_size": x.shape_dict[Axis.N],
         "lstm_hidden_dim": hidden_dim
     }
 
     source = template
+    if "x_projected" in op.inputs:
+        x_projected = op.inputs["x_projected"]
+        assert x_projected.order == OrderNTC
+
+        buffer_injector_items["lstm_X_projected"] = memory_layout[x_projected]
+        buffer_injector_items["lstm_sequence_len"] = x_projected.shape_dict[Axis.T]
+        buffer_injector_items["lstm_batch_size"] = x_projected.shape_dict[Axis.N]
+        source = source.replace("%%INPUT_INITIALIZER%%", projected_input_initializer)
+        source = source.replace("%%INPUT_APPLIER%%", projected_input_applier)
+        source = source.replace("%%INPUT_FINALIZER%%", "")
+
+    else:
+        x = op.inputs["x"]
+        w_input = op.inputs["w_input"]
+        assert x.order == OrderNTC
+        assert w_input.order == OrderCN
+
+        buffer_injector_items["lstm_X"] = memory_layout[x]
+        buffer_injector_items["lstm_W_input"] = memory_layout[w_input]
+        buffer_injector_items["lstm_input_dim"] = x.shape_dict[Axis.C]
+        buffer_injector_items["lstm_sequence_len"] = x.shape_dict[Axis.T]
+        buffer_injector_items["lstm_batch_size"] = x.shape_dict[Axis.N]
+        source = source.replace("%%INPUT_INITIALIZER%%", input_initializer)
+        source = source.replace("%%INPUT_APPLIER%%", input_applier)
+        source = source.replace("%%INPUT_FINALIZER%%", input_finalizer)
+
     if op.parameters["return_sequences"]:
         source = source.replace("%%DEFINE_SEQUENCE_OUTPUT%%", "#define SEQUENCE_OUTPUT")
     else:
@@ -3,6 +3,7 @@ from webdnn.backend.webassembly.optimize_rules.optimize_sgemm_eigen import Optim
 from webdnn.graph.optimize_rule import OptimizeRuleGroup
 from webdnn.optimizer.sub_rules.constant_folding import ConstantFolding
 from webdnn.optimizer.sub_rules.elementwise_kernel_fusion import ElementwiseKernelFusion
+from webdnn.optimizer.sub_rules.hoist_lstm_input_projection import HoistLSTMInputProjection
 from webdnn.optimizer.sub_rules.merge_sgemm_and_elementwise_mul import MergeSgemmAndElementwiseMul
 from webdnn.optimizer.sub_rules.replace_convolution_by_im2col import ReplaceConvolutionByIm2Col
 from webdnn.optimizer.sub_rules.replace_deconvolution_by_col2im import ReplaceDeconvolutionByCol2Im
@@ -27,6 +28,7 @@ class WebassemblyOptimizeRule(OptimizeRuleGroup):
             MergeSgemmAndElementwiseMul(),
             ConstantFolding(),
 
+            HoistLSTMInputProjection(),
             OptimizeSgemmEigen(),
             ElementwiseKernelFusion(),
             UpdateInplaceAttribute()
@@ -1,8 +1,6 @@
 from typing import Dict, List, Set, Union
 
-import numpy as np
-
-from webdnn.backend.code_generator.allocator import MemoryLayout, Allocation, BufferType
+from webdnn.backend.code_generator.allocator import MemoryLayout, Allocation, BufferType, create_constant_buffer
 from webdnn.backend.webgl.attributes.channel_mode import ChannelMode, ChannelModeEnum
 from webdnn.backend.webgl.attributes.texture_shape import TextureShape
 from webdnn.graph import traverse
@@ -238,11 +236,12 @@ def _update_offset(allocations: WebGLAllocationDict):
 
 def _update_constant_offset(allocations: WebGLAllocationDict):
     offset = 0
-    data = []
-
     for v, a in allocations.items():  # type: ConstantVariable, WebGLAllocation
-        data.append(v.data.flatten())
         a.offset = offset
         offset = _align(offset + v.size)
 
-    return np.concatenate(data) if len(data) > 0 else np.empty((0,))
+    data = create_constant_buffer(offset)
+    for v, a in allocations.items():  # type: ConstantVariable, WebGLAllocation
+        data[a.offset:a.offset + v.size] = v.data.ravel()
+
+    return data
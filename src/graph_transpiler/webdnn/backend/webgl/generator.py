@@ -1,7 +1,11 @@
+import hashlib
 import os
 import os.path as path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, BinaryIO
 
+import numpy as np
+
+from webdnn.backend.code_generator.allocator import Allocation, MemoryLayout, create_constant_buffer
 from webdnn.backend.interface.generator import DescriptorGenerator
 from webdnn.backend.interface.graph_descriptor import IGraphExecutionData
 from webdnn.backend.webgl.allocator import allocate
@@ -12,31 +16,110 @@ from webdnn.encoder.constant_encoder import ConstantEncoder
 from webdnn.graph import traverse
 from webdnn.graph.graph import Graph
 from webdnn.graph.variables.constant_variable import ConstantVariable
-from webdnn.util import config
+from webdnn.util import config, console, profiler
 from webdnn.util.json import json
 
 
 class GraphExecutionData(IGraphExecutionData[Kernel]):
-    def __init__(self, graph: Graph, data_dict: Dict[int, Tuple[GraphDescriptor, bytes]]):
+    """GraphExecutionData(graph, descriptors, weight_pack, constant_encoder)
+
+    Args:
+        graph: graph
+        descriptors: descriptor for each max texture size
+        weight_pack: weight pack shared by all descriptors
+        constant_encoder: encoder of the weight pack, which is used when saved
+    """
+
+    def __init__(self, graph: Graph, descriptors: Dict[int, GraphDescriptor], weight_pack: "WeightPack",
+                 constant_encoder: ConstantEncoder):
         self.graph = graph
-        self.data_dict = data_dict
+        self.descriptors = descriptors
+        self.weight_pack = weight_pack
+        self.constant_encoder = constant_encoder
         self.backend_suffix = "webgl"
 
     def save(self, dirname: str):
         os.makedirs(dirname, exist_ok=True)
 
-        for max_texture_size, (descriptor, constant_bytes) in self.data_dict.items():
+        for max_texture_size, descriptor in self.descriptors.items():
             with open(path.join(dirname, f"graph_{self.backend_suffix}_{max_texture_size}.json"), "w") as f:
                 json.dump(descriptor, f, indent=2)
 
-            with open(path.join(dirname, f"weight_{self.backend_suffix}_{max_texture_size}.bin"), "wb") as f:
-                f.write(constant_bytes)
+        with open(path.join(dirname, f"weight_{self.backend_suffix}.bin"), "wb") as f:
+            constants_size = self.weight_pack.encode_to(self.constant_encoder, f)
+
+        console.debug(f"[WebGLDescriptorGenerator] constants encoded size: {constants_size}")
+
+
+class WeightPack:
+    """WeightPack()
+
+    Content-addressed store of constant data shared by descriptors for each max texture size. Constants with same data are stored only
+    once, and each descriptor refers to the range in the store by its :code:`constants_map`.
+    """
+
+    def __init__(self):
+        self.offsets = {}  # type: Dict[str, int]
+        self.allocations = {}  # type: Dict[ConstantVariable, Allocation]
+        self.chunks = []  # type: List[np.ndarray]
+        self.size = 0
+
+    def add(self, constant: ConstantVariable, data: np.ndarray) -> int:
+        """add(constant, data)
+
+        Args:
+            constant: constant variable
+            data: data of the constant variable in memory layout
+
+        Returns:
+            (int) offset of the data in the store
+        """
+        key = hashlib.sha256(np.ascontiguousarray(data, dtype=np.float32).data).hexdigest()
+        if key not in self.offsets:
+            if constant in self.allocations:
+                # Same variable is modified by optimization for other max texture size
+                constant = ConstantVariable(data.reshape(constant.shape), constant.order)
+
+            self.offsets[key] = self.size
+            self.allocations[constant] = Allocation(size=data.size, offset=self.size, name=constant.name)
+            self.chunks.append(data)
+            self.size += data.size
+
+        return self.offsets[key]
+
+    def _memory_layout(self) -> MemoryLayout:
+        data = create_constant_buffer(self.size)
+        for allocation, chunk in zip(self.allocations.values(), self.chunks):
+            data[allocation.offset:allocation.offset + allocation.size] = chunk
+
+        return MemoryLayout(self.allocations, data)
+
+    def encode(self, constant_encoder: ConstantEncoder) -> bytes:
+        with profiler.profile("encoder", constant_encoder.__class__.__name__):
+            return constant_encoder.encode(self._memory_layout())
+
+    def encode_to(self, constant_encoder: ConstantEncoder, f: BinaryIO) -> int:
+        """encode_to(constant_encoder, f)
+
+        Encode the store and write it into the file.
+
+        Args:
+            constant_encoder: constant encoder
+            f: binary file object
+
+        Returns:
+            (int) written size in bytes
+        """
+        with profiler.profile("encoder", constant_encoder.__class__.__name__):
+            return constant_encoder.encode_to(self._memory_layout(), f)
 
 
 class WebGLDescriptorGenerator(DescriptorGenerator[Kernel, GraphExecutionData]):
     @classmethod
     def generate(cls, graph: Graph, **kwargs):
-        data_dict = {}  # type: Dict[int, Tuple[GraphDescriptor, bytes]]
+        descriptors = {}  # type: Dict[int, GraphDescriptor]
+        weight_pack = WeightPack()
+        constant_encoder = ConstantEncoder.get_encoder(kwargs.get("constant_encoder_name", None))
 
         for max_texture_size in [4096, 8192, 16384]:
             config.WEBGL_MAX_TEXTURE_SIZE = max_texture_size
@@ -46,14 +129,12 @@ class WebGLDescriptorGenerator(DescriptorGenerator[Kernel, GraphExecutionData]):
 
             constants_map = {}
             for constant in traverse.filter_nodes(traverse.listup_nodes(graph), ConstantVariable):  # type: ConstantVariable
+                offset = memory_layout[constant].offset
                 constants_map[constant.name] = {
-                    "byte_offset": memory_layout[constant].offset * 4,
+                    "byte_offset": weight_pack.add(constant, memory_layout.data[offset:offset + constant.size]) * 4,
                     "size": constant.size
                 }
 
-            constant_encoder = ConstantEncoder.get_encoder(kwargs.get("constant_encoder_name", None))
-            constants_bytes = constant_encoder.encode(memory_layout)
-
             kernels = cls.generate_kernels(graph)
 
             descriptor = GraphDescriptor(
@@ -65,9 +146,9 @@ class WebGLDescriptorGenerator(DescriptorGenerator[Kernel, GraphExecutionData]):
                 constants_map=constants_map,
                 licenses=graph.licenses
             )
-            data_dict[max_texture_size] = (descriptor, constants_bytes)
+            descriptors[max_texture_size] = descriptor
 
-        return GraphExecutionData(graph, data_dict)
+        return GraphExecutionData(graph, descriptors, weight_pack, constant_encoder)
 
     # noinspection PyMethodOverriding
     @classmethod
@@ -79,7 +160,8 @@ class WebGLDescriptorGenerator(DescriptorGenerator[Kernel, GraphExecutionData]):
             if key not in cls._handler_map[cls.__name__]:
                 raise NotImplementedError(f"[{cls.__name__}] Operator {op} is not handled by any generator handler")
 
-            kernels += cls._handler_map[cls.__name__][key](op)
+            with profiler.profile("generator_handler", f"{cls.__name__}.{key}"):
+                kernels += cls._handler_map[cls.__name__][key](op)
 
         return kernels
 
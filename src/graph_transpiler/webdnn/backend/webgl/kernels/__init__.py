@@ -13,10 +13,13 @@ from webdnn.backend.webgl.kernels import elementwise_div
 from webdnn.backend.webgl.kernels import elementwise_mul
 from webdnn.backend.webgl.kernels import elementwise_pow
 from webdnn.backend.webgl.kernels import elu
+from webdnn.backend.webgl.kernels import embedding
 from webdnn.backend.webgl.kernels import exp
 from webdnn.backend.webgl.kernels import hard_sigmoid
 from webdnn.backend.webgl.kernels import im2col
 from webdnn.backend.webgl.kernels import leaky_relu
+from webdnn.backend.webgl.kernels import local_response_normalization
+from webdnn.backend.webgl.kernels import lstm
 from webdnn.backend.webgl.kernels import max
 from webdnn.backend.webgl.kernels import max_pooling_2d
 from webdnn.backend.webgl.kernels import min
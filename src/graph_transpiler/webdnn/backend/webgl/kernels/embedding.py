@@ -0,0 +1,83 @@
+from typing import List
+
+from webdnn.backend.code_generator.injectors.kernel_name_injector import KernelNameInjector
+from webdnn.backend.webgl.generator import WebGLDescriptorGenerator
+from webdnn.backend.webgl.kernel import Kernel
+from webdnn.backend.webgl.kernels.util import FragmentShaderPreamble, texture_stride, texture_shape
+from webdnn.backend.webgl.uniform_injector import UniformInjector
+from webdnn.graph.operators.embedding import Embedding
+from webdnn.graph.order import OrderNTC, OrderNT, OrderCN
+
+template = FragmentShaderPreamble + """
+%%UNIFORM(sampler2D, X)%%;
+%%UNIFORM(sampler2D, W)%%;
+
+%%UNIFORM(vec2, s_y)%%;
+%%UNIFORM(vec3, d_Y)%%;
+%%UNIFORM(vec3, s_Y)%%;
+
+%%UNIFORM(vec2, d_x)%%;
+%%UNIFORM(vec2, s_x)%%;
+%%UNIFORM(vec2, s_X)%%;
+
+%%UNIFORM(vec2, d_w)%%;
+%%UNIFORM(vec2, s_w)%%;
+%%UNIFORM(vec2, s_W)%%;
+
+void main() {
+    ivec3 p_Y = convert_position_i(gl_FragCoord.xy, s_y, s_Y, d_Y);
+    int n = p_Y.x;
+    int t = p_Y.y;
+    int c = p_Y.z;
+
+    float word = texture2D(X, convert_coord(vec2(n, t) + 0.5, s_X, s_x, d_x)).r;
+    float v = texture2D(W, convert_coord(vec2(floor(word + 0.5), c) + 0.5, s_W, s_w, d_w)).r;
+
+    gl_FragColor = vec4(v, 0, 0, 0);
+}
+"""
+
+
+@WebGLDescriptorGenerator.register_handler(Embedding)
+def embedding(op: Embedding) -> List[Kernel]:
+    x = op.inputs["x"]
+    w = op.inputs["w"]
+    y = op.outputs["y"]
+
+    # Positions are computed in the canonical axis order (x: NT, w: CN, y: NTC), and the actual memory order of each variable is
+    # handled by its strides. Therefore no transpose is needed.
+    assert x.order.check_same_axes(OrderNT)
+    assert w.order.check_same_axes(OrderCN)
+    assert y.order.check_same_axes(OrderNTC)
+
+    name_injector = KernelNameInjector(op)
+    uniform_injector = UniformInjector()
+    uniform_injector.register({
+        "X": x,
+        "W": w,
+
+        "s_y": texture_stride(y),
+        "d_Y": [y.shape_dict[a] for a in OrderNTC.axes],
+        "s_Y": [y.stride_dict[a] for a in OrderNTC.axes],
+
+        "d_x": texture_shape(x),
+        "s_x": texture_stride(x),
+        "s_X": [x.stride_dict[a] for a in OrderNT.axes],
+
+        "d_w": texture_shape(w),
+        "s_w": texture_stride(w),
+        "s_W": [w.stride_dict[a] for a in OrderCN.axes],
+    })
+
+    source = template
+    source = uniform_injector.inject(source)
+    source = name_injector.inject(source)
+    kernel = Kernel(
+        source,
+        name_injector.name,
+        uniform_injector.samplers,
+        uniform_injector.uniforms,
+        y
+    )
+
+    return [kernel]
@@ -0,0 +1,95 @@
+from typing import List
+
+from webdnn.backend.code_generator.injectors.kernel_name_injector import KernelNameInjector
+from webdnn.backend.webgl.generator import WebGLDescriptorGenerator
+from webdnn.backend.webgl.kernel import Kernel
+from webdnn.backend.webgl.kernels.util import FragmentShaderPreamble, texture_stride, texture_shape
+from webdnn.backend.webgl.uniform_injector import UniformInjector
+from webdnn.graph.axis import Axis
+from webdnn.graph.operators.local_response_normalization import LocalResponseNormalization
+from webdnn.graph.order import OrderNHWC
+
+
+def generate_template(half_n: int):
+    return FragmentShaderPreamble + """
+    %%UNIFORM(sampler2D, X)%%;
+
+    %%UNIFORM(vec2, s_y)%%;
+    %%UNIFORM(vec4, d_Y)%%;
+    %%UNIFORM(vec4, s_Y)%%;
+
+    %%UNIFORM(vec2, d_x)%%;
+    %%UNIFORM(vec2, s_x)%%;
+    %%UNIFORM(vec4, s_X)%%;
+
+    %%UNIFORM(int, C)%%;
+    %%UNIFORM(float, k)%%;
+    %%UNIFORM(float, alpha)%%;
+    %%UNIFORM(float, minus_beta)%%;
+
+    void main() {
+        ivec4 p_Y = convert_position_i(gl_FragCoord.xy, s_y, s_Y, d_Y);
+        int n = p_Y.x;
+        int h = p_Y.y;
+        int w = p_Y.z;
+        int c = p_Y.w;
+
+        float sq_sum = 0.0;
+
+        for (int i = 0; i < %%WINDOW_SIZE%%; i++) {
+            int c1 = c - %%HALF_N%% + i;
+            if (c1 < 0 || c1 >= C) continue;
+
+            float v = texture2D(X, convert_coord(vec4(n, h, w, c1) + 0.5, s_X, s_x, d_x)).r;
+            sq_sum += v * v;
+        }
+
+        float x = texture2D(X, convert_coord(vec4(n, h, w, c) + 0.5, s_X, s_x, d_x)).r;
+
+        gl_FragColor = vec4(x * pow(sq_sum * alpha + k, minus_beta), 0, 0, 0);
+    }
+    """ \
+        .replace("%%WINDOW_SIZE%%", f"{half_n * 2 + 1}") \
+        .replace("%%HALF_N%%", f"{half_n}")
+
+
+@WebGLDescriptorGenerator.register_handler(LocalResponseNormalization)
+def local_response_normalization(op: LocalResponseNormalization) -> List[Kernel]:
+    x = op.inputs["x"]
+    y = op.outputs["y"]
+
+    # Positions are computed in OrderNHWC, and the actual memory order of each variable is handled by its strides.
+    assert x.order.check_same_axes(OrderNHWC)
+    assert y.order.check_same_axes(OrderNHWC)
+
+    name_injector = KernelNameInjector(op)
+    uniform_injector = UniformInjector()
+    uniform_injector.register({
+        "X": x,
+
+        "s_y": texture_stride(y),
+        "d_Y": [y.shape_dict[a] for a in OrderNHWC.axes],
+        "s_Y": [y.stride_dict[a] for a in OrderNHWC.axes],
+
+        "d_x": texture_shape(x),
+        "s_x": texture_stride(x),
+        "s_X": [x.stride_dict[a] for a in OrderNHWC.axes],
+
+        "C": x.shape_dict[Axis.C],
+        "k": float(op.parameters["k"]),
+        "alpha": float(op.parameters["alpha"]),
+        "minus_beta": float(-op.parameters["beta"])
+    })
+
+    source = generate_template(half_n=int(op.parameters["n"] // 2))
+    source = uniform_injector.inject(source)
+    source = name_injector.inject(source)
+    kernel = Kernel(
+        source,
+        name_injector.name,
+        uniform_injector.samplers,
+        uniform_injector.uniforms,
+        y
+    )
+
+    return [kernel]
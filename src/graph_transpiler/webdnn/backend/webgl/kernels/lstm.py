@@ -0,0 +1,330 @@
+"""
+LSTM is computed by a sequence of fragment shaders for each time step :code:`t`.
+
+- cell kernel: computes input, forget and activation gates, and renders the cell state :code:`c_t`
+- hidden kernel: computes output gate, and renders the hidden state :code:`h_t` from :code:`c_t`
+- gather kernel (only if :code:`return_sequences=True`): after all time steps, concatenates hidden states along the time axis into the
+  output sequence. Each gather kernel reads at most :code:`MAX_GATHER_INPUTS` textures, so long sequences are gathered in a few levels.
+
+Because fragment shader cannot read the texture which it renders into, states are rendered into workspaces alternately. Workspaces are
+attached by :class:`~webdnn.backend.webgl.optimize_rules.attach_lstm_workspace.AttachLSTMWorkspace`.
+
+All positions are computed in canonical orders (x: NTC, w_input and w_hidden: CN, b: C, states: NC), and the actual memory order of each
+variable is handled by its strides.
+"""
+from typing import List, Optional, Sequence
+
+from webdnn.backend.code_generator.injectors.kernel_name_injector import KernelNameInjector
+from webdnn.backend.webgl.generator import WebGLDescriptorGenerator
+from webdnn.backend.webgl.kernel import Kernel
+from webdnn.backend.webgl.kernels.util import FragmentShaderPreamble, texture_stride, texture_shape
+from webdnn.backend.webgl.optimize_rules.attach_lstm_workspace import gather_lengths, MAX_GATHER_INPUTS
+from webdnn.backend.webgl.uniform_injector import UniformInjector
+from webdnn.graph.axis import Axis
+from webdnn.graph.operators.lstm import LSTM
+from webdnn.graph.order import OrderNTC, OrderNC, OrderCN, OrderC, Order
+from webdnn.graph.variable import Variable
+
+_activation_snippets = {
+    "tanh": """
+float activation(float x) {
+    float v = exp(-2.0 * abs(x));
+    return (1.0 - v) / (1.0 + v) * sign(x);
+}
+""",
+}
+
+_recurrent_activation_snippets = {
+    "sigmoid": """
+float recurrent_activation(float x) {
+    return 1.0 / (1.0 + exp(-1.0 * x));
+}
+""",
+    "hard_sigmoid": """
+float recurrent_activation(float x) {
+    return clamp(x * 0.2 + 0.5, 0.0, 1.0);
+}
+"""
+}
+
+
+def _uniform_snippet(key: str, ndim: int):
+    return f"""
+%%UNIFORM(sampler2D, sampler_{key})%%;
+%%UNIFORM(vec2, texture_shape_{key})%%;
+%%UNIFORM(vec2, texture_stride_{key})%%;
+%%UNIFORM(vec{ndim}, variable_stride_{key})%%;
+"""
+
+
+def _load_snippet(key: str, position: str):
+    texture_position = f"convert_coord({position} + 0.5, variable_stride_{key}, texture_stride_{key}, texture_shape_{key})"
+    return f"texture2D(sampler_{key}, {texture_position}).r"
+
+
+def _register_input(uniform_injector: UniformInjector, key: str, v: Variable, order: Order):
+    # Axes which the variable does not have are broadcasted (ex. hidden state of single time step is loaded as a sequence)
+    variable_stride = [v.stride_dict[a] if a in v.order.axes else 0 for a in order.axes]
+    variable_stride += [0] * ((2 if len(variable_stride) <= 2 else 4) - len(variable_stride))
+
+    uniform_injector.register({
+        f"sampler_{key}": v,
+        f"texture_shape_{key}": texture_shape(v),
+        f"texture_stride_{key}": texture_stride(v),
+        f"variable_stride_{key}": variable_stride,
+    })
+
+
+def _register_output(uniform_injector: UniformInjector, v: Variable, order: Order):
+    uniform_injector.register({
+        "texture_stride_y": texture_stride(v),
+        "variable_shape_y": [v.shape_dict[a] for a in order.axes],
+        "variable_stride_y": [v.stride_dict[a] for a in order.axes],
+    })
+
+
+def _generate_gate_snippet(op: LSTM, use_h_prev: bool):
+    """
+    Generate the function to compute the value of gates before activation, :code:`x_t * w_input + h_{t-1} * w_hidden + b`.
+    """
+    snippets = [
+        _uniform_snippet("x", 4),
+        _uniform_snippet("w_input", 2),
+        "%%UNIFORM(int, t)%%;"
+    ]
+    if use_h_prev:
+        snippets += [
+            _uniform_snippet("w_hidden", 2),
+            _uniform_snippet("h_prev", 2)
+        ]
+
+    if op.parameters["use_bias"]:
+        snippets.append(_uniform_snippet("b", 2))
+
+    snippets.append(f"""
+float gate(int n, int j) {{
+    float v = {_load_snippet("b", "vec2(j, 0)") if op.parameters["use_bias"] else "0.0"};
+
+    for (int k = 0; k < %%C1%%; k++) {{
+        v += {_load_snippet("x", "vec4(n, t, k, 0)")} * {_load_snippet("w_input", "vec2(k, j)")};
+    }}
+""")
+
+    if use_h_prev:
+        snippets.append(f"""
+    for (int k = 0; k < %%C2%%; k++) {{
+        v += {_load_snippet("h_prev", "vec2(n, k)")} * {_load_snippet("w_hidden", "vec2(k, j)")};
+    }}
+""")
+
+    snippets.append("""
+    return v;
+}
+""")
+
+    return "\n".join(snippets)
+
+
+def _generate_header(op: LSTM, use_h_prev: bool):
+    return FragmentShaderPreamble + \
+           _activation_snippets[op.parameters["activation"]] + \
+           _recurrent_activation_snippets[op.parameters["recurrent_activation"]] + """
+%%UNIFORM(vec2, texture_stride_y)%%;
+%%UNIFORM(vec2, variable_shape_y)%%;
+%%UNIFORM(vec2, variable_stride_y)%%;
+""" + _generate_gate_snippet(op, use_h_prev)
+
+
+def _inject_sizes(op: LSTM, source: str):
+    return source \
+        .replace("%%C1%%", f"{op.inputs['x'].shape_dict[Axis.C]}") \
+        .replace("%%C2%%", f"{op.inputs['w_hidden'].shape_dict[Axis.C]}")
+
+
+def _generate_template_cell(op: LSTM, use_h_prev: bool, use_c_prev: bool):
+    return _inject_sizes(op, _generate_header(op, use_h_prev) + (_uniform_snippet("c_prev", 2) if use_c_prev else "") + f"""
+void main() {{
+    ivec2 p_y = convert_position_i(gl_FragCoord.xy, texture_stride_y, variable_stride_y, variable_shape_y);
+    int n = p_y.x;
+    int c2 = p_y.y;
+
+    float i = recurrent_activation(gate(n, c2));
+    float f = recurrent_activation(gate(n, c2 + %%C2%%));
+    float a = activation(gate(n, c2 + %%C2%% * 2));
+    float c = {_load_snippet("c_prev", "vec2(n, c2)") if use_c_prev else "0.0"};
+
+    gl_FragColor = vec4(a * i + c * f, 0, 0, 0);
+}}
+""")
+
+
+def _generate_template_hidden(op: LSTM, use_h_prev: bool):
+    return _inject_sizes(op, _generate_header(op, use_h_prev) + _uniform_snippet("c_next", 2) + f"""
+void main() {{
+    ivec2 p_y = convert_position_i(gl_FragCoord.xy, texture_stride_y, variable_stride_y, variable_shape_y);
+    int n = p_y.x;
+    int c2 = p_y.y;
+
+    float o = recurrent_activation(gate(n, c2 + %%C2%% * 3));
+    float c = {_load_snippet("c_next", "vec2(n, c2)")};
+
+    gl_FragColor = vec4(activation(c) * o, 0, 0, 0);
+}}
+""")
+
+
+def _generate_template_gather(num_inputs: int):
+    snippets = [FragmentShaderPreamble]
+    for i in range(num_inputs):
+        snippets.append(_uniform_snippet(f"x{i}", 4))
+        snippets.append(f"%%UNIFORM(int, begin_{i})%%;")
+
+    snippets.append("""
+%%UNIFORM(vec2, texture_stride_y)%%;
+%%UNIFORM(vec3, variable_shape_y)%%;
+%%UNIFORM(vec3, variable_stride_y)%%;
+
+void main() {
+    ivec3 p_y = convert_position_i(gl_FragCoord.xy, texture_stride_y, variable_stride_y, variable_shape_y);
+    int n = p_y.x;
+    int t = p_y.y;
+    int c2 = p_y.z;
+
+    float v;
+""")
+
+    # Select the input which contains the time step t. Inputs are sorted by the beginning time step.
+    for i in range(num_inputs):
+        load = _load_snippet(f"x{i}", f"vec4(n, t - begin_{i}, c2, 0)")
+        prefix = "" if i == 0 else "else "
+        if i < num_inputs - 1:
+            snippets.append(f"    {prefix}if (t < begin_{i + 1}) {{ v = {load}; }}")
+
+        else:
+            snippets.append(f"    {prefix}{{ v = {load}; }}")
+
+    snippets.append("""
+    gl_FragColor = vec4(v, 0, 0, 0);
+}
+""")
+
+    return "\n".join(snippets)
+
+
+def _generate_kernel(op: LSTM, source: str, uniform_injector: UniformInjector, output: Variable) -> Kernel:
+    name_injector = KernelNameInjector(op)
+    source = uniform_injector.inject(source)
+    source = name_injector.inject(source)
+    return Kernel(
+        source,
+        name_injector.name,
+        uniform_injector.samplers,
+        uniform_injector.uniforms,
+        output
+    )
+
+
+def _register_gate_inputs(uniform_injector: UniformInjector, op: LSTM, t: int, h_prev: Optional[Variable]):
+    _register_input(uniform_injector, "x", op.inputs["x"], OrderNTC)
+    _register_input(uniform_injector, "w_input", op.inputs["w_input"], OrderCN)
+    uniform_injector.register({"t": t})
+
+    if h_prev is not None:
+        _register_input(uniform_injector, "w_hidden", op.inputs["w_hidden"], OrderCN)
+        _register_input(uniform_injector, "h_prev", h_prev, OrderNC)
+
+    if op.parameters["use_bias"]:
+        _register_input(uniform_injector, "b", op.inputs["b"], OrderC)
+
+
+def _cell_kernel(op: LSTM, t: int, h_prev: Optional[Variable], c_prev: Optional[Variable], c_next: Variable) -> Kernel:
+    uniform_injector = UniformInjector()
+    _register_gate_inputs(uniform_injector, op, t, h_prev)
+    _register_output(uniform_injector, c_next, OrderNC)
+    if c_prev is not None:
+        _register_input(uniform_injector, "c_prev", c_prev, OrderNC)
+
+    source = _generate_template_cell(op, use_h_prev=h_prev is not None, use_c_prev=c_prev is not None)
+    return _generate_kernel(op, source, uniform_injector, c_next)
+
+
+def _hidden_kernel(op: LSTM, t: int, h_prev: Optional[Variable], c_next: Variable, h_next: Variable) -> Kernel:
+    uniform_injector = UniformInjector()
+    _register_gate_inputs(uniform_injector, op, t, h_prev)
+    _register_output(uniform_injector, h_next, OrderNC)
+    _register_input(uniform_injector, "c_next", c_next, OrderNC)
+
+    source = _generate_template_hidden(op, use_h_prev=h_prev is not None)
+    return _generate_kernel(op, source, uniform_injector, h_next)
+
+
+def _gather_kernel(op: LSTM, xs: Sequence[Variable], y: Variable) -> Kernel:
+    uniform_injector = UniformInjector()
+    _register_output(uniform_injector, y, OrderNTC)
+
+    begin = 0
+    for i, x in enumerate(xs):
+        _register_input(uniform_injector, f"x{i}", x, OrderNTC)
+        uniform_injector.register({f"begin_{i}": begin})
+        begin += x.shape_dict[Axis.T] if Axis.T in x.order.axes else 1
+
+    source = _generate_template_gather(len(xs))
+    return _generate_kernel(op, source, uniform_injector, y)
+
+
+def _gather_kernels(op: LSTM, hs: Sequence[Variable], y: Variable) -> List[Kernel]:
+    kernels = []
+    xs = hs
+    levels = gather_lengths(len(hs))
+    for level, lengths in enumerate(levels):
+        ys = [y] if level == len(levels) - 1 else [op.inputs[f"workspace_y{level}_{i}"] for i in range(len(lengths))]
+        for i, y_next in enumerate(ys):
+            kernels.append(_gather_kernel(op, xs[i * MAX_GATHER_INPUTS:(i + 1) * MAX_GATHER_INPUTS], y_next))
+
+        xs = ys
+
+    return kernels
+
+
+def _listup_workspaces(op: LSTM, prefix: str, num: int = 2) -> Sequence[Variable]:
+    return [op.inputs[f"{prefix}{i}"] for i in range(num) if f"{prefix}{i}" in op.inputs]
+
+
+@WebGLDescriptorGenerator.register_handler(LSTM)
+def lstm(op: LSTM) -> List[Kernel]:
+    x = op.inputs["x"]
+    y = op.outputs["y"]
+    final_c = op.outputs["final_c"]
+    return_sequences = op.parameters["return_sequences"]
+
+    assert x.order.check_same_axes(OrderNTC)
+    assert y.order.check_same_axes(OrderNTC if return_sequences else OrderNC)
+    assert final_c.order.check_same_axes(OrderNC)
+
+    T = x.shape_dict[Axis.T]
+    workspaces_c = _listup_workspaces(op, "workspace_c")
+    workspaces_h = _listup_workspaces(op, "workspace_h", T if return_sequences else 2)
+
+    c_prev = op.inputs["initial_c"] if op.parameters["use_initial_c"] else None
+    h_prev = op.inputs["initial_h"] if op.parameters["use_initial_h"] else None
+
+    kernels = []
+    for t in range(T):
+        is_last = t == T - 1
+        c_next = final_c if is_last else workspaces_c[t % 2]
+        if return_sequences:
+            h_next = workspaces_h[t]
+
+        else:
+            h_next = y if is_last else workspaces_h[t % 2]
+
+        kernels.append(_cell_kernel(op, t, h_prev, c_prev, c_next))
+        kernels.append(_hidden_kernel(op, t, h_prev, c_next, h_next))
+
+        c_prev = c_next
+        h_prev = h_next
+
+    if return_sequences:
+        kernels += _gather_kernels(op, workspaces_h, y)
+
+    return kernels
@@ -19,6 +19,7 @@ class ConvertRtoRGBA(Elementwise):
         - **x0** - Input variable whose channel mode is R.
         - **y** - Output variable whose channel mode is RGBA.
     """
+    __slots__ = ()
 
     def __call__(self, x0: Variable):
         y, = super(ConvertRtoRGBA, self).__call__(x0)
@@ -19,6 +19,7 @@ class ConvertRGBAtoR(Elementwise):
         - **x0** - Input variable whose channel mode is RGBA.
         - **y** - Output variable whose channel mode is R.
     """
+    __slots__ = ()
 
     def __call__(self, x0: Variable):
         y, = super(ConvertRGBAtoR, self).__call__(x0)
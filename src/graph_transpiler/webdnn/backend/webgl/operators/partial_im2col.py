@@ -24,6 +24,7 @@ class PartialIm2Col(Operator):
         col1.order == OrderNHWC
         col1.shape == col2.shape == [1, 64, 32, 8*3*3]
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], ksize: IntOrTuple, stride: IntOrTuple, padding: IntOrTuple,
                  dilation_rate: IntOrTuple, sections: List[int], axis: Axis):
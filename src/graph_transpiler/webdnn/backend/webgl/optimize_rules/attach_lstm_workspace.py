@@ -0,0 +1,81 @@
+from typing import Tuple, List
+
+from webdnn.graph import traverse
+from webdnn.graph.attribute import Attribute
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.lstm import LSTM
+from webdnn.graph.optimize_rule import OptimizeRule
+from webdnn.graph.order import OrderNTC
+from webdnn.graph.variable import Variable
+
+# Maximum number of textures read by a gather kernel. WebGL guarantees at least 8 texture units for fragment shader.
+MAX_GATHER_INPUTS = 8
+
+
+def gather_lengths(T: int) -> List[List[int]]:
+    """gather_lengths(T)
+
+    Hidden states of all time steps are gathered into the output sequence :code:`MAX_GATHER_INPUTS` at a time, so the output sequence
+    is rendered in O(log T) passes instead of once per time step.
+
+    Args:
+        T (int): number of time steps
+
+    Returns:
+        (list of list of int) numbers of time steps of the sequences rendered in each gather level. The last level always contains only
+        one sequence, which is the output variable.
+    """
+    levels = []
+    lengths = [1] * T
+    while True:
+        lengths = [sum(lengths[i:i + MAX_GATHER_INPUTS]) for i in range(0, len(lengths), MAX_GATHER_INPUTS)]
+        levels.append(lengths)
+        if len(lengths) == 1:
+            return levels
+
+
+class LSTMWorkspaceAttached(Attribute):
+    """
+    Fragment shader cannot read the texture which it renders into. Therefore recurrent states are updated in ping-pong manner: states
+    of time step :code:`t` are rendered into the workspace :code:`t % 2`, and those of the last time step are rendered into the output
+    variables directly.
+
+    If :code:`return_sequences=True`, hidden state of each time step is rendered into its own workspace :code:`workspace_h{t}` instead,
+    and they are gathered into the output sequence at the end (see :func:`gather_lengths`). Sequences rendered in the intermediate
+    gather levels are stored in :code:`workspace_y{level}_{i}`.
+
+    Workspaces are attached as inputs named :code:`workspace_c{i}`, :code:`workspace_h{i}` and :code:`workspace_y{level}_{i}`.
+    """
+
+    def __init__(self, base: LSTM):
+        super(LSTMWorkspaceAttached, self).__init__(base)
+        y = base.outputs["y"]
+        final_c = base.outputs["final_c"]
+
+        T = base.inputs["x"].shape_dict[Axis.T]
+        return_sequences = base.parameters["return_sequences"]
+
+        for i in range(min(T - 1, 2)):
+            base.append_input(f"workspace_c{i}", final_c.copy())
+
+        for i in range(T if return_sequences else min(T - 1, 2)):
+            base.append_input(f"workspace_h{i}", final_c.copy())
+
+        if return_sequences:
+            N = y.shape_dict[Axis.N]
+            C2 = y.shape_dict[Axis.C]
+            for level, lengths in enumerate(gather_lengths(T)[:-1]):
+                for i, length in enumerate(lengths):
+                    base.append_input(f"workspace_y{level}_{i}", Variable((N, length, C2), OrderNTC))
+
+
+class AttachLSTMWorkspace(OptimizeRule):
+    def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
+        flag_changed = False
+        for lstm in traverse.filter_nodes(traverse.listup_operators(graph), LSTM):  # type: LSTM
+            if not lstm.has_attribute(LSTMWorkspaceAttached):
+                flag_changed = True
+                lstm.attributes.add(LSTMWorkspaceAttached(lstm))
+
+        return graph, flag_changed
@@ -1,4 +1,4 @@
-from typing import NamedTuple, List, Sequence, Tuple
+from typing import NamedTuple, List, Sequence, Tuple, Dict
 
 import numpy as np
 
@@ -12,7 +12,9 @@ from webdnn.graph.graph import Graph
 from webdnn.graph.operator import Operator
 from webdnn.graph.operators.attributes.tensorwise import Tensorwise
 from webdnn.graph.operators.concat import Concat
+from webdnn.graph.operators.embedding import Embedding
 from webdnn.graph.operators.im2col import Im2Col
+from webdnn.graph.operators.lstm import LSTM
 from webdnn.graph.operators.reshape import Reshape
 from webdnn.graph.operators.sgemm import Sgemm
 from webdnn.graph.operators.split_axis import SplitAxis
@@ -85,6 +87,12 @@ def _split_axis(v: Variable, axis: Axis, graph):
         elif isinstance(op, Sgemm):
             _split_sgemm(graph, op, v, [v1, v2], axis)
 
+        elif isinstance(op, Embedding):
+            _split_embedding(graph, op, v, [v1, v2], axis)
+
+        elif isinstance(op, LSTM):
+            _split_lstm(graph, op, v, [v1, v2], axis)
+
         elif Tensorwise.check_splittable(op, axis):
             _split_tensorwise(graph, op, v, [v1, v2], axis)
 
@@ -942,6 +950,98 @@ def _split_tensorwise(graph: Graph, op: Operator, v: Variable, v_pair: Sequence[
     op_0.exec()
     op_1.exec()
 
+    _merge_split_outputs(graph, ys, op_0, op_1, v, v_pair, axis)
+
+
+def _split_embedding(graph: Graph, op: Embedding, v: Variable, v_pair: Sequence[Variable], axis: Axis):
+    """
+    Axis.N of dictionary variable :code:`w` is the feature axis, which corresponds to Axis.C of output variable :code:`y`.
+
+        x(N, T) -+
+                 +-{Embedding}- y(N, T, C)
+        w(C, N) -+
+
+    - If :code:`x` or :code:`y` is split in Axis.N or Axis.T, the other one is also split in same axis, and :code:`w` is shared.
+    - If :code:`w` is split in Axis.N or :code:`y` is split in Axis.C, the other one is also split, and :code:`x` is shared.
+    """
+    s1 = v_pair[0].shape_dict[axis]
+    x = op.inputs["x"]
+    w = op.inputs["w"]
+    y = op.outputs["y"]
+    op.remove_all()
+
+    if v == x:
+        x_0, x_1 = v_pair
+        w_0 = w_1 = w
+        y_axis = axis
+
+    elif v == w:
+        x_0 = x_1 = x
+        w_0, w_1 = v_pair
+        y_axis = Axis.C
+
+    elif v == y:
+        if axis == Axis.C:
+            x_0 = x_1 = x
+            w_0, w_1 = SplitAxis(None, axis=Axis.N, sections=[s1])(w)
+
+        else:
+            x_0, x_1 = SplitAxis(None, axis=axis, sections=[s1])(x)
+            w_0 = w_1 = w
+
+        y_axis = axis
+
+    else:
+        raise UnexpectedAndPleaseReportError
+
+    op_0 = Embedding(None)
+    op_1 = Embedding(None)
+    op_0(x_0, w_0)
+    op_1(x_1, w_1)
+
+    _merge_split_outputs(graph, {"y": y}, op_0, op_1, v, v_pair, y_axis)
+
+
+def _split_lstm(graph: Graph, op: LSTM, v: Variable, v_pair: Sequence[Variable], axis: Axis):
+    """
+    LSTM can be split only in batch axis (Axis.N of :code:`x`, :code:`y` and states). Weights and bias are shared.
+
+    Workspaces attached by :class:`~webdnn.backend.webgl.optimize_rules.attach_lstm_workspace.AttachLSTMWorkspace` are not inherited. They
+    are attached to split operators again.
+    """
+    s1 = v_pair[0].shape_dict[axis]
+    xs = {key: x for key, x in op.inputs.items() if not key.startswith("workspace")}
+    ys = dict(op.outputs)
+    op.remove_all()
+
+    op_0 = LSTM(None, **op.parameters)
+    op_1 = LSTM(None, **op.parameters)
+
+    for key, x in xs.items():
+        if x == v:
+            x_0, x_1 = v_pair
+
+        elif key in ("w_input", "w_hidden", "b"):
+            x_0 = x_1 = x
+
+        else:
+            x_0, x_1 = SplitAxis(None, axis=axis, sections=[s1])(x)
+
+        op_0.append_input(key, x_0)
+        op_1.append_input(key, x_1)
+
+    op_0.exec()
+    op_1.exec()
+
+    _merge_split_outputs(graph, ys, op_0, op_1, v, v_pair, axis)
+
+
+def _merge_split_outputs(graph: Graph, ys: Dict[str, Variable], op_0: Operator, op_1: Operator, v: Variable, v_pair: Sequence[Variable],
+                         axis: Axis):
+    """
+    Replace original output variables :code:`ys` by outputs of split operators. If the output variable is the split target :code:`v`,
+    it is replaced by :code:`v_pair`. Otherwise, outputs of split operators are concatenated in :code:`axis`.
+    """
     for key in ys.keys():
         y = ys[key]
         if y == v:
@@ -1009,6 +1109,23 @@ def _listup_splittable_axis(v: Variable, op: Operator) -> List[Axis]:
         else:
             return list(v.order.axes)
 
+    elif isinstance(op, Embedding):
+        if v == op.inputs["x"]:
+            return [Axis.N, Axis.T]
+
+        elif v == op.inputs["w"]:
+            return [Axis.N]
+
+        else:
+            return [Axis.N, Axis.T, Axis.C]
+
+    elif isinstance(op, LSTM):
+        if v in (op.inputs["w_input"], op.inputs["w_hidden"], op.inputs.get("b", None)):
+            return []
+
+        else:
+            return [Axis.N]
+
     else:
         return list(attr.axis for attr in op.get_attribute(Tensorwise))
 
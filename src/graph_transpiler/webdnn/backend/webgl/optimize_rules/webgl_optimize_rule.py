@@ -1,4 +1,5 @@
 from webdnn.backend.webgl.optimize_rules.attach_concat_workspace import AttachConcatWorkspace
+from webdnn.backend.webgl.optimize_rules.attach_lstm_workspace import AttachLSTMWorkspace
 from webdnn.backend.webgl.optimize_rules.decompose_softmax import DecomposeSoftmax
 from webdnn.backend.webgl.optimize_rules.fix_sgemm_texture_shape import FixSGEMMTextureShape
 from webdnn.backend.webgl.optimize_rules.insert_channel_mode_conversion import InsertChannelModeConversion
@@ -40,6 +41,7 @@ class WebGLOptimizeRule(OptimizeRuleGroup):
                 FixSGEMMTextureShape(optimize_channel_mode=True),
             ]),
             AttachConcatWorkspace(),
+            AttachLSTMWorkspace(),
         ]
 
         if flags.DEBUG:
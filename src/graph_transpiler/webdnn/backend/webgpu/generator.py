@@ -12,17 +12,20 @@ from webdnn.backend.webgpu.optimize_rules.webgpu_optimize_rule import WebGPUOpti
 from webdnn.encoder.constant_encoder import ConstantEncoder
 from webdnn.graph import traverse
 from webdnn.graph.graph import Graph
-from webdnn.util import flags, console
+from webdnn.util import flags, console, profiler
 from webdnn.util.json import json
 
+# Alignment of buffer offsets in elements. 16 bytes alignment is required for float4 load and store.
+MEMORY_ALIGNMENT = 4
+
 
 class GraphExecutionData(IGraphExecutionData[Kernel]):
     descriptor: GraphDescriptor
 
-    def __init__(self, graph: Graph, descriptor: GraphDescriptor, constants: bytes):
+    def __init__(self, graph: Graph, descriptor: GraphDescriptor, constant_encoder: ConstantEncoder):
         self.graph = graph
         self.descriptor = descriptor
-        self.constants = constants
+        self.constant_encoder = constant_encoder
         self.backend_suffix = "webgpu"
 
     def save(self, dirname: str):
@@ -31,11 +34,18 @@ class GraphExecutionData(IGraphExecutionData[Kernel]):
         with open(path.join(dirname, "graph_{}.json".format(self.backend_suffix)), "w") as f:
             json.dump(self.descriptor, f, indent=2)
 
+        with open(path.join(dirname, "allocation_{}.json".format(self.backend_suffix)), "w") as f:
+            json.dump(self.descriptor.memory_layout.report, f, indent=2)
+
         with open(path.join(dirname, "kernels_{}.metal".format(self.backend_suffix)), "w") as f:
             f.write(self.descriptor.concat_kernel_sources())
 
+        # Constants are encoded when saved, and streamed into the file
         with open(path.join(dirname, "weight_{}.bin".format(self.backend_suffix)), "wb") as f:
-            f.write(self.constants)
+            with profiler.profile("encoder", self.constant_encoder.__class__.__name__):
+                constants_size = self.constant_encoder.encode_to(self.descriptor.memory_layout, f)
+
+        console.debug(f"[WebGPUDescriptorGenerator] constants encoded size: {constants_size}[B]")
 
 
 def validate_kernel_source(descriptor: GraphDescriptor):
@@ -90,15 +100,12 @@ class WebGPUDescriptorGenerator(DescriptorGenerator[Kernel, GraphExecutionData])
             with open("cg.dot", "w") as f:
                 f.write(traverse.dump_dot(graph))
 
-        memory_layout = allocate(graph)
+        memory_layout = allocate(graph, alignment=MEMORY_ALIGNMENT)
         console.debug(f"[WebGPUDescriptorGenerator] memory_layout total size: {memory_layout.total_size * 4}[B]")
         console.debug(f"[WebGPUDescriptorGenerator] memory_layout static size: {memory_layout.static_size * 4}[B]")
         console.debug(f"[WebGPUDescriptorGenerator] memory_layout dynamic size: {memory_layout.dynamic_size * 4}[B]")
 
         constant_encoder = ConstantEncoder.get_encoder(kwargs.get("constant_encoder_name", None))
-        constants_bytes = constant_encoder.encode(memory_layout)
-
-        console.debug(f"[WebGPUDescriptorGenerator] constants encoded size: {len(constants_bytes)}[B]")
 
         kernels = cls.generate_kernels(graph, memory_layout)
 
@@ -114,7 +121,7 @@ class WebGPUDescriptorGenerator(DescriptorGenerator[Kernel, GraphExecutionData])
         if flags.optimize.VALIDATE_GENERATED_SOURCE:
             validate_kernel_source(descriptor)
 
-        return GraphExecutionData(graph, descriptor, constants_bytes)
+        return GraphExecutionData(graph, descriptor, constant_encoder)
 
 
 def generate(graph: Graph, **kwargs):
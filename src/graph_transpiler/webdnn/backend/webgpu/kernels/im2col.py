@@ -10,12 +10,13 @@ from webdnn.graph.operators.im2col import Im2Col
 from webdnn.graph.order import OrderNHWC, OrderCNHW
 
 
-def generate_template_NHWC(SH, SW, DH, DW, C1):
+def generate_template_NHWC(SH, SW, DH, DW, C1, aligned):
     SH_EQUAL_1 = 1 if SH == 1 else 0
     SW_EQUAL_1 = 1 if SW == 1 else 0
     DH_EQUAL_1 = 1 if DH == 1 else 0
     DW_EQUAL_1 = 1 if DW == 1 else 0
     C1_DIVIDABLE_BY_4 = 1 if C1 % 4 == 0 else 0
+    ALIGNED = 1 if aligned else 0
 
     return f"""
 kernel void %%FUNC_NAME%%(device float * %%STATIC_BUFFER%%[[buffer(0)]],
@@ -29,9 +30,10 @@ kernel void %%FUNC_NAME%%(device float * %%STATIC_BUFFER%%[[buffer(0)]],
 #define DH_EQUAL_1 {DH_EQUAL_1}
 #define DW_EQUAL_1 {DW_EQUAL_1}
 #define C1_DIVIDABLE_BY_4 {C1_DIVIDABLE_BY_4}
+#define ALIGNED {ALIGNED}
 
 
-#if OPTIMIZE && C1_DIVIDABLE_BY_4
+#if OPTIMIZE && C1_DIVIDABLE_BY_4 && ALIGNED
     const device float4 *im4 = (const device float4 *)(%%LOAD_BUFFER(im2col_im)%%);
     device float4 *col4 = (device float4 *)(%%LOAD_BUFFER(im2col_col)%%);
     const int C1_4 = (%%LOAD_BUFFER(im2col_C1)%%) >> 2;
@@ -71,7 +73,7 @@ kernel void %%FUNC_NAME%%(device float * %%STATIC_BUFFER%%[[buffer(0)]],
     const int h1 = (index_group / W1P % H1P) - PH;
     const int  n = index_group / W1P / H1P;
 
-#if OPTIMIZE && C1_DIVIDABLE_BY_4
+#if OPTIMIZE && C1_DIVIDABLE_BY_4 && ALIGNED
     for (int c1_4 = index_thread; c1_4 < C1_4; c1_4 += 64) {{
         const float4 v4 = (h1 < 0 || h1 >= H1 || w1 < 0 || w1 >= W1) ? 0 : im4[((n * H1 + h1) * W1 + w1) * C1_4 + c1_4];
 #else
@@ -114,7 +116,7 @@ kernel void %%FUNC_NAME%%(device float * %%STATIC_BUFFER%%[[buffer(0)]],
 #endif
                 if (w2 < 0 || w2 >= W2) continue;
 
-#if OPTIMIZE && C1_DIVIDABLE_BY_4
+#if OPTIMIZE && C1_DIVIDABLE_BY_4 && ALIGNED
                 col4[((((n * H2 + h2) * W2 + w2) * KH + kh) * KW + kw) * C1_4 + c1_4] = v4;
 #else
                 col[((((n * H2 + h2) * W2 + w2) * KH + kh) * KW + kw) * C1 + c1] = v;
@@ -129,6 +131,7 @@ kernel void %%FUNC_NAME%%(device float * %%STATIC_BUFFER%%[[buffer(0)]],
 #undef DH_EQUAL_1
 #undef DW_EQUAL_1
 #undef C1_DIVIDABLE_BY_4
+#undef ALIGNED
 }}
 """
 
@@ -213,7 +216,9 @@ def im2col(op: Im2Col, memory_layout: MemoryLayout) -> List[Kernel]:
 
     name_injector = KernelNameInjector(op)
 
-    source = template_CNHW if col.order == OrderCNHW else generate_template_NHWC(op.SH, op.SW, op.DH, op.DW, C1)
+    # float4 access is used only when both buffers are aligned
+    aligned = memory_layout.is_aligned(im) and memory_layout.is_aligned(col)
+    source = template_CNHW if col.order == OrderCNHW else generate_template_NHWC(op.SH, op.SW, op.DH, op.DW, C1, aligned)
     source = buffer_injector.inject(source)
     source = name_injector.inject(source)
 
@@ -8,7 +8,7 @@ from webdnn.backend.webgpu.kernel import Kernel, GPUSize
 from webdnn.graph.operators.sgemm import Sgemm
 
 
-def generate_template_64(transpose_A, transpose_B, M, N, K):
+def generate_template_64(transpose_A, transpose_B, M, N, K, aligned_AB, aligned_C):
     return ("""
 kernel void %%FUNC_NAME%%(device float * %%STATIC_BUFFER%%[[buffer(0)]],
                           device float * %%DYNAMIC_BUFFER%%[[buffer(1)]],
@@ -21,6 +21,8 @@ kernel void %%FUNC_NAME%%(device float * %%STATIC_BUFFER%%[[buffer(0)]],
 #define M_DIVIDABLE_BY_64 %%M_DIVIDABLE_BY_64%%
 #define N_DIVIDABLE_BY_64 %%N_DIVIDABLE_BY_64%%
 #define K_DIVIDABLE_BY_8 %%K_DIVIDABLE_BY_8%%
+#define ALIGNED_AB %%ALIGNED_AB%%
+#define ALIGNED_C %%ALIGNED_C%%
 
 #if TRANSPOSE_A
     #define A_STRIDE_K 1
@@ -38,7 +40,7 @@ kernel void %%FUNC_NAME%%(device float * %%STATIC_BUFFER%%[[buffer(0)]],
     #define B_STRIDE_N K
 #endif
 
-#if K_DIVIDABLE_BY_8 && M_DIVIDABLE_BY_64  && N_DIVIDABLE_BY_64 && !TRANSPOSE_A && TRANSPOSE_B && OPTIMIZE
+#if K_DIVIDABLE_BY_8 && M_DIVIDABLE_BY_64  && N_DIVIDABLE_BY_64 && !TRANSPOSE_A && TRANSPOSE_B && ALIGNED_AB && OPTIMIZE
     const device float4 *load_target4 = (index & 32) 
         ? (const device float4 *)(%%LOAD_BUFFER(sgemm_B)%%) 
         : (const device float4 *)(%%LOAD_BUFFER(sgemm_A)%%);
@@ -85,7 +87,7 @@ kernel void %%FUNC_NAME%%(device float * %%STATIC_BUFFER%%[[buffer(0)]],
         {
 #if OPTIMIZE && K_DIVIDABLE_BY_8
     #if OPTIMIZE && M_DIVIDABLE_BY_64 && N_DIVIDABLE_BY_64
-        #if OPTIMIZE && !TRANSPOSE_A && TRANSPOSE_B
+        #if OPTIMIZE && !TRANSPOSE_A && TRANSPOSE_B && ALIGNED_AB
             shared4[shared_offset4 + 32 * 0] = load_target4[track0 >> 2];
             shared4[shared_offset4 + 32 * 2] = load_target4[track2 >> 2];
             shared4[shared_offset4 + 32 * 4] = load_target4[track4 >> 2];
@@ -304,7 +306,7 @@ kernel void %%FUNC_NAME%%(device float * %%STATIC_BUFFER%%[[buffer(0)]],
 
     {
     
-#if OPTIMIZE && N_DIVIDABLE_BY_64
+#if OPTIMIZE && N_DIVIDABLE_BY_64 && ALIGNED_C
         device float4 *C4 = (device float4 *)(%%LOAD_BUFFER(sgemm_C)%%);
         const int N4 = N >> 2;
         int m = group_position.x * 64 + m_offset * 8;
@@ -355,6 +357,8 @@ kernel void %%FUNC_NAME%%(device float * %%STATIC_BUFFER%%[[buffer(0)]],
 #undef M_DIVIDABLE_BY_64
 #undef N_DIVIDABLE_BY_64
 #undef K_DIVIDABLE_BY_8
+#undef ALIGNED_AB
+#undef ALIGNED_C
 #undef TRANSPOSE_A
 #undef TRANSPOSE_B
 #undef A_STRIDE_K
@@ -367,7 +371,9 @@ kernel void %%FUNC_NAME%%(device float * %%STATIC_BUFFER%%[[buffer(0)]],
         .replace("%%N_DIVIDABLE_BY_64%%", "1" if N % 64 == 0 else "0") \
         .replace("%%K_DIVIDABLE_BY_8%%", "1" if K % 8 == 0 else "0") \
         .replace("%%TRANSPOSE_A%%", "1" if transpose_A else "0") \
-        .replace("%%TRANSPOSE_B%%", "1" if transpose_B else "0")
+        .replace("%%TRANSPOSE_B%%", "1" if transpose_B else "0") \
+        .replace("%%ALIGNED_AB%%", "1" if aligned_AB else "0") \
+        .replace("%%ALIGNED_C%%", "1" if aligned_C else "0")
 
 
 @WebGPUDescriptorGenerator.register_handler(Sgemm)
@@ -391,7 +397,9 @@ def sgemm(op: Sgemm, memory_layout: MemoryLayout) -> List[Kernel]:
     # transpose_X assumes fortran-order data. True means X is C-order, False means Fortran-order.
     # In default convolution, transpose_A == transpose_B == True.
     # The order of output matrix C is C-order.
-    source = generate_template_64(op.transpose_A, op.transpose_B, op.M, op.N, op.K)
+    source = generate_template_64(op.transpose_A, op.transpose_B, op.M, op.N, op.K,
+                                  aligned_AB=memory_layout.is_aligned(A) and memory_layout.is_aligned(B),
+                                  aligned_C=memory_layout.is_aligned(C))
     source = buffer_injector.inject(source)
     source = name_injector.inject(source)
 
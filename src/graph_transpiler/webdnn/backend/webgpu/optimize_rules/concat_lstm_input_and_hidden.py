@@ -8,6 +8,7 @@ from webdnn.graph.axis import Axis
 from webdnn.graph.graph import Graph
 from webdnn.graph.operators.concat import Concat
 from webdnn.graph.operators.lstm import LSTM
+from webdnn.graph.operators.transpose import Transpose
 from webdnn.graph.optimize_rule import OptimizeRule
 from webdnn.graph.order import OrderCN, OrderNC
 from webdnn.graph.variable import Variable
@@ -37,6 +38,14 @@ class ConcatLSTMInputAndHidden(OptimizeRule):
         workspace:
             store the data of product of W_all and XH (=`v` in above equations)
 
+    If the input projection is already hoisted by :class:`~webdnn.optimizer.sub_rules.hoist_lstm_input_projection.HoistLSTMInputProjection`,
+    only `W' * h` is computed in LSTM kernel. In this case, W' is not concatenated, and following 2 inputs are appended:
+
+        hidden:
+            store the hidden state `h`
+
+        workspace:
+            store `v` in above equations
     """
 
     def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
@@ -47,6 +56,10 @@ class ConcatLSTMInputAndHidden(OptimizeRule):
             if lstm.has_attribute(LSTMOptimized):
                 continue
 
+            if "x_projected" in lstm.inputs:
+                flag_changed |= self._append_hidden_workspace(lstm)
+                continue
+
             x = lstm.inputs["x"]
             w_input = lstm.inputs["w_input"]
             w_hidden = lstm.inputs["w_hidden"]
@@ -77,3 +90,28 @@ class ConcatLSTMInputAndHidden(OptimizeRule):
             flag_changed = True
 
         return graph, flag_changed
+
+    @staticmethod
+    def _append_hidden_workspace(lstm: LSTM) -> bool:
+        if "workspace" in lstm.inputs:
+            return False
+
+        x_projected = lstm.inputs["x_projected"]
+        w_hidden = lstm.inputs["w_hidden"]
+        if isinstance(w_hidden, ConstantVariable):
+            w_hidden.change_order(OrderCN)
+
+        elif w_hidden.order != OrderCN:
+            w_hidden_t, = Transpose(None)(w_hidden)
+            w_hidden_t.change_order(OrderCN)
+            lstm.replace_input(w_hidden, w_hidden_t, with_assert=False)
+
+        N = x_projected.shape_dict[Axis.N]
+        C2 = lstm.inputs["w_hidden"].shape_dict[Axis.C]
+
+        hidden = Variable([C2, N], OrderCN)
+        workspace = Variable([N, 4 * C2], OrderNC)
+
+        lstm.append_input("hidden", hidden)
+        lstm.append_input("workspace", workspace)
+        return True
@@ -3,6 +3,7 @@ from webdnn.backend.webgpu.optimize_rules.insert_transpose import InsertTranspos
 from webdnn.graph.optimize_rule import OptimizeRuleGroup
 from webdnn.optimizer.sub_rules.constant_folding import ConstantFolding
 from webdnn.optimizer.sub_rules.elementwise_kernel_fusion import ElementwiseKernelFusion
+from webdnn.optimizer.sub_rules.hoist_lstm_input_projection import HoistLSTMInputProjection
 from webdnn.optimizer.sub_rules.merge_sgemm_and_elementwise_mul import MergeSgemmAndElementwiseMul
 from webdnn.optimizer.sub_rules.remove_no_effect_operator import RemoveNoEffectOperator
 from webdnn.optimizer.sub_rules.remove_redundant_operator import RemoveRedundantOperator
@@ -23,6 +24,7 @@ class WebGPUOptimizeRule(OptimizeRuleGroup):
                 ReplaceDeconvolutionByCol2Im(),
                 MergeSgemmAndElementwiseMul(),
                 ConstantFolding(),
+                HoistLSTMInputProjection(),
                 ReplaceLinearBySgemm(),
                 MergeSgemmAndElementwiseMul(),
                 ConstantFolding(),
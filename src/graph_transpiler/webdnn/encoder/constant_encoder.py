@@ -1,4 +1,9 @@
-from webdnn.backend.code_generator.allocator import MemoryLayout
+from typing import List, Tuple, BinaryIO, Iterator
+
+import numpy as np
+
+from webdnn.backend.code_generator.allocator import MemoryLayout, Allocation
+from webdnn.graph.variables.constant_variable import ConstantVariable
 
 
 class ConstantEncoder:
@@ -7,14 +12,111 @@ class ConstantEncoder:
     def encode(self, memory_layout: MemoryLayout) -> bytes:
         raise NotImplementedError()
 
+    def encode_to(self, memory_layout: MemoryLayout, f: BinaryIO) -> int:
+        """encode_to(memory_layout, f)
+
+        Encode constants and write them into the file. Encoders which can encode constants chunk by chunk override this method so that
+        whole encoded bytes are not created in memory.
+
+        Args:
+            memory_layout: memory layout
+            f: binary file object
+
+        Returns:
+            (int) written size in bytes
+        """
+        data = self.encode(memory_layout)
+        f.write(data)
+        return len(data)
+
+    def decode(self, data: bytes) -> np.ndarray:
+        """decode(data)
+
+        Inverse operation of :func:`encode`. It's used to execute generated descriptors in python.
+
+        Args:
+            data: encoded bytes
+
+        Returns:
+            (np.ndarray) decoded float32 array
+        """
+        raise NotImplementedError()
+
     @classmethod
     def get_encoder(cls, name: str = None) -> "ConstantEncoder":
         # FIXME
         from webdnn.encoder.constant_encoder_raw import ConstantEncoderRaw
         from webdnn.encoder.constant_encoder_eightbit import ConstantEncoderEightbit
+        from webdnn.encoder.constant_encoder_fp16 import ConstantEncoderFP16
+        from webdnn.encoder.constant_encoder_int8 import ConstantEncoderInt8Symmetric, ConstantEncoderInt8Asymmetric
+        from webdnn.encoder.constant_encoder_kmeans import ConstantEncoderKMeans
         if name is None or name == "raw":
             return ConstantEncoderRaw()
         elif name == "eightbit":
             return ConstantEncoderEightbit()
+        elif name == "fp16":
+            return ConstantEncoderFP16()
+        elif name == "int8_symmetric":
+            return ConstantEncoderInt8Symmetric()
+        elif name == "int8_asymmetric":
+            return ConstantEncoderInt8Asymmetric()
+        elif name == "kmeans":
+            return ConstantEncoderKMeans()
+        elif name.startswith("kmeans") and name[len("kmeans"):].isdigit():
+            return ConstantEncoderKMeans(bits=int(name[len("kmeans"):]))
         else:
             raise ValueError("Unknown encoder")
+
+
+def listup_constant_allocations(memory_layout: MemoryLayout) -> List[Tuple[ConstantVariable, Allocation]]:
+    """listup_constant_allocations(memory_layout)
+
+    List up constant variables and their allocations in order of offset.
+
+    Args:
+        memory_layout: memory layout
+
+    Returns:
+        (list of tuple of :class:`~webdnn.graph.variables.constant_variable.ConstantVariable` and
+        :class:`~webdnn.backend.code_generator.allocator.Allocation`) constant variables and allocations
+    """
+    pairs = [(v, a) for v, a in memory_layout.allocations.items() if isinstance(v, ConstantVariable)]
+    return sorted(pairs, key=lambda pair: pair[1].offset)
+
+
+def align4(size: int) -> int:
+    return (size + 3) // 4 * 4
+
+
+def write_array(buffer: bytearray, offset: int, array: np.ndarray) -> int:
+    """write_array(buffer, offset, array)
+
+    Copy the array into the buffer without creating intermediate bytes object.
+
+    Args:
+        buffer: destination buffer
+        offset: byte offset in the buffer
+        array: source array
+
+    Returns:
+        (int) byte offset next to written data
+    """
+    array = np.ascontiguousarray(array)
+    np.frombuffer(buffer, dtype=array.dtype, count=array.size, offset=offset)[:] = array.ravel()
+    return offset + array.nbytes
+
+
+def iter_chunks(array: np.ndarray, chunk_size: int = 2 ** 22) -> Iterator[np.ndarray]:
+    """iter_chunks(array, chunk_size=2 ** 22)
+
+    Iterate contiguous views of 1D array. When the array is :class:`numpy.memmap`, only the chunk being processed is loaded into memory.
+
+    Args:
+        array: source array
+        chunk_size: number of elements in each chunk
+
+    Returns:
+        (iterator of np.ndarray) chunks
+    """
+    for offset in range(0, array.size, chunk_size):
+        yield array[offset:offset + chunk_size]
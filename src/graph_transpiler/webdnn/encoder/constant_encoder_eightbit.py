@@ -1,13 +1,17 @@
 # algorithm, implementation is based on "8-Bit Approximations for Parallelism in Deep Learning" by Tim Dettmers
 # https://github.com/TimDettmers/clusterNet/blob/master/source/clusterKernels.cu
 
+import os
 import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Callable, Tuple
 
 import numpy as np
 
 from webdnn.backend.code_generator.allocator import Allocation, MemoryLayout
-from webdnn.encoder.constant_encoder import ConstantEncoder
+from webdnn.encoder.constant_encoder import ConstantEncoder, listup_constant_allocations
 from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util import flags
 
 tbl_floats = [2.750000021e-06, 7.249999726e-06, 1.875000089e-05, 3.624999954e-05, 5.874999624e-05, 8.624999464e-05,
               1.437500032e-04, 2.312500001e-04, 3.187500115e-04, 4.062500084e-04, 5.187499919e-04, 6.562499912e-04,
@@ -52,36 +56,98 @@ for i in range(127):
         thresholds.append(thres_high)
 threshold_array = np.array(thresholds, dtype=np.float32)
 
+decode_table = np.array([0.0] + tbl_floats + [1.0], dtype=np.float32)
+
 
 class ConstantEncoderEightbit(ConstantEncoder):
-    def __init__(self):
+    """ConstantEncoderEightbit(num_workers=None, chunk_size=2 ** 22)
+
+    Encode each allocation into 8bit symbols and compress it by zlib.
+
+    Allocations are encoded in parallel by thread pool (both `np.searchsorted` and `zlib.compress` release the GIL). Quantization of large
+    allocation is also split into chunks. Compression is not split because it changes the compressed stream. The output is same as serial
+    encoding.
+
+    Args:
+        num_workers: number of worker threads. If `None`, :code:`flags.ENCODER_NUM_WORKERS` is used. If it's also `0`, the number of CPUs
+            is used. `1` means serial encoding.
+        chunk_size: number of elements quantized in single task
+    """
+
+    def __init__(self, num_workers: Optional[int] = None, chunk_size: int = 2 ** 22):
         self.name = "eightbit"
 
+        if num_workers is None:
+            num_workers = flags.ENCODER_NUM_WORKERS
+
+        if num_workers <= 0:
+            num_workers = os.cpu_count() or 1
+
+        self.num_workers = num_workers
+        self.chunk_size = chunk_size
+
     def encode(self, memory_layout: MemoryLayout) -> bytes:
-        all_code = b""
-        for alloc in memory_layout.allocations.values():
-            if alloc.offset >= memory_layout.data.size:
-                continue
-
-            single_data = memory_layout.data[alloc.offset:alloc.offset + alloc.size]
-            all_code += self._single_encode(single_data, alloc)
-
-        return all_code
-
-    # noinspection PyMethodMayBeStatic
-    def _single_encode(self, single_data: np.ndarray, alloc: Allocation) -> bytes:
-        maxval = np.max(np.abs(single_data))
-        maxval = np.maximum(maxval, 1e-20)  # avoid zero division
-        abs_scaled_data = np.abs(single_data) / maxval
-        code = np.searchsorted(threshold_array, abs_scaled_data)
-        code += (single_data < 0.0).astype(np.int32) * 128
-        code_raw_bytes = code.astype(np.uint8).tobytes("C")
-        code_bytes = zlib.compress(code_raw_bytes, level=9)
-
-        out_data = b""
-        out_data += np.array([alloc.offset, len(code_bytes)], dtype=np.int32).tobytes()
-        out_data += np.array([maxval], dtype=np.float32).tobytes()
-        out_data += np.array([0], dtype=np.int32).tobytes()
-        out_data += code_bytes
-
-        return out_data
+        allocs = [alloc for _, alloc in listup_constant_allocations(memory_layout)]  # type: List[Allocation]
+
+        if self.num_workers == 1:
+            return b"".join(self._encode_allocations(memory_layout.data, allocs, map))
+
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            return b"".join(self._encode_allocations(memory_layout.data, allocs, executor.map))
+
+    def _encode_allocations(self, data: np.ndarray, allocs: List[Allocation], map_func: Callable) -> List[bytes]:
+        # 1. Quantize all allocations. Large allocation is split into chunks.
+        maxvals = []  # type: List[float]
+        codes = []  # type: List[np.ndarray]
+        tasks = []  # type: List[Tuple[np.ndarray, float, np.ndarray]]
+        for alloc in allocs:
+            single_data = data[alloc.offset:alloc.offset + alloc.size]
+            maxval = np.max(np.abs(single_data))
+            maxval = np.maximum(maxval, 1e-20)  # avoid zero division
+            code = np.empty(single_data.shape, dtype=np.uint8)
+
+            for begin in range(0, single_data.size, self.chunk_size):
+                end = begin + self.chunk_size
+                tasks.append((single_data[begin:end], maxval, code[begin:end]))
+
+            maxvals.append(maxval)
+            codes.append(code)
+
+        if len(tasks) > 0:
+            list(map_func(_quantize, *zip(*tasks)))
+
+        # 2. Compress each allocation. `map_func` returns results in same order as inputs.
+        return list(map_func(_compress, allocs, maxvals, codes))
+
+    def decode(self, data: bytes) -> np.ndarray:
+        blocks = []  # type: List[Tuple[int, np.ndarray]]
+        offset = 0
+        while offset < len(data):
+            dst_offset, body_size, _, _ = np.frombuffer(data, dtype=np.int32, count=4, offset=offset)
+            maxval = np.frombuffer(data, dtype=np.float32, count=1, offset=offset + 8)[0]
+            offset += 16
+
+            code = np.frombuffer(zlib.decompress(data[offset:offset + body_size]), dtype=np.uint8)
+            blocks.append((dst_offset, decode_table[code & 0x7F] * maxval * np.where(code < 128, 1.0, -1.0).astype(np.float32)))
+            offset += body_size
+
+        result = np.zeros((max([o + b.size for o, b in blocks], default=0),), dtype=np.float32)
+        for dst_offset, block in blocks:
+            result[dst_offset:dst_offset + block.size] = block
+
+        return result
+
+
+def _quantize(data: np.ndarray, maxval: float, out: np.ndarray):
+    code = np.searchsorted(threshold_array, np.abs(data) / maxval).astype(np.uint8)
+    code += (data < 0.0).astype(np.uint8) * 128
+    out[:] = code
+
+
+def _compress(alloc: Allocation, maxval: float, code: np.ndarray) -> bytes:
+    code_bytes = zlib.compress(code.data, level=9)
+
+    header = np.array([alloc.offset, len(code_bytes), 0, 0], dtype=np.int32)
+    header.view(np.float32)[2] = maxval
+
+    return header.tobytes() + code_bytes
@@ -0,0 +1,33 @@
+from typing import BinaryIO
+
+import numpy as np
+
+from webdnn.backend.code_generator.allocator import MemoryLayout
+from webdnn.encoder.constant_encoder import ConstantEncoder, iter_chunks
+
+_FP16_MAX = float(np.finfo(np.float16).max)
+
+
+def _to_fp16(data: np.ndarray) -> np.ndarray:
+    return np.clip(data, -_FP16_MAX, _FP16_MAX).astype(np.float16)
+
+
+class ConstantEncoderFP16(ConstantEncoder):
+    """
+    Encode constants as IEEE 754 half precision floats. Values out of the representable range are clipped.
+    """
+
+    def __init__(self):
+        self.name = "fp16"
+
+    def encode(self, memory_layout: MemoryLayout) -> bytes:
+        return _to_fp16(memory_layout.data).tobytes("C")
+
+    def encode_to(self, memory_layout: MemoryLayout, f: BinaryIO) -> int:
+        for chunk in iter_chunks(memory_layout.data):
+            f.write(memoryview(_to_fp16(chunk)))
+
+        return memory_layout.data.size * 2
+
+    def decode(self, data: bytes) -> np.ndarray:
+        return np.frombuffer(data, dtype=np.float16).astype(np.float32)
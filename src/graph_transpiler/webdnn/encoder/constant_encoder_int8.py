@@ -0,0 +1,118 @@
+import numpy as np
+
+from webdnn.backend.code_generator.allocator import MemoryLayout
+from webdnn.encoder.constant_encoder import ConstantEncoder, listup_constant_allocations, align4, write_array
+
+# Format (all values are little endian)
+#
+#   int32 total_size
+#   for each constant variable:
+#       int32 offset, int32 size, int32 num_channels, int32 reserved
+#       float32 scale[num_channels]
+#       float32 minimum[num_channels] (asymmetric only)
+#       int8 (symmetric) or uint8 (asymmetric) code[size]
+#       padding to 4 bytes alignment
+#
+# Channels are the first dimension of each constant variable.
+
+
+class ConstantEncoderInt8Base(ConstantEncoder):
+    asymmetric = False  # type: bool
+
+    def encode(self, memory_layout: MemoryLayout) -> bytes:
+        pairs = listup_constant_allocations(memory_layout)
+
+        total_byte_size = 4
+        for v, _ in pairs:
+            total_byte_size += self._block_byte_size(v.size, self._num_channels(v))
+
+        buffer = bytearray(total_byte_size)
+        offset = write_array(buffer, 0, np.array([memory_layout.data.size], dtype=np.int32))
+
+        for v, a in pairs:
+            num_channels = self._num_channels(v)
+            data = memory_layout.data[a.offset:a.offset + v.size].reshape(num_channels, -1)
+
+            block_end = offset + self._block_byte_size(v.size, num_channels)
+            offset = write_array(buffer, offset, np.array([a.offset, v.size, num_channels, 0], dtype=np.int32))
+            offset = self._encode_block(buffer, offset, data)
+            offset = block_end
+
+        return bytes(buffer)
+
+    def decode(self, data: bytes) -> np.ndarray:
+        result = np.zeros((np.frombuffer(data, dtype=np.int32, count=1)[0],), dtype=np.float32)
+        offset = 4
+        while offset < len(data):
+            dst_offset, size, num_channels, _ = np.frombuffer(data, dtype=np.int32, count=4, offset=offset)
+            offset += 16
+
+            scale = np.frombuffer(data, dtype=np.float32, count=num_channels, offset=offset)
+            offset += num_channels * 4
+
+            minimum = np.zeros_like(scale)
+            if self.asymmetric:
+                minimum = np.frombuffer(data, dtype=np.float32, count=num_channels, offset=offset)
+                offset += num_channels * 4
+
+            code = np.frombuffer(data, dtype=np.uint8 if self.asymmetric else np.int8, count=size, offset=offset)
+            offset += align4(size)
+
+            result[dst_offset:dst_offset + size] = (code.reshape(num_channels, -1) * scale[:, None] + minimum[:, None]).ravel()
+
+        return result
+
+    def _block_byte_size(self, size: int, num_channels: int) -> int:
+        return 16 + num_channels * 4 * (2 if self.asymmetric else 1) + align4(size)
+
+    # noinspection PyMethodMayBeStatic
+    def _num_channels(self, v) -> int:
+        return v.shape[0] if v.ndim > 0 and v.size > 0 else 1
+
+    def _encode_block(self, buffer: bytearray, offset: int, data: np.ndarray) -> int:
+        raise NotImplementedError
+
+
+class ConstantEncoderInt8Symmetric(ConstantEncoderInt8Base):
+    """
+    Per-channel symmetric linear quantization into int8. Each value is decoded as :code:`code * scale`.
+    """
+
+    def __init__(self):
+        self.name = "int8_symmetric"
+
+    def _encode_block(self, buffer: bytearray, offset: int, data: np.ndarray) -> int:
+        scale = np.max(np.abs(data), axis=1) / 127.0 if data.size > 0 else np.ones((data.shape[0],))
+        scale = np.maximum(scale, 1e-20)  # avoid zero division
+        code = np.clip(np.round(data / scale[:, None]), -127, 127).astype(np.int8)
+
+        offset = write_array(buffer, offset, scale.astype(np.float32))
+        offset = write_array(buffer, offset, code)
+        return offset
+
+
+class ConstantEncoderInt8Asymmetric(ConstantEncoderInt8Base):
+    """
+    Per-channel asymmetric linear quantization into uint8. Each value is decoded as :code:`code * scale + minimum`.
+    """
+    asymmetric = True
+
+    def __init__(self):
+        self.name = "int8_asymmetric"
+
+    def _encode_block(self, buffer: bytearray, offset: int, data: np.ndarray) -> int:
+        if data.size > 0:
+            minimum = np.min(data, axis=1)
+            scale = (np.max(data, axis=1) - minimum) / 255.0
+
+        else:
+            minimum = np.zeros((data.shape[0],))
+            scale = np.ones((data.shape[0],))
+
+        scale = np.where(scale > 0, scale, 1.0)  # avoid zero division
+        code = np.clip(np.round((data - minimum[:, None]) / scale[:, None]), 0, 255).astype(np.uint8)
+
+        offset = write_array(buffer, offset, scale.astype(np.float32))
+        offset = write_array(buffer, offset, minimum.astype(np.float32))
+        offset = write_array(buffer, offset, code)
+        return offset
@@ -0,0 +1,120 @@
+import numpy as np
+
+from webdnn.backend.code_generator.allocator import MemoryLayout
+from webdnn.encoder.constant_encoder import ConstantEncoder, listup_constant_allocations, align4, write_array
+
+# Format (all values are little endian)
+#
+#   int32 total_size
+#   for each constant variable:
+#       int32 offset, int32 size, int32 bits, int32 reserved
+#       float32 codebook[2 ** bits]
+#       uint8 packed_code[ceil(size * bits / 8)] (bit stream, MSB first)
+#       padding to 4 bytes alignment
+
+_PACK_CHUNK_SIZE = 1 << 20  # must be multiple of 8
+
+
+def kmeans_1d(data: np.ndarray, k: int, max_iteration: int = 20) -> np.ndarray:
+    """kmeans_1d(data, k, max_iteration=20)
+
+    Lloyd's algorithm for 1-dimensional data. Because clusters are contiguous ranges in sorted data, each iteration is computed by
+    binary search and prefix sums.
+
+    Time order: O(N log N) for sorting, and O(k log N) for each iteration.
+
+    Args:
+        data: 1-dimensional data
+        k: number of clusters
+        max_iteration: maximum number of iterations
+
+    Returns:
+        (np.ndarray) sorted centroids whose length is :code:`k`
+    """
+    if data.size == 0:
+        return np.zeros((k,))
+
+    sorted_data = np.sort(data.astype(np.float64))
+    prefix_sum = np.concatenate([[0.0], np.cumsum(sorted_data)])
+
+    centroids = np.percentile(sorted_data, np.linspace(0, 100, k))
+    for _ in range(max_iteration):
+        boundaries = np.concatenate([[0], np.searchsorted(sorted_data, (centroids[1:] + centroids[:-1]) / 2), [sorted_data.size]])
+        counts = boundaries[1:] - boundaries[:-1]
+        sums = prefix_sum[boundaries[1:]] - prefix_sum[boundaries[:-1]]
+
+        # Keep centroids of empty clusters
+        new_centroids = np.where(counts > 0, sums / np.maximum(counts, 1), centroids)
+        if np.all(new_centroids == centroids):
+            break
+
+        centroids = new_centroids
+
+    return centroids
+
+
+class ConstantEncoderKMeans(ConstantEncoder):
+    """
+    Encode each constant variable into indices of k-means codebook with :code:`2 ** bits` entries.
+    """
+
+    def __init__(self, bits: int = 4):
+        if not 1 <= bits <= 8:
+            raise ValueError(f"bits must be in range [1, 8]: bits={bits}")
+
+        self.name = "kmeans"
+        self.bits = bits
+
+    def encode(self, memory_layout: MemoryLayout) -> bytes:
+        pairs = listup_constant_allocations(memory_layout)
+
+        total_byte_size = 4
+        for v, _ in pairs:
+            total_byte_size += self._block_byte_size(v.size)
+
+        buffer = bytearray(total_byte_size)
+        offset = write_array(buffer, 0, np.array([memory_layout.data.size], dtype=np.int32))
+
+        for v, a in pairs:
+            data = memory_layout.data[a.offset:a.offset + v.size]
+
+            block_end = offset + self._block_byte_size(v.size)
+            offset = write_array(buffer, offset, np.array([a.offset, v.size, self.bits, 0], dtype=np.int32))
+            offset = self._encode_block(buffer, offset, data)
+            offset = block_end
+
+        return bytes(buffer)
+
+    def decode(self, data: bytes) -> np.ndarray:
+        result = np.zeros((np.frombuffer(data, dtype=np.int32, count=1)[0],), dtype=np.float32)
+        offset = 4
+        while offset < len(data):
+            dst_offset, size, bits, _ = np.frombuffer(data, dtype=np.int32, count=4, offset=offset)
+            offset += 16
+
+            codebook = np.frombuffer(data, dtype=np.float32, count=2 ** bits, offset=offset)
+            offset += 2 ** bits * 4
+
+            packed_size = (size * bits + 7) // 8
+            code_bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8, count=packed_size, offset=offset))[:size * bits]
+            code = np.packbits(np.pad(code_bits.reshape(size, bits), ((0, 0), (8 - bits, 0)), "constant"), axis=1).ravel()
+            offset += align4(packed_size)
+
+            result[dst_offset:dst_offset + size] = codebook[code]
+
+        return result
+
+    def _block_byte_size(self, size: int) -> int:
+        return 16 + (2 ** self.bits) * 4 + align4((size * self.bits + 7) // 8)
+
+    def _encode_block(self, buffer: bytearray, offset: int, data: np.ndarray) -> int:
+        centroids = kmeans_1d(data, 2 ** self.bits)
+        offset = write_array(buffer, offset, centroids.astype(np.float32))
+
+        thresholds = (centroids[1:] + centroids[:-1]) / 2
+        for begin in range(0, data.size, _PACK_CHUNK_SIZE):
+            code = np.searchsorted(thresholds, data[begin:begin + _PACK_CHUNK_SIZE]).astype(np.uint8)
+            bits = np.unpackbits(code[:, None], axis=1)[:, 8 - self.bits:]
+            offset = write_array(buffer, offset, np.packbits(bits.ravel()))
+
+        return offset
@@ -1,5 +1,9 @@
+from typing import BinaryIO
+
+import numpy as np
+
 from webdnn.backend.code_generator.allocator import MemoryLayout
-from webdnn.encoder.constant_encoder import ConstantEncoder
+from webdnn.encoder.constant_encoder import ConstantEncoder, iter_chunks
 
 
 class ConstantEncoderRaw(ConstantEncoder):
@@ -8,3 +12,12 @@ class ConstantEncoderRaw(ConstantEncoder):
 
     def encode(self, memory_layout: MemoryLayout) -> bytes:
         return memory_layout.data.tobytes("C")
+
+    def encode_to(self, memory_layout: MemoryLayout, f: BinaryIO) -> int:
+        for chunk in iter_chunks(memory_layout.data):
+            f.write(memoryview(np.ascontiguousarray(chunk)))
+
+        return memory_layout.data.nbytes
+
+    def decode(self, data: bytes) -> np.ndarray:
+        return np.frombuffer(data, dtype=np.float32).copy()
@@ -82,6 +82,7 @@ class AxisVar(InferenceVar[Axis]):
     def __repr__(self):
         return self.name
 
+    # name is changed by unification, so AxisVar cannot have stable hash. AxisKeyDict looks up it by linear search.
     __hash__ = None
 
 
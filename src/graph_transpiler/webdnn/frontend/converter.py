@@ -5,7 +5,7 @@ from typing import Callable, Dict, TypeVar, Generic
 from webdnn.graph.graph import Graph
 from webdnn.graph.operator import Operator
 from webdnn.graph.variable import Variable
-from webdnn.util import console
+from webdnn.util import console, profiler
 
 T_OP = TypeVar('T_OP')
 
@@ -105,6 +105,7 @@ class Converter(Generic[T_OP]):
         if operator_key not in self._handler_map[self.__class__.__name__].keys():
             raise NotImplementedError(f"Operator '{operator_key}' is not handled any converter handlers.")
 
-        self._handler_map[self.__class__.__name__][operator_key](self, operator)
+        with profiler.profile("frontend_handler", f"{self.__class__.__name__}.{operator_key}"):
+            self._handler_map[self.__class__.__name__][operator_key](self, operator)
 
         return None
@@ -1,6 +1,8 @@
-from typing import Generic, TypeVar, List, Iterable, Tuple
+from typing import Generic, TypeVar, List, Iterable, Tuple, Dict
+from weakref import WeakValueDictionary
 
 _i = 0
+_interned = WeakValueDictionary()  # type: WeakValueDictionary[str, Axis]
 
 
 def _unique():
@@ -12,6 +14,8 @@ def _unique():
 class Axis:
     """
     Enum class for representing semantics of each dimension of variables.
+
+    Axes are interned by name, so :code:`Axis("C") is Axis.C`, and axes can be used as keys of dict and set.
     """
     N = None  # type: "Axis"
     C = None  # type: "Axis"
@@ -19,10 +23,20 @@ class Axis:
     W = None  # type: "Axis"
     T = None  # type: "Axis"
 
-    def __init__(self, name):
+    def __new__(cls, name=None):
         if name is None:
             name = _unique()
-        self._name = name
+
+        axis = _interned.get(name, None)
+        if axis is None:
+            axis = super().__new__(cls)
+            axis._name = name
+            _interned[name] = axis
+
+        return axis
+
+    def __reduce__(self):
+        return Axis, (self._name,)
 
     @property
     def name(self):
@@ -35,6 +49,10 @@ class Axis:
         return self.name
 
     def __eq__(self, other):
+        if other is self:
+            return True
+
+        # compared by name, to be equal to unified AxisVar (see webdnn.frontend.constraints)
         # noinspection PyBroadException
         try:
             return other.name == self.name
@@ -42,37 +60,78 @@ class Axis:
         except Exception:
             return False
 
-    __hash__ = None
+    def __hash__(self):
+        return hash(self._name)
 
 
 T = TypeVar('T')
 
 
 class AxisKeyDict(Generic[T]):
+    """AxisKeyDict(keys=None, vals=None)
+
+    Ordered dictionary whose keys are axes.
+
+    Keys are looked up by hash. :class:`~webdnn.frontend.constraints.AxisVar` is not hashable because its name is changed by
+    unification, so lookup with it, and any lookup in the dictionary which contains it, falls back to linear search.
+    """
+
     def __init__(self, keys: Iterable[Axis] = None, vals: Iterable[T] = None):
-        self._keys = list(keys if keys else [])  # type: List[Axis]
-        self._vals = list(vals if vals else [])  # type: List[T]
+        self._keys = []  # type: List[Axis]
+        self._vals = []  # type: List[T]
+        self._index = {}  # type: Dict[Axis, int]
+        self._num_unhashable_keys = 0
+
+        if keys:
+            for key, val in zip(keys, vals):
+                self[key] = val
+
+    def _find(self, key: Axis) -> int:
+        if self._num_unhashable_keys == 0 and isinstance(key, Axis):
+            return self._index.get(key, -1)
+
+        for i, k in enumerate(self._keys):
+            if k == key:
+                return i
+
+        return -1
 
     def __contains__(self, item: Axis) -> bool:
-        return item in self._keys
+        return self._find(item) >= 0
 
     def __getitem__(self, item: Axis) -> T:
-        index = self._keys.index(item)
+        index = self._find(item)
+        if index < 0:
+            raise KeyError(item)
+
         return self._vals[index]
 
     def __setitem__(self, key: Axis, value: T):
-        if key in self:
-            index = self._keys.index(key)
+        index = self._find(key)
+        if index >= 0:
             self._vals[index] = value
+            return
+
+        if isinstance(key, Axis):
+            self._index[key] = len(self._keys)
 
         else:
-            self._keys.append(key)
-            self._vals.append(value)
+            self._num_unhashable_keys += 1
+
+        self._keys.append(key)
+        self._vals.append(value)
 
     def __delitem__(self, key: Axis):
-        index = self._keys.index(key)
+        index = self._find(key)
+        if index < 0:
+            raise KeyError(key)
+
+        if not isinstance(self._keys[index], Axis):
+            self._num_unhashable_keys -= 1
+
         self._keys.pop(index)
         self._vals.pop(index)
+        self._index = {k: i for i, k in enumerate(self._keys) if isinstance(k, Axis)}
 
     def __len__(self) -> int:
         return len(self._keys)
@@ -81,7 +140,8 @@ class AxisKeyDict(Generic[T]):
         return self.keys()
 
     def get(self, k: Axis, default: T) -> T:
-        return self[k] if k in self else default
+        index = self._find(k)
+        return default if index < 0 else self._vals[index]
 
     def keys(self) -> Iterable[Axis]:
         return self._keys.__iter__()
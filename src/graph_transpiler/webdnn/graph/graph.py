@@ -1,6 +1,10 @@
-from typing import Iterable
+import copy
+import weakref
+from typing import Iterable, Dict, Any, List, Set
 
+from webdnn.graph.node import Node
 from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
 
 WEBDNN_LICENSE = "(C) Machine Intelligence Laboratory (The University of Tokyo), MIT License"
 
@@ -21,6 +25,122 @@ class Graph:
         self.inputs = list(inputs)
         self.outputs = list(outputs)
         self.licenses = {"webdnn": WEBDNN_LICENSE}
+        self._version = 0
+        self._cache = {}  # type: Dict[Any, Any]
+        self._cache_key = None
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_cache"] = {}
+        state["_cache_key"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    @property
+    def version(self) -> int:
+        """
+        Counter which is incremented whenever nodes adopted by this graph are modified. See :meth:`adopt_nodes`.
+        """
+        return self._version
+
+    @property
+    def cache(self) -> Dict[Any, Any]:
+        """
+        Storage for values derived from the graph structure (ex. topological order of nodes). It is cleared automatically when any node
+        adopted by this graph or :attr:`inputs` / :attr:`outputs` are modified.
+
+        Values which are computed from nodes must be cached only after the nodes are adopted by :meth:`adopt_nodes`.
+        """
+        key = (self._version, tuple(self.inputs), tuple(self.outputs))
+        if self._cache_key != key:
+            self._cache = {}
+            self._cache_key = key
+
+        return self._cache
+
+    def adopt_nodes(self, nodes: Iterable[Node]):
+        """adopt_nodes(nodes)
+
+        Make this graph the owner of the nodes. Modification of owned nodes is notified to this graph by :meth:`notify_modified`, and
+        modification of other graphs' nodes does not affect the cache of this graph.
+
+        Each node has only one owner. When a node is adopted from other graph (ex. sub graph which shares nodes), the previous owner is
+        notified, because modification of the node will not be notified to it anymore.
+
+        Args:
+            nodes (iterable of :class:`~webdnn.graph.node.Node`): nodes
+        """
+        ref = weakref.ref(self)
+        for node in nodes:
+            if node._graph is ref:
+                continue
+
+            owner = node.owner_graph
+            if owner is not None:
+                owner.notify_modified()
+
+            node._graph = ref
+
+    def notify_modified(self):
+        """notify_modified()
+
+        Notify that nodes in this graph are modified. :attr:`cache` is cleared.
+        """
+        self._version += 1
+
+    def clone(self) -> "Graph":
+        """clone()
+
+        Create a copy of this graph. Unlike :func:`copy.deepcopy`, nodes are copied without recursion, and therefore this function works
+        with very deep graph.
+
+        Data of :class:`~webdnn.graph.variables.constant_variable.ConstantVariable` is not copied. The cloned variable refers the same
+        array as a read-only view. Because optimize rules replace the data instead of modifying in place, the array is shared until
+        either of the variables is modified.
+
+        Other objects referred from nodes (parameters, attributes, placeholders, etc.) are deep-copied. Objects shared among nodes are
+        also shared among cloned nodes.
+
+        Returns:
+            (:class:`~webdnn.Graph`) the cloned graph
+        """
+        nodes = []  # type: List[Node]
+        stack = list(self.inputs) + list(self.outputs)  # type: List[Node]
+        found = set(stack)  # type: Set[Node]
+        while len(stack) > 0:
+            node = stack.pop()
+            nodes.append(node)
+
+            for linked_node in node.prevs + node.nexts:
+                if linked_node not in found:
+                    found.add(linked_node)
+                    stack.append(linked_node)
+
+        # `memo` is the identity map used by `copy.deepcopy`. Because all nodes are registered in advance, `copy.deepcopy` does not
+        # recurse into linked nodes.
+        memo = {}  # type: Dict[int, Any]
+        for node in nodes:
+            memo[id(node)] = node.__class__.__new__(node.__class__)
+
+        for node in nodes:
+            new_node = memo[id(node)]
+            state = node.__getstate__()
+
+            if isinstance(node, ConstantVariable):
+                data = state.pop("data").view()
+                data.flags.writeable = False
+
+                new_node.__setstate__(copy.deepcopy(state, memo))
+                new_node.data = data
+
+            else:
+                new_node.__setstate__(copy.deepcopy(state, memo))
+
+        new_graph = self.__class__.__new__(self.__class__)
+        new_graph.__setstate__(copy.deepcopy(self.__getstate__(), memo))
+        return new_graph
 
     def __repr__(self):
         return f"""<{self.__class__.__name__} inputs={self.inputs}, outputs={self.outputs}>"""
@@ -1,8 +1,143 @@
-from typing import Dict, Set, Type, Optional, List, TypeVar
+import weakref
+from typing import Dict, Type, Optional, List, TypeVar, Callable, Iterator, Tuple
 
 from webdnn.graph import attribute
 
 _node_serial_counter_dict: Dict[Type["Node"], int] = {}
+_modification_listeners: List[Callable[["Node"], None]] = []
+
+
+def add_modification_listener(listener: Callable[["Node"], None]):
+    """add_modification_listener(listener)
+
+    Register the function which is called with the node when the node is modified (connection, parameters and attributes).
+
+    Args:
+        listener: the function
+    """
+    _modification_listeners.append(listener)
+
+
+def remove_modification_listener(listener: Callable[["Node"], None]):
+    """remove_modification_listener(listener)
+
+    Unregister the function registered by :func:`add_modification_listener`.
+
+    Args:
+        listener: the function
+    """
+    _modification_listeners.remove(listener)
+
+
+_TAttr = TypeVar("T", bound="attribute.Attribute")
+
+
+class _ParameterDict(dict):
+    """
+    Dictionary of node parameters which notifies the modification to the node by :meth:`Node.notify_modified`. Therefore
+    parameter-only rewrites are also recorded by modification listeners.
+    """
+    __slots__ = ("_node",)
+
+    def __init__(self, node: "Node", *args, **kwargs):
+        super(_ParameterDict, self).__init__(*args, **kwargs)
+        self._node = node
+
+    def __reduce__(self):
+        # Copied or pickled parameters are not bound to the node
+        return dict, (dict(self),)
+
+
+def _notify_parameter_modified(name: str):
+    method = getattr(dict, name)
+
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._node.notify_modified()
+        return result
+
+    return wrapper
+
+
+for _name in ["__setitem__", "__delitem__", "clear", "pop", "popitem", "setdefault", "update"]:
+    setattr(_ParameterDict, _name, _notify_parameter_modified(_name))
+
+
+class _AttributeSet:
+    """
+    Insertion-ordered set of attributes which notifies the modification to the node by :meth:`Node.notify_modified`.
+
+    Attributes are also indexed by the queried type, so :meth:`Node.get_attribute` does not scan all attributes every time.
+    """
+    __slots__ = ("_node", "_items", "_index")
+
+    def __init__(self, node: "Node"):
+        self._node = node
+        self._items = []  # type: List["attribute.Attribute"]
+        self._index = None  # type: Optional[Dict[Type["attribute.Attribute"], List["attribute.Attribute"]]]
+
+    def add(self, element: "attribute.Attribute"):
+        if element not in self._items:
+            self._items.append(element)
+            self._index = None
+
+        self._node.notify_modified()
+
+    def remove(self, element: "attribute.Attribute"):
+        if element not in self._items:
+            raise KeyError(element)
+
+        self.discard(element)
+
+    def discard(self, element: "attribute.Attribute"):
+        if element in self._items:
+            self._items.remove(element)
+            self._index = None
+
+        self._node.notify_modified()
+
+    def of_type(self, Attr: Type[_TAttr]) -> List[_TAttr]:
+        """
+        Returns the cached list of attributes which are instance of :code:`Attr`. The list must not be modified.
+        """
+        if self._index is None:
+            self._index = {}
+
+        attrs = self._index.get(Attr, None)
+        if attrs is None:
+            attrs = self._index[Attr] = [attr for attr in self._items if isinstance(attr, Attr)]
+
+        return attrs
+
+    def __contains__(self, element: "attribute.Attribute") -> bool:
+        return element in self._items
+
+    def __iter__(self) -> Iterator["attribute.Attribute"]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getstate__(self):
+        return self._items
+
+    def __setstate__(self, state):
+        # The node is restored by Node.__setstate__
+        self._node = None
+        self._items = state
+        self._index = None
+
+
+_slot_names_dict = {}  # type: Dict[Type["Node"], Tuple[str, ...]]
+
+
+def _slot_names(klass: Type["Node"]) -> Tuple[str, ...]:
+    names = _slot_names_dict.get(klass, None)
+    if names is None:
+        names = tuple(name for k in reversed(klass.__mro__) for name in k.__dict__.get("__slots__", ()))
+        _slot_names_dict[klass] = names
+
+    return names
 
 
 def _generate_name(node: "Node"):
@@ -15,30 +150,78 @@ def _generate_name(node: "Node"):
     return name
 
 
-_TAttr = TypeVar("T", bound="attribute.Attribute")
-
-
 class Node:
     """
     Basic graph node class.
+
+    Nodes are slotted to reduce memory usage of large graphs. :code:`prevs` and :code:`nexts` are lists ordered by connected time, so
+    traversal order of the graph does not depend on memory address.
+
+    Each node refers the graph which listed it up last (the owner graph) weakly, and notifies its modification to the owner graph by
+    :meth:`Graph.notify_modified<webdnn.Graph.notify_modified>`. See :meth:`Graph.adopt_nodes<webdnn.Graph.adopt_nodes>`.
     """
+    __slots__ = ("parameters", "attributes", "_name", "prevs", "nexts", "_graph")
 
     def __init__(self, name: Optional[str] = None):
+        self._graph = None  # type: Optional[weakref.ReferenceType]
         if name is None:
             name = _generate_name(self)
-        self.parameters = {}  # type: Dict[str, any]
-        self.attributes = set()  # type: Set["attribute.Attribute"]
+        self.parameters = _ParameterDict(self)  # type: Dict[str, any]
+        self.attributes = _AttributeSet(self)  # type: _AttributeSet
         self.name = name
-        self.prevs = set()  # type: Set["Node"]
-        self.nexts = set()  # type: Set["Node"]
+        self.prevs = []  # type: List["Node"]
+        self.nexts = []  # type: List["Node"]
+
+    def __getstate__(self):
+        state = {name: getattr(self, name) for name in _slot_names(self.__class__) if hasattr(self, name)}
+        if hasattr(self, "__dict__"):
+            state.update(self.__dict__)
+
+        state["parameters"] = dict(self.parameters)
+
+        # The owner graph is not copied. Copied node is adopted by the graph which lists it up.
+        state.pop("_graph", None)
+        return state
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            object.__setattr__(self, key, value)
+
+        self._graph = None
+        self.parameters = _ParameterDict(self, self.parameters)
+        self.attributes._node = self
+
+    @property
+    def owner_graph(self):
+        """(:class:`~webdnn.Graph` or :code:`None`) the graph which owns this node, or :code:`None` if this node is not adopted by any
+        living graph"""
+        return None if self._graph is None else self._graph()
+
+    @property
+    def name(self) -> str:
+        """name of this node"""
+        return self._name
+
+    @name.setter
+    def name(self, name: str):
+        self._name = name
+        self._notify_owner_graph()
 
     def append_prev(self, prev: "Node"):
-        prev.nexts.add(self)
-        self.prevs.add(prev)
+        if self not in prev.nexts:
+            prev.nexts.append(self)
+
+        if prev not in self.prevs:
+            self.prevs.append(prev)
+
+        self.notify_modified()
+        prev.notify_modified()
 
     def remove_prev(self, prev: "Node"):
         prev.nexts.remove(self)
         self.prevs.remove(prev)
+        self.notify_modified()
+        prev.notify_modified()
 
     def append_next(self, next: "Node"):
         next.append_prev(self)
@@ -46,6 +229,24 @@ class Node:
     def remove_next(self, next: "Node"):
         next.remove_prev(self)
 
+    def notify_modified(self):
+        """notify_modified()
+
+        Notify that this node is modified to listeners registered by :func:`add_modification_listener`. Modification of connection,
+        :attr:`parameters` and :attr:`attributes` is notified automatically.
+
+        The owner graph is also notified, and its :attr:`cache<webdnn.Graph.cache>` is cleared.
+        """
+        self._notify_owner_graph()
+
+        for listener in _modification_listeners:
+            listener(self)
+
+    def _notify_owner_graph(self):
+        owner = self.owner_graph
+        if owner is not None:
+            owner.notify_modified()
+
     def __repr__(self):
         return f"<{self.__class__.__name__}>"
 
@@ -53,7 +254,7 @@ class Node:
         return self.__repr__()
 
     def get_attribute(self, Attr: Type[_TAttr]) -> List[_TAttr]:
-        return [attr for attr in self.attributes if isinstance(attr, Attr)]
+        return list(self.attributes.of_type(Attr))
 
     def has_attribute(self, Attr: Type["attribute.Attribute"]) -> bool:
-        return len(self.get_attribute(Attr)) > 0
+        return len(self.attributes.of_type(Attr)) > 0
@@ -0,0 +1,515 @@
+"""
+Reference implementation of IR operators by NumPy.
+
+This module computes operators on CPU without any backend. It's used to fold constant sub-graphs in compile time, and to compute
+numerically expected results of whole graph.
+"""
+
+from typing import Callable, Dict, List, Sequence, Type, Union
+
+import numpy as np
+
+from webdnn.graph import traverse
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.operator import Operator
+from webdnn.graph.operators.abs import Abs
+from webdnn.graph.operators.average_pooling_2d import AveragePooling2D
+from webdnn.graph.operators.broadcast import Broadcast
+from webdnn.graph.operators.clipped_relu import ClippedRelu
+from webdnn.graph.operators.col2im import Col2Im
+from webdnn.graph.operators.concat import Concat
+from webdnn.graph.operators.convolution2d import Convolution2D
+from webdnn.graph.operators.deconvolution2d import Deconvolution2D
+from webdnn.graph.operators.depth2space import Depth2Space
+from webdnn.graph.operators.elementwise_add import ElementwiseAdd
+from webdnn.graph.operators.elementwise_div import ElementwiseDiv
+from webdnn.graph.operators.elementwise_mul import ElementwiseMul
+from webdnn.graph.operators.elementwise_pow import ElementwisePow
+from webdnn.graph.operators.elu import Elu
+from webdnn.graph.operators.embedding import Embedding
+from webdnn.graph.operators.exp import Exp
+from webdnn.graph.operators.fused_elementwise import FusedElementwise
+from webdnn.graph.operators.hard_sigmoid import HardSigmoid
+from webdnn.graph.operators.im2col import Im2Col
+from webdnn.graph.operators.leaky_relu import LeakyRelu
+from webdnn.graph.operators.linear import Linear
+from webdnn.graph.operators.local_response_normalization import LocalResponseNormalization
+from webdnn.graph.operators.lstm import LSTM
+from webdnn.graph.operators.max import Max
+from webdnn.graph.operators.max_pooling_2d import MaxPooling2D
+from webdnn.graph.operators.min import Min
+from webdnn.graph.operators.reinterpret_axis import ReinterpretAxis
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.operators.reshape import Reshape
+from webdnn.graph.operators.rsqrt import Rsqrt
+from webdnn.graph.operators.scalar_add import ScalarAdd
+from webdnn.graph.operators.scalar_affine import ScalarAffine
+from webdnn.graph.operators.scalar_mul import ScalarMul
+from webdnn.graph.operators.scalar_pow import ScalarPow
+from webdnn.graph.operators.sgemm import Sgemm
+from webdnn.graph.operators.sigmoid import Sigmoid
+from webdnn.graph.operators.softmax import Softmax
+from webdnn.graph.operators.softplus import Softplus
+from webdnn.graph.operators.softsign import Softsign
+from webdnn.graph.operators.space2depth import Space2Depth
+from webdnn.graph.operators.split_axis import SplitAxis
+from webdnn.graph.operators.sum import Sum
+from webdnn.graph.operators.tanh import Tanh
+from webdnn.graph.operators.threshold_relu import ThresholdRelu
+from webdnn.graph.operators.transpose import Transpose
+from webdnn.graph.operators.zero_padding_1d import ZeroPadding1D
+from webdnn.graph.operators.zero_padding_2d import ZeroPadding2D
+from webdnn.graph.order import Order, OrderNHWC, OrderNTC, OrderNC, OrderCN, OrderNT
+from webdnn.graph.placeholder import Placeholder
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+ArrayDict = Dict[str, np.ndarray]
+Handler = Callable[[Operator, ArrayDict], ArrayDict]
+
+_handlers = {}  # type: Dict[Type[Operator], Handler]
+
+
+def register_handler(*OperatorClasses: Type[Operator]):
+    """register_handler(*OperatorClasses)
+
+    Decorator to register the NumPy implementation of operators. The handler receives the operator and input arrays (in the order of each
+    input variable), and returns output arrays in the order of each output variable.
+    """
+
+    def decorator(handler: Handler):
+        for OperatorClass in OperatorClasses:
+            _handlers[OperatorClass] = handler
+
+        return handler
+
+    return decorator
+
+
+def _find_handler(op: Operator):
+    for klass in type(op).__mro__:
+        if klass in _handlers:
+            return _handlers[klass]
+
+    return None
+
+
+def is_supported(op: Operator) -> bool:
+    """is_supported(op)
+
+    Args:
+        op: operator
+
+    Returns:
+        (bool) If :code:`True`, the operator can be computed by :func:`execute_operator`.
+    """
+    if _find_handler(op) is None:
+        return False
+
+    return all(Placeholder.check_resolved(v.size) for v in list(op.inputs.values()) + list(op.outputs.values()))
+
+
+def execute_operator(op: Operator, inputs: ArrayDict) -> ArrayDict:
+    """execute_operator(op, inputs)
+
+    Compute the operator.
+
+    Args:
+        op: operator
+        inputs: input arrays keyed by the name of input variables. Each array must be the data of the input variable, that is, its shape
+            and order are same as the variable.
+
+    Returns:
+        (dict of str and np.ndarray) output arrays keyed by the name of output variables. The shape and order of each array are same as
+        the output variable.
+    """
+    handler = _find_handler(op)
+    if handler is None:
+        raise NotImplementedError(f"[NumPyExecutor] Operator {op} is not supported")
+
+    outputs = handler(op, inputs)
+    for name, y in op.outputs.items():
+        outputs[name] = np.asarray(outputs[name], dtype=np.float32).reshape(y.shape)
+
+    return outputs
+
+
+def run(graph: Graph, inputs: Union[Sequence[np.ndarray], Dict[Variable, np.ndarray]]) -> List[np.ndarray]:
+    """run(graph, inputs)
+
+    Compute the whole graph.
+
+    Args:
+        graph: graph
+        inputs: arrays for each input variable of the graph, in the order of each input variable
+
+    Returns:
+        (list of np.ndarray) arrays for each output variable of the graph, in the order of each output variable
+    """
+    if not isinstance(inputs, dict):
+        inputs = dict(zip(graph.inputs, inputs))
+
+    values = {}  # type: Dict[Variable, np.ndarray]
+    for v, data in inputs.items():
+        values[v] = np.asarray(data, dtype=np.float32).reshape(v.shape)
+
+    def get(v: Variable) -> np.ndarray:
+        if v not in values:
+            if not isinstance(v, ConstantVariable):
+                raise ValueError(f"[NumPyExecutor] Value of variable {v} is not given")
+
+            values[v] = v.data
+
+        return values[v]
+
+    for op in traverse.listup_operators(graph):
+        outputs = execute_operator(op, {name: get(v) for name, v in op.inputs.items()})
+        for name, v in op.outputs.items():
+            values[v] = outputs[name]
+
+    return [get(v) for v in graph.outputs]
+
+
+def change_order(data: np.ndarray, in_order: Order, out_order: Order) -> np.ndarray:
+    """change_order(data, in_order, out_order)
+
+    Transpose array. Axes which are not contained in :code:`in_order` are inserted with size 1, and axes which are not contained in
+    :code:`out_order` are removed (their size must be 1).
+
+    Args:
+        data: array
+        in_order: order of the array
+        out_order: new order
+
+    Returns:
+        (np.ndarray) transposed array
+    """
+    common_axes = [a for a in in_order.axes if a in out_order.axes]
+    removed = tuple(i for i, a in enumerate(in_order.axes) if a not in out_order.axes)
+    data = np.reshape(data, [s for i, s in enumerate(data.shape) if i not in removed])
+
+    common_axes_in_out_order = [a for a in out_order.axes if a in common_axes]
+    data = np.transpose(data, [common_axes.index(a) for a in common_axes_in_out_order])
+
+    return np.reshape(data, [data.shape[common_axes_in_out_order.index(a)] if a in common_axes else 1 for a in out_order.axes])
+
+
+def _input(op: Operator, inputs: ArrayDict, name: str, order: Order) -> np.ndarray:
+    return change_order(inputs[name], op.inputs[name].order, order)
+
+
+def _output(op: Operator, data: np.ndarray, order: Order, name: str = "y") -> ArrayDict:
+    return {name: change_order(data, order, op.outputs[name].order)}
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# Elementwise
+
+def _elementwise(func: Callable[..., np.ndarray]) -> Handler:
+    def handler(op: Operator, inputs: ArrayDict) -> ArrayDict:
+        order = op.outputs["y"].order
+        xs = [_input(op, inputs, f"x{i}", order) for i in range(len(op.inputs))]
+        return {"y": np.broadcast_to(func(op, *xs), op.outputs["y"].shape)}
+
+    return handler
+
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+for _OperatorClass, _func in [
+    (Abs, lambda op, x: np.abs(x)),
+    (ClippedRelu, lambda op, x: np.clip(x, 0, op.parameters["cap"])),
+    (Elu, lambda op, x: np.where(x >= 0, x, np.exp(np.minimum(x, 0)) - 1)),
+    (Exp, lambda op, x: np.exp(x)),
+    (HardSigmoid, lambda op, x: np.clip(x * 0.2 + 0.5, 0, 1)),
+    (LeakyRelu, lambda op, x: np.where(x > 0, x, x * op.parameters["slope"])),
+    (Relu, lambda op, x: np.maximum(x, 0)),
+    (Rsqrt, lambda op, x: 1 / np.sqrt(x)),
+    (ScalarAdd, lambda op, x: x + op.value),
+    (ScalarAffine, lambda op, x: x * op.scale + op.bias),
+    (ScalarMul, lambda op, x: x * op.value),
+    (ScalarPow, lambda op, x: x ** op.value),
+    (Sigmoid, lambda op, x: _sigmoid(x)),
+    (Softplus, lambda op, x: np.logaddexp(0, x * op.parameters["beta"]) / op.parameters["beta"]),
+    (Softsign, lambda op, x: x / (np.abs(x) + 1)),
+    (Tanh, lambda op, x: np.tanh(x)),
+    (ThresholdRelu, lambda op, x: np.where(x > op.parameters["threshold"], x, 0)),
+    (Broadcast, lambda op, x: x),
+    (Transpose, lambda op, x: x),
+    (ElementwiseAdd, lambda op, x0, x1: x0 + x1),
+    (ElementwiseDiv, lambda op, x0, x1: x0 / x1),
+    (ElementwiseMul, lambda op, x0, x1: x0 * x1),
+    (ElementwisePow, lambda op, x0, x1: x0 ** x1),
+]:
+    register_handler(_OperatorClass)(_elementwise(_func))
+
+
+@register_handler(FusedElementwise)
+def _fused_elementwise(op: FusedElementwise, inputs: ArrayDict) -> ArrayDict:
+    sub_graph = op.sub_graph
+    y, = run(sub_graph, [inputs[f"x{i}"] for i in range(len(sub_graph.inputs))])
+    return _output(op, y, sub_graph.outputs[0].order)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# Shape manipulation
+
+@register_handler(Reshape)
+def _reshape(op: Reshape, inputs: ArrayDict) -> ArrayDict:
+    x = _input(op, inputs, "x", op.parameters["in_order"])
+    return _output(op, x.reshape(op.parameters["out_shape"]), op.parameters["out_order"])
+
+
+@register_handler(ReinterpretAxis)
+def _reinterpret_axis(op: ReinterpretAxis, inputs: ArrayDict) -> ArrayDict:
+    x = _input(op, inputs, "x", op.parameters["in_order"])
+    return _output(op, x, op.parameters["out_order"])
+
+
+@register_handler(Concat)
+def _concat(op: Concat, inputs: ArrayDict) -> ArrayDict:
+    order = op.outputs["y"].order
+    xs = [_input(op, inputs, f"x{i}", order) for i in range(len(op.inputs))]
+    return {"y": np.concatenate(xs, axis=order.axes_dict[op.axis])}
+
+
+@register_handler(SplitAxis)
+def _split_axis(op: SplitAxis, inputs: ArrayDict) -> ArrayDict:
+    order = op.inputs["x"].order
+    ys = np.split(inputs["x"], op.sections, axis=order.axes_dict[op.axis])
+
+    outputs = {}
+    for i, y in enumerate(ys):
+        outputs.update(_output(op, y, order, f"y{i}"))
+
+    return outputs
+
+
+@register_handler(Depth2Space)
+def _depth2space(op: Depth2Space, inputs: ArrayDict) -> ArrayDict:
+    r = op.parameters["r"]
+    x = _input(op, inputs, "x", OrderNHWC)
+    n, h, w, c = x.shape
+    y = x.reshape(n, h, w, r, r, c // r // r).transpose(0, 1, 3, 2, 4, 5).reshape(n, h * r, w * r, c // r // r)
+    return _output(op, y, OrderNHWC)
+
+
+@register_handler(Space2Depth)
+def _space2depth(op: Space2Depth, inputs: ArrayDict) -> ArrayDict:
+    r = op.parameters["r"]
+    x = _input(op, inputs, "x", OrderNHWC)
+    n, h, w, c = x.shape
+    y = x.reshape(n, h // r, r, w // r, r, c).transpose(0, 1, 3, 2, 4, 5).reshape(n, h // r, w // r, c * r * r)
+    return _output(op, y, OrderNHWC)
+
+
+@register_handler(ZeroPadding1D)
+def _zero_padding_1d(op: ZeroPadding1D, inputs: ArrayDict) -> ArrayDict:
+    pad = op.parameters["padding"]
+    x = _input(op, inputs, "x", OrderNTC)
+    return _output(op, np.pad(x, ((0, 0), (pad[0], pad[1]), (0, 0)), "constant"), OrderNTC)
+
+
+@register_handler(ZeroPadding2D)
+def _zero_padding_2d(op: ZeroPadding2D, inputs: ArrayDict) -> ArrayDict:
+    pad = op.parameters["padding"]
+    x = _input(op, inputs, "x", OrderNHWC)
+    return _output(op, np.pad(x, ((0, 0), (pad[0], pad[0]), (pad[1], pad[1]), (0, 0)), "constant"), OrderNHWC)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# Reduction and normalization
+
+def _reduce(func: Callable[..., np.ndarray]) -> Handler:
+    def handler(op: Operator, inputs: ArrayDict) -> ArrayDict:
+        order = op.inputs["x"].order
+        y = func(inputs["x"], axis=order.axes_dict[op.parameters["axis"]])
+        return _output(op, y, Order([a for a in order.axes if a != op.parameters["axis"]]))
+
+    return handler
+
+
+register_handler(Max)(_reduce(np.max))
+register_handler(Min)(_reduce(np.min))
+register_handler(Sum)(_reduce(np.sum))
+
+
+@register_handler(Softmax)
+def _softmax(op: Softmax, inputs: ArrayDict) -> ArrayDict:
+    x = inputs["x"]
+    axis = op.inputs["x"].order.axes_dict[op.parameters["axis"]]
+    e = np.exp(x - np.max(x, axis=axis, keepdims=True))
+    return _output(op, e / np.sum(e, axis=axis, keepdims=True), op.inputs["x"].order)
+
+
+@register_handler(LocalResponseNormalization)
+def _local_response_normalization(op: LocalResponseNormalization, inputs: ArrayDict) -> ArrayDict:
+    x = _input(op, inputs, "x", OrderNHWC)
+    half_n = int(op.parameters["n"] // 2)
+    sq = np.pad(x ** 2, ((0, 0), (0, 0), (0, 0), (half_n, half_n)), "constant")
+    cumsum = np.concatenate([np.zeros(x.shape[:3] + (1,), dtype=sq.dtype), np.cumsum(sq, axis=3)], axis=3)
+    sq_sum = cumsum[..., 2 * half_n + 1:] - cumsum[..., :-2 * half_n - 1]
+    y = x * (sq_sum * op.parameters["alpha"] + op.parameters["k"]) ** -op.parameters["beta"]
+    return _output(op, y, OrderNHWC)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# Convolution and pooling
+
+def _im2col(im: np.ndarray, ksize, stride, padding, dilation_rate, out_size, pad_value: float = 0) -> np.ndarray:
+    """
+    Returns array whose shape is (N, H2, W2, KH, KW, C). `im` must be NHWC-order. Padded pixels (also pixels out of the image when the
+    window exceeds edge) are filled by `pad_value`.
+    """
+    n, h1, w1, c = im.shape
+    h2, w2 = out_size
+    kh, kw = ksize
+    sh, sw = stride
+    ph, pw = padding
+    dh, dw = dilation_rate
+
+    pad_bottom = max(0, (h2 - 1) * sh + (kh - 1) * dh + 1 - h1 - ph)
+    pad_right = max(0, (w2 - 1) * sw + (kw - 1) * dw + 1 - w1 - pw)
+    im = np.pad(im, ((0, 0), (ph, pad_bottom), (pw, pad_right), (0, 0)), "constant", constant_values=pad_value)
+
+    col = np.empty((n, h2, w2, kh, kw, c), dtype=im.dtype)
+    for ky in range(kh):
+        for kx in range(kw):
+            col[:, :, :, ky, kx, :] = im[:, ky * dh:ky * dh + (h2 - 1) * sh + 1:sh, kx * dw:kx * dw + (w2 - 1) * sw + 1:sw, :]
+
+    return col
+
+
+def _col2im(col: np.ndarray, ksize, stride, padding, out_size) -> np.ndarray:
+    """
+    Inverse operation of `_im2col`. `col` must be (N, H2, W2, KH, KW, C), and returned image is NHWC-order.
+    """
+    n, h2, w2, kh, kw, c = col.shape
+    h1, w1 = out_size
+    sh, sw = stride
+    ph, pw = padding
+
+    im = np.zeros((n, max(h1 + 2 * ph, (h2 - 1) * sh + kh), max(w1 + 2 * pw, (w2 - 1) * sw + kw), c), dtype=col.dtype)
+    for ky in range(kh):
+        for kx in range(kw):
+            im[:, ky:ky + (h2 - 1) * sh + 1:sh, kx:kx + (w2 - 1) * sw + 1:sw, :] += col[:, :, :, ky, kx, :]
+
+    return im[:, ph:ph + h1, pw:pw + w1, :]
+
+
+def _spatial_size(v: Variable):
+    return v.shape_dict[Axis.H], v.shape_dict[Axis.W]
+
+
+@register_handler(Im2Col)
+def _im2col_handler(op: Im2Col, inputs: ArrayDict) -> ArrayDict:
+    im = _input(op, inputs, "im", OrderNHWC)
+    col = _im2col(im, op.ksize, op.stride, op.padding, op.dilation_rate, _spatial_size(op.outputs["col"]))
+    return _output(op, col.reshape(col.shape[:3] + (-1,)), OrderNHWC, "col")
+
+
+@register_handler(Col2Im)
+def _col2im_handler(op: Col2Im, inputs: ArrayDict) -> ArrayDict:
+    col = _input(op, inputs, "col", OrderNHWC)
+    col = col.reshape(col.shape[:3] + (op.KH, op.KW, -1))
+    return _output(op, _col2im(col, op.ksize, op.stride, op.padding, _spatial_size(op.outputs["im"])), OrderNHWC, "im")
+
+
+@register_handler(Convolution2D)
+def _convolution_2d(op: Convolution2D, inputs: ArrayDict) -> ArrayDict:
+    x = _input(op, inputs, "x", OrderNHWC)
+    w = _input(op, inputs, "w", OrderNHWC)
+    col = _im2col(x, op.ksize, op.stride, op.padding, op.dilation_rate, _spatial_size(op.outputs["y"]))
+    y = np.tensordot(col, w, axes=([3, 4, 5], [1, 2, 3]))
+    return _output(op, y, OrderNHWC)
+
+
+@register_handler(Deconvolution2D)
+def _deconvolution_2d(op: Deconvolution2D, inputs: ArrayDict) -> ArrayDict:
+    x = _input(op, inputs, "x", OrderNHWC)
+    w = _input(op, inputs, "w", OrderNHWC)
+    col = np.tensordot(x, w, axes=([3], [3])).transpose(0, 1, 2, 4, 5, 3)  # (N, H, W, KH, KW, C_out)
+    return _output(op, _col2im(col, op.ksize, op.stride, op.padding, _spatial_size(op.outputs["y"])), OrderNHWC)
+
+
+@register_handler(MaxPooling2D)
+def _max_pooling_2d(op: MaxPooling2D, inputs: ArrayDict) -> ArrayDict:
+    x = _input(op, inputs, "x", OrderNHWC)
+    col = _im2col(x, op.parameters["ksize"], op.parameters["stride"], op.parameters["padding"], (1, 1), _spatial_size(op.outputs["y"]),
+                  pad_value=-np.inf)
+    return _output(op, np.max(col, axis=(3, 4)), OrderNHWC)
+
+
+@register_handler(AveragePooling2D)
+def _average_pooling_2d(op: AveragePooling2D, inputs: ArrayDict) -> ArrayDict:
+    x = _input(op, inputs, "x", OrderNHWC)
+    col = _im2col(x, op.parameters["ksize"], op.parameters["stride"], op.parameters["padding"], (1, 1), _spatial_size(op.outputs["y"]))
+    return _output(op, np.mean(col, axis=(3, 4)), OrderNHWC)
+
+
+# ----------------------------------------------------------------------------------------------------------------------------------------
+# Matrix multiplication
+
+@register_handler(Sgemm)
+def _sgemm(op: Sgemm, inputs: ArrayDict) -> ArrayDict:
+    a = inputs["A"].reshape((op.M, op.K) if op.transpose_A else (op.K, op.M))
+    b = inputs["B"].reshape((op.K, op.N) if op.transpose_B else (op.N, op.K))
+    c = np.dot(a if op.transpose_A else a.T, b if op.transpose_B else b.T)
+    return _output(op, c.reshape(op.parameters["out_shape"]), op.parameters["out_order"], "C")
+
+
+@register_handler(Linear)
+def _linear(op: Linear, inputs: ArrayDict) -> ArrayDict:
+    x_order = op.inputs["x"].order
+    x = _input(op, inputs, "x", Order([Axis.N] + [a for a in x_order.axes if a != Axis.N]))
+    w = _input(op, inputs, "w", Order([Axis.N] + [a for a in x_order.axes if a != Axis.N]))
+    y = np.dot(x.reshape(x.shape[0], -1), w.reshape(w.shape[0], -1).T)
+    return _output(op, y, OrderNC)
+
+
+@register_handler(Embedding)
+def _embedding(op: Embedding, inputs: ArrayDict) -> ArrayDict:
+    x = _input(op, inputs, "x", OrderNT)
+    w = _input(op, inputs, "w", OrderCN)
+    return _output(op, w[x.astype(np.int64)], OrderNTC)
+
+
+@register_handler(LSTM)
+def _lstm(op: LSTM, inputs: ArrayDict) -> ArrayDict:
+    x = _input(op, inputs, "x", OrderNTC)
+    w_input = _input(op, inputs, "w_input", OrderCN)
+    w_hidden = _input(op, inputs, "w_hidden", OrderCN)
+    batch_size, sequence_len, _ = x.shape
+    hidden_dim = w_hidden.shape[0]
+
+    activation = np.tanh
+    recurrent_activation = _sigmoid if op.parameters["recurrent_activation"] == "sigmoid" else lambda v: np.clip(v * 0.2 + 0.5, 0, 1)
+
+    c = _input(op, inputs, "initial_c", OrderNC) if op.parameters["use_initial_c"] else np.zeros((batch_size, hidden_dim), np.float32)
+    h = _input(op, inputs, "initial_h", OrderNC) if op.parameters["use_initial_h"] else np.zeros((batch_size, hidden_dim), np.float32)
+
+    # Input projection of all time steps is computed at once
+    v_input = np.dot(x.reshape(batch_size * sequence_len, -1), w_input).reshape(batch_size, sequence_len, hidden_dim * 4)
+    if op.parameters["use_bias"]:
+        v_input += inputs["b"]
+
+    hs = []
+    for t in range(sequence_len):
+        v = v_input[:, t, :] + np.dot(h, w_hidden)
+        i = recurrent_activation(v[:, :hidden_dim])
+        f = recurrent_activation(v[:, hidden_dim:hidden_dim * 2])
+        c = activation(v[:, hidden_dim * 2:hidden_dim * 3]) * i + c * f
+        h = activation(c) * recurrent_activation(v[:, hidden_dim * 3:])
+        hs.append(h)
+
+    outputs = _output(op, c, OrderNC, "final_c")
+    if op.parameters["return_sequences"]:
+        outputs.update(_output(op, np.stack(hs, axis=1), OrderNTC))
+
+    else:
+        outputs.update(_output(op, h, OrderNC))
+
+    return outputs
@@ -12,6 +12,7 @@ class Operator(Node):
     Args:
         name (str): the name. If :code:`None`, automatically generated name is used.
     """
+    __slots__ = ("_inputs", "_outputs")
 
     def __init__(self, name: Optional[str] = None):
         super().__init__(name)
@@ -24,8 +25,11 @@ class Operator(Node):
         Copy this operator. Follow fields are copied.
 
         - parameters
+
+        Parameters are passed to the constructor as keyword arguments, therefore the keys of :code:`parameters` must be same as the
+        argument names of the constructor.
         """
-        return self.__class__(None, *self.parameters)
+        return self.__class__(None, **self.parameters)
 
     @property
     def inputs(self) -> Dict[str, "variable.Variable"]:
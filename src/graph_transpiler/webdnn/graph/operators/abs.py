@@ -22,3 +22,4 @@ class Abs(Elementwise):
 
             y = abs(x0)
     """
+    __slots__ = ()
@@ -20,3 +20,4 @@ class AveragePooling2D(Pooling2D):
         - **x** - Input variable.
         - **y** - Output value. Its order is same as :code:`x`.
     """
+    __slots__ = ()
@@ -26,6 +26,7 @@ class AxiswiseBias(ElementwiseAdd):
     .. deprecated:: v1.2
        Use :class:`~webdnn.graph.operators.elementwise_add.ElementwiseAdd` instead.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], axis: Axis):
         super().__init__(name)
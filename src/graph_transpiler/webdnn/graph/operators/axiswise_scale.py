@@ -27,6 +27,7 @@ class AxiswiseScale(ElementwiseMul):
     .. deprecated:: v1.2
        Use :class:`~webdnn.graph.operators.elementwise_mul.ElementwiseMul` instead.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], axis: Axis):
         super().__init__(name)
@@ -24,6 +24,7 @@ class Broadcast(Elementwise):
         - **x** - Input variable.
         - **y** - Output variable.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], out_shape: List[int], out_order: Order):
         super(Broadcast, self).__init__(name)
@@ -24,6 +24,7 @@ class ClippedRelu(Elementwise):
         - **x0** - Input variable.
         - **y** - Output variable. Its order and shape is same as :code:`x0`.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], cap: float):
         super().__init__(name)
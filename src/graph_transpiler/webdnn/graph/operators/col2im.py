@@ -9,6 +9,8 @@ from webdnn.graph.variable import Variable
 
 
 class Col2Im(Operator):
+    __slots__ = ()
+
     def __init__(self, name: Optional[str], ksize: IntOrTuple, stride: IntOrTuple, padding: IntOrTuple):
         super().__init__(name)
         self.parameters["ksize"] = to_tuple(ksize)
@@ -24,6 +24,7 @@ class Concat(Operator):
         - **x0**, **x1**, ... - Input variables. All variables has same shape except the specified axis.
         - **y** - Output variable. Its order is same as :code:`x0`.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], axis: Axis):
         super().__init__(name)
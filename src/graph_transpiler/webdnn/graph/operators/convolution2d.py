@@ -35,6 +35,7 @@ class Convolution2D(Operator):
           :code:`x`.
         - **y** - Output variable. Its order is same as :code:`x`.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], ksize: IntOrTuple, stride: IntOrTuple, padding: IntOrTuple,
                  dilation_rate: Optional[IntOrTuple] = 1):
@@ -33,6 +33,7 @@ class Deconvolution2D(Operator):
           :code:`x`.
         - **y** - Output variable. Its order is same as :code:`x`.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], ksize: IntOrTuple, stride: IntOrTuple, padding: IntOrTuple):
         super().__init__(name)
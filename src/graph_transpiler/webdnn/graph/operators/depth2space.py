@@ -24,6 +24,7 @@ class Depth2Space(Operator):
         - **x** - Input variable.
         - **y** - Output variable. Its order is same as :code:`x`.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], r: int):
         super().__init__(name)
@@ -42,6 +42,7 @@ class Elementwise(Operator, metaclass=ABCMeta):
         - **x0**, **x1**, ... - Input variables.
         - **y** - Output variable. Its shape and order is same as :code:`x0`.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str]):
         super().__init__(name)
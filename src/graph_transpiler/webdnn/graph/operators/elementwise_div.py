@@ -24,6 +24,7 @@ class ElementwiseDiv(Elementwise):
 
             y = x0 / x1
     """
+    __slots__ = ()
 
     def fold_constance(self):
         x0 = self.inputs["x0"]  # type: ConstantVariable
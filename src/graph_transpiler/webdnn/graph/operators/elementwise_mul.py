@@ -28,6 +28,7 @@ class ElementwiseMul(Elementwise):
 
             y = x0 * x1
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str]):
         super(ElementwiseMul, self).__init__(name)
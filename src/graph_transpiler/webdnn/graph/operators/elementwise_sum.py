@@ -8,6 +8,7 @@ class ElementwiseSum(ElementwiseAdd):
     .. deprecated:: v1.2
        Use :class:`~webdnn.graph.operators.elementwise_add.ElementwiseAdd` instead.
     """
+    __slots__ = ()
 
     def __init__(self, *args, **kwargs):
         # FIXME: Deprecated
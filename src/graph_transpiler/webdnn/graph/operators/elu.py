@@ -26,3 +26,4 @@ class Elu(Elementwise):
         - **x0** - Input variable.
         - **y** - Output variable. Its order and shape is same as :code:`x0`.
     """
+    __slots__ = ()
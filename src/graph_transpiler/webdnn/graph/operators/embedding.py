@@ -26,6 +26,7 @@ class Embedding(Operator):
           must be same as the embed feature size.
         - **y** - Output variable. Its order is :obj:`~webdnn.graph.order.OrderNTC`.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str]):
         super().__init__(name)
@@ -17,3 +17,4 @@ class Exp(Elementwise):
         - **x0** - Input variable.
         - **y** - Output variable. Its order and shape is same as :code:`x0`.
     """
+    __slots__ = ()
@@ -36,6 +36,7 @@ class FusedElementwise(Elementwise):
                      +-------------------------------+
 
     """
+    __slots__ = ("sub_graph", "real2dummy", "dummy2real")
 
     def __init__(self, name: Optional[str], sub_graph: Graph):
         super().__init__(name)
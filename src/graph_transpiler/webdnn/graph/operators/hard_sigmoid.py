@@ -25,3 +25,4 @@ class HardSigmoid(Elementwise):
         - **x0** - Input variable.
         - **y** - Output variable. Its order and shape is same as :code:`x0`.
     """
+    __slots__ = ()
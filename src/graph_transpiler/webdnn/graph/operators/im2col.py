@@ -9,6 +9,8 @@ from webdnn.graph.variable import Variable
 
 
 class Im2Col(Operator):
+    __slots__ = ()
+
     def __init__(self, name: Optional[str], ksize: IntOrTuple, stride: IntOrTuple, padding: IntOrTuple,
                  dilation_rate: IntOrTuple):
         super().__init__(name)
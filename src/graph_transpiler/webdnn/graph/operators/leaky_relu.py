@@ -25,6 +25,7 @@ class LeakyRelu(Elementwise):
         - **x0** - Input variable.
         - **y** - Output variable. Its order and shape is same as :code:`x0`.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], slope: float):
         super().__init__(name)
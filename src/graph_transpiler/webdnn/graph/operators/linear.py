@@ -35,6 +35,7 @@ class Linear(Operator):
         - **y** - Output variable. Its order is :obj:`~webdnn.graph.order.OrderNC`. Its :obj:`~webdnn.Axis.N` size is same as
           :code:`x.shape_dict[Axis.N]`, and its :obj:`~webdnn.Axis.C` size is same as :code:`w.shape_dict[Axis.N]`
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str]):
         super().__init__(name)
@@ -30,6 +30,7 @@ class LocalResponseNormalization(Operator):
         - **x** - Input variable.
         - **y** - Output variable. Its order and shape is same as :code:`x`.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], n: float, k: float, alpha: float, beta: float):
         super().__init__(name)
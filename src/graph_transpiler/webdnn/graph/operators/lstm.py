@@ -16,6 +16,7 @@ class LSTM(Operator):
         name (str): Operator name.
 
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], use_bias: bool, return_sequences: bool,
                  use_initial_c: bool, use_initial_h: bool,
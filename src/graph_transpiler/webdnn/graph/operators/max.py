@@ -18,4 +18,4 @@ class Max(Reduce):
         - **x** - Input variables.
         - **y** - Output variable.
     """
-    pass
+    __slots__ = ()
@@ -21,3 +21,4 @@ class MaxPooling2D(Pooling2D):
         - **x** - Input variable.
         - **y** - Output value. Its order is same as :code:`x`.
     """
+    __slots__ = ()
@@ -18,4 +18,4 @@ class Min(Reduce):
         - **x** - Input variables.
         - **y** - Output variable.
     """
-    pass
+    __slots__ = ()
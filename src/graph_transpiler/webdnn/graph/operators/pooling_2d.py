@@ -29,6 +29,7 @@ class Pooling2D(Operator):
         - **x** - Input variable.
         - **y** - Output value. Its order is same as :code:`x`.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], ksize: IntOrTuple, stride: IntOrTuple, padding: IntOrTuple):
         super().__init__(name)
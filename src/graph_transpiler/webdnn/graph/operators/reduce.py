@@ -26,6 +26,7 @@ class Reduce(Operator, metaclass=ABCMeta):
         - **x** - Input variables.
         - **y** - Output variable.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], axis: Axis):
         super().__init__(name)
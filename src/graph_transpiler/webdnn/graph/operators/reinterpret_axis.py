@@ -26,6 +26,7 @@ class ReinterpretAxis(Operator):
         - **x** - Input variable.
         - **y** - Output variable. Its shape is same as :code:`x`.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], in_order: Order, out_order: Order):
         super().__init__(name)
@@ -37,6 +37,7 @@ class Reshape(Operator):
         - **x** - Input variable.
         - **y** - Output variable.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], in_order: Order, out_order: Order, out_shape: Sequence[Union[int, Placeholder]]):
         super().__init__(name)
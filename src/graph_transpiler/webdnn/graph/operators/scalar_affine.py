@@ -22,6 +22,7 @@ class ScalarAffine(Elementwise):
         - **x0** - Input variable.
         - **y** - Output variable. Its order and shape is same as :code:`x0`.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], scale: float, bias: float):
         super().__init__(name)
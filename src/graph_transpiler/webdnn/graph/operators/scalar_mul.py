@@ -27,6 +27,7 @@ class ScalarMul(Elementwise):
 
             y = x0 * value
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], value: float):
         super().__init__(name)
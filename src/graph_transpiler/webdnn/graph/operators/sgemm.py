@@ -9,6 +9,8 @@ from webdnn.util.misc import mul
 
 
 class Sgemm(Operator):
+    __slots__ = ()
+
     def __init__(self, name: Optional[str], M: Union[int, Placeholder], N: Union[int, Placeholder],
                  K: Union[int, Placeholder],
                  out_shape: Sequence[Union[int, Placeholder]], out_order: Order, transpose_A: bool, transpose_B: bool):
@@ -23,6 +23,7 @@ class Softmax(Operator):
         - **x0** - Input variable.
         - **y** - Output variable. Its order and shape is same as :code:`x0`.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], axis: Axis):
         super().__init__(name)
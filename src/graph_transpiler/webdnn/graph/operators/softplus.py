@@ -24,6 +24,7 @@ class Softplus(Elementwise):
         - **x0** - Input variable.
         - **y** - Output variable. Its order and shape is same as :code:`x0`.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], beta: float):
         super().__init__(name)
@@ -27,6 +27,7 @@ class SplitAxis(Operator):
         - **x** - Input variable.
         - **y{n}** - Output variables.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], sections: List[int], axis: Axis):
         super().__init__(name)
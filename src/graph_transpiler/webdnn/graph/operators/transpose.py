@@ -12,6 +12,7 @@ class Transpose(Elementwise):
     Args:
         name (str): Operator name.
     """
+    __slots__ = ()
 
     def fold_constance(self):
         x0 = self.inputs["x0"]
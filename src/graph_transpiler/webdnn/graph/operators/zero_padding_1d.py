@@ -27,6 +27,7 @@ class ZeroPadding1D(Operator):
         - **x** - Input variable.
         - **y** - Output variable. Its order and shape is same as :code:`x`.
     """
+    __slots__ = ()
 
     def __init__(self, name: Optional[str], padding: IntOrTuple):
         super().__init__(name)
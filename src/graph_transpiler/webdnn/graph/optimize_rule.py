@@ -1,8 +1,12 @@
-from typing import List, Tuple
+from collections import OrderedDict
+from typing import List, Tuple, Iterable, Optional
 
+from webdnn.graph import traverse
 from webdnn.graph.graph import Graph
+from webdnn.graph.node import Node, add_modification_listener, remove_modification_listener
+from webdnn.graph.operator import Operator
 from webdnn.graph.variable import Variable
-from webdnn.util import console
+from webdnn.util import console, profiler
 
 
 class OptimizeRule:
@@ -48,6 +52,115 @@ class OptimizeRule:
         raise NotImplementedError
 
 
+class OperatorOptimizeRule(OptimizeRule):
+    """OperatorOptimizeRule()
+
+    :code:`OperatorOptimizeRule` transforms each operator matched with :attr:`pattern` independently. Each transformation must depend only
+    on the operator and its neighborhood (input and output variables, and operators connected with them).
+
+    Because of this restriction, :class:`OptimizeRuleGroup` can re-apply this rule only to operators around modified nodes, instead of
+    whole graph.
+
+    Attributes:
+        pattern(type of :class:`~webdnn.Operator` or :class:`~webdnn.graph.attribute.Attribute`): operator type or attribute type which
+            this rule is applied to.
+    """
+    pattern = Operator  # type: traverse.Query
+
+    def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
+        return self.optimize_operators(graph, traverse.listup_operators(graph))
+
+    def optimize_operators(self, graph: Graph, ops: Iterable[Operator]) -> Tuple[Graph, bool]:
+        """optimize_operators(graph, ops)
+
+        Optimize only the specified operators. Operators which are not matched with :attr:`pattern` or which are already removed from
+        the graph are ignored.
+
+        args:
+            graph(:class:`~webdnn.Graph`): Computational graph
+            ops(list of :class:`~webdnn.Operator`): operators
+
+        returns:
+            (tuple of :class:`~webdnn.Graph` and bool): Optimized graph and flag whether the graph is changed or not.
+        """
+        flag_changed = False
+
+        for op in ops:
+            if len(op.prevs) == 0 and len(op.nexts) == 0:
+                # already removed
+                continue
+
+            if not traverse.check_match(op, self.pattern):
+                continue
+
+            flag_changed |= self.optimize_operator(graph, op)
+
+        return graph, flag_changed
+
+    def optimize_operator(self, graph: Graph, op: Operator) -> bool:
+        """optimize_operator(graph, op)
+
+        Optimize the operator.
+
+        args:
+            graph(:class:`~webdnn.Graph`): Computational graph
+            op(:class:`~webdnn.Operator`): the operator matched with :attr:`pattern`
+
+        returns:
+            (bool): flag whether the graph is changed or not.
+        """
+        raise NotImplementedError
+
+
+class _ModificationLog:
+    """
+    Records nodes modified while this log is active.
+    """
+
+    def __init__(self):
+        self.nodes = []  # type: List[Node]
+
+    def _listener(self, node: Node):
+        self.nodes.append(node)
+
+    def __enter__(self):
+        add_modification_listener(self._listener)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        remove_modification_listener(self._listener)
+
+    @property
+    def position(self) -> int:
+        return len(self.nodes)
+
+    def neighbor_operators(self, since: int) -> List[Operator]:
+        """
+        List up operators around nodes modified after specified position.
+        """
+        ops = OrderedDict()  # type: OrderedDict[Operator, None]
+
+        for node in OrderedDict.fromkeys(self.nodes[since:]).keys():
+            if isinstance(node, Operator):
+                ops[node] = None
+                variables = list(node.inputs.values()) + list(node.outputs.values())
+
+            elif isinstance(node, Variable):
+                variables = [node]
+
+            else:
+                continue
+
+            for v in variables:
+                if v.output_from is not None:
+                    ops[v.output_from] = None
+
+                for op in v.input_to:
+                    ops[op] = None
+
+        return list(ops.keys())
+
+
 class OptimizeRuleGroup(OptimizeRule):
     """OptimizeRuleGroup()
 
@@ -55,6 +168,9 @@ class OptimizeRuleGroup(OptimizeRule):
 
     When :func:`optimize(graph)<OptimizeRuleGroup.optimize>` is called, the transform rule is applied for given graph.
 
+    When :attr:`repeat` is `True`, modified nodes are recorded. Each sub rule is re-applied only when some nodes are modified after the
+    last application of the sub rule. In addition, :class:`OperatorOptimizeRule` is re-applied only to operators around the modified nodes.
+
     Attributes:
         repeat(bool): If `True`, sub rules are applied multiple times in the single `optimize()` call until the graph will be not changed.
     """
@@ -78,26 +194,86 @@ class OptimizeRuleGroup(OptimizeRule):
         if not all(self.flags()):
             return graph, False
 
-        flag_retry = True
-        flag_totally_changed = False
+        with profiler.profile("optimize_rule", self.__class__.__name__, graph) as record:
+            graph, record.changed = self._optimize(graph)
+
+        return graph, record.changed
+
+    @staticmethod
+    def _apply_sub_rule(graph: Graph, sub_rule: OptimizeRule, ops: Optional[List[Operator]] = None) -> Tuple[Graph, bool]:
+        if isinstance(sub_rule, OptimizeRuleGroup):
+            # Sub rule group is recorded by itself
+            return sub_rule.optimize(graph)
 
-        while flag_retry:
-            flag_retry = False
+        with profiler.profile("optimize_rule", sub_rule.__class__.__name__, graph) as record:
+            if ops is None:
+                graph, record.changed = sub_rule.optimize(graph)
+
+            else:
+                graph, record.changed = sub_rule.optimize_operators(graph, ops)
+
+        return graph, record.changed
+
+    def _optimize(self, graph: Graph) -> Tuple[Graph, bool]:
+        if not self.repeat:
+            flag_totally_changed = False
 
             for sub_rule in self.sub_rules:
                 if not all(sub_rule.flags()):
                     continue
 
-                graph, flag_changed = sub_rule.optimize(graph)
+                graph, flag_changed = self._apply_sub_rule(graph, sub_rule)
                 if flag_changed:
                     console.debug(f"[OptimizeRule] apply: {sub_rule.__class__.__name__}")
 
-                flag_retry |= flag_changed
+                flag_totally_changed |= flag_changed
+
+            return graph, flag_totally_changed
+
+        with _ModificationLog() as log:
+            # The log position when each sub rule was applied last time. `None` means the sub rule must be applied to whole graph.
+            last_positions = [None] * len(self.sub_rules)  # type: List[Optional[int]]
+
+            flag_retry = True
+            flag_totally_changed = False
+
+            while flag_retry:
+                flag_retry = False
+
+                for i, sub_rule in enumerate(self.sub_rules):
+                    if not all(sub_rule.flags()):
+                        continue
+
+                    last_position = last_positions[i]
+                    position = log.position
+
+                    if last_position is None:
+                        graph, flag_changed = self._apply_sub_rule(graph, sub_rule)
+
+                    elif last_position == position:
+                        # No node is modified after last application
+                        continue
+
+                    elif isinstance(sub_rule, OperatorOptimizeRule):
+                        graph, flag_changed = self._apply_sub_rule(graph, sub_rule, log.neighbor_operators(last_position))
+
+                    else:
+                        graph, flag_changed = self._apply_sub_rule(graph, sub_rule)
+
+                    last_positions[i] = position
+
+                    if flag_changed:
+                        console.debug(f"[OptimizeRule] apply: {sub_rule.__class__.__name__}")
+
+                        if log.position == position:
+                            # The graph is changed without any recorded modification (ex. parameters are changed). Because which nodes are
+                            # affected is unknown, all sub rules are applied to whole graph again.
+                            last_positions = [None] * len(self.sub_rules)
+                            last_positions[i] = position
+
+                    flag_retry |= flag_changed
 
-            flag_totally_changed |= flag_retry
-            
-            if not self.repeat:
-                break
+                flag_totally_changed |= flag_retry
 
         return graph, flag_totally_changed
 
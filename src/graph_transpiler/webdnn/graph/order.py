@@ -23,6 +23,7 @@ class Order:
 
     def __init__(self, axes: Sequence[Axis]):
         self._axes = tuple(axes)
+        self._axes_dict = None  # type: AxisKeyDict[int]
 
     @property
     def axes(self) -> Tuple[Axis, ...]:
@@ -34,7 +35,11 @@ class Order:
 
     @property
     def axes_dict(self) -> AxisKeyDict[int]:
-        return AxisKeyDict(self.axes, range(self.ndim))
+        """dictionary of axis and its index pairs. The dictionary is shared, and must not be modified."""
+        if self._axes_dict is None:
+            self._axes_dict = AxisKeyDict(self.axes, range(self.ndim))
+
+        return self._axes_dict
 
     def __eq__(self, other):
         if isinstance(other, Order):
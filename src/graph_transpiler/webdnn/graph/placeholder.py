@@ -1,5 +1,7 @@
+from collections import OrderedDict
 from enum import auto, Enum
-from typing import Union, Optional, List
+from typing import Union, Optional, List, Dict, Tuple, Hashable
+from weakref import WeakValueDictionary
 
 import numpy as np
 
@@ -15,101 +17,247 @@ class PlaceholderOperator(Enum):
     FloorDiv = auto()  # v1 // v2
 
 
+# Canonical form of placeholder expression
+# ----------------------------------------
+#
+# Unresolved expression is represented as a polynomial, that is, a sum of products (monomials) of atoms and integer coefficients. Atoms
+# are unresolved placeholders without dependency, and unresolved modulo and floor-division. Atoms and polynomials are interned into
+# ids, and therefore two expressions are symbolically equal if and only if the ids of their polynomials are same.
+#
+# The intern table holds ids weakly, so an entry is dropped when no memoized expression refers it any more.
+#
+# Since placeholders can be resolved at any time, canonical forms computed when some placeholders are unresolved can be outdated.
+# Memoized results are tagged with :code:`_epoch`, which is incremented whenever any placeholder is resolved.
+
+_epoch = 0
+_serial = 0
+
+
+class CanonicalId:
+    """
+    Interned id of a canonical form. Ids are compared by identity, and ordered by creation to sort monomials.
+    """
+    __slots__ = ["serial", "__weakref__"]
+
+    def __init__(self):
+        global _serial
+        self.serial = _serial
+        _serial += 1
+
+    def __lt__(self, other: "CanonicalId") -> bool:
+        return self.serial < other.serial
+
+    def __repr__(self):
+        return f"<CanonicalId {self.serial}>"
+
+
+Monomial = Tuple[CanonicalId, ...]
+Polynomial = Dict[Monomial, int]
+
+_interned_ids = WeakValueDictionary()  # type: WeakValueDictionary[Hashable, CanonicalId]
+
+
+def _intern(key: Hashable) -> CanonicalId:
+    canonical_id = _interned_ids.get(key, None)
+    if canonical_id is None:
+        canonical_id = CanonicalId()
+        _interned_ids[key] = canonical_id
+
+    return canonical_id
+
+
+def _add_polynomial(p1: Polynomial, p2: Polynomial, sign: int = 1) -> Polynomial:
+    result = dict(p1)
+    for monomial, coefficient in p2.items():
+        coefficient = result.get(monomial, 0) + sign * coefficient
+        if coefficient == 0:
+            result.pop(monomial, None)
+
+        else:
+            result[monomial] = coefficient
+
+    return result
+
+
+def _mul_polynomial(p1: Polynomial, p2: Polynomial) -> Polynomial:
+    result = {}  # type: Polynomial
+    for monomial1, coefficient1 in p1.items():
+        for monomial2, coefficient2 in p2.items():
+            monomial = tuple(sorted(monomial1 + monomial2))
+            coefficient = result.get(monomial, 0) + coefficient1 * coefficient2
+            if coefficient == 0:
+                result.pop(monomial, None)
+
+            else:
+                result[monomial] = coefficient
+
+    return result
+
+
+def _to_placeholder(v: Union[int, "Placeholder"]) -> "Placeholder":
+    return v if isinstance(v, Placeholder) else Placeholder(value=v)
+
+
+def _split_term(p: "Placeholder") -> Tuple[int, List["Placeholder"]]:
+    """
+    Split a product term into the integer coefficient and unresolved factors.
+    """
+    if p.is_resolved:
+        return p.value, []
+
+    if p.dependency is not None and p.dependency.operator == PlaceholderOperator.Mul:
+        coefficient = 1
+        factors = []
+        for operand in p.dependency.operands:
+            if operand.is_resolved:
+                coefficient *= operand.value
+
+            else:
+                factors.append(operand)
+
+        return coefficient, factors
+
+    return 1, [p]
+
+
 class Dependency:
     operator: PlaceholderOperator
     operands: List[Union[int, "Placeholder"]]
 
     @staticmethod
     def check_deep_equal(d1: "Dependency", d2: "Dependency") -> bool:
-        if d1.operator != d2.operator:
-            return False
-
-        if d1.operator == PlaceholderOperator.Mul or d1.operator == PlaceholderOperator.Add:
-            operands1 = sorted(d1.operands, key=lambda op: str(op))
-            operands2 = sorted(d2.operands, key=lambda op: str(op))
-            if len(operands1) != len(operands2):
-                return False
-
-            return all([Placeholder._check_deep_equal(p1, p2) for p1, p2 in zip(operands1, operands2)])
-
-        elif d1.operator == PlaceholderOperator.Mod or \
-                d1.operator == PlaceholderOperator.Mod or \
-                d1.operator == PlaceholderOperator.FloorDiv:
-            return Placeholder._check_deep_equal(d1.operands[0], d2.operands[0]) and \
-                   Placeholder._check_deep_equal(d1.operands[1], d2.operands[1])
+        return d1.canonical_id() == d2.canonical_id()
 
     def __init__(self, operator: PlaceholderOperator, operands: List[Union[int, "Placeholder"]]):
         self.operator = operator
-        operands = list(operands)
+        self._memo_epoch = -1
+        self._memo_polynomial = None  # type: Optional[Polynomial]
+        self._memo_id = None  # type: Optional[int]
+
+        operands = [_to_placeholder(v) for v in operands]
 
         if operator == PlaceholderOperator.Add:
-            i = 0
-            while i < len(operands):
-                v1 = operands[i]
-                if v1 == 0:
-                    operands.pop(i)
+            # Terms which have same factors are merged, and constant terms are merged into last operand.
+            #
+            #   v = p * 2 + q + p * 3 + 1 + 2
+            #     = p * 5 + q + 3
+            terms = OrderedDict()  # type: Dict[Monomial, Tuple[int, List[Placeholder]]]
+            constant = 0
+
+            stack = list(reversed(operands))
+            while len(stack) > 0:
+                v = stack.pop()
+                if not v.is_resolved and v.dependency is not None and v.dependency.operator == PlaceholderOperator.Add:
+                    stack.extend(reversed(v.dependency.operands))
+                    continue
+
+                coefficient, factors = _split_term(v)
+                if len(factors) == 0:
+                    constant += coefficient
                     continue
 
-                j = i + 1
-                while j < len(operands):
-                    v2 = operands[j]
-                    if v2 == 0:
-                        operands.pop(j)
-                        continue
-
-                    # v = ... + v1 + v2 + ...
-                    # v1 = common_term * other_term1
-                    # v2 = common_term * other_term2
-                    #
-                    #
-                    # >> When other_term1 and other_term2 are resolved,
-                    #
-                    # v = (... + (other_term1 + other_term2) * common_term + ...)
-                    other_term1 = list(v1.dependency.operands) if v1.dependency else {v1}
-                    other_term2 = list(v2.dependency.operands) if v2.dependency else {v2}
-                    common_term = list()
-
-                    for vv in list(other_term1):
-                        if vv in other_term2:
-                            other_term1.remove(vv)
-                            other_term2.remove(vv)
-                            common_term.append(vv)
-
-                    for vv in list(other_term2):
-                        if vv in other_term1:
-                            other_term1.remove(vv)
-                            other_term2.remove(vv)
-                            common_term.append(vv)
-
-                    if all(p.is_resolved for p in other_term1) and all(p.is_resolved for p in other_term2):
-                        other_term1 = Placeholder(Dependency(PlaceholderOperator.Mul, list(other_term1)))
-                        other_term2 = Placeholder(Dependency(PlaceholderOperator.Mul, list(other_term2)))
-                        common_term = Placeholder(Dependency(PlaceholderOperator.Mul, list(common_term)))
-                        operands.pop(j)
-                        operands.pop(i)
-                        j -= 1
-                        i -= 1
-                        operands.append(Placeholder(value=(other_term1 + other_term2) * common_term))
-
-                    j += 1
-                i += 1
+                key = tuple(sorted(f.canonical_id() for f in factors))
+                if key in terms:
+                    terms[key] = (terms[key][0] + coefficient, terms[key][1])
+
+                else:
+                    terms[key] = (coefficient, factors)
+
+            operands = []
+            for coefficient, factors in terms.values():
+                if coefficient == 0:
+                    continue
+
+                if coefficient == 1 and len(factors) == 1:
+                    operands.append(factors[0])
+
+                else:
+                    operands.append(Placeholder(Dependency(PlaceholderOperator.Mul, factors + [Placeholder(value=coefficient)])))
+
+            if constant != 0:
+                operands.append(Placeholder(value=constant))
 
         elif operator == PlaceholderOperator.Mul:
             s = 1
-            i = 0
-            while i < len(operands):
-                v1 = operands[i]
-                if v1.is_resolved:
-                    s *= v1
-                    operands.pop(i)
-                    i -= 1
-                i += 1
+            factors = []
+
+            stack = list(reversed(operands))
+            while len(stack) > 0:
+                v = stack.pop()
+                if v.is_resolved:
+                    s *= v.value
+
+                elif v.dependency is not None and v.dependency.operator == PlaceholderOperator.Mul:
+                    stack.extend(reversed(v.dependency.operands))
+
+                else:
+                    factors.append(v)
 
             if s != 1:
-                operands.append(Placeholder(value=s))
+                factors.append(Placeholder(value=s))
+
+            operands = factors
 
         self.operands = operands
 
+    def __getstate__(self):
+        # Memoized results depend on the epoch of this process
+        state = dict(self.__dict__)
+        state["_memo_epoch"] = -1
+        state["_memo_polynomial"] = None
+        state["_memo_id"] = None
+        return state
+
+    def polynomial(self) -> Polynomial:
+        """polynomial()
+
+        Returns:
+            (dict of tuple of :class:`CanonicalId` and int) canonical sum-of-products form. Keys are monomials (sorted tuple of atom ids)
+            and values are coefficients. Terms whose coefficient is 0 are removed.
+        """
+        if self._memo_epoch == _epoch and self._memo_polynomial is not None:
+            return self._memo_polynomial
+
+        if self.operator == PlaceholderOperator.Add:
+            result = {}
+            for v in self.operands:
+                result = _add_polynomial(result, v.polynomial())
+
+        elif self.operator == PlaceholderOperator.Sub:
+            result = self.operands[0].polynomial()
+            for v in self.operands[1:]:
+                result = _add_polynomial(result, v.polynomial(), sign=-1)
+
+        elif self.operator == PlaceholderOperator.Mul:
+            result = {(): 1}
+            for v in self.operands:
+                result = _mul_polynomial(result, v.polynomial())
+
+        else:
+            # Modulo and floor-division are not distributive, so they are treated as atoms
+            atom = _intern((self.operator.name,) + tuple(v.canonical_id() for v in self.operands))
+            result = {(atom,): 1}
+
+        if self._memo_epoch != _epoch:
+            self._memo_id = None
+
+        self._memo_epoch = _epoch
+        self._memo_polynomial = result
+        return result
+
+    def canonical_id(self) -> CanonicalId:
+        """canonical_id()
+
+        Returns:
+            (:class:`CanonicalId`) interned id of the canonical form. Two expressions are symbolically equal if and only if their ids are
+            same.
+        """
+        polynomial = self.polynomial()
+        if self._memo_id is None:
+            self._memo_id = _intern(tuple(sorted(polynomial.items())))
+
+        return self._memo_id
+
     @property
     def is_resolved(self) -> bool:
         """
@@ -312,6 +460,7 @@ class Placeholder(json.SerializableMixin):
     """
     _value = None  # type: Optional[int]
     _cache_value = None  # type: Optional[int]
+    _unresolved_epoch = -1  # type: int
     label = None  # type: Optional[str]
     dependency = None  # type: Optional[Dependency]
 
@@ -373,14 +522,7 @@ class Placeholder(json.SerializableMixin):
         if Placeholder.check_resolved(p1) and Placeholder.check_resolved(p2):
             return Placeholder.force_int(p1) == Placeholder.force_int(p2)
 
-        elif Placeholder.check_resolved(p1) or Placeholder.check_resolved(p2):
-            return False
-
-        elif p1.dependency is not None and p2.dependency is not None:
-            return Dependency.check_deep_equal(p1.dependency, p2.dependency)
-
-        else:
-            return p1.label == p2.label
+        return _to_placeholder(p1).canonical_id() == _to_placeholder(p2).canonical_id()
 
     def __new__(cls, dependency: Optional[Dependency] = None, value: Union[int, "Placeholder"] = None,
                 label: str = None):
@@ -432,12 +574,15 @@ class Placeholder(json.SerializableMixin):
 
     @value.setter
     def value(self, new_v: int):
+        global _epoch
+
         if self.is_resolved:
             raise ValueError(f"{self} is already resolved")
 
         elif isinstance(new_v, int) or isinstance(new_v, np.int32) or isinstance(new_v, np.int64):
             # noinspection PyTypeChecker
             self._value = int(new_v)
+            _epoch += 1
 
         else:
             raise TypeError(f"Placeholder#value must be a int, not '{type(new_v)}'")
@@ -451,11 +596,52 @@ class Placeholder(json.SerializableMixin):
             return True
 
         elif self.dependency:
-            return self.dependency.is_resolved
+            # Once resolved, the placeholder is never unresolved. Unresolved state is valid until any placeholder is resolved.
+            if self._unresolved_epoch == _epoch:
+                return False
+
+            if self.dependency.is_resolved:
+                self._cache_value = self.dependency.value
+                return True
+
+            self._unresolved_epoch = _epoch
+            return False
 
         else:
             return False
 
+    def polynomial(self) -> Polynomial:
+        """polynomial()
+
+        Returns:
+            (dict of tuple of :class:`CanonicalId` and int) canonical sum-of-products form. See :func:`Dependency.polynomial`.
+        """
+        if self.is_resolved:
+            value = self.value
+            return {} if value == 0 else {(): value}
+
+        if self.dependency:
+            return self.dependency.polynomial()
+
+        return {(_intern(("label", self.label)),): 1}
+
+    def canonical_id(self) -> CanonicalId:
+        """canonical_id()
+
+        Returns:
+            (:class:`CanonicalId`) interned id of the canonical form. Two placeholders are equal if and only if their ids are same.
+        """
+        if self.dependency and not self.is_resolved:
+            return self.dependency.canonical_id()
+
+        return _intern(tuple(sorted(self.polynomial().items())))
+
+    def __getstate__(self):
+        # Memoized unresolved state depends on the epoch of this process
+        state = dict(self.__dict__)
+        state.pop("_unresolved_epoch", None)
+        return state
+
     def __add__(self, other: Union[int, "Placeholder"]) -> Union[int, "Placeholder"]:
         other = Placeholder(value=other)
 
@@ -587,6 +773,7 @@ class Placeholder(json.SerializableMixin):
                 return f"<{self.label}>" if self.label else f"<{self.__class__.__name__} at {hex(id(self))}>"
 
     def __hash__(self):
+        # Equality changes when placeholders are resolved, so the hash is not structural. Use canonical_id() to compare expressions.
         return id(self)
 
     def dump(self):
@@ -1,4 +1,5 @@
-from typing import Type, List, Set, Iterable, Union, Tuple, Optional, TypeVar
+from collections import deque
+from typing import Type, List, Set, Iterable, Union, Tuple, Optional, TypeVar, Dict, Deque
 
 from webdnn.graph.attribute import Attribute
 from webdnn.graph.graph import Graph
@@ -37,10 +38,10 @@ def check_node_type_match(node: Node, query: Type[Node]):
 
 def search_sub_structure(graph: Graph, query: List[Query]) -> List[List[Operator]]:
     matches: List[List[Operator]] = []
-    queue: List[Tuple(Node, int, List[Node])] = [(node, 0, []) for node in listup_nodes(graph)]
+    queue: Deque[Tuple[Node, int, List[Node]]] = deque((node, 0, []) for node in filter_nodes(listup_nodes(graph), query[0]))
 
     while len(queue) > 0:
-        node, index, matched = queue.pop(0)
+        node, index, matched = queue.popleft()
         if check_match(node, query[index]):
             matched.append(node)
 
@@ -57,7 +58,60 @@ def search_sub_structure(graph: Graph, query: List[Query]) -> List[List[Operator
 T = TypeVar("T", bound=Node)
 
 
+class _NodeIndex:
+    """
+    Cache of filtering results for a node list returned by :func:`listup_nodes` and its variants.
+    """
+
+    def __init__(self, graph: Graph, nodes: List[Node]):
+        self.graph = graph
+        self.nodes = nodes
+        self.version = graph.version
+        self.filtered = {}  # type: Dict[Tuple[Query, bool], List[Node]]
+
+    def filter(self, query: Query, mode_not: bool) -> Optional[List[Node]]:
+        if self.version != self.graph.version:
+            # Attributes of nodes may be changed
+            return None
+
+        key = (query, mode_not)
+        if key not in self.filtered:
+            self.filtered[key] = [node for node in self.nodes if not mode_not == check_match(node, query)]
+
+        return self.filtered[key]
+
+
+class _IndexedNodeList(list):
+    """
+    Node list which answers :func:`filter_nodes` from the index. The index is detached when the list is modified.
+    """
+
+    def __init__(self, index: _NodeIndex):
+        super(_IndexedNodeList, self).__init__(index.nodes)
+        self.node_index = index  # type: Optional[_NodeIndex]
+
+
+def _detach_index(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        self.node_index = None
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+for _name in ["__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend", "insert", "remove", "pop", "clear", "sort",
+              "reverse"]:
+    setattr(_IndexedNodeList, _name, _detach_index(_name))
+
+
 def filter_nodes(nodes: Iterable[T], query: Query, mode_not: bool = False) -> List[T]:
+    if isinstance(nodes, _IndexedNodeList) and nodes.node_index is not None:
+        result = nodes.node_index.filter(query, mode_not)
+        if result is not None:
+            return list(result)
+
     return [node for node in nodes if not mode_not == check_match(node, query)]
 
 
@@ -85,8 +139,20 @@ def listup_nodes(graph: Graph, ignore_internal_input_bound=False, ignore_interna
       # >>> ignore_internal_input_bound=False, ignore_internal_output_bound=True  : [1,    3, 4, 5, 6] (default)
       # >>> ignore_internal_input_bound=True,  ignore_internal_output_bound=False : [1, 2, 3, 4,    6]
       # >>> ignore_internal_input_bound=True,  ignore_internal_output_bound=True  : [1, 2, 3, 4, 5, 6]
+
+    The result is cached in :attr:`graph.cache<webdnn.Graph.cache>` until the graph is modified.
     """
+    key = ("listup_nodes", ignore_internal_input_bound, ignore_internal_output_bound)
+    cache = graph.cache
+    if key not in cache:
+        nodes = _listup_nodes(graph, ignore_internal_input_bound, ignore_internal_output_bound)
+        graph.adopt_nodes(nodes)
+        cache[key] = _NodeIndex(graph, nodes)
+
+    return _IndexedNodeList(cache[key])
+
 
+def _listup_nodes(graph: Graph, ignore_internal_input_bound: bool, ignore_internal_output_bound: bool) -> List[Node]:
     input_bound = graph.inputs
     output_bound = graph.outputs
 
@@ -165,13 +231,22 @@ def listup_nodes(graph: Graph, ignore_internal_input_bound=False, ignore_interna
     return result
 
 
+def _listup_nodes_by_type(graph: Graph, node_type: Type[Node]) -> List[Node]:
+    key = ("listup_nodes_by_type", node_type)
+    cache = graph.cache
+    if key not in cache:
+        cache[key] = _NodeIndex(graph, filter_nodes(listup_nodes(graph), node_type))
+
+    return _IndexedNodeList(cache[key])
+
+
 def listup_operators(graph: Graph) -> List[Operator]:
-    ops = filter_nodes(listup_nodes(graph), Operator)  # type: List[Operator]
+    ops = _listup_nodes_by_type(graph, Operator)  # type: List[Operator]
     return ops
 
 
 def listup_variables(graph: Graph) -> List[Variable]:
-    variables = filter_nodes(listup_nodes(graph), Variable)  # type: List[Variable]
+    variables = _listup_nodes_by_type(graph, Variable)  # type: List[Variable]
     return variables
 
 
@@ -1,7 +1,7 @@
-from typing import Union, List, Set, Tuple, Sequence
+from typing import Union, List, Tuple, Sequence
 
 import webdnn.graph
-from webdnn.graph import operator
+from webdnn.graph import operator, placeholder
 from webdnn.graph.axis import AxisKeyDict
 from webdnn.graph.node import Node
 from webdnn.graph.order import Order
@@ -29,6 +29,7 @@ class Variable(Node):
         #       +-[ElementwiseAdd]-> h -[ElementwiseAbs]-> y
         #   x2 -+
     """
+    __slots__ = ("_shape", "_order", "_shape_dict_cache", "_stride_dict_cache")
 
     def __init__(self, shape: Sequence[Union[int, Placeholder]], order: Order):
         super().__init__()
@@ -37,6 +38,13 @@ class Variable(Node):
 
         self._shape = tuple(shape)  # type: Tuple[Union[int, Placeholder]]
         self._order = order  # type: Order
+        self._invalidate_dict_cache()
+
+    def _invalidate_dict_cache(self):
+        # shape_dict and stride_dict are cached with the epoch of placeholder resolution, because resolved placeholders are
+        # converted into int.
+        self._shape_dict_cache = None  # type: Tuple[int, AxisKeyDict[Union[int, Placeholder]]]
+        self._stride_dict_cache = None  # type: Tuple[int, AxisKeyDict[Union[int, Placeholder]]]
 
     @property
     def shape(self) -> Tuple[Union[int, Placeholder], ...]:
@@ -44,14 +52,14 @@ class Variable(Node):
         return tuple(Placeholder.to_int(v) for v in self._shape)
 
     @property
-    def input_to(self) -> Set["operator.Operator"]:
-        """operators which this variable is input to"""
-        return set(self.nexts)
+    def input_to(self) -> List["operator.Operator"]:
+        """operators which this variable is input to, in order of connection"""
+        return list(self.nexts)
 
     @property
     def output_from(self) -> "operator.Operator":
         """operator which this variable is output from"""
-        return None if len(self.prevs) == 0 else list(self.prevs)[0]
+        return None if len(self.prevs) == 0 else self.prevs[0]
 
     @property
     def order(self) -> Order:
@@ -79,8 +87,11 @@ class Variable(Node):
 
     @property
     def shape_dict(self) -> AxisKeyDict[Union[int, Placeholder]]:
-        """dictionary of axis and shape size pairs"""
-        return AxisKeyDict(self.order.axes, self.shape)
+        """dictionary of axis and shape size pairs. The dictionary is cached until shape or order is changed, and must not be modified."""
+        if self._shape_dict_cache is None or self._shape_dict_cache[0] != placeholder._epoch:
+            self._shape_dict_cache = (placeholder._epoch, AxisKeyDict(self.order.axes, self.shape))
+
+        return self._shape_dict_cache[1]
 
     @property
     def stride(self) -> List[Union[int, Placeholder]]:
@@ -89,8 +100,11 @@ class Variable(Node):
 
     @property
     def stride_dict(self) -> AxisKeyDict[Union[int, Placeholder]]:
-        """dictionary of axis and stride size pairs"""
-        return AxisKeyDict(self.order.axes, self.stride)
+        """dictionary of axis and stride size pairs. The dictionary is cached as same as :attr:`shape_dict`, and must not be modified."""
+        if self._stride_dict_cache is None or self._stride_dict_cache[0] != placeholder._epoch:
+            self._stride_dict_cache = (placeholder._epoch, AxisKeyDict(self.order.axes, self.stride))
+
+        return self._stride_dict_cache[1]
 
     def copy(self) -> "Variable":
         return Variable(self.shape, self.order)
@@ -115,6 +129,8 @@ class Variable(Node):
                                       f"variable={self}, shape_dict[{axis}]={size}, new_order={order}."
         self._order = order
         self._shape = new_shape
+        self._invalidate_dict_cache()
+        self.notify_modified()
 
         return self
 
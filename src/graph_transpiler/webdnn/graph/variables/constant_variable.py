@@ -15,6 +15,7 @@ class ConstantVariable(Variable):
         data (np.array): constant data.
         order (:class:`~webdnn.Order`): the data order.
     """
+    __slots__ = ("data",)
 
     def __init__(self, data: np.ndarray, order: Order):
         super(ConstantVariable, self).__init__(data.shape, order)
@@ -1,16 +1,18 @@
-from typing import Tuple
-
-from webdnn.graph import traverse
+from webdnn.graph import numpy_executor
 from webdnn.graph.graph import Graph
 from webdnn.graph.operator import Operator
-from webdnn.graph.optimize_rule import OptimizeRule
+from webdnn.graph.optimize_rule import OperatorOptimizeRule
 from webdnn.graph.variables.constant_variable import ConstantVariable
 from webdnn.util import flags
 
 
-class ConstantFolding(OptimizeRule):
+class ConstantFolding(OperatorOptimizeRule):
     """
     Calculate constant expression in compile time
+
+    If the operator implements :func:`~webdnn.graph.operator.Operator.fold_constance`, it's used. Otherwise the operator is computed by
+    :mod:`~webdnn.graph.numpy_executor`. In the latter case, operators which make constant data larger (ex. broadcasting a bias) are not
+    folded because it only increases the weight file size.
     """
 
     def flags(self):
@@ -19,16 +21,27 @@ class ConstantFolding(OptimizeRule):
             flags.optimize.CONSTANT_FOLDING
         ]
 
-    def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
-        flag_changed = False
+    def optimize_operator(self, graph: Graph, op: Operator):
+        if not all(isinstance(v, ConstantVariable) for v in op.inputs.values()):
+            return False
+
+        if getattr(op.fold_constance, '__func__', None) is not Operator.fold_constance:
+            op.fold_constance()
+            return True
+
+        if not numpy_executor.is_supported(op):
+            return False
+
+        if any(y in graph.outputs for y in op.outputs.values()):
+            return False
 
-        for op in traverse.listup_operators(graph):
-            if getattr(op.fold_constance, '__func__', None) is Operator.fold_constance:
-                # fold_constance is not implemented
-                continue
+        if sum(y.size for y in op.outputs.values()) > sum(x.size for x in op.inputs.values()):
+            return False
 
-            if all(isinstance(v, ConstantVariable) for v in op.inputs.values()):
-                op.fold_constance()
-                flag_changed = True
+        outputs = numpy_executor.execute_operator(op, {name: x.data for name, x in op.inputs.items()})
+        ys = dict(op.outputs)
+        op.remove_all()
+        for name, y in ys.items():
+            y.replace(ConstantVariable(outputs[name], y.order))
 
-        return graph, flag_changed
+        return True
@@ -0,0 +1,76 @@
+from typing import Tuple
+
+from webdnn.graph import traverse
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.lstm import LSTM
+from webdnn.graph.operators.sgemm import Sgemm
+from webdnn.graph.optimize_rule import OptimizeRule
+from webdnn.graph.order import OrderNTC, OrderCN, OrderNC
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util import flags
+
+
+class HoistLSTMInputProjection(OptimizeRule):
+    """
+    In LSTM, gate signals at time :code:`t` are calculated as follows:
+
+        v_t = W_input * x_t + W_hidden * h_{t-1} + b
+
+    The first term does not depend on the previous hidden state, so it can be calculated for all timesteps before the recurrent loop, as
+    single SGEMM whose M is :code:`N * T` (:code:`x` with OrderNTC is regarded as a matrix with shape :code:`[N * T, C1]`).
+
+    .. code-block:: text
+
+              x -+
+                 +-{Sgemm}- x_projected -+
+        w_input -+                       +-{LSTM}- y
+                             w_hidden ---+
+
+    This optimize rule replaces inputs :code:`x` and :code:`w_input` of LSTM by :code:`x_projected` (OrderNTC, shape is
+    :code:`[N, T, 4 * C2]`). Backend kernels compute only :code:`W_hidden * h_{t-1}` in the recurrent loop.
+    """
+
+    def flags(self):
+        return [
+            flags.optimize.OPTIMIZE,
+            flags.optimize.HOIST_LSTM_INPUT_PROJECTION
+        ]
+
+    def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
+        flag_changed = False
+        for lstm in traverse.filter_nodes(traverse.listup_operators(graph), LSTM):  # type: LSTM
+            if "x" not in lstm.inputs or "w_input" not in lstm.inputs:
+                continue
+
+            x = lstm.inputs["x"]
+            w_input = lstm.inputs["w_input"]
+            if x.order != OrderNTC:
+                continue
+
+            if isinstance(w_input, ConstantVariable):
+                w_input.change_order(OrderCN)
+
+            elif w_input.order != OrderCN and w_input.order != OrderNC:
+                continue
+
+            N = x.shape_dict[Axis.N]
+            T = x.shape_dict[Axis.T]
+            C1 = x.shape_dict[Axis.C]
+            C2_4 = w_input.shape_dict[Axis.N]
+
+            x_projected, = Sgemm(None,
+                                 M=N * T,
+                                 N=C2_4,
+                                 K=C1,
+                                 out_shape=[N, T, C2_4],
+                                 out_order=OrderNTC,
+                                 transpose_A=True,
+                                 transpose_B=w_input.order == OrderCN)(x, w_input)
+
+            lstm.remove_input(x)
+            lstm.remove_input(w_input)
+            lstm.append_input("x_projected", x_projected)
+            flag_changed = True
+
+        return graph, flag_changed
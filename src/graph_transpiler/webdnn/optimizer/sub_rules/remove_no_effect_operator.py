@@ -1,9 +1,6 @@
-from typing import Tuple, Type
-
 import numpy as np
 
 from webdnn.frontend.constraints import AxisVar
-from webdnn.graph import traverse
 from webdnn.graph.graph import Graph
 from webdnn.graph.operator import Operator
 from webdnn.graph.operators.broadcast import Broadcast
@@ -19,7 +16,7 @@ from webdnn.graph.operators.scalar_affine import ScalarAffine
 from webdnn.graph.operators.scalar_mul import ScalarMul
 from webdnn.graph.operators.scalar_pow import ScalarPow
 from webdnn.graph.operators.transpose import Transpose
-from webdnn.graph.optimize_rule import OptimizeRule, OptimizeRuleGroup
+from webdnn.graph.optimize_rule import OptimizeRule, OptimizeRuleGroup, OperatorOptimizeRule
 from webdnn.graph.variable import Variable
 from webdnn.graph.variables.constant_variable import ConstantVariable
 from webdnn.util import flags
@@ -55,9 +52,7 @@ def _remove_binary_elementwise(graph: Graph, op: Operator, v: Variable):
     OptimizeRule.replace_variable(graph, v, y, with_assert=False)
 
 
-class RemoveNoEffectOperatorBase(OptimizeRule):
-    pattern = Operator  # type: Type[Operator]
-
+class RemoveNoEffectOperatorBase(OperatorOptimizeRule):
     def flags(self):
         return [
             flags.optimize.OPTIMIZE,
@@ -65,17 +60,6 @@ class RemoveNoEffectOperatorBase(OptimizeRule):
             flags.optimize.REMOVE_NO_EFFECT_OPERATOR
         ]
 
-    def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
-        flag_changed = False
-
-        for op in traverse.filter_nodes(traverse.listup_operators(graph), self.pattern):  # type: Operator
-            flag_changed |= self.optimize_operator(graph, op)
-
-        return graph, flag_changed
-
-    def optimize_operator(self, graph: Graph, op: Operator):
-        raise NotImplementedError
-
 
 class RemoveScalarAdd(RemoveNoEffectOperatorBase):
     pattern = ScalarAdd
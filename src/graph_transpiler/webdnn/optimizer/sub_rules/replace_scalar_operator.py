@@ -1,22 +1,20 @@
-from typing import Tuple
-
 import numpy as np
 
-from webdnn.graph import traverse
 from webdnn.graph.graph import Graph
 from webdnn.graph.operators.scalar_add import ScalarAdd
 from webdnn.graph.operators.scalar_affine import ScalarAffine
 from webdnn.graph.operators.scalar_mul import ScalarMul
-from webdnn.graph.optimize_rule import OptimizeRule, OptimizeRuleGroup
+from webdnn.graph.optimize_rule import OptimizeRuleGroup, OperatorOptimizeRule
 from webdnn.graph.placeholder import Placeholder
 from webdnn.graph.variables.constant_variable import ConstantVariable
 from webdnn.util import flags
 
 
-class ReplaceScalarAffine(OptimizeRule):
+class ReplaceScalarAffine(OperatorOptimizeRule):
     """
     Replace :class:`ScalarAffine` into :class:`ElementwiseMul` and :class:`ElementwiseAdd`
     """
+    pattern = ScalarAffine
 
     def flags(self):
         return [
@@ -25,33 +23,29 @@ class ReplaceScalarAffine(OptimizeRule):
             flags.optimize.REPLACE_SCALAR_OPERATOR
         ]
 
-    def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
-        flag_changed = False
-        for op in traverse.filter_nodes(traverse.listup_operators(graph), ScalarAffine):  # type: ScalarAffine
-            x = op.inputs["x0"]
-            y = op.outputs["y"]
-
-            if not Placeholder.check_resolved(x.size) or not Placeholder.check_resolved(y.size):
-                continue
+    def optimize_operator(self, graph: Graph, op: ScalarAffine):
+        x = op.inputs["x0"]
+        y = op.outputs["y"]
 
-            op.remove_all()
+        if not Placeholder.check_resolved(x.size) or not Placeholder.check_resolved(y.size):
+            return False
 
-            scale = ConstantVariable(np.ones(x.shape) * op.scale, x.order)
-            bias = ConstantVariable(np.ones(x.shape) * op.bias, x.order)
+        op.remove_all()
 
-            y_dummy = x * scale + bias
-            y_dummy.change_order(y.order)
-            y_dummy.replace(y)
+        scale = ConstantVariable(np.ones(x.shape) * op.scale, x.order)
+        bias = ConstantVariable(np.ones(x.shape) * op.bias, x.order)
 
-            flag_changed = True
+        y_dummy = x * scale + bias
+        y_dummy.change_order(y.order)
+        y_dummy.replace(y)
+        return True
 
-        return graph, flag_changed
 
-
-class ReplaceScalarAdd(OptimizeRule):
+class ReplaceScalarAdd(OperatorOptimizeRule):
     """
     Replace :class:`ScalarAdd` into :class:`ElementwiseAdd`
     """
+    pattern = ScalarAdd
 
     def flags(self):
         return [
@@ -60,32 +54,28 @@ class ReplaceScalarAdd(OptimizeRule):
             flags.optimize.REPLACE_SCALAR_OPERATOR
         ]
 
-    def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
-        flag_changed = False
-        for op in traverse.filter_nodes(traverse.listup_operators(graph), ScalarAdd):  # type: ScalarAdd
-            x = op.inputs["x0"]
-            y = op.outputs["y"]
-
-            if not Placeholder.check_resolved(x.size) or not Placeholder.check_resolved(y.size):
-                continue
+    def optimize_operator(self, graph: Graph, op: ScalarAdd):
+        x = op.inputs["x0"]
+        y = op.outputs["y"]
 
-            op.remove_all()
+        if not Placeholder.check_resolved(x.size) or not Placeholder.check_resolved(y.size):
+            return False
 
-            value = ConstantVariable(np.ones(x.shape) * op.value, x.order)
+        op.remove_all()
 
-            y_dummy = x + value
-            y_dummy.change_order(y.order)
-            y_dummy.replace(y)
+        value = ConstantVariable(np.ones(x.shape) * op.value, x.order)
 
-            flag_changed = True
+        y_dummy = x + value
+        y_dummy.change_order(y.order)
+        y_dummy.replace(y)
+        return True
 
-        return graph, flag_changed
 
-
-class ReplaceScalarMul(OptimizeRule):
+class ReplaceScalarMul(OperatorOptimizeRule):
     """
     Replace :class:`ScalarMul` into :class:`ElementwiseMul`
     """
+    pattern = ScalarMul
 
     def flags(self):
         return [
@@ -94,26 +84,21 @@ class ReplaceScalarMul(OptimizeRule):
             flags.optimize.REPLACE_SCALAR_OPERATOR
         ]
 
-    def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
-        flag_changed = False
-        for op in traverse.filter_nodes(traverse.listup_operators(graph), ScalarMul):  # type: ScalarMul
-            x = op.inputs["x0"]
-            y = op.outputs["y"]
-
-            if not Placeholder.check_resolved(x.size) or not Placeholder.check_resolved(y.size):
-                continue
-
-            op.remove_all()
+    def optimize_operator(self, graph: Graph, op: ScalarMul):
+        x = op.inputs["x0"]
+        y = op.outputs["y"]
 
-            value = ConstantVariable(np.ones(x.shape) * op.value, x.order)
+        if not Placeholder.check_resolved(x.size) or not Placeholder.check_resolved(y.size):
+            return False
 
-            y_dummy = x * value
-            y_dummy.change_order(y.order)
-            y_dummy.replace(y)
+        op.remove_all()
 
-            flag_changed = True
+        value = ConstantVariable(np.ones(x.shape) * op.value, x.order)
 
-        return graph, flag_changed
+        y_dummy = x * value
+        y_dummy.change_order(y.order)
+        y_dummy.replace(y)
+        return True
 
 
 class ReplaceScalarOperator(OptimizeRuleGroup):
@@ -7,3 +7,8 @@ DEBUG = os.environ.get("DEBUG", "0") == "1"
 VISUALIZE_MEMORY_ALLOCATION = os.environ.get("VISUALIZE_MEMORY_ALLOCATION", "0") == "1"
 AGGRESSIVE_ORDER_INFERENCE = os.environ.get("AGGRESSIVE_ORDER_INFERENCE", "1") == "1"
 AUTO_UPGRADE_OPERATOR_TYPE = os.environ.get("AUTO_UPGRADE_OPERATOR_TYPE", "1") == "1"
+ENCODER_NUM_WORKERS = int(os.environ.get("ENCODER_NUM_WORKERS", "0"))  # 0 means the number of CPUs
+PROFILE = os.environ.get("PROFILE", "0") == "1"
+WEBASSEMBLY_COMPILER = os.environ.get("WEBASSEMBLY_COMPILER", "em++")
+WEBASSEMBLY_COMPILE_CACHE = os.environ.get("WEBASSEMBLY_COMPILE_CACHE", "~/.cache/webdnn/webassembly")  # empty string disables cache
+CONSTANT_MEMMAP_THRESHOLD = int(os.environ.get("CONSTANT_MEMMAP_THRESHOLD", str(64 * 1024 * 1024)))  # in bytes
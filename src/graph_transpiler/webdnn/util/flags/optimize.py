@@ -15,6 +15,7 @@ MERGE_SGEMM_AND_ELEMENTWISE_MUL = os.environ.get("MERGE_SGEMM_AND_ELEMENTWISE_MU
 OPTIMIZE_CHANNEL_MODE = os.environ.get("OPTIMIZE_CHANNEL_MODE", "1") == "1"
 EXTRACT_UNIFORM_LITERAL = os.environ.get("EXTRACT_UNIFORM_LITERAL", "0") == "1"
 CONSTANT_FOLDING = os.environ.get("CONSTANT_FOLDING", "1") == "1"
+HOIST_LSTM_INPUT_PROJECTION = os.environ.get("HOIST_LSTM_INPUT_PROJECTION", "1") == "1"
 
 # compression
 CONV_FILTER_PRUNING = os.environ.get("CONV_FILTER_PRUNING", "0") == "1"
@@ -24,6 +25,8 @@ CONV_SVD_COMPRESSION = os.environ.get("CONV_SVD_COMPRESSION", "0") == "1"
 VALIDATE_GENERATED_SOURCE = os.environ.get("VALIDATE_GENERATED_SOURCE", "1") == "1"
 OPTIMIZE_INPLACE_OPERATION = os.environ.get("OPTIMIZE_INPLACE_OPERATION", "1") == "1"
 OPTIMIZE_MEMORY_ALLOCATION = os.environ.get("OPTIMIZE_MEMORY_ALLOCATION", "1") == "1"
+MEMORY_ALLOCATION_PLANNER = os.environ.get("MEMORY_ALLOCATION_PLANNER", "greedy")  # "greedy" or "merge_table"
+MEMORY_ALLOCATION_COMPARE_PLANNERS = os.environ.get("MEMORY_ALLOCATION_COMPARE_PLANNERS", "0") == "1"
 
 # webgl backend
 WEBGL_OPTIMIZE_TEXTURE_SIZE = os.environ.get("WEBGL_OPTIMIZE_TEXTURE_SIZE", "1") == "1"
@@ -1,6 +1,27 @@
+import sys
+from contextlib import contextmanager
 from functools import reduce
 from typing import Iterable
 
 
 def mul(iterable: Iterable, start=1, func=lambda x, y: x * y):
     return reduce(func, iterable, start)
+
+
+@contextmanager
+def recursion_limit(limit: int):
+    """recursion_limit(limit)
+
+    Context manager which raises the recursion limit temporarily. Use this only around calls which recurse along the graph (ex.
+    :func:`pickle.dumps` of deep graph), instead of raising the limit of whole process.
+
+    Args:
+        limit: the recursion limit. If the current limit is larger, it is not changed.
+    """
+    original = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, original))
+    try:
+        yield
+
+    finally:
+        sys.setrecursionlimit(original)
@@ -0,0 +1,264 @@
+"""
+Profiler of the conversion pipeline
+
+Each phase of the conversion (optimize rules, memory allocation, generator handlers, constant encoding, and so on) is recorded by
+:func:`profile` while a :class:`Profiler` is active.
+
+.. code::
+
+    with Profiler() as profiler:
+        generate_descriptor("webgpu", graph)
+
+    print(profiler.report())
+    profiler.save_chrome_trace("trace.json")  # can be opened with chrome://tracing
+
+When environment variable :code:`PROFILE=1` is set, a profiler is activated on import and the report is printed at exit.
+"""
+import atexit
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+from webdnn.util import flags, console
+from webdnn.util.json import json
+
+_active_profilers = []  # type: List[Profiler]
+
+
+class ProfileRecord:
+    """
+    A single execution of a profiled phase.
+
+    Attributes:
+        category (str): category of the phase (ex. "optimize_rule", "allocator")
+        name (str): name of the phase
+        start (float): start time in seconds
+        duration (float): elapsed time in seconds
+        changed (bool or None): whether the graph is changed or not. `None` means unknown.
+        node_delta (int or None): change of the number of nodes in the graph. `None` means unknown.
+    """
+
+    def __init__(self, category: str, name: str, start: float):
+        self.category = category
+        self.name = name
+        self.start = start
+        self.duration = 0.0
+        self.changed = None  # type: Optional[bool]
+        self.node_delta = None  # type: Optional[int]
+
+
+class ProfileSummary:
+    """
+    Aggregated records of the phase with same category and name.
+    """
+
+    def __init__(self, category: str, name: str):
+        self.category = category
+        self.name = name
+        self.calls = 0
+        self.changed = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.node_delta = 0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls > 0 else 0.0
+
+
+_SORT_KEYS = {
+    "total": lambda s: -s.total,
+    "mean": lambda s: -s.mean,
+    "max": lambda s: -s.max,
+    "calls": lambda s: -s.calls,
+    "changed": lambda s: -s.changed,
+    "name": lambda s: (s.category, s.name)
+}
+
+
+class Profiler:
+    """Profiler()
+
+    Records all phases profiled by :func:`profile` while this profiler is active. Profilers are activated by :code:`with` statement, and
+    can be nested.
+
+    Attributes:
+        records (list of :class:`ProfileRecord`): recorded phases in order of start time
+    """
+
+    def __init__(self):
+        self.records = []  # type: List[ProfileRecord]
+
+    def __enter__(self):
+        _active_profilers.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _active_profilers.remove(self)
+
+    def summary(self, sort_by: str = "total") -> List[ProfileSummary]:
+        """summary(sort_by="total")
+
+        Args:
+            sort_by (str): sort key, one of "total", "mean", "max", "calls", "changed" and "name"
+
+        Returns:
+            (list of :class:`ProfileSummary`) aggregated records
+        """
+        if sort_by not in _SORT_KEYS:
+            raise ValueError(f"[Profiler] Unknown sort key: {sort_by}")
+
+        summaries = OrderedDict()  # type: OrderedDict[Tuple[str, str], ProfileSummary]
+        for record in self.records:
+            key = (record.category, record.name)
+            if key not in summaries:
+                summaries[key] = ProfileSummary(record.category, record.name)
+
+            summary = summaries[key]
+            summary.calls += 1
+            summary.changed += 1 if record.changed else 0
+            summary.total += record.duration
+            summary.max = max(summary.max, record.duration)
+            summary.node_delta += record.node_delta or 0
+
+        return sorted(summaries.values(), key=_SORT_KEYS[sort_by])
+
+    def report(self, sort_by: str = "total") -> str:
+        """report(sort_by="total")
+
+        Returns the text table of aggregated records. Because phases are nested (ex. an optimize rule group and its sub rules), the
+        time of each row includes the time of nested phases.
+
+        Args:
+            sort_by (str): sort key, one of "total", "mean", "max", "calls", "changed" and "name"
+
+        Returns:
+            (str) text table
+        """
+        header = ("category", "name", "calls", "changed", "total[ms]", "mean[ms]", "max[ms]", "nodes")
+        rows = [(s.category, s.name, str(s.calls), str(s.changed), f"{s.total * 1000:.3f}", f"{s.mean * 1000:.3f}",
+                 f"{s.max * 1000:.3f}", f"{s.node_delta:+d}") for s in self.summary(sort_by)]
+
+        widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+
+        def format_row(row):
+            # text columns are left-aligned, and numeric columns are right-aligned
+            return "  ".join(c.ljust(w) if i < 2 else c.rjust(w) for i, (c, w) in enumerate(zip(row, widths)))
+
+        lines = [format_row(header), "  ".join("-" * w for w in widths)]
+        lines += [format_row(row) for row in rows]
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        """chrome_trace()
+
+        Returns:
+            (dict) records in Chrome Trace Event Format
+        """
+        pid = os.getpid()
+        events = []
+        for record in self.records:
+            args = {}
+            if record.changed is not None:
+                args["changed"] = record.changed
+
+            if record.node_delta is not None:
+                args["node_delta"] = record.node_delta
+
+            events.append({
+                "name": record.name,
+                "cat": record.category,
+                "ph": "X",
+                "ts": record.start * 1e6,
+                "dur": record.duration * 1e6,
+                "pid": pid,
+                "tid": 0,
+                "args": args
+            })
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, filename: str):
+        """save_chrome_trace(filename)
+
+        Save records in Chrome Trace Event Format, which can be opened with :code:`chrome://tracing`.
+
+        Args:
+            filename (str): output file name
+        """
+        with open(filename, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+class _NullRecord:
+    """
+    Record which is used when no profiler is active. Assigned values are discarded.
+    """
+    __slots__ = ["changed"]
+
+
+class _NullProfile:
+    """
+    Context manager which is returned by :func:`profile` when no profiler is active. It is shared by all calls, and records nothing.
+    """
+    __slots__ = ["record"]
+
+    def __init__(self):
+        self.record = _NullRecord()
+
+    def __enter__(self):
+        return self.record
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+
+_null_profile = _NullProfile()
+
+
+def _count_nodes(graph) -> int:
+    from webdnn.graph import traverse
+
+    return len(traverse.listup_nodes(graph))
+
+
+def profile(category: str, name: str, graph=None):
+    """profile(category, name, graph=None)
+
+    Context manager to record the phase into active profilers. If no profiler is active, nothing is recorded and a shared no-op context
+    manager is returned.
+
+    The yielded record has :code:`changed` attribute, which can be set to record whether the graph is changed or not.
+
+    Args:
+        category (str): category of the phase
+        name (str): name of the phase
+        graph (:class:`~webdnn.Graph`): if specified, the change of the number of nodes in the graph is also recorded.
+    """
+    if len(_active_profilers) == 0:
+        return _null_profile
+
+    return _profile(category, name, graph)
+
+
+@contextmanager
+def _profile(category: str, name: str, graph=None):
+    num_nodes = None if graph is None else _count_nodes(graph)
+    record = ProfileRecord(category, name, time.perf_counter())
+    for profiler in _active_profilers:
+        profiler.records.append(record)
+
+    try:
+        yield record
+
+    finally:
+        record.duration = time.perf_counter() - record.start
+        if graph is not None:
+            record.node_delta = _count_nodes(graph) - num_nodes
+
+
+if flags.PROFILE:
+    _default_profiler = Profiler().__enter__()
+    atexit.register(lambda: console.stderr(_default_profiler.report()))
@@ -19,7 +19,7 @@ def test_general():
 
     generate_kernel_test_case(
         description=f"Embedding",
-        backend=["webgpu"],
+        backend=["webgpu", "webgl"],
         graph=Graph([x], [y]),
         inputs={x: vx},
         expected={y: vy}
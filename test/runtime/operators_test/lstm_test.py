@@ -53,7 +53,7 @@ def test_t_is_1():
 
     generate_kernel_test_case(
         description=f"LSTM t=1",
-        backend=["webassembly", "webgpu"],
+        backend=["webassembly", "webgpu", "webgl"],
         graph=Graph([x], [y, c_out]),
         inputs={x: vx},
         expected={y: vh, c_out: vc_out},
@@ -96,7 +96,7 @@ def test_t_is_5():
 
     generate_kernel_test_case(
         description=f"LSTM t=5",
-        backend=["webassembly", "webgpu"],
+        backend=["webassembly", "webgpu", "webgl"],
         graph=Graph([x], [y, c_out]),
         inputs={x: vx},
         expected={y: vh, c_out: vc_out},
@@ -139,7 +139,7 @@ def test_t_is_10():
 
     generate_kernel_test_case(
         description=f"LSTM t=10",
-        backend=["webassembly", "webgpu"],
+        backend=["webassembly", "webgpu", "webgl"],
         graph=Graph([x], [y, c_out]),
         inputs={x: vx},
         expected={y: vh, c_out: vc_out},
@@ -185,7 +185,7 @@ def test_t_is_10_nonzero_c():
 
     generate_kernel_test_case(
         description=f"LSTM t=10 initial_c,initial_h=nonzero",
-        backend=["webassembly", "webgpu"],
+        backend=["webassembly", "webgpu", "webgl"],
         graph=Graph([x], [y, c_out]),
         inputs={x: vx},
         expected={y: vh, c_out: vc_out},
@@ -233,7 +233,7 @@ def test_t_is_10_nonzero_c_sequence_output():
 
     generate_kernel_test_case(
         description=f"LSTM t=10 initial_c,initial_h=nonzero sequence_out",
-        backend=["webassembly", "webgpu"],
+        backend=["webassembly", "webgpu", "webgl"],
         graph=Graph([x], [y, c_out]),
         inputs={x: vx},
         expected={y: vh, c_out: vc_out},
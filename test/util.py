@@ -1,4 +1,5 @@
 import atexit
+import os
 import os.path as path
 import shutil
 from typing import Dict, List
@@ -6,13 +7,15 @@ from unittest import SkipTest
 
 import numpy as np
 
+from webdnn.backend.fallback.runner import FallbackRunner, assert_allclose
 from webdnn.backend.interface.generator import generate_descriptor
 from webdnn.graph import traverse
 from webdnn.graph.axis import Axis, AxisKeyDict
 from webdnn.graph.graph import Graph
 from webdnn.graph.order import OrderNC
+from webdnn.graph.placeholder import Placeholder
 from webdnn.graph.variable import Variable
-from webdnn.util import flags
+from webdnn.util import flags, console
 from webdnn.util.json import json
 
 
@@ -91,9 +94,9 @@ def wrap_template(fn, arg_name="description"):
 class KernelTestCaseGenerator:
     OUTPUT_ROOT: str = path.join(path.dirname(__file__), "../build/test")
     cases: List[Dict[str, any]] = []
-    concatenated_data: bytes = b""
+    data_file = None
+    data_size = 0
     flag_initialized = False
-    use_separate_data = True
     counter = 0
 
     @classmethod
@@ -101,7 +104,10 @@ class KernelTestCaseGenerator:
         if path.exists(cls.OUTPUT_ROOT):
             shutil.rmtree(cls.OUTPUT_ROOT)
 
-        cls.use_separate_data = True
+        # Test data is streamed into the file instead of being concatenated in memory
+        os.makedirs(cls.OUTPUT_ROOT, exist_ok=True)
+        cls.data_file = open(path.join(cls.OUTPUT_ROOT, "./master.json.bin"), "wb")
+        cls.data_size = 0
 
         cls.flag_initialized = True
 
@@ -117,7 +123,8 @@ class KernelTestCaseGenerator:
                                   ABS_EPS: float = 0.0):
         """Generate test data for generated kernel codes
     
-        Generated data are saved in JSON format, and BrowserTestRunner executes it.
+        Generated data are saved in JSON format, and BrowserTestRunner executes it. If :code:`TEST_FALLBACK_RUNNER=1`, fallback backend
+        test cases are also executed in this process by :class:`~webdnn.backend.fallback.runner.FallbackRunner`.
         """
 
         if not cls.flag_initialized:
@@ -163,49 +170,79 @@ class KernelTestCaseGenerator:
         with open(path.join(output_root, "./cg.dot"), "w") as f:
             f.write(traverse.dump_dot(graph_descriptor.graph))
 
-        if cls.use_separate_data:
-            cls.cases.append({
-                "description": description,
-                "inputs_ref": [cls.add_data(inputs[v]) for v in graph.inputs],
-                "expected_ref": [cls.add_data(expected[v]) for v in graph.outputs],
-                "dirname": testcase_dirname,
-                "backend": backend,
-                "EPS": EPS,
-                "ABS_EPS": ABS_EPS
-            })
-        else:
-            cls.cases.append({
-                "description": description,
-                "inputs": [inputs[v].flatten().tolist() for v in graph.inputs],
-                "expected": [expected[v].flatten().tolist() for v in graph.outputs],
-                "dirname": testcase_dirname,
-                "backend": backend,
-                "EPS": EPS,
-                "ABS_EPS": ABS_EPS
-            })
+        if backend == "fallback" and flags.test.TEST_FALLBACK_RUNNER:
+            run_fallback_test_case(output_root, description, [inputs[v] for v in graph.inputs], [expected[v] for v in graph.outputs],
+                                   EPS, ABS_EPS, placeholders=_get_placeholder_values(graph, inputs))
+
+        cls.cases.append({
+            "description": description,
+            "inputs_ref": [cls.add_data(inputs[v]) for v in graph.inputs],
+            "expected_ref": [cls.add_data(expected[v]) for v in graph.outputs],
+            "dirname": testcase_dirname,
+            "backend": backend,
+            "EPS": EPS,
+            "ABS_EPS": ABS_EPS
+        })
 
         if raise_skip:
             raise SkipTest(f"[BrowserTest|{backend}] {description}")
 
     @classmethod
     def add_data(cls, ary: np.ndarray) -> dict:
-        byte_offset = len(cls.concatenated_data)
-        ary = ary.astype(np.float32)
-        length = ary.size
-        cls.concatenated_data += ary.tobytes()
-        return {"byte_offset": byte_offset, "length": length}
+        byte_offset = cls.data_size
+        ary = np.ascontiguousarray(ary, dtype=np.float32)
+        cls.data_file.write(ary.data)
+        cls.data_size += ary.nbytes
+        return {"byte_offset": byte_offset, "length": ary.size}
 
     @classmethod
     def clean_up_callback(cls):
+        if cls.data_file is not None:
+            cls.data_file.close()
+            cls.data_file = None
+
         if len(cls.cases) == 0:
             return
 
         with open(path.join(cls.OUTPUT_ROOT, "./master.json"), "w") as f:
             json.dump(cls.cases, f)
 
-        if cls.use_separate_data:
-            with open(path.join(cls.OUTPUT_ROOT, "./master.json.bin"), "wb") as f:
-                f.write(cls.concatenated_data)
+
+def _get_placeholder_values(graph: Graph, inputs: Dict[Variable, np.array]) -> Dict[str, int]:
+    """
+    Placeholders in input variables' shapes are resolved by the shapes of given input data.
+    """
+    values = {}
+    for v in graph.inputs:
+        for size, actual_size in zip(v.shape, inputs[v].shape):
+            if isinstance(size, Placeholder) and not size.is_resolved and size.dependency is None:
+                values[size.label] = actual_size
+
+    return values
+
+
+def run_fallback_test_case(dirname: str, description: str, inputs: List[np.ndarray], expected: List[np.ndarray], EPS: float,
+                           ABS_EPS: float, placeholders: Dict[str, int] = None):
+    """run_fallback_test_case(dirname, description, inputs, expected, EPS, ABS_EPS, placeholders=None)
+
+    Execute saved fallback descriptor without web browser, and check the outputs with the same criterion as BrowserTestRunner.
+    """
+    runner = FallbackRunner(dirname, placeholders=placeholders)
+    try:
+        outputs = runner.run(inputs)
+
+    finally:
+        runner.close()
+
+    console.debug(f"[FallbackRunner] {description}: " +
+                  ", ".join(f"{name}={elapsed * 1000:.3f}ms" for name, elapsed in runner.timings))
+
+    for y, e in zip(outputs, expected):
+        try:
+            assert_allclose(e, y, EPS, ABS_EPS)
+
+        except AssertionError as err:
+            raise AssertionError(f"[FallbackRunner] {description}: {err}")
 
 
 atexit.register(KernelTestCaseGenerator.clean_up_callback)
@@ -0,0 +1,230 @@
+import numpy as np
+
+from webdnn.backend.code_generator.allocator import Allocation, _optimize_buffer_reuse_greedy, \
+    _optimize_buffer_reuse_merge_table, _peak_size, allocate, BufferType
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.attributes.inplace import InplaceOperator
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.order import OrderNC
+from webdnn.graph.placeholder import Placeholder
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util import flags
+
+
+def _check_no_conflict(allocations):
+    for i, a1 in enumerate(allocations):
+        for a2 in allocations[i + 1:]:
+            if a1.end <= a2.begin or a2.end <= a1.begin:
+                continue
+
+            assert a1.offset + a1.size <= a2.offset or a2.offset + a2.size <= a1.offset, \
+                f"{a1.name}[{a1.offset}, {a1.offset + a1.size}) and {a2.name}[{a2.offset}, {a2.offset + a2.size}) are conflicted"
+
+
+def _generate_allocations(n: int, t_max: int, seed: int):
+    rand = np.random.RandomState(seed)
+    allocations = []
+    for _ in range(n):
+        begin = int(rand.randint(0, t_max - 1))
+        end = int(rand.randint(begin + 1, min(begin + 5, t_max) + 1))
+        allocations.append(Allocation(size=int(rand.randint(1, 100)), begin=begin, end=end))
+
+    return sorted(allocations, key=lambda a: (-a.size, a.begin, a.end, a.name))
+
+
+def test_greedy():
+    allocations = [
+        Allocation(size=5, begin=0, end=2),
+        Allocation(size=4, begin=2, end=4),
+        Allocation(size=3, begin=0, end=5),
+        Allocation(size=2, begin=3, end=5),
+        Allocation(size=1, begin=6, end=8)
+    ]
+
+    _optimize_buffer_reuse_greedy(allocations)
+
+    _check_no_conflict(allocations)
+    assert _peak_size(allocations) <= 5 + 4 + 3 + 2 + 1
+
+
+def test_greedy_random():
+    for seed in range(5):
+        allocations = _generate_allocations(n=100, t_max=50, seed=seed)
+        _optimize_buffer_reuse_greedy(allocations)
+        _check_no_conflict(allocations)
+
+
+def test_greedy_not_larger_than_merge_table():
+    total_size_merge_table = 0
+    total_size_greedy = 0
+
+    for seed in range(10):
+        allocations = _generate_allocations(n=50, t_max=30, seed=seed)
+
+        _optimize_buffer_reuse_merge_table(allocations)
+        total_size_merge_table += _peak_size(allocations)
+
+        _optimize_buffer_reuse_greedy(allocations)
+        total_size_greedy += _peak_size(allocations)
+
+    assert total_size_greedy <= total_size_merge_table, f"greedy={total_size_greedy}, merge_table={total_size_merge_table}"
+
+
+def test_allocate_sequential():
+    v = Variable((4, 8), OrderNC)
+    x = v
+    for _ in range(10):
+        x, = Relu(None)(x)
+
+    layout = allocate(Graph([v], [x]))
+
+    # input and output are alive always, and intermediate variables can be placed in at most 2 buffers.
+    assert layout.static_size <= 4 * 8 * 4
+
+
+def test_allocate_dynamic_sequential():
+    N = Placeholder(label="N")
+    v = Variable((N, 8), OrderNC)
+    x = v
+    for _ in range(10):
+        x, = Relu(None)(x)
+
+    layout = allocate(Graph([v], [x]))
+
+    assert all(layout[v].buffer_type == BufferType.Dynamic for v in layout.allocations.keys())
+    assert layout.dynamic_size == N * 24
+
+    N.value = 2
+    allocations = list(set(layout.allocations.values()))
+    for i, a1 in enumerate(allocations):
+        for a2 in allocations[i + 1:]:
+            if a1.end <= a2.begin or a2.end <= a1.begin:
+                continue
+
+            offset1, size1 = Placeholder.force_int(a1.offset), Placeholder.force_int(a1.size)
+            offset2, size2 = Placeholder.force_int(a2.offset), Placeholder.force_int(a2.size)
+            assert offset1 + size1 <= offset2 or offset2 + size2 <= offset1
+
+
+def test_report_static():
+    v = Variable((4, 8), OrderNC)
+    x = v
+    for _ in range(10):
+        x, = Relu(None)(x)
+
+    report = allocate(Graph([v], [x])).report
+
+    assert report.num_steps == 10
+    assert len(report.static.timeline) == 10
+    assert report.static.peak_live_size == max(report.static.timeline)
+    assert report.static.peak_live_size <= report.static.size
+    assert 0 <= report.static.fragmentation < 1
+    assert report.static.size_without_reuse == report.static.num_allocations * 4 * 8 * 4
+    assert report.static.reuse_ratio >= 1
+    assert report.static.inplace_merges == report.static.num_variables - report.static.num_allocations
+    assert v.name in report.static.peak_variables
+    assert report.dynamic == []
+
+
+def _relu_chain_graph():
+    v = Variable((4, 8), OrderNC)
+    x = v
+    for _ in range(10):
+        x, = Relu(None)(x)
+
+    return Graph([v], [x])
+
+
+def test_report_planner_static_sizes():
+    layout = allocate(_relu_chain_graph())
+
+    assert list(layout.planner_static_sizes.keys()) == [flags.optimize.MEMORY_ALLOCATION_PLANNER]
+    assert layout.planner_static_sizes[flags.optimize.MEMORY_ALLOCATION_PLANNER] == layout.report.static.size
+    assert layout.report.planner_static_sizes == layout.planner_static_sizes
+
+
+def test_report_planner_static_sizes_compare():
+    flag_backup = flags.optimize.MEMORY_ALLOCATION_COMPARE_PLANNERS
+    flags.optimize.MEMORY_ALLOCATION_COMPARE_PLANNERS = True
+    try:
+        layout = allocate(_relu_chain_graph())
+
+    finally:
+        flags.optimize.MEMORY_ALLOCATION_COMPARE_PLANNERS = flag_backup
+
+    assert set(layout.planner_static_sizes.keys()) == {"greedy", "merge_table"}
+    assert layout.planner_static_sizes[flags.optimize.MEMORY_ALLOCATION_PLANNER] == layout.report.static.size
+
+
+def test_allocate_dynamic_inplace():
+    N = Placeholder(label="N")
+    v = Variable((N, 8), OrderNC)
+    x = v
+    for _ in range(3):
+        op = Relu(None)
+        x, = op(x)
+        op.get_attribute(InplaceOperator)[0].toggle_status(True)
+
+    layout = allocate(Graph([v], [x]))
+
+    assert layout[v] is layout[x]
+    assert layout[v].buffer_type == BufferType.Dynamic
+    assert layout[v].size == N * 8
+    N.value = 3
+    assert layout.dynamic_size == 24
+
+
+def test_report_dynamic():
+    N = Placeholder(label="N")
+    v = Variable((N, 8), OrderNC)
+    x = v
+    for _ in range(10):
+        x, = Relu(None)(x)
+
+    layout = allocate(Graph([v], [x]))
+    report = layout.report
+
+    assert report.static.size == 0
+    assert len(report.dynamic) == 1
+    assert report.dynamic[0].term == "<N>"
+    assert report.dynamic[0].size * N == layout.dynamic_size * 4
+    assert report.dynamic[0].peak_live_size <= report.dynamic[0].size
+
+
+def test_allocate_aligned():
+    v = Variable((3, 5), OrderNC)
+    w1 = ConstantVariable(np.random.rand(3, 5), OrderNC)
+    w2 = ConstantVariable(np.random.rand(3, 5), OrderNC)
+    x = v * w1
+    x = x + w2
+    x, = Relu(None)(x)
+
+    layout = allocate(Graph([v], [x]), alignment=4)
+
+    assert all(a.offset % 4 == 0 for a in layout.allocations.values())
+    assert all(layout.is_aligned(v) for v in layout.allocations.keys())
+    _check_no_conflict(list(set(layout.allocations.values())))
+
+    # each constant (15 elements) is padded to 16 elements
+    assert layout.data.size == 32
+    assert np.array_equal(layout.data[layout[w1].offset:layout[w1].offset + 15], w1.data.ravel())
+    assert np.array_equal(layout.data[layout[w2].offset:layout[w2].offset + 15], w2.data.ravel())
+    assert layout.data[15] == 0 and layout.data[31] == 0
+    assert layout.report.alignment == 16
+    assert layout.report.constant_padding_size == 2 * 4
+    assert layout.report.static.padding_size == layout.report.static.num_allocations * 4
+
+
+def test_allocate_dynamic_aligned():
+    N = Placeholder(label="N")
+    v = Variable((N, 3), OrderNC)
+    x = v
+    for _ in range(10):
+        x, = Relu(None)(x)
+
+    layout = allocate(Graph([v], [x]), alignment=4)
+
+    assert all(layout.is_aligned(v) for v in layout.allocations.keys())
+    N.value = 3
+    assert all(Placeholder.force_int(a.offset) % 4 == 0 for a in layout.allocations.values())
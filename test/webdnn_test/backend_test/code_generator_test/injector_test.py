@@ -0,0 +1,57 @@
+from webdnn.backend.code_generator.injector import Injector, Tag, parse_template, parse_raw_template
+from webdnn.backend.code_generator.injectors.buffer_injector import BufferInjector, _flatten
+from webdnn.backend.code_generator.injectors.kernel_name_injector import KernelNameInjector
+
+
+class EchoInjector(Injector):
+    def __init__(self):
+        self.tags = []
+
+    def inject_tag(self, tag: Tag):
+        self.tags.append(tag)
+        return f"<{tag.name}:{','.join(tag.args)}>"
+
+
+def test_inject():
+    injector = EchoInjector()
+    text = "a %%FOO%% b %%BAR(x, y)%%%%FOO%%"
+
+    assert injector.inject(text) == "a <FOO:> b <BAR:x,y><FOO:>"
+    assert [tag.name for tag in injector.tags] == ["FOO", "BAR", "FOO"]
+    assert injector.tags[1].args == ["x", "y"]
+    assert injector.tags[1].span == (12, 25)
+
+
+def test_inject_no_tag():
+    assert EchoInjector().inject("") == ""
+    assert EchoInjector().inject("void main() {}") == "void main() {}"
+
+
+def test_injected_value_is_not_scanned():
+    class NestedInjector(Injector):
+        def inject_tag(self, tag: Tag):
+            return "%%FOO%%"
+
+    assert NestedInjector().inject("%%BAR%%") == "%%FOO%%"
+
+
+def test_parse_raw_template_cached():
+    text = "void %%FUNC_NAME%%(%%ARGS%%) {}"
+    segments = parse_raw_template(text)
+
+    assert parse_raw_template(text) is segments
+    assert parse_template(text) is not segments
+    assert segments[0] == "void " and isinstance(segments[1], Tag) and segments[-1] == ") {}"
+
+
+def test_kernel_name_injector_not_cached():
+    parse_raw_template.cache_clear()
+    text = BufferInjector().inject("void %%FUNC_NAME%%() {}")
+    KernelNameInjector("test").inject(text)
+
+    assert parse_raw_template.cache_info().currsize == 1
+
+
+def test_flatten():
+    assert _flatten([[1, 2], 3, [[4], 5, [[6, 7]]], [8, 9]]) == [1, 2, 3, 4, 5, 6, 7, 8, 9]
+    assert _flatten([]) == []
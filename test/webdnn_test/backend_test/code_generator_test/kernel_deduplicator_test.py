@@ -0,0 +1,49 @@
+from webdnn.backend.code_generator.injectors.kernel_name_injector import KernelNameInjector
+from webdnn.backend.code_generator.kernel_deduplicator import deduplicate_kernels
+from webdnn.backend.fallback.kernel import Kernel
+
+source_template = """
+%%FUNC_NAME%%: function(input_arrays, output_arrays, option) {
+    output_arrays[0][0] = input_arrays[0][0] + %%VALUE%%;
+},
+"""
+
+
+def _generate_kernel(base_name: str, value: int = 1, name_injector: bool = True) -> Kernel:
+    source = source_template.replace("%%VALUE%%", str(value))
+    if name_injector:
+        injector = KernelNameInjector(base_name)
+        source = injector.inject(source)
+        name = injector.name
+
+    else:
+        name = base_name
+        source = source.replace("%%FUNC_NAME%%", name)
+
+    return Kernel({name: source}, name, inputs=[], outputs=[], call_option={})
+
+
+def test_deduplicate():
+    kernels = deduplicate_kernels([
+        _generate_kernel("relu"),
+        _generate_kernel("fusedelementwise"),
+        _generate_kernel("fusedelementwise", value=2),
+        _generate_kernel("relu")
+    ])
+
+    names = [kernel.exec_info.entry_func_name for kernel in kernels]
+    assert names[0] == names[1] == names[3]
+    assert names[0].startswith("relu_")
+    assert names[2].startswith("fusedelementwise_")
+
+    assert list(kernels[1].func_sources.keys()) == [names[0]]
+    assert kernels[1].func_sources[names[0]] == kernels[0].func_sources[names[0]]
+
+
+def test_fixed_name_is_not_renamed():
+    kernels = deduplicate_kernels([
+        _generate_kernel("add_one", name_injector=False),
+        _generate_kernel("increment", name_injector=False)
+    ])
+
+    assert [kernel.exec_info.entry_func_name for kernel in kernels] == ["add_one", "increment"]
@@ -0,0 +1,127 @@
+import shutil
+import tempfile
+from unittest import SkipTest
+
+import numpy as np
+from nose.tools import raises
+
+from webdnn.backend.fallback.generator import FallbackDescriptorGenerator
+from webdnn.backend.fallback.runner import FallbackRunner, assert_allclose
+from webdnn.graph import numpy_executor
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.average_pooling_2d import AveragePooling2D
+from webdnn.graph.operators.concat import Concat
+from webdnn.graph.operators.convolution2d import Convolution2D
+from webdnn.graph.operators.linear import Linear
+from webdnn.graph.operators.max_pooling_2d import MaxPooling2D
+from webdnn.graph.operators.softmax import Softmax
+from webdnn.graph.order import OrderNC, OrderNHWC, OrderHWCN, OrderCN, OrderNCHW
+from webdnn.graph.placeholder import Placeholder
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+
+def _run(graph: Graph, encoder: str = "raw"):
+    inputs = [np.random.rand(*x.shape).astype(np.float32) for x in graph.inputs]
+    expected = numpy_executor.run(graph, inputs)
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        FallbackDescriptorGenerator.generate(graph, constant_encoder_name=encoder).save(tmpdir)
+        runner = FallbackRunner(tmpdir)
+        try:
+            outputs = runner.run(inputs)
+        finally:
+            runner.close()
+
+    finally:
+        shutil.rmtree(tmpdir)
+
+    return outputs, expected, runner.timings
+
+
+def test_conv_pool_linear():
+    x = Variable((2, 8, 8, 3), OrderNHWC)
+    w1 = ConstantVariable(np.random.rand(3, 3, 3, 4), OrderHWCN)
+    w2 = ConstantVariable(np.random.rand(5, 4, 4, 4), OrderNHWC)
+    h, = Convolution2D(None, ksize=3, stride=1, padding=1)(x, w1)
+    h1, = MaxPooling2D(None, ksize=2, stride=2, padding=0)(h)
+    h2, = AveragePooling2D(None, ksize=4, stride=2, padding=1)(h)
+    h, = Concat(None, axis=Axis.C)(h1, h2)
+    h, = Convolution2D(None, ksize=1, stride=1, padding=0)(h, ConstantVariable(np.random.rand(1, 1, 8, 4), OrderHWCN))
+    h, = Linear(None)(h, w2)
+    y, = Softmax(None, axis=Axis.C)(h)
+
+    outputs, expected, timings = _run(Graph([x], [y]))
+
+    assert_allclose(expected[0], outputs[0], EPS=1e-4, ABS_EPS=1e-6)
+    assert [name for name, _ in timings] == ["convolution_2d_im2col", "max_pooling_2d", "average_pooling_2d", "concat",
+                                             "convolution_2d_im2col", "linear", "softmax"]
+
+
+def test_encoded_weight():
+    x = Variable((2, 5), OrderNC)
+    w = ConstantVariable(np.random.rand(5, 3), OrderCN)
+    y, = Linear(None)(x, w)
+
+    outputs, expected, _ = _run(Graph([x], [y]), encoder="fp16")
+
+    assert_allclose(expected[0], outputs[0], EPS=1e-2, ABS_EPS=1e-3)
+
+
+def test_elementwise_in_node():
+    if shutil.which("node") is None:
+        raise SkipTest("Node.js is not installed")
+
+    x = Variable((2, 3, 4, 5), OrderNCHW)
+    y = (x * 2 + 1) / (x + 3)
+
+    outputs, expected, timings = _run(Graph([x], [y]))
+
+    assert_allclose(expected[0], outputs[0], EPS=1e-5, ABS_EPS=1e-6)
+    assert len(timings) > 0
+
+
+@raises(AssertionError)
+def test_assert_allclose():
+    assert_allclose(np.array([1.0, 2.0]), np.array([1.0, 2.1]), EPS=1e-3)
+
+
+def _save_placeholder_graph(tmpdir: str):
+    N = Placeholder(label="N")
+    x = Variable((N, 5), OrderNC)
+    w = ConstantVariable(np.random.rand(5, 3), OrderCN)
+    y, = Linear(None)(x, w)
+    FallbackDescriptorGenerator.generate(Graph([x], [y])).save(tmpdir)
+
+    return w.data
+
+
+def test_placeholder():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        w = _save_placeholder_graph(tmpdir)
+        runner = FallbackRunner(tmpdir, placeholders={"N": 2})
+        try:
+            for n in [2, 7]:
+                runner.set_placeholder_value({"N": n})
+                x = np.random.rand(n, 5).astype(np.float32)
+                y, = runner.run([x])
+                assert_allclose(np.dot(x, w), y.reshape(n, 3), EPS=1e-4, ABS_EPS=1e-6)
+        finally:
+            runner.close()
+
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+@raises(ValueError)
+def test_placeholder_unresolved():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        _save_placeholder_graph(tmpdir)
+        FallbackRunner(tmpdir).run([np.zeros((2, 5), dtype=np.float32)])
+
+    finally:
+        shutil.rmtree(tmpdir)
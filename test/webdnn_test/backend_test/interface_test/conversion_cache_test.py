@@ -0,0 +1,75 @@
+import os
+import tempfile
+from os import path
+
+import numpy as np
+
+from webdnn.backend.interface.conversion_cache import compute_cache_key, CachedGraphExecutionData, compute_source_fingerprint
+from webdnn.backend.interface.generator import generate_descriptor
+from webdnn.graph.graph import Graph
+from webdnn.graph.order import OrderNC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+
+def _generate_graph(w: np.ndarray):
+    x = Variable((2, 3), OrderNC)
+    x.name = "x"
+    y = x * ConstantVariable(w, OrderNC)
+    y.name = "y"
+    return Graph([x], [y])
+
+
+def test_compute_cache_key():
+    w = np.arange(6).reshape(2, 3)
+    key1 = compute_cache_key("fallback", _generate_graph(w))
+    key2 = compute_cache_key("fallback", _generate_graph(w))
+    key3 = compute_cache_key("fallback", _generate_graph(w + 1))
+    key4 = compute_cache_key("webgpu", _generate_graph(w))
+    key5 = compute_cache_key("fallback", _generate_graph(w), constant_encoder_name="eightbit")
+
+    assert key1 == key2
+    assert len({key1, key3, key4, key5}) == 4
+
+
+def test_generate_descriptor_with_cache():
+    w = np.arange(6).reshape(2, 3)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache_dir = path.join(tmpdir, "cache")
+
+        result1 = generate_descriptor("fallback", _generate_graph(w), cache_dir=cache_dir)
+        assert isinstance(result1, CachedGraphExecutionData) and result1.source is not None
+        result1.save(path.join(tmpdir, "out1"))
+
+        result2 = generate_descriptor("fallback", _generate_graph(w), cache_dir=cache_dir)
+        assert isinstance(result2, CachedGraphExecutionData) and result2.source is None
+        result2.save(path.join(tmpdir, "out2"))
+
+        # Descriptor and other fields are restored from the cache
+        assert result2.backend_suffix == "fallback"
+        assert len(result2.descriptor.kernels) == len(result1.descriptor.kernels)
+        assert result2.descriptor.memory_layout.static_size == result1.descriptor.memory_layout.static_size
+
+        names = sorted(os.listdir(path.join(tmpdir, "out1")))
+        assert names == sorted(os.listdir(path.join(tmpdir, "out2")))
+        for name in names:
+            with open(path.join(tmpdir, "out1", name), "rb") as f1, open(path.join(tmpdir, "out2", name), "rb") as f2:
+                assert f1.read() == f2.read()
+
+
+def test_compute_source_fingerprint():
+    assert compute_source_fingerprint("fallback") == compute_source_fingerprint("fallback")
+    assert compute_source_fingerprint("fallback") != compute_source_fingerprint("webgpu")
+
+
+def test_generate_descriptor_with_cache_all_backends():
+    w = np.arange(6).reshape(2, 3)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for backend in ["webgpu", "webgl", "fallback"]:
+            generate_descriptor(backend, _generate_graph(w), cache_dir=tmpdir).save(path.join(tmpdir, "out"))
+
+            result = generate_descriptor(backend, _generate_graph(w), cache_dir=tmpdir)
+            assert result.source is None
+            assert result.backend_suffix == backend
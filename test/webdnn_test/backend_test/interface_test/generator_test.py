@@ -0,0 +1,26 @@
+import os
+import tempfile
+from os import path
+
+import numpy as np
+
+from webdnn.backend.interface.generator import generate_and_save_descriptors
+from webdnn.graph.graph import Graph
+from webdnn.graph.order import OrderNC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+
+def test_generate_and_save_descriptors():
+    x = Variable((2, 3), OrderNC)
+    y = x * ConstantVariable(np.arange(6).reshape(2, 3), OrderNC)
+    graph = Graph([x], [y])
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        errors = generate_and_save_descriptors(["fallback", "webgl", "unknown"], graph, tmpdir, jobs=2)
+
+        assert errors["fallback"] is None
+        assert errors["webgl"] is None
+        assert errors["unknown"] is not None
+        assert "graph_fallback.json" in os.listdir(tmpdir)
+        assert path.exists(path.join(tmpdir, "weight_fallback.bin"))
@@ -0,0 +1,134 @@
+import os
+import sys
+import tempfile
+from os import path
+
+import numpy as np
+
+from webdnn.backend.webassembly.compiler import EmscriptenCompiler
+from webdnn.backend.webassembly.generator import WebassemblyDescriptorGenerator
+from webdnn.graph.graph import Graph
+from webdnn.graph.order import OrderNC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util import flags
+
+# Stub of em++. Compiled object is the source itself, and linked output is the concatenation of objects. Each invocation is logged.
+STUB_SOURCE = """
+import sys
+
+log, args = sys.argv[1], sys.argv[2:]
+output = args[args.index("-o") + 1]
+with open(log, "a") as f:
+    f.write(("compile" if "-c" in args else "link") + "\\n")
+
+if "-c" in args:
+    with open(args[0]) as f:
+        data = f.read()
+
+else:
+    data = ""
+    for arg in args:
+        if arg.endswith(".o"):
+            with open(arg) as f:
+                data += f.read()
+
+with open(output, "w") as f:
+    f.write(data)
+
+if "WASM=1" in args:
+    with open(output[:-3] + ".wasm", "w") as f:
+        f.write(data)
+"""
+
+
+class _StubEnvironment:
+    def __init__(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.stub = path.join(self.tmpdir.name, "stub.py")
+        self.log = path.join(self.tmpdir.name, "log")
+        self.cache_dir = path.join(self.tmpdir.name, "cache")
+        with open(self.stub, "w") as f:
+            f.write(STUB_SOURCE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.tmpdir.cleanup()
+
+    @property
+    def command(self):
+        return [sys.executable, self.stub, self.log]
+
+    def pop_log(self):
+        if not path.exists(self.log):
+            return []
+
+        with open(self.log) as f:
+            lines = f.read().split()
+
+        os.remove(self.log)
+        return lines
+
+    def build(self, units, cache=True):
+        output_dir = tempfile.mkdtemp(dir=self.tmpdir.name)
+        compiler = EmscriptenCompiler(self.command, cache_dir=self.cache_dir if cache else "", num_workers=2)
+        compiler.build(units, output_dir, {"out_wasm.js": ["-s", "WASM=1"], "out_asmjs.js": []}, options=["-O3"])
+        return output_dir
+
+
+def test_cache():
+    with _StubEnvironment() as env:
+        units = {"main": "int main;\n", "kernel_a": "void a();\n", "kernel_b": "void b();\n"}
+
+        output_dir1 = env.build(units)
+        assert sorted(env.pop_log()) == ["compile"] * 3 + ["link"] * 2
+        assert sorted(os.listdir(output_dir1)) == ["out_asmjs.js", "out_wasm.js", "out_wasm.wasm"]
+
+        output_dir2 = env.build(units)
+        assert env.pop_log() == []
+        for name in os.listdir(output_dir1):
+            with open(path.join(output_dir1, name)) as f1, open(path.join(output_dir2, name)) as f2:
+                assert f1.read() == f2.read()
+
+        units["kernel_b"] = "void b2();\n"
+        output_dir3 = env.build(units)
+        assert sorted(env.pop_log()) == ["compile"] + ["link"] * 2
+        with open(path.join(output_dir3, "out_asmjs.js")) as f:
+            assert "void b2();" in f.read()
+
+
+def test_no_cache():
+    with _StubEnvironment() as env:
+        units = {"main": "int main;\n"}
+        env.build(units, cache=False)
+        env.build(units, cache=False)
+        assert sorted(env.pop_log()) == ["compile"] * 2 + ["link"] * 4
+        assert not path.exists(env.cache_dir)
+
+
+def test_save_webassembly_descriptor():
+    x = Variable((2, 3), OrderNC)
+    y = x * ConstantVariable(np.random.rand(2, 3), OrderNC)
+    exec_data = WebassemblyDescriptorGenerator.generate(Graph([x], [y]))
+
+    with _StubEnvironment() as env:
+        original_flags = flags.WEBASSEMBLY_COMPILER, flags.WEBASSEMBLY_COMPILE_CACHE
+        flags.WEBASSEMBLY_COMPILER = " ".join(env.command)
+        flags.WEBASSEMBLY_COMPILE_CACHE = env.cache_dir
+        try:
+            output_dir = tempfile.mkdtemp(dir=env.tmpdir.name)
+            exec_data.save(output_dir)
+
+        finally:
+            flags.WEBASSEMBLY_COMPILER, flags.WEBASSEMBLY_COMPILE_CACHE = original_flags
+
+        assert {"kernels_webassembly.js", "kernels_webassembly.wasm", "kernels_asmjs.js"} <= set(os.listdir(output_dir))
+
+        with open(path.join(output_dir, "kernels_webassembly.js")) as f:
+            linked_source = f.read()
+
+        assert 'extern "C" void run()' in linked_source
+        for kernel in exec_data.descriptor.kernels:
+            assert f"void {kernel.exec_info.entry_func_name}(const int * meta_buffer);" in linked_source
@@ -0,0 +1,73 @@
+import numpy as np
+
+from webdnn.backend.webgl.optimize_rules.attach_lstm_workspace import AttachLSTMWorkspace, gather_lengths
+from webdnn.graph.axis import Axis
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.lstm import LSTM
+from webdnn.graph.order import OrderNTC, OrderNC, OrderC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+
+def _build_graph(T: int, return_sequences: bool):
+    x = Variable((2, T, 3), OrderNTC)
+    w_input = ConstantVariable(np.random.rand(16, 3), OrderNC)
+    w_hidden = ConstantVariable(np.random.rand(16, 4), OrderNC)
+    b = ConstantVariable(np.random.rand(16), OrderC)
+    lstm = LSTM(None, use_bias=True, return_sequences=return_sequences, use_initial_c=False, use_initial_h=False,
+                activation="tanh", recurrent_activation="sigmoid")
+    y, c = lstm(x, w_input, w_hidden, b)
+
+    return Graph([x], [y, c]), lstm
+
+
+def _workspace_names(lstm: LSTM):
+    return sorted(name for name in lstm.inputs.keys() if name.startswith("workspace"))
+
+
+def test_attach():
+    graph, lstm = _build_graph(T=3, return_sequences=False)
+
+    AttachLSTMWorkspace().optimize(graph)
+    assert _workspace_names(lstm) == ["workspace_c0", "workspace_c1", "workspace_h0", "workspace_h1"]
+
+    _, flag_changed = AttachLSTMWorkspace().optimize(graph)
+    assert not flag_changed
+    assert len(_workspace_names(lstm)) == 4
+
+
+def test_attach_return_sequences():
+    graph, lstm = _build_graph(T=3, return_sequences=True)
+
+    AttachLSTMWorkspace().optimize(graph)
+    assert _workspace_names(lstm) == ["workspace_c0", "workspace_c1", "workspace_h0", "workspace_h1", "workspace_h2"]
+
+
+def test_attach_return_sequences_long():
+    graph, lstm = _build_graph(T=20, return_sequences=True)
+
+    AttachLSTMWorkspace().optimize(graph)
+    names = _workspace_names(lstm)
+    assert len([name for name in names if name.startswith("workspace_h")]) == 20
+    assert [lstm.inputs[name].shape_dict[Axis.T] for name in names if name.startswith("workspace_y")] == [8, 8, 4]
+
+
+def test_gather_lengths():
+    assert gather_lengths(1) == [[1]]
+    assert gather_lengths(8) == [[8]]
+    assert gather_lengths(20) == [[8, 8, 4], [20]]
+    assert gather_lengths(100) == [[8] * 12 + [4], [64, 36], [100]]
+
+
+def test_attach_single_step():
+    graph, lstm = _build_graph(T=1, return_sequences=False)
+
+    AttachLSTMWorkspace().optimize(graph)
+    assert _workspace_names(lstm) == []
+
+
+def test_attach_single_step_return_sequences():
+    graph, lstm = _build_graph(T=1, return_sequences=True)
+
+    AttachLSTMWorkspace().optimize(graph)
+    assert _workspace_names(lstm) == ["workspace_h0"]
@@ -0,0 +1,49 @@
+import json
+import os
+import tempfile
+from os import path
+
+import numpy as np
+
+from webdnn.backend.webgl.generator import WebGLDescriptorGenerator, WeightPack
+from webdnn.encoder.constant_encoder import ConstantEncoder
+from webdnn.graph.graph import Graph
+from webdnn.graph.order import OrderNC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+
+def test_weight_pack_deduplicate():
+    pack = WeightPack()
+    w1 = ConstantVariable(np.arange(6).reshape(2, 3), OrderNC)
+    w2 = ConstantVariable(np.arange(6).reshape(2, 3) + 1, OrderNC)
+
+    assert pack.add(w1, w1.data.ravel()) == 0
+    assert pack.add(w2, w2.data.ravel()) == 6
+    assert pack.add(w1, w1.data.ravel()) == 0
+    assert pack.size == 12
+
+    w1.data[:] = 0
+    assert pack.add(w1, w1.data.ravel()) == 12
+    assert np.frombuffer(pack.encode(ConstantEncoder.get_encoder("raw")), dtype=np.float32).size == 18
+
+
+def test_shared_weight_file():
+    x = Variable((2, 3), OrderNC)
+    y = x * ConstantVariable(np.arange(6).reshape(2, 3), OrderNC) + ConstantVariable(np.ones((2, 3)), OrderNC)
+    graph = Graph([x], [y])
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        WebGLDescriptorGenerator.generate(graph).save(tmpdir)
+
+        assert sorted(os.listdir(tmpdir)) == ["graph_webgl_16384.json", "graph_webgl_4096.json", "graph_webgl_8192.json",
+                                              "weight_webgl.bin"]
+        weight = np.fromfile(path.join(tmpdir, "weight_webgl.bin"), dtype=np.float32)
+        assert weight.size == 12
+
+        for max_texture_size in [4096, 8192, 16384]:
+            with open(path.join(tmpdir, f"graph_webgl_{max_texture_size}.json")) as f:
+                constants_map = json.load(f)["constants_map"]
+
+            values = sorted(tuple(weight[c["byte_offset"] // 4:c["byte_offset"] // 4 + c["size"]]) for c in constants_map.values())
+            assert values == [(0, 1, 2, 3, 4, 5), (1, 1, 1, 1, 1, 1)]
@@ -0,0 +1,161 @@
+import io
+
+import numpy as np
+from nose.tools import raises
+
+from webdnn.backend.code_generator.allocator import allocate
+from webdnn.encoder.constant_encoder import ConstantEncoder
+from webdnn.encoder.constant_encoder_eightbit import ConstantEncoderEightbit
+from webdnn.encoder.constant_encoder_kmeans import kmeans_1d
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.linear import Linear
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.order import OrderNC, OrderCN
+from webdnn.graph.placeholder import Placeholder
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util import flags
+
+
+def _generate_layout():
+    x = Variable((3, 50), OrderNC)
+    w1 = ConstantVariable(np.random.randn(3, 50), OrderNC)
+    w2 = ConstantVariable(np.random.rand(3, 50) + 1, OrderNC)
+    y = x * w1 + w2
+    return allocate(Graph([x], [y]))
+
+
+def _decode_int8(data: bytes, asymmetric: bool) -> np.ndarray:
+    total_size = np.frombuffer(data, dtype=np.int32, count=1)[0]
+    result = np.zeros((total_size,), dtype=np.float32)
+    offset = 4
+    while offset < len(data):
+        dst_offset, size, num_channels, _ = np.frombuffer(data, dtype=np.int32, count=4, offset=offset)
+        offset += 16
+        scale = np.frombuffer(data, dtype=np.float32, count=num_channels, offset=offset)
+        offset += num_channels * 4
+        minimum = np.zeros_like(scale)
+        if asymmetric:
+            minimum = np.frombuffer(data, dtype=np.float32, count=num_channels, offset=offset)
+            offset += num_channels * 4
+
+        code = np.frombuffer(data, dtype=np.uint8 if asymmetric else np.int8, count=size, offset=offset).reshape(num_channels, -1)
+        offset += (size + 3) // 4 * 4
+        result[dst_offset:dst_offset + size] = (code * scale[:, None] + minimum[:, None]).ravel()
+
+    return result
+
+
+def _decode_kmeans(data: bytes) -> np.ndarray:
+    total_size = np.frombuffer(data, dtype=np.int32, count=1)[0]
+    result = np.zeros((total_size,), dtype=np.float32)
+    offset = 4
+    while offset < len(data):
+        dst_offset, size, bits, _ = np.frombuffer(data, dtype=np.int32, count=4, offset=offset)
+        offset += 16
+        codebook = np.frombuffer(data, dtype=np.float32, count=2 ** bits, offset=offset)
+        offset += 2 ** bits * 4
+        packed_size = (size * bits + 7) // 8
+        code_bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8, count=packed_size, offset=offset))[:size * bits]
+        code = np.packbits(np.pad(code_bits.reshape(size, bits), ((0, 0), (8 - bits, 0)), "constant"), axis=1).ravel()
+        offset += (packed_size + 3) // 4 * 4
+        result[dst_offset:dst_offset + size] = codebook[code]
+
+    return result
+
+
+def test_fp16():
+    layout = _generate_layout()
+    decoded = np.frombuffer(ConstantEncoder.get_encoder("fp16").encode(layout), dtype=np.float16).astype(np.float32)
+    assert np.allclose(decoded, layout.data, rtol=1e-3, atol=1e-3)
+
+
+def test_int8_symmetric():
+    layout = _generate_layout()
+    encoder = ConstantEncoder.get_encoder("int8_symmetric")
+    decoded = _decode_int8(encoder.encode(layout), asymmetric=False)
+    assert encoder.name == "int8_symmetric"
+    assert np.allclose(decoded, layout.data, atol=np.max(np.abs(layout.data)) / 127)
+
+
+def test_int8_asymmetric():
+    layout = _generate_layout()
+    encoder = ConstantEncoder.get_encoder("int8_asymmetric")
+    decoded = _decode_int8(encoder.encode(layout), asymmetric=True)
+    assert encoder.name == "int8_asymmetric"
+    assert np.allclose(decoded, layout.data, atol=(np.max(layout.data) - np.min(layout.data)) / 255)
+
+
+def test_kmeans():
+    layout = _generate_layout()
+    for bits in [1, 3, 4, 8]:
+        encoder = ConstantEncoder.get_encoder(f"kmeans{bits}")
+        decoded = _decode_kmeans(encoder.encode(layout))
+        assert encoder.name == "kmeans"
+        assert np.mean(np.abs(decoded - layout.data)) < np.std(layout.data)
+
+
+def test_kmeans_1d():
+    data = np.array([0.0, 0.1, 0.2, 10.0, 10.1, 10.2, 20.0])
+    centroids = kmeans_1d(data, 3)
+    assert np.allclose(centroids, [0.1, 10.1, 20.0])
+
+
+@raises(ValueError)
+def test_unknown_encoder():
+    ConstantEncoder.get_encoder("unknown")
+
+
+def test_eightbit_parallel():
+    layout = _generate_layout()
+    serial = ConstantEncoderEightbit(num_workers=1).encode(layout)
+    parallel = ConstantEncoderEightbit(num_workers=4, chunk_size=16).encode(layout)
+    assert serial == parallel
+
+
+def test_decode():
+    layout = _generate_layout()
+    for name, atol in [("raw", 0), ("fp16", 1e-2), ("eightbit", 0.1), ("int8_symmetric", 0.1), ("int8_asymmetric", 0.1)]:
+        encoder = ConstantEncoder.get_encoder(name)
+        decoded = encoder.decode(encoder.encode(layout))
+        assert np.allclose(decoded, layout.data, atol=atol), name
+
+    encoder = ConstantEncoder.get_encoder("kmeans4")
+    assert np.array_equal(encoder.decode(encoder.encode(layout)), _decode_kmeans(encoder.encode(layout)))
+
+
+def test_decode_dynamic():
+    N = Placeholder(label="N")
+    x = Variable((N, 5), OrderNC)
+    w = ConstantVariable(np.random.randn(5, 3), OrderCN)
+    y, = Linear(None)(x, w)
+    y, = Relu(None)(y)
+    layout = allocate(Graph([x], [y]))
+
+    for name, atol in [("raw", 0), ("fp16", 1e-2), ("eightbit", 0.1), ("int8_symmetric", 0.1), ("int8_asymmetric", 0.1)]:
+        encoder = ConstantEncoder.get_encoder(name)
+        decoded = encoder.decode(encoder.encode(layout))
+        assert np.allclose(decoded, layout.data, atol=atol), name
+
+
+def test_encode_to():
+    layout = _generate_layout()
+    for name in ["raw", "fp16", "eightbit"]:
+        encoder = ConstantEncoder.get_encoder(name)
+        f = io.BytesIO()
+        size = encoder.encode_to(layout, f)
+        assert f.getvalue() == encoder.encode(layout)
+        assert size == len(f.getvalue())
+
+
+def test_memmap_constant_buffer():
+    original_threshold = flags.CONSTANT_MEMMAP_THRESHOLD
+    try:
+        flags.CONSTANT_MEMMAP_THRESHOLD = 0
+        layout = _generate_layout()
+
+    finally:
+        flags.CONSTANT_MEMMAP_THRESHOLD = original_threshold
+
+    assert isinstance(layout.data, np.memmap)
+    assert np.array_equal(np.frombuffer(ConstantEncoder.get_encoder("raw").encode(layout), dtype=np.float32), layout.data)
@@ -0,0 +1,49 @@
+import pickle
+
+from nose.tools import raises
+
+from webdnn.frontend.constraints import AxisVar, unify
+from webdnn.graph.axis import Axis, AxisKeyDict
+
+
+def test_interned():
+    assert Axis("C") is Axis.C
+    assert Axis(None) is not Axis(None)
+    assert pickle.loads(pickle.dumps(Axis.C)) is Axis.C
+
+
+def test_hash():
+    assert {Axis.N: 1, Axis.C: 2}[Axis("C")] == 2
+    assert len({Axis.N, Axis("N"), Axis.C}) == 2
+
+
+def test_axis_key_dict():
+    d = AxisKeyDict([Axis.N, Axis.C], [1, 2])
+    d[Axis.H] = 3
+    d[Axis.N] = 4
+    del d[Axis.C]
+
+    assert list(d.items()) == [(Axis.N, 4), (Axis.H, 3)]
+    assert d[Axis.H] == 3
+    assert Axis.C not in d
+    assert d.get(Axis.C, 5) == 5
+
+
+@raises(KeyError)
+def test_axis_key_dict_missing_key():
+    AxisKeyDict([Axis.N], [1])[Axis.C]
+
+
+def test_axis_key_dict_with_axis_var():
+    a = AxisVar()
+    d = AxisKeyDict([Axis.N, a], [1, 2])
+
+    assert d[a] == 2
+    assert Axis.C not in d
+
+    unify(a, Axis.C)
+    assert d[Axis.C] == 2
+
+    del d[a]
+    assert list(d.keys()) == [Axis.N]
+    assert d[Axis.N] == 1
@@ -0,0 +1,82 @@
+import pickle
+
+import numpy as np
+
+from webdnn.graph import traverse
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.elementwise_mul import ElementwiseMul
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.order import OrderNC
+from webdnn.graph.placeholder import Placeholder
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+
+def test_clone():
+    N = Placeholder(label="N")
+    x = Variable((N, 3), OrderNC)
+    w = ConstantVariable(np.arange(6).reshape(2, 3), OrderNC)
+    h, = Relu(None)(x)
+    y = h * w
+    graph = Graph([x], [y])
+
+    graph2 = graph.clone()
+
+    nodes1 = traverse.listup_nodes(graph)
+    nodes2 = traverse.listup_nodes(graph2)
+    assert len(nodes1) == len(nodes2)
+    for n1, n2 in zip(nodes1, nodes2):
+        assert n1 is not n2
+        assert n1.__class__ == n2.__class__
+        assert n1.name == n2.name
+
+    x2 = graph2.inputs[0]
+    y2 = graph2.outputs[0]
+    assert x2.order == x.order
+    assert isinstance(y2.output_from, ElementwiseMul)
+    assert y2.output_from.outputs["y"] is y2
+
+    # placeholders are cloned, and shared placeholders are still shared
+    N2 = x2.shape_dict[OrderNC.axes[0]]
+    assert N2 is not N
+    h2 = x2.input_to.pop().outputs["y"]
+    assert h2.shape_dict[OrderNC.axes[0]] is N2
+
+    # constant data is shared as read-only view
+    w2 = traverse.filter_nodes(nodes2, ConstantVariable)[0]  # type: ConstantVariable
+    assert np.shares_memory(w.data, w2.data)
+    assert not w2.data.flags.writeable
+    assert w.data.flags.writeable
+
+
+def test_clone_deep_graph():
+    x = Variable((2, 3), OrderNC)
+    h = x
+    for _ in range(12000):
+        h, = Relu(None)(h)
+
+    graph = Graph([x], [h]).clone()
+
+    depth = 0
+    v = graph.outputs[0]
+    while v.output_from is not None:
+        v = v.output_from.inputs["x0"]
+        depth += 1
+
+    assert depth == 12000
+    assert v is graph.inputs[0]
+
+
+def test_pickle_drops_cache():
+    x = Variable((2, 3), OrderNC)
+    y, = Relu(None)(x)
+    graph = Graph([x], [y])
+    traverse.listup_nodes(graph)
+    assert len(graph.cache) > 0
+
+    graph2 = pickle.loads(pickle.dumps(graph))
+    assert graph2._cache == {}
+    assert graph2.inputs[0].owner_graph is None
+
+    assert len(traverse.listup_nodes(graph2)) == 3
+    assert graph2.inputs[0].owner_graph is graph2
@@ -1,4 +1,9 @@
-from webdnn.graph.node import Node
+import pickle
+
+from webdnn.graph.attribute import Attribute
+from webdnn.graph.node import Node, add_modification_listener, remove_modification_listener
+from webdnn.graph.order import OrderNC
+from webdnn.graph.variable import Variable
 
 
 def test_append_prev():
@@ -6,10 +11,10 @@ def test_append_prev():
     n2 = Node()
     n2.append_prev(n1)
 
-    assert n1.prevs == set()
-    assert n1.nexts == {n2}
-    assert n2.prevs == {n1}
-    assert n2.nexts == set()
+    assert n1.prevs == []
+    assert n1.nexts == [n2]
+    assert n2.prevs == [n1]
+    assert n2.nexts == []
 
 
 def test_remove_prev():
@@ -18,10 +23,10 @@ def test_remove_prev():
     n2.append_prev(n1)
     n2.remove_prev(n1)
 
-    assert n1.prevs == set()
-    assert n1.nexts == set()
-    assert n2.prevs == set()
-    assert n2.nexts == set()
+    assert n1.prevs == []
+    assert n1.nexts == []
+    assert n2.prevs == []
+    assert n2.nexts == []
 
 
 def test_append_next():
@@ -29,10 +34,10 @@ def test_append_next():
     n2 = Node()
     n1.append_next(n2)
 
-    assert n1.prevs == set()
-    assert n1.nexts == {n2}
-    assert n2.prevs == {n1}
-    assert n2.nexts == set()
+    assert n1.prevs == []
+    assert n1.nexts == [n2]
+    assert n2.prevs == [n1]
+    assert n2.nexts == []
 
 
 def test_remove_next():
@@ -41,7 +46,93 @@ def test_remove_next():
     n1.append_next(n2)
     n1.remove_next(n2)
 
-    assert n1.prevs == set()
-    assert n1.nexts == set()
-    assert n2.prevs == set()
-    assert n2.nexts == set()
+    assert n1.prevs == []
+    assert n1.nexts == []
+    assert n2.prevs == []
+    assert n2.nexts == []
+
+
+def test_modification_listener():
+    modified = []
+    add_modification_listener(modified.append)
+
+    n1 = Node()
+    n2 = Node()
+    n2.append_prev(n1)
+    n2.remove_prev(n1)
+
+    remove_modification_listener(modified.append)
+    n2.append_prev(n1)
+
+    assert modified == [n2, n1, n2, n1]
+
+
+def test_adjacency_order():
+    n1 = Node()
+    nexts = [Node() for _ in range(10)]
+    for n in nexts:
+        n1.append_next(n)
+
+    n1.remove_next(nexts[3])
+    n1.append_next(nexts[3])
+    n1.append_next(nexts[0])
+
+    assert n1.nexts == nexts[:3] + nexts[4:] + [nexts[3]]
+
+
+def test_slots():
+    n1 = Node()
+    assert not hasattr(n1, "__dict__")
+
+    v = Variable((1, 2), OrderNC)
+    assert not hasattr(v, "__dict__")
+
+
+def test_get_attribute():
+    class Attr1(Attribute):
+        pass
+
+    class Attr2(Attr1):
+        pass
+
+    n1 = Node()
+    a1 = Attr1(n1)
+    a2 = Attr2(n1)
+    n1.attributes.add(a1)
+    assert n1.get_attribute(Attr1) == [a1]
+    assert not n1.has_attribute(Attr2)
+
+    n1.attributes.add(a2)
+    assert n1.get_attribute(Attr1) == [a1, a2]
+    assert n1.get_attribute(Attr2) == [a2]
+
+    n1.attributes.remove(a1)
+    assert n1.get_attribute(Attr1) == [a2]
+
+
+def test_pickle():
+    n1 = Node()
+    n2 = Node()
+    n1.append_next(n2)
+    n1.parameters["foo"] = 1
+
+    n1_copy = pickle.loads(pickle.dumps(n1))
+    assert n1_copy.name == n1.name
+    assert n1_copy.parameters == {"foo": 1}
+    assert n1_copy.nexts[0].prevs == [n1_copy]
+
+
+def test_modification_listener_parameters_and_attributes():
+    n1 = Node()
+    modified = []
+    add_modification_listener(modified.append)
+
+    n1.parameters["foo"] = 1
+    n1.parameters.update(bar=2)
+    del n1.parameters["foo"]
+    n1.attributes.add(Attribute(n1))
+
+    remove_modification_listener(modified.append)
+
+    assert modified == [n1, n1, n1, n1]
+    assert n1.parameters == {"bar": 2}
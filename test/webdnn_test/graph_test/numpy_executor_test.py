@@ -0,0 +1,97 @@
+import numpy as np
+
+from webdnn.graph import numpy_executor
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.convolution2d import Convolution2D
+from webdnn.graph.operators.deconvolution2d import Deconvolution2D
+from webdnn.graph.operators.lstm import LSTM
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.operators.sgemm import Sgemm
+from webdnn.graph.order import OrderNHWC, OrderNCHW, OrderNC, OrderCN, OrderNTC, OrderC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+
+
+def _convolution_2d_naive(x, w, stride, padding):
+    n, h1, w1, c1 = x.shape
+    c2, kh, kw, _ = w.shape
+    x = np.pad(x, ((0, 0), (padding, padding), (padding, padding), (0, 0)), "constant")
+    h2 = (h1 + 2 * padding - kh) // stride + 1
+    w2 = (w1 + 2 * padding - kw) // stride + 1
+    y = np.zeros((n, h2, w2, c2))
+    for i in range(h2):
+        for j in range(w2):
+            patch = x[:, i * stride:i * stride + kh, j * stride:j * stride + kw, :]
+            y[:, i, j, :] = np.tensordot(patch, w, axes=([1, 2, 3], [1, 2, 3]))
+
+    return y
+
+
+def test_convolution_2d():
+    vx = np.random.rand(2, 7, 6, 3)
+    vw = np.random.rand(4, 3, 3, 3)
+
+    x = Variable(vx.shape, OrderNHWC)
+    w = ConstantVariable(vw, OrderNHWC)
+    y, = Convolution2D(None, ksize=3, stride=2, padding=1)(x, w)
+    y.change_order(OrderNCHW)
+
+    vy, = numpy_executor.run(Graph([x], [y]), [vx])
+
+    assert np.allclose(vy, _convolution_2d_naive(vx, vw, 2, 1).transpose(0, 3, 1, 2), atol=1e-5)
+
+
+def test_deconvolution_2d_is_adjoint_of_convolution_2d():
+    vx = np.random.rand(1, 5, 5, 3)
+    vw = np.random.rand(2, 3, 3, 3)  # (C_out, KH, KW, C_in) of convolution
+
+    vy = _convolution_2d_naive(vx, vw, 2, 1)
+    vgy = np.random.rand(*vy.shape)
+
+    gy = Variable(vgy.shape, OrderNHWC)
+    w = ConstantVariable(vw.transpose(3, 1, 2, 0), OrderNHWC)
+    gx, = Deconvolution2D(None, ksize=3, stride=2, padding=1)(gy, w)
+
+    vgx, = numpy_executor.run(Graph([gy], [gx]), [vgy])
+    assert np.allclose(np.sum(vy * vgy), np.sum(vx * vgx), rtol=1e-4)
+
+
+def test_sgemm():
+    va = np.random.rand(3, 4)
+    vb = np.random.rand(5, 4)
+
+    a = Variable(va.shape, OrderNC)
+    b = ConstantVariable(vb, OrderNC)
+    c, = Sgemm(None, M=3, N=5, K=4, out_shape=[3, 5], out_order=OrderNC, transpose_A=True, transpose_B=False)(a, b)
+
+    vc, = numpy_executor.run(Graph([a], [c]), [va])
+    assert np.allclose(vc, np.dot(va, vb.T), atol=1e-5)
+
+
+def test_lstm_zero_weight():
+    x = Variable((2, 3, 4), OrderNTC)
+    w_input = ConstantVariable(np.zeros((4, 8)), OrderCN)
+    w_hidden = ConstantVariable(np.zeros((2, 8)), OrderCN)
+    b = ConstantVariable(np.ones((8,)), OrderC)
+    y, c = LSTM(None, use_bias=True, return_sequences=False, use_initial_c=False, use_initial_h=False, activation="tanh",
+                recurrent_activation="sigmoid")(x, w_input, w_hidden, b)
+
+    vy, vc = numpy_executor.run(Graph([x], [y, c]), [np.random.rand(2, 3, 4)])
+
+    # c_t = tanh(1) * sigmoid(1) + c_{t-1} * sigmoid(1)
+    s = 1 / (1 + np.exp(-1))
+    expected_c = sum(np.tanh(1) * s * s ** t for t in range(3))
+    assert np.allclose(vc, expected_c)
+    assert np.allclose(vy, np.tanh(expected_c) * s)
+
+
+def test_change_order():
+    data = np.random.rand(2, 3)
+    assert np.array_equal(numpy_executor.change_order(data, OrderNC, OrderCN), data.T)
+    assert numpy_executor.change_order(data, OrderNC, OrderNHWC).shape == (2, 1, 1, 3)
+
+
+def test_is_supported():
+    x = Variable((2, 3), OrderNC)
+    y, = Relu(None)(x)
+    assert numpy_executor.is_supported(y.output_from)
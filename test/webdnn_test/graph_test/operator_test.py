@@ -1,4 +1,10 @@
+import importlib
+import inspect
+import pkgutil
+
+import webdnn.graph.operators
 from webdnn.graph.operator import Operator
+from webdnn.graph.operators.local_response_normalization import LocalResponseNormalization
 from webdnn.graph.order import OrderNHWC
 from webdnn.graph.variable import Variable
 
@@ -13,8 +19,8 @@ def test_append_input():
 
     assert op.inputs["v1"] == v1
     assert op.inputs["v2"] == v2
-    assert v1.input_to == {op}
-    assert v2.input_to == {op}
+    assert v1.input_to == [op]
+    assert v2.input_to == [op]
 
 
 def test_remove_input():
@@ -28,8 +34,8 @@ def test_remove_input():
 
     assert "v1" not in op.inputs
     assert op.inputs["v2"] == v2
-    assert v1.input_to == set()
-    assert v2.input_to == {op}
+    assert v1.input_to == []
+    assert v2.input_to == [op]
 
 
 def test_replace_input():
@@ -41,8 +47,8 @@ def test_replace_input():
     op.replace_input(v1, v2)
 
     assert op.inputs["v1"] == v2
-    assert v1.input_to == set()
-    assert v2.input_to == {op}
+    assert v1.input_to == []
+    assert v2.input_to == [op]
 
 
 def test_append_output():
@@ -103,8 +109,8 @@ def test_remove_all():
 
     assert len(op.inputs) == 0
     assert len(op.outputs) == 0
-    assert v1.input_to == set()
-    assert v2.input_to == set()
+    assert v1.input_to == []
+    assert v2.input_to == []
     assert v3.output_from is None
     assert v4.output_from is None
 
@@ -124,5 +130,25 @@ def test_replace_all():
     assert len(op1.outputs) == 0
     assert len(op2.inputs) == 1 and op2.inputs["v1"] == v1
     assert len(op2.outputs) == 1 and op2.outputs["v2"] == v2
-    assert v1.input_to == {op2}
+    assert v1.input_to == [op2]
     assert v2.output_from == op2
+
+
+def test_copy():
+    op = LocalResponseNormalization(None, n=5, k=2, alpha=1e-4, beta=0.75)
+    op2 = op.copy()
+
+    assert op2 is not op
+    assert isinstance(op2, LocalResponseNormalization)
+    assert op2.parameters == op.parameters
+
+
+def test_operators_slots():
+    for module_info in pkgutil.iter_modules(webdnn.graph.operators.__path__):
+        module = importlib.import_module(f"webdnn.graph.operators.{module_info.name}")
+        for klass in vars(module).values():
+            if inspect.isclass(klass) and issubclass(klass, Operator) and klass.__module__ == module.__name__:
+                assert "__slots__" in vars(klass), f"{klass.__name__} does not define __slots__"
+
+    op = LocalResponseNormalization(None, n=5, k=2, alpha=1e-4, beta=0.75)
+    assert not hasattr(op, "__dict__")
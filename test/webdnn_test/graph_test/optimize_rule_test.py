@@ -0,0 +1,140 @@
+from typing import Tuple
+
+import numpy as np
+
+from webdnn.graph import traverse
+from webdnn.graph.graph import Graph
+from webdnn.graph.operator import Operator
+from webdnn.graph.operators.elementwise_add import ElementwiseAdd
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.operators.scalar_add import ScalarAdd
+from webdnn.graph.optimize_rule import OptimizeRule, OptimizeRuleGroup, OperatorOptimizeRule, _ModificationLog
+from webdnn.graph.order import OrderNC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.optimizer.sub_rules.simplify_commutative_operator import SimplifyCommutativeOperator
+
+
+class RemoveScalarAddRule(OperatorOptimizeRule):
+    pattern = ScalarAdd
+
+    def __init__(self):
+        super(RemoveScalarAddRule, self).__init__()
+        self.applied_ops = []
+
+    def optimize_operator(self, graph: Graph, op: Operator):
+        self.applied_ops.append(op)
+        x = op.inputs["x0"]
+        y = op.outputs["y"]
+        op.remove_all()
+        OptimizeRule.replace_variable(graph, y, x, with_assert=False)
+        return True
+
+
+class CountRule(OptimizeRule):
+    def __init__(self):
+        super(CountRule, self).__init__()
+        self.count = 0
+
+    def optimize(self, graph: Graph) -> Tuple[Graph, bool]:
+        self.count += 1
+        return graph, False
+
+
+def _build_graph():
+    v = Variable((2, 3), OrderNC)
+    h, = Relu(None)(v)
+    h, = ScalarAdd(None, value=1)(h)
+    h, = Relu(None)(h)
+    h, = ScalarAdd(None, value=1)(h)
+    y, = Relu(None)(h)
+    return Graph([v], [y])
+
+
+def test_operator_optimize_rule():
+    graph = _build_graph()
+    rule = RemoveScalarAddRule()
+
+    graph, flag_changed = rule.optimize(graph)
+
+    assert flag_changed
+    assert len(rule.applied_ops) == 2
+
+
+def test_group_repeat():
+    graph = _build_graph()
+    sub_rule = RemoveScalarAddRule()
+    count_rule = CountRule()
+
+    graph, flag_changed = OptimizeRuleGroup([count_rule, sub_rule], repeat=True).optimize(graph)
+
+    assert flag_changed
+    assert len(traverse.filter_nodes(traverse.listup_operators(graph), ScalarAdd)) == 0
+    assert len(sub_rule.applied_ops) == 2
+
+    # CountRule is applied at first, and re-applied once after the graph is modified by RemoveScalarAddRule.
+    # After that, no node is modified and therefore it is not applied again.
+    assert count_rule.count == 2
+
+
+def test_group_no_repeat():
+    graph = _build_graph()
+    count_rule = CountRule()
+
+    graph, flag_changed = OptimizeRuleGroup([count_rule, RemoveScalarAddRule()], repeat=False).optimize(graph)
+
+    assert flag_changed
+    assert count_rule.count == 1
+
+
+class IncrementScalarAddRule(OperatorOptimizeRule):
+    pattern = ScalarAdd
+
+    def optimize_operator(self, graph: Graph, op: ScalarAdd):
+        if op.value != 1:
+            return False
+
+        # Only the parameter is modified
+        op.parameters["value"] = 2
+        return True
+
+
+class SpyRule(OperatorOptimizeRule):
+    def __init__(self):
+        super(SpyRule, self).__init__()
+        self.applied_ops = []
+
+    def optimize_operator(self, graph: Graph, op: Operator):
+        self.applied_ops.append(op)
+        return False
+
+
+def test_group_parameter_modification():
+    v = Variable((2, 3), OrderNC)
+    h = v
+    for _ in range(5):
+        h, = Relu(None)(h)
+    h, = ScalarAdd(None, value=1)(h)
+    for _ in range(5):
+        h, = Relu(None)(h)
+    graph = Graph([v], [h])
+
+    spy_rule = SpyRule()
+    OptimizeRuleGroup([spy_rule, IncrementScalarAddRule()], repeat=True).optimize(graph)
+
+    # Modification of parameter is recorded, and therefore SpyRule is re-applied only to operators around the ScalarAdd instead of
+    # whole graph.
+    assert len(spy_rule.applied_ops) == 11 + 3
+
+
+def test_commutative_swap_is_logged():
+    x = Variable((2, 3), OrderNC)
+    c = ConstantVariable(np.ones((2, 3)), OrderNC)
+    op = ElementwiseAdd(None)
+    op(c, x)
+
+    with _ModificationLog() as log:
+        assert SimplifyCommutativeOperator().optimize_operator(None, op)
+
+    assert op in log.nodes
+    assert op.inputs["x0"] is x and op.inputs["x1"] is c
@@ -1,3 +1,7 @@
+import gc
+import pickle
+
+from webdnn.graph import placeholder
 from webdnn.graph.placeholder import Placeholder
 
 
@@ -201,3 +205,58 @@ def test_deep_equal4():
     a = p1
     b = p2
     assert a == b
+
+
+def test_deep_equal_cancel():
+    p1 = Placeholder(label='p1')
+    p2 = Placeholder(label='p2')
+    a = p1 * p2 * 3 + p2 * 2 - p2 * p1 * 3
+    assert a == p2 * 2
+
+
+def test_deep_equal_after_resolve():
+    p1 = Placeholder(label='p1')
+    p2 = Placeholder(label='p2')
+    a = p1 * 2 + p2
+    b = p1 * 3 + p2
+    assert a != b
+
+    p1.value = 0
+    assert a == b
+    assert a != p2 + 1
+
+
+def test_sum_of_many_terms():
+    n = Placeholder(label='n')
+    s = 0
+    for i in range(100):
+        s = s + n * i + 1
+
+    assert s == n * 4950 + 100
+    n.value = 2
+    assert s == 10000
+
+
+def test_canonical_id():
+    n = Placeholder(label='n')
+    assert (n * 2 + 3).canonical_id() == (3 + 2 * n).canonical_id()
+    assert (n % 3).canonical_id() != (n // 3).canonical_id()
+
+
+def test_canonical_id_released():
+    n = Placeholder(label='test_canonical_id_released')
+    num_ids = len(placeholder._interned_ids)
+    expressions = [n * i + 1 for i in range(100)]
+    assert all(e.canonical_id() != expressions[0].canonical_id() for e in expressions[1:])
+    assert len(placeholder._interned_ids) > num_ids
+
+    del expressions
+    gc.collect()
+    assert len(placeholder._interned_ids) <= num_ids
+
+
+def test_pickle():
+    n = Placeholder(label='n')
+    a = pickle.loads(pickle.dumps(n * 2 + 1))
+    assert a == n * 2 + 1
+    assert a.generate_js_function() == "placeholders['n'] * 2 + 1"
@@ -4,6 +4,7 @@ from webdnn.graph.attribute import Attribute
 from webdnn.graph.graph import Graph
 from webdnn.graph.node import Node
 from webdnn.graph.operator import Operator
+from webdnn.graph.operators.relu import Relu
 from webdnn.graph.order import OrderNC
 from webdnn.graph.traverse import check_attribute_match, check_match, check_node_type_match, search_sub_structure, \
     filter_nodes, listup_operators, listup_variables, listup_nodes
@@ -263,3 +264,90 @@ def test_ignore_internal_bound_flag():
     assert result.index(n4) < result.index(n5)
     assert result.index(n5) < result.index(n6)
     assert result.index(n1) < result.index(n6)
+
+
+def test_listup_nodes_cache_invalidation():
+    n1 = Node("n1")
+    n2 = Node("n2")
+    n3 = Node("n3")
+    n2.append_prev(n1)
+    graph = Graph([n1], [n2])
+
+    assert listup_nodes(graph) == [n1, n2]
+
+    n3.append_prev(n2)
+    graph.outputs = [n3]
+    assert listup_nodes(graph) == [n1, n2, n3]
+
+    n3.remove_prev(n2)
+    n3.append_prev(n1)
+    assert listup_nodes(graph) == [n1, n3]
+
+
+def test_filter_nodes_cache_attribute_modified():
+    class TestAttribute(Attribute):
+        pass
+
+    v1 = Variable((1, 1), OrderNC)
+    op = Operator("op")
+    op.append_input("x", v1)
+    v2 = Variable((1, 1), OrderNC)
+    op.append_output("y", v2)
+    graph = Graph([v1], [v2])
+
+    assert filter_nodes(listup_operators(graph), TestAttribute) == []
+
+    op.attributes.add(TestAttribute(op))
+    assert filter_nodes(listup_operators(graph), TestAttribute) == [op]
+
+
+def test_filter_nodes_modified_list():
+    v1 = Variable((1, 1), OrderNC)
+    op = Operator("op")
+    op.append_input("x", v1)
+    v2 = Variable((1, 1), OrderNC)
+    op.append_output("y", v2)
+    graph = Graph([v1], [v2])
+
+    nodes = listup_nodes(graph)
+    nodes.remove(op)
+    assert filter_nodes(nodes, Operator) == []
+
+
+def test_listup_nodes_cache_per_graph():
+    x1 = Variable((1, 1), OrderNC)
+    y1, = Relu(None)(x1)
+    graph1 = Graph([x1], [y1])
+
+    x2 = Variable((1, 1), OrderNC)
+    y2, = Relu(None)(x2)
+    graph2 = Graph([x2], [y2])
+
+    nodes1 = listup_nodes(graph1)
+    listup_nodes(graph2)
+
+    # Modification of other graph does not clear the cache
+    y2.output_from.parameters["foo"] = 1
+    z2, = Relu(None)(y2)
+    assert listup_nodes(graph1).node_index is nodes1.node_index
+
+    y1.output_from.parameters["foo"] = 1
+    assert listup_nodes(graph1).node_index is not nodes1.node_index
+
+
+def test_listup_nodes_cache_adopted_by_other_graph():
+    n1 = Node("n1")
+    n2 = Node("n2")
+    n3 = Node("n3")
+    n2.append_prev(n1)
+    n3.append_prev(n2)
+    graph = Graph([n1], [n3])
+    sub_graph = Graph([n1], [n2])
+
+    assert listup_nodes(graph) == [n1, n2, n3]
+    version = graph.version
+
+    # Modification of n2 is not notified to graph after n2 is adopted by sub_graph, so the cache of graph is cleared at the adoption.
+    assert listup_nodes(sub_graph) == [n1, n2]
+    assert n2.owner_graph is sub_graph
+    assert graph.version != version
@@ -2,6 +2,7 @@ from nose.tools import raises
 
 from webdnn.graph.axis import Axis
 from webdnn.graph.order import OrderNHWC, OrderHWCN, OrderNC, OrderCHWN, OrderCN
+from webdnn.graph.placeholder import Placeholder
 from webdnn.graph.variable import Variable
 
 
@@ -62,3 +63,22 @@ def test_change_order_with_compression():
 def test_change_order_with_invalid_compression():
     v = Variable([3, 2, 2, 4], OrderNHWC)
     v.change_order(OrderCN)
+
+
+def test_shape_dict_cache():
+    v = Variable([1, 2, 3, 4], OrderNHWC)
+    assert v.shape_dict is v.shape_dict
+    assert v.stride_dict[Axis.H] == 12
+
+    v.change_order(OrderHWCN)
+    assert v.shape_dict[Axis.N] == 1
+    assert v.stride_dict[Axis.H] == 3 * 4 * 1
+
+
+def test_shape_dict_cache_with_placeholder():
+    p = Placeholder()
+    v = Variable([p, 2], OrderNC)
+    assert isinstance(v.shape_dict[Axis.N], Placeholder)
+
+    p.value = 3
+    assert v.shape_dict[Axis.N] == 3 and isinstance(v.shape_dict[Axis.N], int)
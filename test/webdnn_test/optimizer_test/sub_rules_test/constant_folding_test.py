@@ -1,7 +1,11 @@
 import numpy as np
 
+from webdnn.graph.axis import Axis
 from webdnn.graph.graph import Graph
-from webdnn.graph.order import OrderNCHW
+from webdnn.graph.operators.broadcast import Broadcast
+from webdnn.graph.operators.concat import Concat
+from webdnn.graph.operators.relu import Relu
+from webdnn.graph.order import OrderNCHW, OrderC, OrderNHWC
 from webdnn.graph.variable import Variable
 from webdnn.graph.variables.constant_variable import ConstantVariable
 from webdnn.optimizer.sub_rules.constant_folding import ConstantFolding
@@ -130,3 +134,52 @@ def test_fold_mul_deep():
     assert h2_new is not h2
     assert isinstance(h2_new, ConstantVariable)
     assert np.abs(np.mean(h2_new.data - (c0.data * c1.data * c2.data))) < 1e-5
+
+
+def test_fold_by_numpy_executor():
+    """
+    before)
+
+    c0 -+
+        +-{Concat}-h1-{Relu}-h2-+
+    c1 -+                       +-{Add}-h4
+                             h3-+
+
+    after)
+
+    relu(concat(c0, c1)) -+
+                          +-{Add}-h4
+                      h3 -+
+    """
+    c0 = ConstantVariable(np.random.rand(2, 3, 4, 5) - 0.5, OrderNCHW)
+    c1 = ConstantVariable(np.random.rand(2, 2, 4, 5) - 0.5, OrderNCHW)
+
+    h1, = Concat(None, axis=Axis.C)(c0, c1)
+    h2, = Relu(None)(h1)
+    h3 = Variable([2, 5, 4, 5], OrderNCHW)
+
+    h4 = h2 + h3
+
+    graph = Graph([h3], [h4])
+
+    ConstantFolding().optimize(graph)
+
+    h2_new = h4.output_from.inputs["x0"]
+
+    assert h2_new is not h2
+    assert isinstance(h2_new, ConstantVariable)
+    assert np.allclose(h2_new.data, np.maximum(np.concatenate([c0.data, c1.data], axis=1), 0))
+
+
+def test_not_fold_broadcast():
+    c0 = ConstantVariable(np.random.rand(5), OrderC)
+    h1, = Broadcast(None, out_shape=[2, 3, 4, 5], out_order=OrderNHWC)(c0)
+    h2 = Variable([2, 3, 4, 5], OrderNHWC)
+
+    h3 = h1 + h2
+
+    graph = Graph([h2], [h3])
+
+    ConstantFolding().optimize(graph)
+
+    assert isinstance(h3.output_from.inputs["x0"].output_from, Broadcast)
@@ -0,0 +1,68 @@
+import numpy as np
+
+from webdnn.graph import traverse
+from webdnn.graph.graph import Graph
+from webdnn.graph.operators.lstm import LSTM
+from webdnn.graph.operators.sgemm import Sgemm
+from webdnn.graph.order import OrderNTC, OrderCN, OrderC, OrderNC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.optimizer.sub_rules.hoist_lstm_input_projection import HoistLSTMInputProjection
+
+
+def _lstm_graph(w_input_order=OrderCN):
+    x = Variable((2, 5, 7), OrderNTC)
+    w_input = ConstantVariable(np.random.rand(7, 12), OrderCN).change_order(w_input_order)
+    w_hidden = ConstantVariable(np.random.rand(3, 12), OrderCN)
+    b = ConstantVariable(np.random.rand(12), OrderC)
+    lstm = LSTM(None, use_bias=True, return_sequences=True, use_initial_c=False, use_initial_h=False,
+                activation="tanh", recurrent_activation="sigmoid")
+    y, c = lstm(x, w_input, w_hidden, b)
+
+    return Graph([x], [y, c]), lstm, x, w_input
+
+
+def test_hoist():
+    """
+    before)
+
+          x -+
+             +-{LSTM}- y
+    w_input -+
+
+    after)
+
+          x -+
+             +-{Sgemm}- x_projected -{LSTM}- y
+    w_input -+
+    """
+    graph, lstm, x, w_input = _lstm_graph()
+
+    _, changed = HoistLSTMInputProjection().optimize(graph)
+
+    assert changed
+    assert "x" not in lstm.inputs and "w_input" not in lstm.inputs
+
+    x_projected = lstm.inputs["x_projected"]
+    assert x_projected.order == OrderNTC
+    assert x_projected.shape == (2, 5, 12)
+
+    sgemm = x_projected.output_from
+    assert isinstance(sgemm, Sgemm)
+    assert sgemm.inputs["A"] is x and sgemm.inputs["B"] is w_input
+    assert (sgemm.M, sgemm.N, sgemm.K) == (10, 12, 7)
+    assert sgemm.transpose_A and sgemm.transpose_B
+
+    _, changed = HoistLSTMInputProjection().optimize(graph)
+    assert not changed
+
+
+def test_hoist_w_input_nc():
+    graph, lstm, x, w_input = _lstm_graph(OrderNC)
+
+    HoistLSTMInputProjection().optimize(graph)
+
+    # constant weight is converted into OrderCN
+    assert w_input.order == OrderCN
+    assert lstm.inputs["x_projected"].output_from.transpose_B
+    assert len(traverse.filter_nodes(traverse.listup_operators(graph), Sgemm)) == 1
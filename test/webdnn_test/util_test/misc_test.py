@@ -0,0 +1,21 @@
+import sys
+
+from webdnn.util.misc import recursion_limit
+
+
+def test_recursion_limit():
+    original = sys.getrecursionlimit()
+
+    with recursion_limit(original + 1000):
+        assert sys.getrecursionlimit() == original + 1000
+
+    assert sys.getrecursionlimit() == original
+
+
+def test_recursion_limit_not_lowered():
+    original = sys.getrecursionlimit()
+
+    with recursion_limit(10):
+        assert sys.getrecursionlimit() == original
+
+    assert sys.getrecursionlimit() == original
@@ -0,0 +1,72 @@
+import tempfile
+
+import numpy as np
+from nose.tools import raises
+
+from webdnn.backend.interface.generator import generate_descriptor
+from webdnn.graph.graph import Graph
+from webdnn.graph.order import OrderNC
+from webdnn.graph.variable import Variable
+from webdnn.graph.variables.constant_variable import ConstantVariable
+from webdnn.util.profiler import Profiler, profile
+
+
+def test_profile_without_profiler():
+    with profile("test", "phase") as record:
+        record.changed = True
+
+
+def test_profile_without_profiler_is_shared():
+    assert profile("test", "a") is profile("test", "b")
+
+    with Profiler():
+        assert profile("test", "a") is not profile("test", "b")
+
+
+def test_nested_profiler():
+    with Profiler() as outer:
+        with profile("test", "a"):
+            pass
+
+        with Profiler() as inner:
+            with profile("test", "b") as record:
+                record.changed = True
+
+            with profile("test", "b"):
+                pass
+
+    assert [r.name for r in outer.records] == ["a", "b", "b"]
+    assert [r.name for r in inner.records] == ["b", "b"]
+
+    summary = {s.name: s for s in outer.summary()}
+    assert summary["b"].calls == 2
+    assert summary["b"].changed == 1
+
+
+def test_generate_descriptor():
+    x = Variable((2, 3), OrderNC)
+    y = x * ConstantVariable(np.random.rand(2, 3), OrderNC) + 1
+
+    with Profiler() as profiler:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # constants are encoded when saved
+            generate_descriptor("fallback", Graph([x], [y])).save(tmpdir)
+
+    categories = {r.category for r in profiler.records}
+    assert {"generator", "optimize_rule", "allocator", "generator_handler", "encoder"} <= categories
+
+    general = [r for r in profiler.records if r.name == "GeneralOptimizeRule"]
+    assert len(general) == 1
+    assert general[0].node_delta is not None
+
+    report = profiler.report("calls")
+    assert "GeneralOptimizeRule" in report
+
+    events = profiler.chrome_trace()["traceEvents"]
+    assert len(events) == len(profiler.records)
+    assert all(e["ph"] == "X" for e in events)
+
+
+@raises(ValueError)
+def test_unknown_sort_key():
+    Profiler().report("unknown")